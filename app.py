@@ -1,39 +1,14 @@
 import os
 import threading
-import time
 import sys
-from flask import Flask
 import webview
-from backend.bootstrap import init_app_state
-from backend.presentation.routes.status_routes import status_bp
-from backend.presentation.routes.flashcard_routes import flashcard_bp
-from backend.presentation.routes.chat_routes import chat_bp
-from backend.presentation.routes.debug_routes import debug_bp
-from backend.presentation.routes.credentials_routes import credentials_bp
+from backend.bootstrap import init_app_state, start_date_rollover
+from backend.presentation.app_factory import create_app
+from backend.presentation.dependencies import container
+from backend.presentation.js_bridge import attach_window
 
 # Initialize Flask
-server = Flask(__name__, static_folder='frontend/build', static_url_path='')
-server.register_blueprint(status_bp, url_prefix='/api')
-server.register_blueprint(flashcard_bp, url_prefix='/api')
-server.register_blueprint(chat_bp, url_prefix='/api')
-server.register_blueprint(debug_bp, url_prefix='/api')
-server.register_blueprint(credentials_bp, url_prefix='/api')
-
-@server.route('/')
-def index():
-    return server.send_static_file('index.html')
-
-def verify_date_loop():
-    """Background thread to check for date changes."""
-    while True:
-        time.sleep(300)  # Check every 5 minutes
-        # In a real app, we would check if the date has changed.
-        # For this prototype, we'll just print a heartbeat.
-        #print("Checking date...", file=sys.stderr)
-        # Logic to reload if date changed:
-        # current_day = str(datetime.date.today())
-        # if current_day != app_state.get_current_date():
-        #     init_app_state()
+server = create_app()
 
 def start_server():
     """Starts the Flask server."""
@@ -52,15 +27,22 @@ if __name__ == '__main__':
     t_load = threading.Thread(target=init_app_state, daemon=True)
     t_load.start()
 
-    # Start date verification thread
-    t = threading.Thread(target=verify_date_loop, daemon=True)
-    t.start()
-
-    # Start Flask in a separate thread
-    t_server = threading.Thread(target=start_server, daemon=True)
-    t_server.start()
-
-    # Create WebView window
-    webview.create_window('Dailystack', 'http://127.0.0.1:5000', width=1200, height=800, resizable=True)
+    # Switch to the next day's challenge at local midnight
+    start_date_rollover()
+
+    if os.environ.get("DAILYSTACK_DESKTOP_TRANSPORT", "http").lower() == "bridge":
+        # API calls go through pywebview's js_api and answers are pushed with evaluate_js.
+        # pywebview serves the app (static assets) itself, on a free port.
+        window = webview.create_window(
+            'Dailystack', server, js_api=container.js_bridge, width=1200, height=800, resizable=True
+        )
+        attach_window(container.js_bridge, window)
+    else:
+        # Start Flask in a separate thread
+        t_server = threading.Thread(target=start_server, daemon=True)
+        t_server.start()
+
+        # Create WebView window
+        webview.create_window('Dailystack', 'http://127.0.0.1:5000', width=1200, height=800, resizable=True)
     # Disable debug mode when running as packaged executable
     webview.start(debug=not is_packaged)
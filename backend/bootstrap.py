@@ -1,4 +1,5 @@
 """Legacy API entry point (Refactored to use Clean Architecture)."""
+from datetime import date
 from backend.presentation.dependencies import container
 
 # Export app_state for compatibility (though not strictly needed if app.py doesn't use it)
@@ -7,27 +8,31 @@ app_state = container.state_repository.get_state()
 def init_app_state():
     """Initialize the application state on startup."""
     print("Initializing application state...", flush=True)
+    
+    # Another worker sharing the state already loaded today's challenge
     state = container.state_repository.get_state()
-    state.is_loading = True
-    state.error = None
+    if state.get_current_date() == str(date.today()) and not state.is_generating and not state.error:
+        print("Daily challenge already loaded by another worker.", flush=True)
+        return
     
     try:
-        # Use the GetDailyChallenge use case
-        challenge = container.get_daily_challenge.execute()
+        # Use the LoadDailyChallenge use case
+        challenge = container.load_daily_challenge.execute()
         
         if challenge:
-             state.daily_challenge = challenge
-             state.current_flashcard_index = 0
-             state.conversations = {}
-             state.initialize_conversation(0)
-             state.is_loading = False
              print("Daily challenge loaded successfully.", flush=True)
         else:
-             state.error = "Failed to load daily challenge"
-             state.is_loading = False
              print("Failed to load daily challenge.", flush=True)
              
     except Exception as e:
-        state.error = str(e)
-        state.is_loading = False
         print(f"Error initializing state: {e}", flush=True)
+    
+    # Generate the coming days ahead of time (runs on this background thread)
+    try:
+        container.prefetch_challenges.execute()
+    except Exception as e:
+        print(f"Error prefetching challenges: {e}", flush=True)
+
+def start_date_rollover():
+    """Start the timer that switches to the next day's challenge at local midnight."""
+    container.midnight_timer.start()
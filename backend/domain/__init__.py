@@ -5,7 +5,8 @@ from .entities import (
     DailyChallenge,
     Agent,
     AgentCreationRequest,
-    AppState
+    AppState,
+    SearchHit
 )
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
     'DailyChallenge',
     'Agent',
     'AgentCreationRequest',
-    'AppState'
+    'AppState',
+    'SearchHit'
 ]
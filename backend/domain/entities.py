@@ -7,6 +7,28 @@ from datetime import date
 import uuid
 
 
+def generate_ulid() -> str:
+    """Generates a ULID-like string (26 chars) using Crockford's Base32."""
+    import time
+    import random
+    
+    CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+    t = int(time.time() * 1000)
+    
+    # Timestamp (10 chars)
+    timestamp_str = ""
+    for _ in range(10):
+        timestamp_str = CROCKFORD_BASE32[t % 32] + timestamp_str
+        t //= 32
+        
+    # Randomness (16 chars)
+    random_str = ""
+    for _ in range(16):
+        random_str += random.choice(CROCKFORD_BASE32)
+        
+    return timestamp_str + random_str
+
+
 @dataclass
 class Agent:
     """Represents a GenAI Agent."""
@@ -38,7 +60,7 @@ class Flashcard:
         """Create a Flashcard from a dictionary."""
         return cls(
             question=data.get('question', ''),
-            answer=data.get('short_answer', ''),
+            answer=data.get('short_answer', data.get('answer', '')),
             category=data.get('category', 'General'),
             detailed_explanation=data.get('detailed_explanation'),
             code_example=data.get('code_example', ''),
@@ -66,13 +88,10 @@ class Scenario:
     @classmethod
     def from_dict(cls, data: dict) -> 'Scenario':
         """Create a Scenario from a dictionary."""
-        print(f"DEBUG - Scenario.from_dict input: {data}", flush=True)
-        scenario = cls(
+        return cls(
             title=data.get('title', ''),
-            description=data.get('problem_description', '')
+            description=data.get('problem_description', data.get('description', ''))
         )
-        print(f"DEBUG - Created Scenario object: title='{scenario.title}', description='{scenario.description}'", flush=True)
-        return scenario
     
     def to_dict(self) -> dict:
         """Convert Scenario to dictionary."""
@@ -110,12 +129,102 @@ class DailyChallenge:
         }
 
 
+@dataclass
+class SearchHit:
+    """Represents a single full-text search result over past study content."""
+    kind: str
+    date: str
+    title: str
+    snippet: str
+    score: float
+    flashcard_index: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        """Convert SearchHit to dictionary."""
+        return {
+            'kind': self.kind,
+            'date': self.date,
+            'title': self.title,
+            'snippet': self.snippet,
+            'score': self.score,
+            'flashcard_index': self.flashcard_index
+        }
+
+
+@dataclass
+class StudyEvent:
+    """Represents something the learner did (card viewed, question asked, answer revealed)."""
+    type: str
+    # Unix seconds; 0 until the event log stamps it on append
+    timestamp: float = 0.0
+    challenge_date: Optional[str] = None
+    flashcard_index: Optional[int] = None
+    data: Dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'StudyEvent':
+        """Create a StudyEvent from a dictionary."""
+        return cls(
+            type=data['type'],
+            timestamp=data.get('timestamp', 0.0),
+            challenge_date=data.get('challenge_date'),
+            flashcard_index=data.get('flashcard_index'),
+            data=dict(data.get('data') or {})
+        )
+
+    def to_dict(self) -> dict:
+        """Convert StudyEvent to dictionary."""
+        return {
+            'type': self.type,
+            'timestamp': self.timestamp,
+            'challenge_date': self.challenge_date,
+            'flashcard_index': self.flashcard_index,
+            'data': self.data
+        }
+
+
 @dataclass
 class ConversationState:
     """Represents the state of a conversation for a specific flashcard."""
     id: str
     messages: List[dict] = field(default_factory=list)
     is_first: bool = True
+    # Older messages live in the message archive; `messages` is the recent window
+    spilled_count: int = 0
+    summary: Optional[str] = None
+    # Set once its day is over: new messages go straight to the archive
+    archived: bool = False
+    # Initial explanation generated in the background, served when the card is opened
+    explanation: Optional[str] = None
+    
+    def total_messages(self) -> int:
+        """Number of messages, archived ones included."""
+        return self.spilled_count + len(self.messages)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ConversationState':
+        """Create a ConversationState from a dictionary."""
+        return cls(
+            id=data['id'],
+            messages=list(data.get('messages', [])),
+            is_first=data.get('is_first', True),
+            spilled_count=data.get('spilled_count', 0),
+            summary=data.get('summary'),
+            archived=data.get('archived', False),
+            explanation=data.get('explanation')
+        )
+    
+    def to_dict(self) -> dict:
+        """Convert ConversationState to dictionary."""
+        return {
+            'id': self.id,
+            'messages': self.messages,
+            'is_first': self.is_first,
+            'spilled_count': self.spilled_count,
+            'summary': self.summary,
+            'archived': self.archived,
+            'explanation': self.explanation
+        }
 
 
 @dataclass
@@ -126,9 +235,45 @@ class AppState:
     current_conversation_id: Optional[str] = None
     is_first_message_for_card: bool = True
     is_loading: bool = True
+    # True while the remaining flashcards of a streamed challenge are still arriving
+    is_generating: bool = False
     error: Optional[str] = None
     conversations: Dict[int, ConversationState] = field(default_factory=dict)
     
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AppState':
+        """Create an AppState from a dictionary (see `to_dict`)."""
+        challenge = data.get('daily_challenge')
+        return cls(
+            daily_challenge=DailyChallenge.from_dict(challenge) if challenge else None,
+            current_flashcard_index=data.get('current_flashcard_index', 0),
+            current_conversation_id=data.get('current_conversation_id'),
+            is_first_message_for_card=data.get('is_first_message_for_card', True),
+            is_loading=data.get('is_loading', True),
+            is_generating=data.get('is_generating', False),
+            error=data.get('error'),
+            conversations={
+                int(index): ConversationState.from_dict(conversation)
+                for index, conversation in data.get('conversations', {}).items()
+            }
+        )
+    
+    def to_dict(self) -> dict:
+        """Convert AppState to a JSON-serializable dictionary."""
+        return {
+            'daily_challenge': self.daily_challenge.to_dict() if self.daily_challenge else None,
+            'current_flashcard_index': self.current_flashcard_index,
+            'current_conversation_id': self.current_conversation_id,
+            'is_first_message_for_card': self.is_first_message_for_card,
+            'is_loading': self.is_loading,
+            'is_generating': self.is_generating,
+            'error': self.error,
+            'conversations': {
+                str(index): conversation.to_dict()
+                for index, conversation in self.conversations.items()
+            }
+        }
+    
     def get_scenario(self) -> Optional[Scenario]:
         """Get the current scenario."""
         if self.daily_challenge:
@@ -151,6 +296,10 @@ class AppState:
         if not self.daily_challenge or not self.daily_challenge.flashcards:
             return None
         
+        # The next card is still being generated: stay on the last one
+        if self.is_generating and self.current_flashcard_index + 1 >= len(self.daily_challenge.flashcards):
+            return self.get_current_flashcard()
+        
         self.current_flashcard_index += 1
         
         # Loop back to 0 if we exceed the list
@@ -202,31 +351,27 @@ class AppState:
         )
         return conv_id
 
+    def ensure_conversation(self, index: int) -> ConversationState:
+        """Get the conversation of a flashcard, creating it without making it current."""
+        if index not in self.conversations:
+            self.conversations[index] = ConversationState(id=self.generate_ulid())
+        return self.conversations[index]
+
     def generate_ulid(self) -> str:
         """Generates a ULID-like string (26 chars) using Crockford's Base32."""
-        import time
-        import random
-        
-        CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
-        t = int(time.time() * 1000)
-        
-        # Timestamp (10 chars)
-        timestamp_str = ""
-        for _ in range(10):
-            timestamp_str = CROCKFORD_BASE32[t % 32] + timestamp_str
-            t //= 32
-            
-        # Randomness (16 chars)
-        random_str = ""
-        for _ in range(16):
-            random_str += random.choice(CROCKFORD_BASE32)
-            
-        return timestamp_str + random_str
+        return generate_ulid()
     
     def get_conversation(self, index: int) -> Optional[ConversationState]:
         """Get the conversation state for a specific flashcard index."""
         return self.conversations.get(index)
     
+    def find_conversation(self, conversation_id: str) -> Optional[ConversationState]:
+        """Find a conversation of the current challenge by its ID."""
+        for conversation in self.conversations.values():
+            if conversation.id == conversation_id:
+                return conversation
+        return None
+    
     def get_flashcard_count(self) -> int:
         """Get the total number of flashcards."""
         if self.daily_challenge and self.daily_challenge.flashcards:
@@ -1,6 +1,6 @@
 """Repository interfaces (abstractions) for the domain layer."""
-from typing import Protocol, Optional
-from .entities import Agent, DailyChallenge, AppState
+from typing import Protocol, Optional, List, Iterator, Dict, Any, Tuple
+from .entities import Agent, AgentCreationRequest, DailyChallenge, AppState, SearchHit, StudyEvent
 
 
 class AgentRepository(Protocol):
@@ -10,7 +10,7 @@ class AgentRepository(Protocol):
         """Get agent by name."""
         ...
     
-    def create(self, name: str, description: str, prompt: str, output_schema: Optional[dict]) -> Optional[Agent]:
+    def create(self, request: AgentCreationRequest) -> Optional[Agent]:
         """Create a new agent."""
         ...
 
@@ -23,6 +23,31 @@ class ChallengeRepository(Protocol):
         ...
 
 
+class ChallengeGenerator(Protocol):
+    """Interface for LLM providers that generate daily challenges with an agent."""
+    
+    def get_daily_challenge(self, agent_id: str, conversation_id: str = ...,
+                            validate_schema: bool = False, user_prompt: str = ...) -> Optional[DailyChallenge]:
+        """Generate a challenge and return it once complete (`user_prompt` defaults to asking for the next one)."""
+        ...
+    
+    def stream_daily_challenge(self, agent_id: str, conversation_id: str = ...) -> Iterator[Tuple[str, Any]]:
+        """Generate a challenge, yielding ("scenario" | "flashcard" | "challenge", value) as parts complete."""
+        ...
+
+
+class ChatProvider(Protocol):
+    """Interface for LLM providers that stream chat answers."""
+    
+    def chat_with_agent(self, conversation_id: str, user_prompt: str) -> Iterator[Dict[str, Any]]:
+        """Send a message, yielding {"answer": delta} chunks or a single {"error": message}."""
+        ...
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Counters of started/completed/cancelled streams and bytes received."""
+        ...
+
+
 class StateRepository(Protocol):
     """Interface for application state repository."""
     
@@ -33,3 +58,109 @@ class StateRepository(Protocol):
     def update_state(self, state: AppState) -> None:
         """Update application state."""
         ...
+
+
+class SearchIndex(Protocol):
+    """Interface for the full-text index over past challenges and conversations."""
+    
+    def index_challenge(self, challenge: DailyChallenge) -> None:
+        """Add or replace the scenario and flashcards of a challenge."""
+        ...
+    
+    def index_message(self, challenge_date: str, flashcard_index: int, conversation_id: str,
+                      message_index: int, content: str) -> None:
+        """Add or replace a single chat message."""
+        ...
+    
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Search the index, best matches first."""
+        ...
+
+
+class MessageArchive(Protocol):
+    """Interface for storage of chat messages spilled out of the in-memory window."""
+    
+    def archive(self, conversation_id: str, start_position: int, messages: List[dict]) -> None:
+        """Store messages, the first one at `start_position`."""
+        ...
+    
+    def load(self, conversation_id: str, start_position: int, end_position: int) -> List[dict]:
+        """Load messages with start_position <= position < end_position, oldest first."""
+        ...
+
+
+class StudyEventLog(Protocol):
+    """Interface for the append-only log of study events."""
+    
+    def append(self, event: StudyEvent) -> bool:
+        """Queue an event for writing without blocking; False if it was dropped."""
+        ...
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event queued so far is written; False on timeout."""
+        ...
+    
+    def read(self, start: Optional[float] = None, end: Optional[float] = None,
+             types: Optional[List[str]] = None) -> Iterator[StudyEvent]:
+        """Events with start <= timestamp < end (Unix seconds), oldest first."""
+        ...
+
+
+class ChallengeStore(Protocol):
+    """Interface for the local store of generated challenges, keyed by date."""
+    
+    def get(self, challenge_date: str) -> Optional[DailyChallenge]:
+        """Get the challenge stored for a date (YYYY-MM-DD)."""
+        ...
+    
+    def save(self, challenge: DailyChallenge) -> None:
+        """Store a challenge under its date, replacing any previous one."""
+        ...
+    
+    def dates(self) -> List[str]:
+        """Dates that have a stored challenge, sorted."""
+        ...
+    
+    def clear(self, since: str) -> None:
+        """Remove the challenges of `since` (YYYY-MM-DD) and later dates."""
+        ...
+
+
+class KeyValueStore(Protocol):
+    """Interface for the store shared by every backend node (Redis or a local stand-in)."""
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get the value of a key, or None if it is missing or expired."""
+        ...
+    
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        """Set a key, optionally expiring after `ttl_seconds`."""
+        ...
+    
+    def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        """Set a key only if it does not exist; True if it was set."""
+        ...
+    
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+        ...
+    
+    def compare_and_set(self, key: str, expected: Optional[str], value: str) -> bool:
+        """Set a key only if it still holds `expected` (None: only if missing); True if it was set."""
+        ...
+    
+    def compare_and_delete(self, key: str, expected: str) -> bool:
+        """Remove a key only if it still holds `expected`; True if it was removed."""
+        ...
+    
+    def compare_and_expire(self, key: str, expected: str, ttl_seconds: float) -> bool:
+        """Reset the TTL of a key only if it still holds `expected`; True on success."""
+        ...
+    
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer key (missing = 0) and return the new value."""
+        ...
+    
+    def keys(self, prefix: str) -> List[str]:
+        """Keys starting with `prefix`."""
+        ...
@@ -0,0 +1 @@
+# Static frontend assets
@@ -0,0 +1,305 @@
+"""Static asset store - precompressed frontend files with strong ETags."""
+import os
+import re
+import sys
+import gzip
+import hashlib
+import argparse
+import mimetypes
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+# Vite names bundles like assets/index-BXk3_9aF.js; their content never changes under that name
+HASHED_ASSET_PATTERN = re.compile(r"(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.\w+$")
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/wasm")
+# Extension of the precompressed sibling file of each encoding, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz")) if brotli else (("gzip", ".gz"),)
+
+
+class StaticAsset:
+    """One file of the build, with its precompressed variants."""
+
+    def __init__(self, path: str, filename: str, size: int, mtime: float, etag: str, content_type: str):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.content_type = content_type
+        self.immutable = bool(HASHED_ASSET_PATTERN.search(path))
+        # encoding ("identity", "gzip", "br") -> bytes kept in memory
+        self.bodies: Dict[str, bytes] = {}
+        # encoding -> file on disk
+        self.files: Dict[str, str] = {"identity": filename}
+
+    def etag_for(self, encoding: str) -> str:
+        """Strong ETag of one representation: each content-coding has its own."""
+        suffix = dict(ENCODINGS).get(encoding)
+        if not suffix:
+            return self.etag
+        return self.etag[:-1] + "-" + suffix.lstrip(".") + '"'
+
+
+class StaticAssetStore:
+    """
+    Serves the files of the frontend build.
+
+    Each file gets a strong ETag (hash of its content, with a suffix per
+    content-coding, see `StaticAsset.etag_for`). Compressible files
+    are precompressed once, at build time (`main`) or on first access, and
+    the compressed copy is stored next to the original. Files up to
+    `memory_file_bytes` are kept in memory, within `memory_budget_bytes`
+    overall. A file that changes on disk is picked up on its next request.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        memory_file_bytes: int = 256 * 1024,
+        memory_budget_bytes: int = 16 * 1024 * 1024,
+        compress_min_bytes: int = 1024
+    ):
+        self.directory = os.path.abspath(directory)
+        self.memory_file_bytes = memory_file_bytes
+        self.memory_budget_bytes = memory_budget_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self._assets: Dict[str, StaticAsset] = {}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"memory": 0, "disk": 0, "not_modified": 0, "compressed_on_demand": 0}
+        self.load_timings = LoadTimings()
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        """Return the asset at `path` (relative to the build directory), or None."""
+        filename = self._resolve(path)
+        if filename is None:
+            return None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset and asset.mtime == stat.st_mtime and asset.size == stat.st_size:
+                return asset
+            if asset:
+                self._forget(asset)
+
+        asset = self._load(path, filename, stat)
+        with self._lock:
+            self._assets[path] = asset
+        return asset
+
+    def select(self, asset: StaticAsset, accept_encoding: str) -> Tuple[str, Optional[bytes], Optional[str]]:
+        """
+        Choose the representation of `asset` for a request.
+
+        Returns:
+            (encoding, body in memory or None, file to stream or None)
+        """
+        encoding = self.choose_encoding(asset, accept_encoding)
+        if encoding in asset.bodies:
+            self._count("memory")
+            return encoding, asset.bodies[encoding], None
+        self._count("disk")
+        return encoding, None, asset.files.get(encoding, asset.filename)
+
+    @staticmethod
+    def choose_encoding(asset: StaticAsset, accept_encoding: str) -> str:
+        """The content-coding `select` sends for a request (to validate its ETag first)."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and (encoding in asset.bodies or encoding in asset.files):
+                return encoding
+        return "identity"
+
+    def count_not_modified(self) -> None:
+        self._count("not_modified")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self._stats,
+                assets=len(self._assets),
+                memory_bytes=self._memory_bytes,
+                encodings=[e for e, _ in ENCODINGS]
+            )
+
+    def _resolve(self, path: str) -> Optional[str]:
+        filename = os.path.abspath(os.path.join(self.directory, path))
+        if not filename.startswith(self.directory + os.sep) or not os.path.isfile(filename):
+            return None
+        return filename
+
+    def _load(self, path: str, filename: str, stat: os.stat_result) -> StaticAsset:
+        with open(filename, "rb") as f:
+            content = f.read()
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        etag = '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+        asset = StaticAsset(path, filename, stat.st_size, stat.st_mtime, etag, content_type)
+
+        if is_compressible(content_type) and len(content) >= self.compress_min_bytes:
+            for encoding, suffix in ENCODINGS:
+                compressed_file = filename + suffix
+                body = self._read_fresh(compressed_file, stat.st_mtime)
+                on_disk = body is not None
+                if body is None:
+                    body = compress(content, encoding)
+                    self._count("compressed_on_demand")
+                    on_disk = self._write(compressed_file, body)
+                if len(body) >= len(content):
+                    continue
+                if on_disk:
+                    asset.files[encoding] = compressed_file
+                if not on_disk or len(body) <= self.memory_file_bytes:
+                    # A read-only build directory keeps the compressed copy in memory only
+                    asset.bodies[encoding] = body
+
+        if len(content) <= self.memory_file_bytes:
+            asset.bodies["identity"] = content
+
+        with self._lock:
+            size = sum(len(body) for body in asset.bodies.values())
+            if self._memory_bytes + size > self.memory_budget_bytes:
+                # Over budget: keep only what exists nowhere else, stream the rest from disk
+                asset.bodies = {e: b for e, b in asset.bodies.items() if e not in asset.files}
+                size = sum(len(body) for body in asset.bodies.values())
+            self._memory_bytes += size
+        return asset
+
+    def _forget(self, asset: StaticAsset) -> None:
+        self._memory_bytes -= sum(len(body) for body in asset.bodies.values())
+        del self._assets[asset.path]
+
+    @staticmethod
+    def _read_fresh(filename: str, source_mtime: float) -> Optional[bytes]:
+        """Precompressed file, unless it is missing or older than its source."""
+        try:
+            if os.path.getmtime(filename) < source_mtime:
+                return None
+            with open(filename, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write(filename: str, body: bytes) -> bool:
+        tmp_path = f"{filename}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, filename)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+class LoadTimings:
+    """Window load timings reported by the frontend (time-to-interactive)."""
+
+    def __init__(self, max_samples: int = 100):
+        self._samples: Deque[Dict[str, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, tti_ms: float, transfer_bytes: float = 0) -> None:
+        with self._lock:
+            self._samples.append({"tti_ms": float(tti_ms), "transfer_bytes": float(transfer_bytes)})
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {"samples": 0}
+        tti = sorted(sample["tti_ms"] for sample in samples)
+        return {
+            "samples": len(samples),
+            "last_tti_ms": round(samples[-1]["tti_ms"], 1),
+            "p50_tti_ms": round(tti[len(tti) // 2], 1),
+            "p95_tti_ms": round(tti[min(len(tti) - 1, int(len(tti) * 0.95))], 1),
+            "last_transfer_bytes": int(samples[-1]["transfer_bytes"])
+        }
+
+
+def parse_accept_encoding(header: Optional[str]) -> List[str]:
+    """Encodings accepted by the client (q > 0), e.g. "gzip, br;q=0.9" -> ["gzip", "br"]."""
+    accepted = []
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.append(name.strip().lower())
+    return accepted
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=11)
+    # mtime=0 keeps the output (and so the build) reproducible
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def precompress_directory(directory: str, min_bytes: int = 1024) -> List[Tuple[str, int, Dict[str, int]]]:
+    """Write .gz (and .br when available) next to every compressible file of `directory`."""
+    written = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith((".gz", ".br", ".tmp")):
+                continue
+            filename = os.path.join(root, name)
+            content_type = mimetypes.guess_type(filename)[0] or ""
+            if not is_compressible(content_type) or os.path.getsize(filename) < min_bytes:
+                continue
+            with open(filename, "rb") as f:
+                content = f.read()
+            sizes = {}
+            for encoding, suffix in ENCODINGS:
+                body = compress(content, encoding)
+                with open(filename + suffix, "wb") as f:
+                    f.write(body)
+                sizes[encoding] = len(body)
+            written.append((os.path.relpath(filename, directory), len(content), sizes))
+    return written
+
+
+def main(argv=None) -> int:
+    """Precompress a frontend build (run after `npm run build`)."""
+    parser = argparse.ArgumentParser(description="Write .gz/.br copies of the compressible files of a build.")
+    parser.add_argument("directory", nargs="?", default="frontend/build", help="Build directory")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Build directory not found: {args.directory}", file=sys.stderr)
+        return 1
+
+    for path, size, sizes in precompress_directory(args.directory):
+        ratios = ", ".join(f"{encoding} {compressed / size:.0%}" for encoding, compressed in sizes.items())
+        print(f"{path}: {size} bytes ({ratios})")
+    if not brotli:
+        print("brotli not installed; only gzip copies were written", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Chat Response Cache - Replays completed LLM streams."""
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def make_cache_key(flashcard_question: str, flashcard_answer: str, prompt: str) -> str:
+    """
+    Build a fingerprint for a (flashcard, prompt) pair.
+    
+    Case and whitespace differences are normalized away so that the same
+    question asked about the same card always maps to the same entry.
+    """
+    def normalize(text: str) -> str:
+        return " ".join((text or "").split()).casefold()
+    
+    material = "\x1f".join(normalize(part) for part in (flashcard_question, flashcard_answer, prompt))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("chunks", "size", "expires_at")
+    
+    def __init__(self, chunks: List[Dict[str, Any]], size: int, expires_at: float):
+        self.chunks = chunks
+        self.size = size
+        self.expires_at = expires_at
+
+
+class ChatResponseCache:
+    """
+    In-memory LRU cache of completed chat streams.
+    
+    Entries keep the original list of stream events so a hit can be replayed
+    at the same chunk granularity the upstream produced. Bounded by entry
+    count and total size; entries expire after a TTL.
+    """
+    
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached stream events for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry and entry.expires_at <= time.time():
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            
+            if not entry:
+                self._misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.chunks
+    
+    def put(self, key: str, chunks: List[Dict[str, Any]]) -> None:
+        """Store the events of a completed stream."""
+        size = sum(len(json.dumps(chunk)) for chunk in chunks)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = _Entry(list(chunks), size, time.time() + self.ttl_seconds)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds
+            }
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
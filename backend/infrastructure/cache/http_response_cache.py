@@ -0,0 +1,253 @@
+"""HTTP Response Cache - In-memory LRU in front of an on-disk store."""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class CachePolicy:
+    """How responses of one endpoint are cached."""
+    # Served without contacting the server while younger than this
+    ttl_seconds: float
+    # Once stale, revalidate with If-None-Match / If-Modified-Since instead of refetching
+    revalidate: bool = True
+
+
+class CachedResponse:
+    """Minimal response object returned by the cache (fresh, revalidated or just fetched)."""
+
+    def __init__(self, status_code: int, content: bytes, headers: Dict[str, str], source: str):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        # "memory", "disk", "revalidated" or "network"
+        self.source = source
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}: {self.text[:200]}")
+
+
+class _Entry:
+    __slots__ = ("content", "headers", "stored_at")
+
+    def __init__(self, content: bytes, headers: Dict[str, str], stored_at: float):
+        self.content = content
+        self.headers = headers
+        self.stored_at = stored_at
+
+
+class HttpResponseCache:
+    """
+    Tiered cache of GET responses.
+
+    Only URLs matching a configured policy (by prefix) are cached. Entries
+    live in a small in-memory LRU and in one JSON file each under
+    `directory/<scope>/`, so they survive restarts. Every entry belongs to a
+    scope (the credentials realm and client), and a scope is only ever read
+    with its own credentials, so switching accounts never serves another
+    account's data. Stale entries are revalidated with conditional requests
+    when the server sent an ETag or Last-Modified.
+    """
+
+    def __init__(self, directory: Optional[str], policies: Dict[str, CachePolicy], memory_entries: int = 128):
+        self.directory = directory
+        self.policies = sorted(policies.items(), key=lambda item: len(item[0]), reverse=True)
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "revalidated": 0, "misses": 0, "bypassed": 0}
+
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                print(f"HTTP disk cache disabled, could not create {directory}: {e}", file=sys.stderr)
+                self.directory = None
+
+    def get(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        scope: str,
+        fetch: Callable[..., Any]
+    ) -> Any:
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: Request URL
+            headers: Request headers (authorization included)
+            scope: Cache partition, e.g. "<realm>:<client_id>"
+            fetch: Performs the request: fetch(url, headers=...) -> response
+
+        Returns:
+            CachedResponse when served or stored by the cache, otherwise the
+            response returned by `fetch`
+        """
+        policy = self._policy(url)
+        if policy is None:
+            self._count("bypassed")
+            return fetch(url, headers=headers)
+
+        key = (self._scope_id(scope), self._url_id(url))
+        entry, source = self._lookup(key)
+
+        if entry and time.time() - entry.stored_at < policy.ttl_seconds:
+            self._count("memory_hits" if source == "memory" else "disk_hits")
+            return CachedResponse(200, entry.content, entry.headers, source)
+
+        conditional = dict(headers)
+        if entry and policy.revalidate:
+            if entry.headers.get("ETag"):
+                conditional["If-None-Match"] = entry.headers["ETag"]
+            if entry.headers.get("Last-Modified"):
+                conditional["If-Modified-Since"] = entry.headers["Last-Modified"]
+
+        response = fetch(url, headers=conditional)
+
+        if response.status_code == 304 and entry:
+            entry.stored_at = time.time()
+            self._store(key, entry)
+            self._count("revalidated")
+            return CachedResponse(200, entry.content, entry.headers, "revalidated")
+
+        self._count("misses")
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return response
+
+        kept_headers = {
+            name: response.headers[name]
+            for name in ("Content-Type", "ETag", "Last-Modified")
+            if response.headers.get(name)
+        }
+        entry = _Entry(response.content, kept_headers, time.time())
+        self._store(key, entry)
+        return CachedResponse(200, entry.content, entry.headers, "network")
+
+    def invalidate(self, scope: Optional[str] = None, url: Optional[str] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            scope: Only entries of this scope (None = every scope)
+            url: Only the entry of this URL (requires scope)
+        """
+        scope_id = self._scope_id(scope) if scope is not None else None
+        url_id = self._url_id(url) if url is not None else None
+
+        with self._lock:
+            for key in list(self._memory):
+                if scope_id is None or (key[0] == scope_id and url_id in (None, key[1])):
+                    del self._memory[key]
+
+        if not self.directory:
+            return
+        try:
+            if scope_id is None:
+                shutil.rmtree(self.directory, ignore_errors=True)
+                os.makedirs(self.directory, exist_ok=True)
+            elif url_id is None:
+                shutil.rmtree(os.path.join(self.directory, scope_id), ignore_errors=True)
+            else:
+                path = self._path((scope_id, url_id))
+                if os.path.exists(path):
+                    os.remove(path)
+        except OSError as e:
+            print(f"Failed to invalidate HTTP disk cache: {e}", file=sys.stderr)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of entries in memory."""
+        with self._lock:
+            return dict(self._stats, memory_entries=len(self._memory))
+
+    def _policy(self, url: str) -> Optional[CachePolicy]:
+        for prefix, policy in self.policies:
+            if url.startswith(prefix):
+                return policy
+        return None
+
+    def _lookup(self, key: Tuple[str, str]) -> Tuple[Optional[_Entry], Optional[str]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+
+        entry = self._read_disk(key)
+        if entry:
+            self._remember(key, entry)
+            return entry, "disk"
+        return None, None
+
+    def _store(self, key: Tuple[str, str], entry: _Entry) -> None:
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def _remember(self, key: Tuple[str, str], entry: _Entry) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return _Entry(data["content"].encode("utf-8"), data["headers"], data["stored_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable HTTP cache entry {path}: {e}", file=sys.stderr)
+            return None
+
+    def _write_disk(self, key: Tuple[str, str], entry: _Entry) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "content": entry.content.decode("utf-8", errors="replace"),
+                    "headers": entry.headers,
+                    "stored_at": entry.stored_at
+                }, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write HTTP cache entry {path}: {e}", file=sys.stderr)
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.directory, key[0], f"{key[1]}.json")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _scope_id(scope: str) -> str:
+        # Hashed so credentials never appear in file names
+        return hashlib.sha256((scope or "").encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _url_id(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
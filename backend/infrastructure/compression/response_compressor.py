@@ -0,0 +1,146 @@
+"""Response compressor - gzip/deflate that also works for streamed responses."""
+import time
+import zlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from backend.infrastructure.assets.static_asset_store import parse_accept_encoding
+
+# Content-Encoding -> zlib window bits (gzip container, zlib container for "deflate")
+WBITS = {"gzip": 31, "deflate": 15}
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript")
+
+
+@dataclass
+class CompressionConfig:
+    """Which responses are compressed, and how hard."""
+    # URL rules (as registered, e.g. "/api/ask-llm") whose responses are compressed
+    routes: Tuple[str, ...] = (
+        "/api/ask-llm", "/api/ask-llm/streams/<stream_id>", "/api/chat/history", "/api/chat/history/stream"
+    )
+    # zlib level; streamed frames are small, so high levels buy little
+    level: int = 6
+    # Buffered responses smaller than this go out as they are
+    min_bytes: int = 1024
+    # Encodings offered, in order of preference
+    encodings: Tuple[str, ...] = field(default=("gzip", "deflate"))
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """The encoding to use for a client's Accept-Encoding header, or None."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+
+class StreamCompressor:
+    """
+    One compressed stream.
+
+    Every `compress` call ends with a Z_SYNC_FLUSH: its output is complete
+    up to the last byte given, so the client can decode each SSE frame as
+    soon as it arrives instead of waiting for zlib's internal buffer to fill.
+    """
+
+    def __init__(self, encoding: str, level: int = 6):
+        self.encoding = encoding
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.cpu_seconds = 0.0
+        self.flushes = 0
+
+    def compress(self, data: bytes, flush_mode: int = zlib.Z_SYNC_FLUSH) -> bytes:
+        start = time.thread_time()
+        out = self._compressor.compress(data) + self._compressor.flush(flush_mode)
+        self.cpu_seconds += time.thread_time() - start
+        self.raw_bytes += len(data)
+        self.sent_bytes += len(out)
+        self.flushes += 1
+        return out
+
+    def finish(self) -> bytes:
+        start = time.thread_time()
+        out = self._compressor.flush(zlib.Z_FINISH)
+        self.cpu_seconds += time.thread_time() - start
+        self.sent_bytes += len(out)
+        return out
+
+
+def compress_body(data: bytes, encoding: str, level: int = 6) -> Tuple[bytes, StreamCompressor]:
+    """Compress a whole body at once (a single flush)."""
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(data, zlib.Z_FINISH), compressor
+
+
+def compress_stream(
+    chunks: Iterable[Any],
+    compressor: StreamCompressor,
+    on_done=None,
+    charset: str = "utf-8"
+) -> Iterator[bytes]:
+    """
+    Compress a streamed body chunk by chunk, flushing after each one.
+
+    `on_done(compressor)` runs once the stream ends or the client goes away,
+    and closing this iterator closes `chunks` too.
+    """
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+        if on_done:
+            on_done(compressor)
+
+
+class CompressionMetrics:
+    """Per-route compression ratio and CPU cost, to tell where compression pays off."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, compressor: StreamCompressor) -> None:
+        with self._lock:
+            entry = self._entry(route)
+            entry["responses"] += 1
+            entry["raw_bytes"] += compressor.raw_bytes
+            entry["sent_bytes"] += compressor.sent_bytes
+            entry["cpu_seconds"] += compressor.cpu_seconds
+            entry["flushes"] += compressor.flushes
+
+    def record_skipped(self, route: str, reason: str) -> None:
+        """Count a response sent uncompressed (e.g. "identity" or "small")."""
+        with self._lock:
+            entry = self._entry(route)
+            key = f"skipped_{reason}"
+            entry[key] = entry.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for route, entry in sorted(self._routes.items()):
+                raw, sent = entry["raw_bytes"], entry["sent_bytes"]
+                result[route] = {
+                    **{key: value for key, value in entry.items() if key != "cpu_seconds"},
+                    "ratio": round(raw / sent, 2) if sent else 0.0,
+                    "saved_bytes": raw - sent,
+                    "cpu_ms": round(entry["cpu_seconds"] * 1000, 2),
+                    # CPU spent per MB of uncompressed output vs. bytes saved
+                    "cpu_ms_per_mb": round(entry["cpu_seconds"] * 1000 / (raw / 1e6), 2) if raw else 0.0,
+                    "bytes_per_flush": round(sent / entry["flushes"], 1) if entry["flushes"] else 0.0
+                }
+            return result
+
+    def _entry(self, route: str) -> Dict[str, float]:
+        return self._routes.setdefault(route, {
+            "responses": 0, "raw_bytes": 0, "sent_bytes": 0, "cpu_seconds": 0.0, "flushes": 0
+        })
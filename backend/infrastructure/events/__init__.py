@@ -0,0 +1 @@
+# Append-only event logs
@@ -0,0 +1,338 @@
+"""Segmented Event Log - append-only JSON-lines segments written in batches."""
+import os
+import sys
+import json
+import time
+import uuid
+import heapq
+import atexit
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from backend.domain.entities import StudyEvent
+
+# When a written batch is made durable: after every batch, at most every interval, or by the OS
+FSYNC_POLICIES = ("batch", "interval", "never")
+
+SEGMENT_SUFFIX = ".log"
+
+
+class SegmentedEventLog:
+    """
+    Append-only log of study events, stored as JSON lines in segment files.
+
+    `append` only puts the event on an in-memory queue. A writer thread
+    takes what is queued as one batch: it waits up to `batch_delay_ms`
+    after the oldest event so that others can join, takes at most
+    `max_batch` events, and writes them with a single write call (group
+    commit). `fsync` decides when a write is made durable: "batch" after
+    every batch, "interval" at most every `fsync_interval` seconds, and
+    "never" leaves it to the OS. Once a segment reaches `segment_bytes` it
+    is closed, and the next batch opens a new one.
+
+    Segments are named "<first event ms>-<writer>.log". Each process (each
+    headless server worker) writes its own segments, and `read` merges
+    them by time. A line cut short by a crash is skipped when reading.
+    When `max_queue` events are waiting, new ones are dropped and counted
+    instead of slowing the caller down.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        batch_delay_ms: float = 50,
+        max_batch: int = 512,
+        max_queue: int = 10000
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}, got {fsync!r}")
+        self.directory = directory
+        self.segment_bytes = max(1, segment_bytes)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.batch_delay = max(0.0, batch_delay_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_queue = max(1, max_queue)
+        self.writer_id = uuid.uuid4().hex[:8]
+
+        self._cond = threading.Condition()
+        # (event, time it was queued)
+        self._queue: Deque[Tuple[StudyEvent, float]] = deque()
+        self._enqueued = 0
+        self._processed = 0
+        self._flush_target = 0
+        self._last_timestamp = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Only touched by the writer thread
+        self._segment = None
+        self._segment_size = 0
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+        self._stats = {
+            "written": 0, "dropped": 0, "failed": 0, "batches": 0, "max_batch": 0,
+            "bytes": 0, "fsyncs": 0, "segments": 0, "write_seconds": 0.0, "wait_seconds": 0.0
+        }
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            print(f"Could not create the event log directory {directory}: {e}", file=sys.stderr)
+
+    def append(self, event: StudyEvent) -> bool:
+        """
+        Queue an event for writing without blocking; False if it was dropped.
+
+        Events without a timestamp are stamped here, in queue order, so each
+        writer's segments are in time order.
+        """
+        with self._cond:
+            if self._closed or len(self._queue) >= self.max_queue:
+                self._stats["dropped"] += 1
+                return False
+            if not event.timestamp:
+                event.timestamp = max(time.time(), self._last_timestamp)
+            self._last_timestamp = max(self._last_timestamp, event.timestamp)
+            self._queue.append((event, time.monotonic()))
+            self._enqueued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+                self._thread.start()
+                # Queued events are written before the interpreter exits
+                atexit.register(self.close)
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event queued so far is written (skipping the batch delay); False on timeout."""
+        with self._cond:
+            target = self._enqueued
+            if self._processed >= target:
+                return True
+            self._flush_target = max(self._flush_target, target)
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._processed >= target, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is still queued, sync and close the current segment, and stop the writer."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def read(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        types: Optional[List[str]] = None
+    ) -> Iterator[StudyEvent]:
+        """
+        Events with start <= timestamp < end (Unix seconds), oldest first.
+
+        Only written events are read (see `flush`). Segments that lie
+        entirely outside the range are not opened.
+        """
+        wanted = set(types) if types else None
+        streams = [
+            self._read_writer(segments, start, end, wanted)
+            for segments in self._segments().values()
+        ]
+        return heapq.merge(*streams, key=lambda event: event.timestamp)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            queued = len(self._queue)
+        batches = stats.pop("batches")
+        processed = stats["written"] + stats["failed"]
+        write_seconds = stats.pop("write_seconds")
+        wait_seconds = stats.pop("wait_seconds")
+        return {
+            "fsync": self.fsync,
+            "queued": queued,
+            "batches": batches,
+            "avg_batch": round(processed / batches, 1) if batches else 0.0,
+            "avg_write_ms": round(write_seconds * 1000 / batches, 3) if batches else 0.0,
+            # Time from `append` until the event's batch was written
+            "avg_wait_ms": round(wait_seconds * 1000 / processed, 3) if processed else 0.0,
+            **stats
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._closed:
+                    self._cond.wait(self._idle_timeout())
+                # Group commit: events that arrive within the delay share one write
+                if self._queue:
+                    deadline = self._queue[0][1] + self.batch_delay
+                    while not self._closed and len(self._queue) < self.max_batch \
+                            and self._flush_target <= self._processed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch))]
+                closing = self._closed and not self._queue
+
+            if batch:
+                self._commit(batch)
+            if closing:
+                self._close_segment()
+                return
+            if self._dirty and self.fsync == "interval" \
+                    and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync()
+
+    def _idle_timeout(self) -> Optional[float]:
+        """How long the idle writer may sleep before an interval fsync is due."""
+        if self._dirty and self.fsync == "interval":
+            return max(0.0, self._last_fsync + self.fsync_interval - time.monotonic())
+        return None
+
+    def _commit(self, batch: List[Tuple[StudyEvent, float]]) -> None:
+        payload = "".join(
+            json.dumps(event.to_dict(), ensure_ascii=False, default=str) + "\n" for event, _ in batch
+        ).encode("utf-8")
+        started = time.perf_counter()
+        ok = True
+        try:
+            if self._segment is None:
+                self._open_segment(batch[0][0].timestamp)
+            self._segment.write(payload)
+            self._segment.flush()
+            self._segment_size += len(payload)
+            self._dirty = True
+            if self.fsync == "batch":
+                self._sync()
+            if self._segment_size >= self.segment_bytes:
+                self._close_segment()
+        except (OSError, ValueError) as e:
+            ok = False
+            print(f"Failed to write {len(batch)} study events: {e}", file=sys.stderr)
+            self._discard_segment()
+        elapsed = time.perf_counter() - started
+
+        now = time.monotonic()
+        with self._cond:
+            self._processed += len(batch)
+            self._stats["written" if ok else "failed"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            self._stats["write_seconds"] += elapsed
+            self._stats["wait_seconds"] += sum(now - queued_at for _, queued_at in batch)
+            if ok:
+                self._stats["bytes"] += len(payload)
+            self._cond.notify_all()
+
+    def _open_segment(self, first_timestamp: float) -> None:
+        name = f"{int(first_timestamp * 1000):013d}-{self.writer_id}{SEGMENT_SUFFIX}"
+        self._segment = open(os.path.join(self.directory, name), "ab")
+        self._segment_size = self._segment.tell()
+        with self._cond:
+            self._stats["segments"] += 1
+        if self.fsync != "never":
+            self._sync_directory()
+
+    def _close_segment(self) -> None:
+        if self._segment is None:
+            return
+        try:
+            if self._dirty and self.fsync != "never":
+                self._sync()
+            self._segment.close()
+        except OSError as e:
+            print(f"Failed to close event log segment: {e}", file=sys.stderr)
+        self._segment = None
+        self._dirty = False
+
+    def _discard_segment(self) -> None:
+        """After a failed write: the next batch starts a new segment."""
+        try:
+            if self._segment is not None:
+                self._segment.close()
+        except OSError:
+            pass
+        self._segment = None
+        self._dirty = False
+
+    def _sync(self) -> None:
+        os.fsync(self._segment.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+        with self._cond:
+            self._stats["fsyncs"] += 1
+
+    def _sync_directory(self) -> None:
+        """Make a new segment's directory entry durable (not possible on Windows)."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _segments(self) -> Dict[str, List[Tuple[float, str]]]:
+        """Segment files per writer, as (first event time, path) in time order."""
+        writers: Dict[str, List[Tuple[float, str]]] = {}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return writers
+        for name in names:
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            first_ms, _, writer = name[:-len(SEGMENT_SUFFIX)].partition("-")
+            try:
+                first = int(first_ms) / 1000
+            except ValueError:
+                continue
+            writers.setdefault(writer, []).append((first, os.path.join(self.directory, name)))
+        for segments in writers.values():
+            segments.sort()
+        return writers
+
+    def _read_writer(
+        self,
+        segments: List[Tuple[float, str]],
+        start: Optional[float],
+        end: Optional[float],
+        wanted: Optional[set]
+    ) -> Iterator[StudyEvent]:
+        for position, (first, path) in enumerate(segments):
+            if end is not None and first >= end:
+                return
+            # Every event of a segment is older than the first one of the next (ms in the name)
+            if start is not None and position + 1 < len(segments) and segments[position + 1][0] + 0.001 <= start:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # Torn by a crash, or still being written
+                            break
+                        try:
+                            event = StudyEvent.from_dict(json.loads(line))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+                        if start is not None and event.timestamp < start:
+                            continue
+                        if end is not None and event.timestamp >= end:
+                            return
+                        if wanted is None or event.type in wanted:
+                            yield event
+            except OSError as e:
+                print(f"Failed to read event log segment {path}: {e}", file=sys.stderr)
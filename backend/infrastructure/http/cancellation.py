@@ -0,0 +1,90 @@
+"""Cancellation of upstream reads blocked on another thread."""
+import sys
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+_local = threading.local()
+
+
+class CancelScope:
+    """
+    Interrupts the blocking reads of one upstream stream from another thread.
+
+    The thread reading the stream runs inside the scope (`active`), and the
+    HTTP clients register how to interrupt their read with `on_cancel`. A
+    generator blocked on that thread cannot be closed from elsewhere, but
+    `cancel` wakes its read right away so it unwinds (and closes) on its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.cancelled = False
+
+    @contextmanager
+    def active(self) -> Iterator["CancelScope"]:
+        """Make this the scope of reads started on the current thread."""
+        previous = getattr(_local, "scope", None)
+        _local.scope = self
+        try:
+            yield self
+        finally:
+            _local.scope = previous
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            self._run(callback)
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback` on cancel (right away if already cancelled); returns its unregister function."""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        self._run(callback)
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Failed to cancel an upstream read: {e}", file=sys.stderr)
+
+
+def on_cancel(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register `callback` with the current thread's scope, if any; returns its unregister function."""
+    scope = getattr(_local, "scope", None)
+    if scope is None:
+        return lambda: None
+    return scope.register(callback)
+
+
+def abort_response(response) -> None:
+    """
+    Wake a thread blocked reading a streamed `requests` response.
+
+    The socket is shut down, not closed: the reading thread sees the stream
+    end (or fail) and closes the response itself.
+    """
+    raw = getattr(response, "raw", None)
+    fp = getattr(getattr(raw, "_fp", None), "fp", None)
+    sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
@@ -0,0 +1,87 @@
+"""Circuit breaker for upstream calls."""
+import threading
+import time
+from typing import Callable, Dict
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive upstream failures and short-circuits calls while open.
+    
+    closed: calls go through; `failure_threshold` consecutive failures open it.
+    open: calls are refused until `reset_timeout` seconds have passed.
+    half_open: one trial call is let through; success closes, failure re-opens.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+    
+    def allow_request(self) -> bool:
+        """True if a call may go upstream now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+    
+    def release_trial(self) -> None:
+        """
+        End an admitted call that produced no verdict (rejected by admission,
+        cancelled, served by another node): a half-open circuit lets the
+        next call try instead. No-op once success or failure was recorded.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def reset(self) -> None:
+        """Close the circuit, e.g. after credentials changed."""
+        self.record_success()
+    
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            state = self._current_state()
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - self._clock()) if state == self.OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": round(retry_in, 1)
+            }
+    
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
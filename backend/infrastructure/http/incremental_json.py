@@ -0,0 +1,154 @@
+"""Incremental JSON parser for LLM token streams."""
+import json
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+PathItem = Union[str, int]
+Path = Tuple[PathItem, ...]
+
+_WHITESPACE = " \t\r\n"
+
+
+class _Frame:
+    __slots__ = ("kind", "path", "start", "key", "index", "expect_key")
+
+    def __init__(self, kind: str, path: Path, start: int):
+        self.kind = kind            # "{" or "["
+        self.path = path
+        self.start = start
+        self.key: Optional[str] = None
+        self.index = -1
+        self.expect_key = kind == "{"
+
+
+class IncrementalJsonParser:
+    """
+    Scans a JSON document as it arrives and reports values as soon as they close.
+
+    Only objects, arrays and strings are reported (bare numbers, booleans and
+    null end at the next delimiter and are only available in their parent).
+    Text before the first "{" or "[" (e.g. a markdown code fence) is ignored.
+    Each character is scanned once; a completed value is decoded with
+    json.loads on its own slice of the buffer.
+
+    Example:
+        parser = IncrementalJsonParser(lambda path: len(path) <= 2)
+        for chunk in chunks:
+            for path, value in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self, watch: Optional[Callable[[Path], bool]] = None):
+        self.watch = watch or (lambda path: True)
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._string_path: Optional[Path] = None
+        self._string_is_key = False
+        self._started = False
+        self.done = False
+        self.root: Any = None
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Add text and return the (path, value) pairs completed by it."""
+        if self.done or not chunk:
+            return []
+
+        self._text += chunk
+        events: List[Tuple[Path, Any]] = []
+        text = self._text
+
+        i = self._pos
+        while i < len(text) and not self.done:
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                i += 1
+                continue
+
+            if not self._started:
+                if ch in "{[":
+                    self._started = True
+                    self._open(ch, (), i)
+                i += 1
+                continue
+
+            frame = self._stack[-1] if self._stack else None
+
+            if ch in _WHITESPACE:
+                pass
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+                if frame and frame.kind == "{" and frame.expect_key:
+                    self._string_is_key = True
+                    self._string_path = None
+                else:
+                    self._string_is_key = False
+                    self._string_path = self._value_path(frame)
+            elif ch in "{[":
+                self._open(ch, self._value_path(frame), i)
+            elif ch in "}]":
+                self._close(i, events)
+            elif ch == ",":
+                if frame and frame.kind == "{":
+                    frame.expect_key = True
+            elif ch == ":":
+                pass
+            elif frame and frame.kind == "[" and self._previous_significant(i) in (",", "["):
+                # Start of a bare scalar inside an array still takes an index
+                frame.index += 1
+            i += 1
+
+        self._pos = i
+        return events
+
+    def _value_path(self, frame: Optional[_Frame]) -> Path:
+        """Path of a value that starts now inside `frame`."""
+        if frame is None:
+            return ()
+        if frame.kind == "[":
+            frame.index += 1
+            return frame.path + (frame.index,)
+        return frame.path + (frame.key,)
+
+    def _open(self, kind: str, path: Path, start: int) -> None:
+        self._stack.append(_Frame(kind, path, start))
+
+    def _close(self, end: int, events: List[Tuple[Path, Any]]) -> None:
+        if not self._stack:
+            return
+        frame = self._stack.pop()
+        if self.watch(frame.path) or not self._stack:
+            value = json.loads(self._text[frame.start:end + 1])
+            if self.watch(frame.path):
+                events.append((frame.path, value))
+            if not self._stack:
+                self.root = value
+                self.done = True
+
+    def _close_string(self, end: int, events: List[Tuple[Path, Any]]) -> None:
+        frame = self._stack[-1] if self._stack else None
+        raw = self._text[self._string_start:end + 1]
+        if self._string_is_key:
+            if frame:
+                frame.key = json.loads(raw)
+                frame.expect_key = False
+            return
+        if self._string_path is not None and self.watch(self._string_path):
+            events.append((self._string_path, json.loads(raw)))
+
+    def _previous_significant(self, i: int) -> str:
+        j = i - 1
+        while j >= 0 and self._text[j] in _WHITESPACE:
+            j -= 1
+        return self._text[j] if j >= 0 else ""
@@ -0,0 +1,48 @@
+"""Minimal JSON Schema validation for agent structured outputs."""
+from typing import Any, List
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+
+def validate(data: Any, schema: dict, path: str = "$") -> List[str]:
+    """
+    Validate data against the subset of JSON Schema used by agent output
+    schemas (type, properties, required, items, enum).
+    
+    Returns:
+        List of human-readable errors, empty if the data is valid
+    """
+    errors: List[str] = []
+    expected = schema.get("type")
+    
+    if expected:
+        python_type = _TYPES.get(expected)
+        # bool is a subclass of int, but not a JSON integer/number
+        is_bool_as_number = isinstance(data, bool) and expected in ("integer", "number")
+        if python_type and (not isinstance(data, python_type) or is_bool_as_number):
+            return [f"{path}: expected {expected}, got {type(data).__name__}"]
+    
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: {data!r} is not one of {schema['enum']}")
+    
+    if isinstance(data, dict):
+        for name in schema.get("required", []):
+            if name not in data:
+                errors.append(f"{path}: missing required property '{name}'")
+        for name, subschema in schema.get("properties", {}).items():
+            if name in data:
+                errors.extend(validate(data[name], subschema, f"{path}.{name}"))
+    
+    if isinstance(data, list) and "items" in schema:
+        for i, item in enumerate(data):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    
+    return errors
@@ -0,0 +1,300 @@
+"""Local LLM Clients (OpenAI-compatible chat completions, e.g. llama.cpp server, Ollama, vLLM)."""
+import sys
+import json
+import threading
+import requests
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+from backend.domain.entities import Agent, AgentCreationRequest, DailyChallenge, Scenario, Flashcard
+from .json_schema import validate
+from .incremental_json import IncrementalJsonParser
+from .cancellation import abort_response, on_cancel
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8080/v1"
+
+CHALLENGE_PROMPT = (
+    "Você gera o desafio de estudo do dia sobre Java, Python e AWS. "
+    "Responda apenas com um objeto JSON, sem texto antes ou depois, com os campos: "
+    "date (YYYY-MM-DD), scenario {title, problem_description, solution_description} e "
+    "flashcards (lista de {id, question, answer, detailed_explanation}) com 5 flashcards "
+    "relacionados ao cenário."
+)
+
+DEFAULT_CHALLENGE_REQUEST = "proximo cenário"
+
+CHAT_PROMPT = "Você é um tutor técnico. Explique de forma clara e objetiva, em português, usando markdown."
+
+
+def iter_completion_deltas(response) -> Generator[str, None, None]:
+    """Yield the content deltas of a streamed chat completion (SSE `data:` lines)."""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        decoded_line = line.decode('utf-8')
+        if not decoded_line.startswith('data:'):
+            continue
+
+        json_data = decoded_line[5:].strip()
+        if json_data == "[DONE]":
+            break
+        if not json_data:
+            continue
+        try:
+            data_dict = json.loads(json_data)
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse line: {decoded_line}, error: {e}", file=sys.stderr)
+            continue
+
+        for choice in data_dict.get('choices') or []:
+            delta = (choice.get('delta') or {}).get('content')
+            if delta:
+                yield delta
+
+
+class LocalAgentClient:
+    """
+    Agent repository for a local model.
+
+    Local servers have no agents: the model name stands in for the agent ID
+    and the prompt lives in the challenge client.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def get_by_name(self, agent_name: str) -> Optional[Agent]:
+        """Get agent by name."""
+        return Agent(id=self.model, name=agent_name)
+
+    def create(self, request: AgentCreationRequest) -> Optional[Agent]:
+        """Create a new agent."""
+        return Agent(id=self.model, name=request.name)
+
+
+class LocalChallengeClient:
+    """Generates daily challenges with a local OpenAI-compatible model."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        output_schema: Optional[dict] = None,
+        system_prompt: str = CHALLENGE_PROMPT,
+        timeout: float = 300
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.output_schema = output_schema
+        self.system_prompt = system_prompt
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get_daily_challenge(
+        self,
+        agent_id: str,
+        conversation_id: Optional[str] = None,
+        validate_schema: bool = False,
+        user_prompt: str = DEFAULT_CHALLENGE_REQUEST
+    ) -> Optional[DailyChallenge]:
+        """
+        Generate the daily challenge.
+
+        Args:
+            agent_id: Model to use
+            conversation_id: Unused, every generation is independent
+            validate_schema: Reject responses that do not match the output schema
+            user_prompt: Message asking for the challenge (e.g. with the date it is for)
+
+        Returns:
+            DailyChallenge object
+        """
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(agent_id, stream=False, user_prompt=user_prompt),
+            timeout=self.timeout
+        )
+
+        if response.status_code != 200:
+            error_msg = f"Local LLM Error {response.status_code}: {response.text}"
+            print(error_msg, file=sys.stderr)
+            raise Exception(error_msg)
+
+        content = response.json()["choices"][0]["message"]["content"]
+        parser = IncrementalJsonParser(lambda path: False)
+        parser.feed(content)
+        if not parser.done or not isinstance(parser.root, dict):
+            raise Exception("Failed to parse local model response")
+
+        if validate_schema and self.output_schema:
+            errors = validate(parser.root, self.output_schema)
+            if errors:
+                raise Exception(f"Local model response does not match output schema: {'; '.join(errors[:5])}")
+
+        return DailyChallenge.from_dict(parser.root)
+
+    def stream_daily_challenge(
+        self,
+        agent_id: str,
+        conversation_id: Optional[str] = None
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Generate the daily challenge, publishing parts as they complete.
+
+        Yields:
+            ("scenario", Scenario), ("flashcard", Flashcard)... and finally
+            ("challenge", DailyChallenge)
+        """
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(agent_id, stream=True),
+            timeout=self.timeout,
+            stream=True
+        )
+        try:
+            if response.status_code != 200:
+                error_msg = f"Local LLM Error {response.status_code}: {response.text}"
+                print(error_msg, file=sys.stderr)
+                raise Exception(error_msg)
+
+            parser = IncrementalJsonParser(
+                lambda path: path == ("scenario",) or (len(path) == 2 and path[0] == "flashcards")
+            )
+            for delta in iter_completion_deltas(response):
+                for path, value in parser.feed(delta):
+                    if path == ("scenario",):
+                        yield "scenario", Scenario.from_dict(value)
+                    else:
+                        yield "flashcard", Flashcard.from_dict(value)
+                if parser.done:
+                    break
+
+            if not parser.done or not isinstance(parser.root, dict):
+                raise Exception("Failed to parse local model response: stream ended before the JSON document closed")
+
+            yield "challenge", DailyChallenge.from_dict(parser.root)
+        finally:
+            response.close()
+
+    def _payload(self, model: str, stream: bool, user_prompt: str = DEFAULT_CHALLENGE_REQUEST) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "stream": stream,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+
+
+class LocalChatClient:
+    """
+    Streams chat answers from a local OpenAI-compatible model.
+
+    Chat completion servers are stateless, so every prompt is sent along
+    with the conversation's earlier turns. `history` rebuilds them from the
+    stored conversation (see ConversationTurns), so they survive restarts
+    and are the same on every worker.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = "local-model",
+        system_prompt: str = CHAT_PROMPT,
+        history: Optional[Callable[[str], List[Dict[str, str]]]] = None,
+        timeout: float = 300
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.system_prompt = system_prompt
+        self.history = history
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._stats = {
+            "streams_started": 0,
+            "streams_completed": 0,
+            "streams_cancelled": 0,
+            "bytes_received": 0,
+            "wasted_bytes": 0
+        }
+
+    def chat_with_agent(self, conversation_id: str, user_prompt: str) -> Generator[Dict[str, Any], None, None]:
+        """
+        Sends a message to the local model and yields streaming responses.
+
+        Args:
+            conversation_id: ID of the conversation
+            user_prompt: User's message
+
+        Yields:
+            dict: {"answer": delta} chunks, or {"error": message}
+        """
+        response = None
+        answer = ""
+        completed = False
+        aborted = threading.Event()
+        unregister = lambda: None
+
+        def abort():
+            # Called from the consumer's thread while this one may be blocked reading
+            aborted.set()
+            abort_response(response)
+
+        try:
+            turns = self.history(conversation_id) if self.history else []
+            messages = [{"role": "system", "content": self.system_prompt}] + turns
+            messages.append({"role": "user", "content": user_prompt})
+
+            response = self.session.post(
+                f"{self.base_url}/chat/completions",
+                json={"model": self.model, "stream": True, "messages": messages},
+                timeout=self.timeout,
+                stream=True
+            )
+            unregister = on_cancel(abort)
+            self._increment("streams_started")
+
+            if response.status_code != 200:
+                error_msg = f"Erro: Status code {response.status_code} - {response.text}"
+                print(error_msg, file=sys.stderr)
+                completed = True
+                yield {"error": error_msg}
+                return
+
+            for delta in iter_completion_deltas(response):
+                answer += delta
+                yield {"answer": delta}
+
+            completed = not aborted.is_set()
+
+        except GeneratorExit:
+            raise
+        except Exception as e:
+            if aborted.is_set():
+                # The read was interrupted because the consumer went away
+                return
+            print(f"Failed to chat with local model: {e}", file=sys.stderr)
+            completed = True
+            yield {"error": str(e)}
+        finally:
+            unregister()
+            if response is not None:
+                response.close()
+                self._record_stream(len(answer.encode("utf-8")), completed)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters of completed/cancelled streams and received bytes."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _increment(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _record_stream(self, bytes_received: int, completed: bool) -> None:
+        with self._lock:
+            self._stats["bytes_received"] += bytes_received
+            if completed:
+                self._stats["streams_completed"] += 1
+            else:
+                self._stats["streams_cancelled"] += 1
+                self._stats["wasted_bytes"] += bytes_received
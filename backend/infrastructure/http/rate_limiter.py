@@ -0,0 +1,235 @@
+"""Token-bucket rate limiting for upstream hosts and client sessions."""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than allowed for a token."""
+    
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {key}, retry in {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, up to `capacity` stored.
+    
+    Callers reserve a token and sleep until it is due, which turns bursts
+    into a smooth flow instead of failures.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+    
+    def reserve(self, max_wait: float) -> float:
+        """
+        Reserve one token.
+        
+        Returns:
+            Seconds the caller must wait before using the token
+            
+        Raises:
+            ValueError: With the required wait if it exceeds max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            
+            if wait > max_wait:
+                self.rejected += 1
+                raise ValueError(wait)
+            
+            self._tokens -= 1
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait_seconds += wait
+            return wait
+    
+    def block_for(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds` (server asked us to back off)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+    
+    def limit_remaining(self, remaining: float) -> None:
+        """Never assume more tokens than the server says are left."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 3),
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 3),
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "total_wait_seconds": round(self.total_wait_seconds, 3)
+            }
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse "host=rate:burst;host2=rate:burst" into a dict.
+    
+    Example: "genai-code-buddy-api.stackspot.com=1:5;idm.stackspot.com=0.5:2"
+    """
+    limits = {}
+    for item in (spec or "").split(";"):
+        if "=" not in item:
+            continue
+        key, value = item.split("=", 1)
+        limits[key.strip()] = parse_rate(value)
+    return limits
+
+
+def parse_rate(value: str) -> Tuple[float, float]:
+    """Parse "rate:burst" (burst defaults to rate)."""
+    rate, _, burst = value.strip().partition(":")
+    return float(rate), float(burst or rate)
+
+
+class RateLimiter:
+    """
+    Registry of token buckets per upstream host and per client session.
+    
+    Host buckets are configured up front and tightened at runtime from
+    Retry-After / X-RateLimit-* response headers. Session buckets are created
+    lazily with a shared default rate.
+    """
+    
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        session_limit: Optional[Tuple[float, float]] = None,
+        max_wait_seconds: float = 5.0,
+        max_sessions: int = 1000
+    ):
+        self.max_wait_seconds = max_wait_seconds
+        self.session_limit = session_limit
+        self.max_sessions = max_sessions
+        self._hosts = {host: TokenBucket(rate, burst) for host, (rate, burst) in (host_limits or {}).items()}
+        self._sessions: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def acquire_host(self, url: str) -> float:
+        """
+        Wait for a token of the host of `url` (no-op for unconfigured hosts).
+        
+        Returns:
+            Seconds waited
+            
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait_seconds
+        """
+        host = urlparse(url).hostname or url
+        bucket = self._hosts.get(host)
+        return self._acquire(host, bucket)
+    
+    def acquire_session(self, session_id: str) -> float:
+        """Wait for a token of a client session (no-op if no session limit is set)."""
+        if not self.session_limit:
+            return 0.0
+        
+        with self._lock:
+            bucket = self._sessions.get(session_id)
+            if bucket is None:
+                if len(self._sessions) >= self.max_sessions:
+                    # Drop the oldest session bucket; dicts keep insertion order
+                    self._sessions.pop(next(iter(self._sessions)))
+                bucket = TokenBucket(*self.session_limit)
+                self._sessions[session_id] = bucket
+        
+        return self._acquire(f"session:{session_id}", bucket)
+    
+    def observe(self, url: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the host bucket to rate-limit information sent by the server."""
+        host = urlparse(url).hostname or url
+        bucket = self._hosts.get(host)
+        if not bucket:
+            return
+        
+        retry_after = self._parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and (status_code == 429 or status_code == 503):
+            bucket.block_for(retry_after)
+        
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        try:
+            if remaining is not None:
+                bucket.limit_remaining(float(remaining))
+                if float(remaining) <= 0 and reset is not None:
+                    bucket.block_for(self._reset_seconds(float(reset)))
+        except ValueError:
+            pass
+        
+        if status_code == 429 and retry_after is None:
+            bucket.block_for(1.0 / bucket.rate)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """State of all buckets, for the debug endpoint."""
+        with self._lock:
+            sessions = dict(self._sessions)
+        return {
+            "max_wait_seconds": self.max_wait_seconds,
+            "hosts": {host: bucket.snapshot() for host, bucket in self._hosts.items()},
+            "sessions": {session: bucket.snapshot() for session, bucket in sessions.items()}
+        }
+    
+    def _acquire(self, key: str, bucket: Optional[TokenBucket]) -> float:
+        if bucket is None:
+            return 0.0
+        try:
+            wait = bucket.reserve(self.max_wait_seconds)
+        except ValueError as e:
+            raise RateLimitExceeded(key, e.args[0])
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _reset_seconds(reset: float) -> float:
+        # Servers send either seconds-until-reset or an epoch timestamp
+        if reset > 10 ** 9:
+            return max(0.0, reset - time.time())
+        return reset
@@ -4,13 +4,23 @@ import re
 from typing import Optional
 from backend.domain.entities import Agent, AgentCreationRequest
 from .stackspot_auth_client import StackSpotAuthClient
+from .rate_limiter import RateLimiter
+from backend.infrastructure.cache.http_response_cache import HttpResponseCache
+from backend.infrastructure.tracing.tracer import tracer
 
 
 class StackSpotAgentClient:
     """Client for StackSpot Agent Management API."""
     
-    def __init__(self, auth_client: StackSpotAuthClient):
+    def __init__(
+        self,
+        auth_client: StackSpotAuthClient,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HttpResponseCache] = None
+    ):
         self.auth_client = auth_client
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
         self.base_url = "https://genai-agent-tools-api.stackspot.com/v1/agents"
     
     def get_by_name(self, agent_name: str) -> Optional[Agent]:
@@ -31,8 +41,23 @@ class StackSpotAgentClient:
         
         headers = {"Authorization": f"Bearer {token}"}
         
+        url = f"{self.base_url}?visibility=personal"
+        
+        def fetch(url, headers):
+            with tracer.span("stackspot.agents.list", **{"http.url": url}) as span:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire_host(url)
+                response = requests.get(url, headers=tracer.inject(headers))
+                if self.rate_limiter:
+                    self.rate_limiter.observe(url, response.status_code, response.headers)
+                span.set_attribute("http.status_code", response.status_code)
+                return response
+        
         try:
-            response = requests.get(f"{self.base_url}?visibility=personal", headers=headers)
+            if self.http_cache:
+                response = self.http_cache.get(url, headers, self.auth_client.cache_scope(), fetch)
+            else:
+                response = fetch(url, headers)
             response.raise_for_status()
             
             agents = response.json()
@@ -109,12 +134,20 @@ class StackSpotAgentClient:
             body["structured_output"] = None
         
         try:
-            response = requests.post(self.base_url, headers=headers, json=body)
+            if self.rate_limiter:
+                self.rate_limiter.acquire_host(self.base_url)
+            with tracer.span("stackspot.agents.create", **{"http.url": self.base_url}):
+                response = requests.post(self.base_url, headers=tracer.inject(headers), json=body)
+            if self.rate_limiter:
+                self.rate_limiter.observe(self.base_url, response.status_code, response.headers)
             
             if response.status_code == 201:
                 agent_data = response.json()
                 agent_id = agent_data["id"]
                 print(f"Agent created successfully with ID: {agent_id}", file=sys.stderr)
+                if self.http_cache:
+                    # The cached agents list no longer has every agent
+                    self.http_cache.invalidate(self.auth_client.cache_scope(), f"{self.base_url}?visibility=personal")
                 return Agent(id=agent_id, name=request.name)
             else:
                 print(f"Failed to create agent: {response.status_code}", file=sys.stderr)
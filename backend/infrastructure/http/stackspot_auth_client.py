@@ -1,14 +1,26 @@
 """StackSpot Authentication Client - Handles OAuth authentication."""
 import os
+import json
+import hashlib
 import requests
 import time
 from typing import Optional
+from .rate_limiter import RateLimiter
+from backend.domain.repositories import KeyValueStore
+from backend.infrastructure.tracing.tracer import tracer
 
 
 class StackSpotAuthClient:
-    """Client for StackSpot OAuth authentication."""
+    """
+    Client for StackSpot OAuth authentication.
     
-    def __init__(self):
+    With a shared store, the token is also published there (per realm and
+    client) so every backend node reuses the same one.
+    """
+    
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, shared_store: Optional[KeyValueStore] = None):
+        self.rate_limiter = rate_limiter
+        self.shared_store = shared_store
         self.client_id = os.environ.get("STK_CLIENT_ID")
         self.client_key = os.environ.get("STK_CLIENT_KEY")
         self.realm = os.environ.get("STK_REALM")
@@ -21,6 +33,17 @@ class StackSpotAuthClient:
         self.client_key = os.environ.get("STK_CLIENT_KEY")
         self.realm = os.environ.get("STK_REALM")
     
+    def invalidate_token(self) -> None:
+        """Forget the cached token so the next call authenticates again."""
+        self.token = None
+        self.token_expires_at = 0
+        if self.shared_store:
+            self.shared_store.delete(self._shared_key())
+    
+    def cache_scope(self) -> str:
+        """Partition for cached responses: data of one account is never served to another."""
+        return f"{self.realm or ''}:{self.client_id or ''}"
+    
     def get_token(self) -> Optional[str]:
         """
         Get a valid authentication token, refreshing if necessary.
@@ -32,6 +55,9 @@ class StackSpotAuthClient:
         if self.token and self.token_expires_at > time.time():
             return self.token
         
+        if self._adopt_shared_token():
+            return self.token
+        
         # Authenticate to get new token
         if not all([self.client_id, self.client_key, self.realm]):
             print("Missing credentials. Please set STK_CLIENT_ID, STK_CLIENT_KEY, and STK_REALM.")
@@ -45,17 +71,58 @@ class StackSpotAuthClient:
             "client_secret": self.client_key
         }
         
+        with tracer.span("stackspot.auth.token", realm=self.realm) as span:
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire_host(url)
+                response = requests.post(url, headers=headers, data=data)
+                if self.rate_limiter:
+                    self.rate_limiter.observe(url, response.status_code, response.headers)
+                response.raise_for_status()
+                token_data = response.json()
+                
+                self.token = token_data["access_token"]
+                # Set expiration with 60 second buffer
+                self.token_expires_at = time.time() + token_data.get("expires_in", 300) - 60
+                self._publish_token()
+                
+                return self.token
+                
+            except Exception as e:
+                print(f"Authentication failed: {e}")
+                span.record_error(e)
+                return None
+    
+    def _shared_key(self) -> str:
+        # Hashed so credentials never appear in key names
+        return "auth:token:" + hashlib.sha256(self.cache_scope().encode("utf-8")).hexdigest()[:32]
+    
+    def _adopt_shared_token(self) -> bool:
+        """Use a token another node already obtained for the same credentials."""
+        if not self.shared_store:
+            return False
         try:
-            response = requests.post(url, headers=headers, data=data)
-            response.raise_for_status()
-            token_data = response.json()
-            
-            self.token = token_data["access_token"]
-            # Set expiration with 60 second buffer
-            self.token_expires_at = time.time() + token_data.get("expires_in", 300) - 60
-            
-            return self.token
-            
+            payload = self.shared_store.get(self._shared_key())
+            if not payload:
+                return False
+            data = json.loads(payload)
+            if data["expires_at"] <= time.time():
+                return False
+            self.token = data["token"]
+            self.token_expires_at = data["expires_at"]
+            return True
         except Exception as e:
-            print(f"Authentication failed: {e}")
-            return None
+            print(f"Ignoring shared token: {e}")
+            return False
+    
+    def _publish_token(self) -> None:
+        if not self.shared_store:
+            return
+        try:
+            self.shared_store.set(
+                self._shared_key(),
+                json.dumps({"token": self.token, "expires_at": self.token_expires_at}),
+                ttl_seconds=max(1, self.token_expires_at - time.time())
+            )
+        except Exception as e:
+            print(f"Failed to share token: {e}")
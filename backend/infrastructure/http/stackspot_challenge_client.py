@@ -2,24 +2,48 @@
 import sys
 import json
 import requests
-from typing import Optional, Dict, Any
-from backend.domain.entities import DailyChallenge
+from typing import Optional, Dict, Any, Generator, Tuple
+from backend.domain.entities import DailyChallenge, Scenario, Flashcard
 from .stackspot_auth_client import StackSpotAuthClient
+from .rate_limiter import RateLimiter
+from .json_schema import validate
+from .incremental_json import IncrementalJsonParser
+from backend.infrastructure.tracing.tracer import tracer
+
+DEFAULT_CONVERSATION_ID = "01KB1ATKQDKNWZXSV3JNCP72KB"
+DEFAULT_CHALLENGE_REQUEST = "proximo cenário"
 
 
 class StackSpotChallengeClient:
     """Client for fetching daily challenges from StackSpot GenAI Agent."""
     
-    def __init__(self, auth_client: StackSpotAuthClient):
+    def __init__(
+        self,
+        auth_client: StackSpotAuthClient,
+        rate_limiter: Optional[RateLimiter] = None,
+        output_schema: Optional[dict] = None
+    ):
         self.auth_client = auth_client
+        self.rate_limiter = rate_limiter
+        self.output_schema = output_schema
         self.base_url = "https://genai-inference-app.stackspot.com/v1/agent"
     
-    def get_daily_challenge(self, agent_id: str) -> Optional[DailyChallenge]:
+    def get_daily_challenge(
+        self,
+        agent_id: str,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+        validate_schema: bool = False,
+        user_prompt: str = DEFAULT_CHALLENGE_REQUEST
+    ) -> Optional[DailyChallenge]:
         """
         Fetch the daily challenge from the GenAI Agent.
         
         Args:
             agent_id: ID of the agent to query
+            conversation_id: Agent conversation to generate in; independent
+                generations (e.g. a batch of days) should each use their own
+            validate_schema: Reject responses that do not match the output schema
+            user_prompt: Message asking for the challenge (e.g. with the date it is for)
             
         Returns:
             DailyChallenge object if successful, None otherwise
@@ -36,15 +60,23 @@ class StackSpotChallengeClient:
         
         payload = {
             "streaming": False,
-            "user_prompt": "proximo cenário",
+            "user_prompt": user_prompt,
             "stackspot_knowledge": False,
             "return_ks_in_response": False,
             "use_conversation": True,
-            "conversation_id": "01KB1ATKQDKNWZXSV3JNCP72KB" 
+            "conversation_id": conversation_id
         }
         
+        if self.rate_limiter:
+            self.rate_limiter.acquire_host(url)
+        
         # Timeout of 60 seconds to accommodate LLM generation time
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        with tracer.span("stackspot.challenge.generate", **{"http.url": url}) as span:
+            response = requests.post(url, headers=tracer.inject(headers), json=payload, timeout=60)
+            span.set_attribute("http.status_code", response.status_code)
+        
+        if self.rate_limiter:
+            self.rate_limiter.observe(url, response.status_code, response.headers)
         
         if response.status_code != 200:
             error_msg = f"API Error {response.status_code}: {response.text}"
@@ -56,11 +88,139 @@ class StackSpotChallengeClient:
         # Parse the response to get the actual data
         parsed_data = self._parse_agent_response(data)
         
+        if parsed_data and validate_schema and self.output_schema:
+            errors = validate(parsed_data, self.output_schema)
+            if errors:
+                raise Exception(f"Agent response does not match output schema: {'; '.join(errors[:5])}")
+        
         if parsed_data:
             return DailyChallenge.from_dict(parsed_data)
         
         raise Exception("Failed to parse agent response")
 
+    def stream_daily_challenge(
+        self,
+        agent_id: str,
+        conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Fetch the daily challenge as a token stream, publishing parts as they complete.
+        
+        The agent's `message` deltas are fed to an incremental JSON parser,
+        so the scenario is available as soon as its object closes and each
+        flashcard as soon as it finishes, long before generation ends.
+        
+        Args:
+            agent_id: ID of the agent to query
+            conversation_id: Agent conversation to generate in
+            
+        Yields:
+            ("scenario", Scenario), then ("flashcard", Flashcard) per card,
+            and finally ("challenge", DailyChallenge) with the full document
+            
+        Raises:
+            Exception: On authentication, API or parse failures
+        """
+        token = self.auth_client.get_token()
+        if not token:
+            raise Exception("Failed to authenticate")
+        
+        url = f'{self.base_url}/{agent_id}/chat'
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {token}'
+        }
+        
+        payload = {
+            "streaming": True,
+            "user_prompt": DEFAULT_CHALLENGE_REQUEST,
+            "stackspot_knowledge": False,
+            "return_ks_in_response": False,
+            "use_conversation": True,
+            "conversation_id": conversation_id
+        }
+        
+        if self.rate_limiter:
+            self.rate_limiter.acquire_host(url)
+        
+        span = tracer.start_span("stackspot.challenge.stream", **{"http.url": url})
+        headers['traceparent'] = span.traceparent
+        try:
+            response = requests.post(url, headers=headers, json=payload, timeout=60, stream=True)
+        except Exception as e:
+            span.record_error(e)
+            span.end()
+            raise
+        span.add_event("response_headers", status_code=response.status_code)
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.observe(url, response.status_code, response.headers)
+            
+            if response.status_code != 200:
+                error_msg = f"API Error {response.status_code}: {response.text}"
+                print(error_msg, file=sys.stderr)
+                raise Exception(error_msg)
+            
+            parser = IncrementalJsonParser(
+                lambda path: path == ("scenario",) or (len(path) == 2 and path[0] == "flashcards")
+            )
+            
+            for delta in self._iter_message_deltas(response):
+                for path, value in parser.feed(delta):
+                    if path == ("scenario",):
+                        span.add_event("scenario")
+                        yield "scenario", Scenario.from_dict(value)
+                    else:
+                        span.add_event("flashcard", index=path[1])
+                        yield "flashcard", Flashcard.from_dict(value)
+                if parser.done:
+                    break
+            
+            if not parser.done or not isinstance(parser.root, dict):
+                raise Exception("Failed to parse agent response: stream ended before the JSON document closed")
+            
+            yield "challenge", DailyChallenge.from_dict(parser.root)
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            response.close()
+            span.end()
+
+    @staticmethod
+    def _iter_message_deltas(response) -> Generator[str, None, None]:
+        """
+        Yield the text deltas of the agent's `message` from an SSE response.
+        
+        Servers that ignore `"streaming": True` answer with a single JSON body,
+        which is yielded whole.
+        """
+        if 'application/json' in response.headers.get('Content-Type', ''):
+            message = response.json().get('message')
+            if isinstance(message, str):
+                yield message
+            return
+        
+        for line in response.iter_lines():
+            if not line:
+                continue
+            decoded_line = line.decode('utf-8')
+            if not decoded_line.startswith('data:'):
+                continue
+            
+            json_data = decoded_line[5:].strip()
+            if not json_data:
+                continue
+            try:
+                data_dict = json.loads(json_data)
+            except json.JSONDecodeError as e:
+                print(f"Failed to parse line: {decoded_line}, error: {e}", file=sys.stderr)
+                continue
+            
+            delta = data_dict.get('message') if isinstance(data_dict, dict) else None
+            if isinstance(delta, str) and delta:
+                yield delta
+
     def _parse_agent_response(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parses the agent response to extract the actual data.
@@ -1,22 +1,42 @@
 """StackSpot Chat Client."""
 import sys
 import json
+import threading
 import requests
-from typing import Generator, Dict, Any
+from typing import Generator, Dict, Any, Optional
 from .stackspot_auth_client import StackSpotAuthClient
+from .rate_limiter import RateLimiter
+from .cancellation import abort_response, on_cancel
+from backend.infrastructure.tracing.tracer import tracer
 
 
 class StackSpotChatClient:
     """Client for chatting with StackSpot GenAI Agent."""
     
-    def __init__(self, auth_client: StackSpotAuthClient):
+    def __init__(self, auth_client: StackSpotAuthClient, rate_limiter: Optional[RateLimiter] = None):
         self.auth_client = auth_client
+        self.rate_limiter = rate_limiter
         self.base_url = "https://genai-code-buddy-api.stackspot.com/v3/chat"
+        # Pooled connections, reused across chat turns
+        self.session = requests.Session()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "streams_started": 0,
+            "streams_completed": 0,
+            "streams_cancelled": 0,
+            "bytes_received": 0,
+            "wasted_bytes": 0
+        }
     
     def chat_with_agent(self, conversation_id: str, user_prompt: str) -> Generator[Dict[str, Any], None, None]:
         """
         Sends a message to the GenAI Code Buddy Agent and yields streaming responses.
         
+        Closing the generator (e.g. because the browser disconnected) closes
+        the upstream response right away instead of reading until end_event.
+        A read blocked on another thread is interrupted through the current
+        CancelScope.
+        
         Args:
             conversation_id: ID of the conversation
             user_prompt: User's message
@@ -24,9 +44,14 @@ class StackSpotChatClient:
         Yields:
             dict: Parsed JSON chunks from the stream
         """
-        token = self.auth_client.get_token()
+        span = tracer.start_span("stackspot.chat", **{"http.url": self.base_url})
+        with tracer.activate(span):
+            token = self.auth_client.get_token()
+        span.add_event("token_ready")
         if not token:
             print("Failed to authenticate.", file=sys.stderr)
+            span.record_error(Exception("Failed to authenticate"))
+            span.end()
             yield {"error": "Failed to authenticate"}
             return
 
@@ -40,19 +65,43 @@ class StackSpotChatClient:
 
         headers = {
             'Content-Type': 'application/json',
-            'authorization': f'Bearer {token}'
+            'authorization': f'Bearer {token}',
+            'traceparent': span.traceparent
         }
 
+        response = None
+        bytes_received = 0
+        completed = False
+        aborted = threading.Event()
+        unregister = lambda: None
+        
+        def abort():
+            # Called from the consumer's thread while this one may be blocked reading
+            aborted.set()
+            abort_response(response)
+        
         try:
-            response = requests.post(self.base_url, json=data, headers=headers, stream=True)
+            if self.rate_limiter:
+                self.rate_limiter.acquire_host(self.base_url)
+            response = self.session.post(self.base_url, json=data, headers=headers, stream=True)
+            unregister = on_cancel(abort)
+            # Connection setup plus upstream time to first byte (status line and headers)
+            span.add_event("response_headers", status_code=response.status_code)
+            self._increment("streams_started")
+            if self.rate_limiter:
+                self.rate_limiter.observe(self.base_url, response.status_code, response.headers)
             
             if response.status_code != 200:
                 error_msg = f"Erro: Status code {response.status_code} - {response.text}"
                 print(error_msg, file=sys.stderr)
+                completed = True
                 yield {"error": error_msg}
                 return
 
             for line in response.iter_lines():
+                if not bytes_received:
+                    span.add_event("first_chunk")
+                bytes_received += len(line) + 1
                 if line:
                     decoded_line = line.decode('utf-8')
                     
@@ -63,12 +112,53 @@ class StackSpotChatClient:
                                 data_dict = json.loads(json_data)
                                 if "answer" in data_dict:
                                     yield data_dict
+                        except GeneratorExit:
+                            raise
                         except Exception as e:
                             print(f"Failed to parse line: {decoded_line}, error: {e}", file=sys.stderr)
                     
                     if 'event: end_event' in decoded_line:
                         break
+            
+            completed = not aborted.is_set()
 
+        except GeneratorExit:
+            # Consumer went away: fall through to finally and drop the upstream
+            span.set_attribute("cancelled", True)
+            raise
         except Exception as e:
+            if aborted.is_set():
+                # The read was interrupted because the consumer went away
+                span.set_attribute("cancelled", True)
+                return
             print(f"Failed to chat with agent: {e}", file=sys.stderr)
+            span.record_error(e)
+            completed = True
             yield {"error": str(e)}
+        finally:
+            unregister()
+            if response is not None:
+                # Unread streams cannot be reused; close() discards the socket
+                # and hands the pool slot back.
+                response.close()
+                self._record_stream(bytes_received, completed)
+            span.set_attribute("bytes_received", bytes_received)
+            span.end()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters of completed/cancelled streams and upstream bytes."""
+        with self._stats_lock:
+            return dict(self._stats)
+    
+    def _increment(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+    
+    def _record_stream(self, bytes_received: int, completed: bool) -> None:
+        with self._stats_lock:
+            self._stats["bytes_received"] += bytes_received
+            if completed:
+                self._stats["streams_completed"] += 1
+            else:
+                self._stats["streams_cancelled"] += 1
+                self._stats["wasted_bytes"] += bytes_received
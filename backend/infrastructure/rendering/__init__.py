@@ -0,0 +1 @@
+# Server-side renderers
@@ -0,0 +1,211 @@
+"""Markdown Renderer - Sanitized HTML for finished messages, cached by content hash."""
+import re
+import html
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    from pygments import highlight
+    from pygments.lexers import get_lexer_by_name
+    from pygments.formatters import HtmlFormatter
+    from pygments.util import ClassNotFound
+except ImportError:  # Optional: code blocks are still rendered, just not highlighted
+    highlight = None
+
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)\s*([\w+#.-]*)\s*$")
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+UNORDERED_PATTERN = re.compile(r"^\s*[-*+]\s+(.*)$")
+ORDERED_PATTERN = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+QUOTE_PATTERN = re.compile(r"^\s*>\s?(.*)$")
+RULE_PATTERN = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+CODE_SPAN_PATTERN = re.compile(r"`([^`]+)`")
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+# Delimiters need a non-word character around them (a following ".name", as in __init__.py, counts
+# as a word) and emphasis never runs past the next delimiter
+BOLD_PATTERN = re.compile(r"(?<![\w*])(\*\*|__)(?=\S)((?:(?!\1).)+?)(?<=\S)\1(?![\w*]|\.\w)")
+ITALIC_PATTERN = re.compile(r"(?<![\w*])([*_])(?=\S)((?:(?!\1).)+?)(?<=\S)\1(?![\w*]|\.\w)")
+SAFE_URL_PATTERN = re.compile(r"^(https?://|mailto:)", re.IGNORECASE)
+
+
+class MarkdownRenderer:
+    """
+    Converts the markdown written by the agent into HTML.
+
+    Everything is escaped before any markup is produced, so raw HTML in a
+    message is shown as text and only the tags generated here (paragraphs,
+    headings, lists, quotes, emphasis, code and http(s) links) reach the
+    client. Code blocks are highlighted with Pygments when it is installed.
+    Rendered HTML is kept in an LRU keyed by the hash of the source text, so
+    a message is only rendered once however often its history is loaded.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._formatter = HtmlFormatter(nowrap=True) if highlight else None
+
+    def render(self, text: Optional[str]) -> str:
+        """Render markdown to sanitized HTML."""
+        if not text:
+            return ""
+        return self._cached(hashlib.sha256(text.encode("utf-8")).hexdigest(), lambda: self._render_blocks(text))
+
+    def render_code(self, code: Optional[str], language: str = "") -> str:
+        """Render a bare code snippet (e.g. `Flashcard.code_example`) as a code block."""
+        if not code:
+            return ""
+        if FENCE_PATTERN.match(code.lstrip().split("\n", 1)[0]):
+            # Already written as a fenced block
+            return self.render(code)
+        digest = hashlib.sha256(f"code\x1f{language}\x1f{code}".encode("utf-8")).hexdigest()
+        return self._cached(digest, lambda: self._code_block(code, language))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "highlighting": self._formatter is not None
+            }
+
+    def _cached(self, key: str, render) -> str:
+        with self._lock:
+            rendered = self._cache.get(key)
+            if rendered is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return rendered
+            self._misses += 1
+
+        rendered = render()
+        with self._lock:
+            self._cache[key] = rendered
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def _render_blocks(self, text: str) -> str:
+        lines = text.replace("\r\n", "\n").split("\n")
+        out: List[str] = []
+        paragraph: List[str] = []
+        i = 0
+
+        def close_paragraph():
+            if paragraph:
+                out.append(f"<p>{'<br>'.join(self._inline(line) for line in paragraph)}</p>")
+                paragraph.clear()
+
+        while i < len(lines):
+            line = lines[i]
+
+            fence = FENCE_PATTERN.match(line)
+            if fence:
+                close_paragraph()
+                marker, language = fence.group(1), fence.group(2)
+                code: List[str] = []
+                i += 1
+                # An unterminated fence (e.g. truncated answer) runs to the end
+                while i < len(lines) and lines[i].strip() != marker:
+                    code.append(lines[i])
+                    i += 1
+                out.append(self._code_block("\n".join(code), language))
+                i += 1
+                continue
+
+            if not line.strip():
+                close_paragraph()
+                i += 1
+                continue
+
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                close_paragraph()
+                level = len(heading.group(1))
+                out.append(f"<h{level}>{self._inline(heading.group(2))}</h{level}>")
+                i += 1
+                continue
+
+            if RULE_PATTERN.match(line):
+                close_paragraph()
+                out.append("<hr>")
+                i += 1
+                continue
+
+            for pattern, tag in ((UNORDERED_PATTERN, "ul"), (ORDERED_PATTERN, "ol")):
+                if pattern.match(line):
+                    close_paragraph()
+                    items = []
+                    while i < len(lines) and pattern.match(lines[i]):
+                        items.append(f"<li>{self._inline(pattern.match(lines[i]).group(1))}</li>")
+                        i += 1
+                    out.append(f"<{tag}>{''.join(items)}</{tag}>")
+                    break
+            else:
+                if QUOTE_PATTERN.match(line):
+                    close_paragraph()
+                    quoted = []
+                    while i < len(lines) and QUOTE_PATTERN.match(lines[i]):
+                        quoted.append(QUOTE_PATTERN.match(lines[i]).group(1))
+                        i += 1
+                    out.append(f"<blockquote>{self._render_blocks(chr(10).join(quoted))}</blockquote>")
+                    continue
+
+                paragraph.append(line.strip())
+                i += 1
+
+        close_paragraph()
+        return "".join(out)
+
+    def _inline(self, text: str) -> str:
+        # NUL marks the placeholders below; in the text it becomes U+FFFD, as CommonMark does
+        text = text.replace("\x00", "\ufffd")
+        # Code spans are cut out first so nothing inside them is interpreted
+        spans: List[str] = []
+
+        def keep_code(match):
+            spans.append(f"<code>{html.escape(match.group(1))}</code>")
+            return f"\x00{len(spans) - 1}\x00"
+
+        # Links likewise, so emphasis markers in a URL are never rewritten
+        def keep_link(match):
+            link = self._link(match)
+            if link is None:
+                return match.group(0)
+            spans.append(link)
+            return f"\x00{len(spans) - 1}\x00"
+
+        text = html.escape(CODE_SPAN_PATTERN.sub(keep_code, text), quote=True)
+        text = self._emphasis(LINK_PATTERN.sub(keep_link, text))
+        return re.sub(r"\x00(\d+)\x00", lambda m: spans[int(m.group(1))], text)
+
+    @staticmethod
+    def _emphasis(text: str) -> str:
+        text = BOLD_PATTERN.sub(r"<strong>\2</strong>", text)
+        return ITALIC_PATTERN.sub(r"<em>\2</em>", text)
+
+    def _link(self, match) -> Optional[str]:
+        label, url = match.group(1), match.group(2)
+        # The URL was escaped with the rest of the line; only known-safe schemes become links
+        if not SAFE_URL_PATTERN.match(html.unescape(url)):
+            return None
+        return f'<a href="{url}" target="_blank" rel="noopener noreferrer">{self._emphasis(label)}</a>'
+
+    def _code_block(self, code: str, language: str) -> str:
+        language_class = f' class="language-{html.escape(language)}"' if language else ""
+        body = None
+        if self._formatter and language:
+            try:
+                body = highlight(code, get_lexer_by_name(language), self._formatter)
+            except ClassNotFound:
+                pass
+        if body is None:
+            body = html.escape(code)
+        return f'<pre class="highlight"><code{language_class}>{body.rstrip(chr(10))}</code></pre>'
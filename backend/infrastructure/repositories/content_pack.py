@@ -0,0 +1,148 @@
+"""Memory-mapped content pack of challenges for offline use."""
+import os
+import sys
+import mmap
+import json
+import zlib
+import struct
+import bisect
+import argparse
+import threading
+from datetime import date
+from typing import Iterable, List, Optional
+from backend.domain.entities import DailyChallenge
+
+MAGIC = b"DSCP"
+VERSION = 2
+# magic, version, entry count, ordinal of the first date
+HEADER = struct.Struct("<4sHIQ")
+# date ordinal, offset and length of one compressed entry, sorted by date
+SLOT = struct.Struct("<IQI")
+
+
+def write_content_pack(challenges: Iterable[DailyChallenge], path: str) -> int:
+    """
+    Write challenges to a pack file.
+    
+    Layout: header, a slot table sorted by date (date ordinal, offset,
+    length), then one zlib-compressed JSON document per challenge. Dates
+    need not be consecutive. Returns the number of entries written.
+    
+    Raises:
+        ValueError: If there are no challenges, or two share a date
+    """
+    by_ordinal = {}
+    for challenge in challenges:
+        ordinal = date.fromisoformat(challenge.date).toordinal()
+        if ordinal in by_ordinal:
+            raise ValueError(f"Two challenges for {challenge.date}")
+        by_ordinal[ordinal] = challenge
+    if not by_ordinal:
+        raise ValueError("A content pack needs at least one challenge")
+    
+    ordinals = sorted(by_ordinal)
+    blobs = [
+        zlib.compress(json.dumps(by_ordinal[o].to_dict(), ensure_ascii=False).encode("utf-8"), 9)
+        for o in ordinals
+    ]
+    
+    offset = HEADER.size + SLOT.size * len(blobs)
+    table = bytearray()
+    for ordinal, blob in zip(ordinals, blobs):
+        table += SLOT.pack(ordinal, offset, len(blob))
+        offset += len(blob)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(blobs), ordinals[0]))
+        f.write(table)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(blobs)
+
+
+class ContentPack:
+    """
+    Read-only view of a content pack.
+    
+    A stored date is found by binary search over the slot table's dates
+    (held in memory), and needs one decompression whatever the pack size.
+    A date missing between the first and last stored ones has no
+    challenge. Outside that range the pack repeats: such dates map to a
+    slot by their distance to the first date, modulo the number of
+    entries, dated as requested.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Not a content pack: {path}")
+        
+        magic, version, count, base_ordinal = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or count == 0 \
+                or len(self._mmap) < HEADER.size + SLOT.size * count:
+            self._mmap.close()
+            raise ValueError(f"Not a content pack (or unsupported version): {path}")
+        self.count = count
+        self.base_ordinal = base_ordinal
+        # (offset, length) per slot, and the date ordinal of each slot in order
+        self._slots: List[tuple] = []
+        self._ordinals: List[int] = []
+        for position in range(count):
+            ordinal, offset, length = SLOT.unpack_from(self._mmap, HEADER.size + position * SLOT.size)
+            self._ordinals.append(ordinal)
+            self._slots.append((offset, length))
+    
+    def get(self, challenge_date: str) -> Optional[DailyChallenge]:
+        """Challenge for a date (YYYY-MM-DD), dated as requested; None for a gap in the stored dates."""
+        try:
+            ordinal = date.fromisoformat(challenge_date).toordinal()
+        except (TypeError, ValueError):
+            return None
+        
+        if self._ordinals[0] <= ordinal <= self._ordinals[-1]:
+            slot = bisect.bisect_left(self._ordinals, ordinal)
+            if self._ordinals[slot] != ordinal:
+                return None
+        else:
+            slot = (ordinal - self.base_ordinal) % self.count
+        offset, length = self._slots[slot]
+        with self._lock:
+            blob = self._mmap[offset:offset + length]
+        
+        challenge = DailyChallenge.from_dict(json.loads(zlib.decompress(blob).decode("utf-8")))
+        challenge.date = challenge_date
+        return challenge
+    
+    def close(self) -> None:
+        self._mmap.close()
+
+
+def main(argv=None) -> int:
+    """Build a pack from the challenges in a FileChallengeStore directory."""
+    from backend.infrastructure.repositories.file_challenge_store import FileChallengeStore
+    
+    parser = argparse.ArgumentParser(description="Build an offline content pack from stored challenges.")
+    parser.add_argument("challenges_dir", help="Directory of <date>.json challenges (e.g. data/challenges)")
+    parser.add_argument("output", help="Pack file to write (e.g. data/content.pack)")
+    args = parser.parse_args(argv)
+    
+    store = FileChallengeStore(args.challenges_dir)
+    challenges = [c for c in (store.get(d) for d in store.dates()) if c]
+    if not challenges:
+        print(f"No challenges found in {args.challenges_dir}", file=sys.stderr)
+        return 1
+    
+    count = write_content_pack(challenges, args.output)
+    print(f"Wrote {count} challenges to {args.output} ({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""File-based Challenge Store."""
+import os
+import re
+import sys
+import json
+import threading
+from typing import List, Optional
+from backend.domain.entities import DailyChallenge
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class FileChallengeStore:
+    """Stores one JSON file per challenge date in a directory."""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def get(self, challenge_date: str) -> Optional[DailyChallenge]:
+        """Get the challenge stored for a date (YYYY-MM-DD)."""
+        path = self._path(challenge_date)
+        if not path or not os.path.exists(path):
+            return None
+        
+        try:
+            with open(path, encoding="utf-8") as f:
+                return DailyChallenge.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Failed to read stored challenge {challenge_date}: {e}", file=sys.stderr)
+            return None
+    
+    def save(self, challenge: DailyChallenge) -> None:
+        """Store a challenge under its date, replacing any previous one."""
+        path = self._path(challenge.date)
+        if not path:
+            raise ValueError(f"Invalid challenge date: {challenge.date!r}")
+        
+        # Write to a temp file and rename so readers never see a partial file
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(challenge.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+    
+    def dates(self) -> List[str]:
+        """Dates that have a stored challenge, sorted."""
+        return sorted(
+            name[:-5] for name in os.listdir(self.directory)
+            if name.endswith(".json") and DATE_PATTERN.match(name[:-5])
+        )
+    
+    def clear(self, since: str) -> None:
+        """Remove the challenges of `since` (YYYY-MM-DD) and later dates."""
+        with self._lock:
+            for challenge_date in self.dates():
+                if challenge_date >= since:
+                    try:
+                        os.remove(self._path(challenge_date))
+                    except OSError as e:
+                        print(f"Failed to remove stored challenge {challenge_date}: {e}", file=sys.stderr)
+    
+    def _path(self, challenge_date: str) -> Optional[str]:
+        if not DATE_PATTERN.match(challenge_date or ""):
+            return None
+        return os.path.join(self.directory, f"{challenge_date}.json")
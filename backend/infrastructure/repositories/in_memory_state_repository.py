@@ -1,18 +1,42 @@
 """In-memory State Repository."""
+import weakref
+import threading
+from typing import Dict
 from backend.domain.entities import AppState
 from backend.domain.repositories import StateRepository
 
 
 class InMemoryStateRepository:
-    """In-memory implementation of StateRepository."""
+    """
+    In-memory implementation of StateRepository.
+    
+    Requests keep the state object they started with. Once the day has
+    switched, a state that was replaced by one of another day is not
+    written back (like `merge_states` does for the stored repositories),
+    so a stream that finishes after the rollover does not bring back
+    yesterday's challenge.
+    """
     
     def __init__(self):
         self._state = AppState()
+        self._lock = threading.Lock()
+        self._replaced: Dict[int, weakref.ref] = {}
     
     def get_state(self) -> AppState:
         """Get current application state."""
-        return self._state
+        with self._lock:
+            return self._state
     
     def update_state(self, state: AppState) -> None:
-        """Update application state."""
-        self._state = state
+        """Update application state (requests already holding the old state keep it)."""
+        with self._lock:
+            if state is self._state:
+                return
+            replaced = self._replaced.get(id(state))
+            if replaced is not None and replaced() is state \
+                    and state.get_current_date() != self._state.get_current_date():
+                # Changes made to an earlier day's state belong to that day
+                return
+            self._replaced = {key: ref for key, ref in self._replaced.items() if ref() is not None}
+            self._replaced[id(self._state)] = weakref.ref(self._state)
+            self._state = state
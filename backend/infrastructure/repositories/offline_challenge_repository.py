@@ -0,0 +1,31 @@
+"""Offline Challenge Repository."""
+import os
+import sys
+from datetime import date
+from typing import Optional
+from backend.domain.entities import DailyChallenge
+from .content_pack import ContentPack
+
+
+class OfflineChallengeRepository:
+    """Serves daily challenges from a local content pack, without any network access."""
+    
+    def __init__(self, pack_path: str):
+        self.pack_path = pack_path
+        self._pack: Optional[ContentPack] = None
+        if not os.path.exists(pack_path):
+            return
+        try:
+            self._pack = ContentPack(pack_path)
+        except (OSError, ValueError) as e:
+            print(f"Offline mode disabled, could not open content pack {pack_path}: {e}", file=sys.stderr)
+    
+    @property
+    def available(self) -> bool:
+        return self._pack is not None
+    
+    def get_daily_challenge(self) -> Optional[DailyChallenge]:
+        """Get the daily challenge."""
+        if not self._pack:
+            return None
+        return self._pack.get(str(date.today()))
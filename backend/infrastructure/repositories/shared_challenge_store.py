@@ -0,0 +1,45 @@
+"""Challenge store on the shared key-value store."""
+import sys
+import json
+from typing import List, Optional
+from backend.domain.entities import DailyChallenge
+from backend.domain.repositories import KeyValueStore
+from .file_challenge_store import DATE_PATTERN
+
+
+class SharedChallengeStore:
+    """ChallengeStore kept in the KeyValueStore every node uses, one key per date."""
+
+    def __init__(self, store: KeyValueStore, prefix: str = "challenge:"):
+        self.store = store
+        self.prefix = prefix
+
+    def get(self, challenge_date: str) -> Optional[DailyChallenge]:
+        """Get the challenge stored for a date (YYYY-MM-DD)."""
+        payload = self.store.get(self.prefix + challenge_date)
+        if not payload:
+            return None
+        try:
+            return DailyChallenge.from_dict(json.loads(payload))
+        except ValueError as e:
+            print(f"Failed to read shared challenge {challenge_date}: {e}", file=sys.stderr)
+            return None
+
+    def save(self, challenge: DailyChallenge) -> None:
+        """Store a challenge under its date, replacing any previous one."""
+        if not DATE_PATTERN.match(challenge.date or ""):
+            raise ValueError(f"Invalid challenge date: {challenge.date!r}")
+        self.store.set(self.prefix + challenge.date, json.dumps(challenge.to_dict(), ensure_ascii=False))
+
+    def dates(self) -> List[str]:
+        """Dates that have a stored challenge, sorted."""
+        return sorted(
+            key[len(self.prefix):] for key in self.store.keys(self.prefix)
+            if DATE_PATTERN.match(key[len(self.prefix):])
+        )
+
+    def clear(self, since: str) -> None:
+        """Remove the challenges of `since` (YYYY-MM-DD) and later dates."""
+        for challenge_date in self.dates():
+            if challenge_date >= since:
+                self.store.delete(self.prefix + challenge_date)
@@ -0,0 +1,103 @@
+"""State repository on the shared key-value store."""
+import sys
+import json
+import threading
+from typing import Optional
+from backend.domain.entities import AppState
+from backend.domain.repositories import KeyValueStore
+from backend.infrastructure.repositories.state_merge import StateSnapshots, merge_states
+
+
+class SharedStateRepository:
+    """
+    StateRepository kept in the KeyValueStore every node uses.
+
+    Same contract as SqliteStateRepository. The state is one JSON document
+    with a version, and it is reloaded only when another node has written a
+    newer version. `update_state` publishes a change with compare-and-set.
+    If another node wrote since the object was loaded, its changes are
+    merged in (see `merge_states`) and the write is retried.
+    """
+
+    MAX_ATTEMPTS = 10
+
+    def __init__(self, store: KeyValueStore, prefix: str = "state:"):
+        self.store = store
+        self.payload_key = prefix + "payload"
+        self.version_key = prefix + "version"
+        self._lock = threading.Lock()
+        self._state = AppState()
+        self._version: Optional[str] = None
+        self._snapshots = StateSnapshots()
+        self._snapshots.remember(self._state, 0, self._state.to_dict())
+
+    def get_state(self) -> AppState:
+        """Get current application state, reloading it if another node changed it."""
+        with self._lock:
+            try:
+                version = self.store.get(self.version_key)
+                if version is not None and version != self._version:
+                    raw = self.store.get(self.payload_key)
+                    if raw:
+                        document_version, state = self._parse(raw)
+                        self._state = AppState.from_dict(state)
+                        # A separate copy: the state object's lists must not alias its merge base
+                        self._snapshots.remember(self._state, document_version, self._parse(raw)[1])
+                        version = str(document_version)
+                    self._version = version
+            except Exception as e:
+                print(f"Failed to read shared state, using the local copy: {e}", file=sys.stderr)
+            return self._state
+
+    def update_state(self, state: AppState) -> None:
+        """Publish the state, merged with what other nodes wrote since it was loaded."""
+        ours = json.loads(json.dumps(state.to_dict(), ensure_ascii=False))
+        with self._lock:
+            try:
+                for _ in range(self.MAX_ATTEMPTS):
+                    raw = self.store.get(self.payload_key)
+                    stored_version, theirs = self._parse(raw) if raw else (0, None)
+                    snapshot = self._snapshots.get(state)
+                    document = ours
+                    if theirs is not None and snapshot is not None and snapshot[0] != stored_version:
+                        document = merge_states(snapshot[1], ours, theirs)
+                    version = stored_version + 1
+                    new_raw = json.dumps({"version": version, "state": document}, ensure_ascii=False)
+                    if self.store.compare_and_set(self.payload_key, raw, new_raw):
+                        break
+                else:
+                    print("Failed to write shared state: too many concurrent writers", file=sys.stderr)
+                    self._state = state
+                    return
+                self._raise_version(version)
+            except Exception as e:
+                print(f"Failed to write shared state: {e}", file=sys.stderr)
+                self._state = state
+                return
+
+            self._version = str(version)
+            if document == ours:
+                self._state = state
+                self._snapshots.remember(state, version, ours)
+            else:
+                # Later requests get the merged state; the caller's object merges again on its next write
+                self._state = AppState.from_dict(self._parse(new_raw)[1])
+                self._snapshots.remember(self._state, version, document)
+                self._snapshots.remember(state, None, ours)
+
+    def _raise_version(self, version: int) -> None:
+        """Move the version key up to `version` (never down, whatever order writers finish in)."""
+        while True:
+            current = self.store.get(self.version_key)
+            if current is not None and int(current) >= version:
+                return
+            if self.store.compare_and_set(self.version_key, current, str(version)):
+                return
+
+    def _parse(self, raw: str):
+        """(version, state dict) of a stored document."""
+        document = json.loads(raw)
+        if "state" not in document:
+            # Written before the version was stored along with the state
+            return int(self.store.get(self.version_key) or 0), document
+        return document["version"], document["state"]
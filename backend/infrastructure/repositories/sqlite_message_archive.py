@@ -0,0 +1,76 @@
+"""SQLite Message Archive."""
+import os
+import sys
+import json
+import sqlite3
+import threading
+from typing import List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, position)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteMessageArchive:
+    """Stores chat messages that no longer fit the in-memory conversation window."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"Message archive disabled, could not open {db_path}: {e}", file=sys.stderr)
+
+    def archive(self, conversation_id: str, start_position: int, messages: List[dict]) -> None:
+        """Store messages, the first one at `start_position`."""
+        if not self._conn or not messages:
+            return
+
+        rows = [
+            (conversation_id, start_position + offset, json.dumps(message))
+            for offset, message in enumerate(messages)
+        ]
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO messages (conversation_id, position, payload) VALUES (?, ?, ?)",
+                        rows
+                    )
+        except sqlite3.Error as e:
+            print(f"Failed to archive messages of {conversation_id}: {e}", file=sys.stderr)
+
+    def load(self, conversation_id: str, start_position: int, end_position: int) -> List[dict]:
+        """Load messages with start_position <= position < end_position, oldest first."""
+        if not self._conn or end_position <= start_position:
+            return []
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT payload FROM messages WHERE conversation_id = ? AND position >= ? AND position < ? "
+                    "ORDER BY position",
+                    (conversation_id, start_position, end_position)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Failed to load archived messages of {conversation_id}: {e}", file=sys.stderr)
+            return []
+
+        return [json.loads(payload) for (payload,) in rows]
@@ -0,0 +1,180 @@
+"""SQLite FTS5 Search Index."""
+import os
+import re
+import sys
+import sqlite3
+import threading
+from typing import List, Optional
+from backend.domain.entities import DailyChallenge, SearchHit
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    date TEXT NOT NULL,
+    flashcard_index INTEGER,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body,
+    content='documents', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+UPSERT = """
+INSERT INTO documents (doc_key, kind, date, flashcard_index, title, body)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(doc_key) DO UPDATE SET
+    kind = excluded.kind,
+    date = excluded.date,
+    flashcard_index = excluded.flashcard_index,
+    title = excluded.title,
+    body = excluded.body
+WHERE documents.title != excluded.title OR documents.body != excluded.body
+"""
+
+# Rank and limit inside the FTS table first, so snippets and the join
+# only run for the rows that are actually returned.
+SEARCH = """
+SELECT d.kind, d.date, d.flashcard_index, d.title,
+       snippet(documents_fts, 1, '<mark>', '</mark>', '…', 16),
+       m.rank
+FROM (
+    SELECT rowid, rank FROM documents_fts
+    WHERE documents_fts MATCH ?
+    ORDER BY rank
+    LIMIT ?
+) AS m
+JOIN documents_fts ON documents_fts.rowid = m.rowid AND documents_fts MATCH ?
+JOIN documents d ON d.id = m.rowid
+ORDER BY m.rank
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SqliteSearchIndex:
+    """Persistent full-text index backed by SQLite FTS5."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            # Matches in titles (scenario titles, flashcard questions) weigh more than body text
+            conn.execute("INSERT INTO documents_fts(documents_fts, rank) VALUES ('rank', 'bm25(5.0, 1.0)')")
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"Search index disabled, could not open {db_path}: {e}", file=sys.stderr)
+
+    def index_challenge(self, challenge: DailyChallenge) -> None:
+        """Add or replace the scenario and flashcards of a challenge."""
+        rows = [(
+            f"scenario:{challenge.date}",
+            "scenario",
+            challenge.date,
+            None,
+            challenge.scenario.title,
+            challenge.scenario.description
+        )]
+
+        for i, flashcard in enumerate(challenge.flashcards):
+            body_parts = [flashcard.answer, flashcard.detailed_explanation, flashcard.code_example]
+            rows.append((
+                f"flashcard:{challenge.date}:{i}",
+                "flashcard",
+                challenge.date,
+                i,
+                flashcard.question,
+                "\n\n".join(part for part in body_parts if part)
+            ))
+
+        self._write(rows)
+
+    def index_message(self, challenge_date: str, flashcard_index: int, conversation_id: str,
+                      message_index: int, content: str) -> None:
+        """Add or replace a single chat message."""
+        self._write([(
+            f"message:{conversation_id}:{message_index}",
+            "message",
+            challenge_date,
+            flashcard_index,
+            "",
+            content
+        )])
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Search the index, best matches first.
+
+        Args:
+            query: Free text typed by the user
+            limit: Maximum number of hits
+
+        Returns:
+            List of SearchHit with highlighted snippets
+        """
+        match = self._build_match_expression(query)
+        if not match or not self._conn:
+            return []
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(SEARCH, (match, limit, match)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Search failed for '{query}': {e}", file=sys.stderr)
+            return []
+
+        return [
+            SearchHit(
+                kind=kind,
+                date=date,
+                title=title,
+                snippet=snippet,
+                # bm25 ranks are negative, lower is better
+                score=round(-rank, 4),
+                flashcard_index=flashcard_index
+            )
+            for kind, date, flashcard_index, title, snippet, rank in rows
+        ]
+
+    def _write(self, rows: list) -> None:
+        """Upsert documents in a single transaction."""
+        if not self._conn:
+            return
+
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.executemany(UPSERT, rows)
+        except sqlite3.Error as e:
+            print(f"Failed to update search index: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _build_match_expression(query: str) -> str:
+        """Turn free text into a safe FTS5 expression (all terms, prefix match)."""
+        tokens = TOKEN_PATTERN.findall(query or "")
+        return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,117 @@
+"""SQLite State Repository."""
+import os
+import sys
+import json
+import sqlite3
+import threading
+from typing import Optional
+from backend.domain.entities import AppState
+from backend.infrastructure.repositories.state_merge import StateSnapshots, merge_states
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS app_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+class SqliteStateRepository:
+    """
+    StateRepository shared by every worker process through one SQLite file.
+
+    The state is stored as a single JSON document with a version number.
+    `get_state` returns the same object for as long as no other process has
+    written a newer version, so requests of one worker keep sharing it as
+    with the in-memory repository; `update_state` must be called after a
+    change for the other workers to see it. If another worker wrote since
+    the object was loaded, its changes are merged in (see `merge_states`)
+    inside the write transaction instead of being overwritten.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._state = AppState()
+        self._version = 0
+        self._snapshots = StateSnapshots()
+        self._snapshots.remember(self._state, 0, json.dumps(self._state.to_dict(), ensure_ascii=False))
+
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"Shared state disabled, could not open {db_path}: {e}", file=sys.stderr)
+
+    def get_state(self) -> AppState:
+        """Get current application state, reloading it if another process changed it."""
+        with self._lock:
+            if not self._conn:
+                return self._state
+            try:
+                row = self._conn.execute("SELECT version FROM app_state WHERE id = 1").fetchone()
+                if row and row[0] != self._version:
+                    version, payload = self._conn.execute(
+                        "SELECT version, payload FROM app_state WHERE id = 1"
+                    ).fetchone()
+                    self._state = AppState.from_dict(json.loads(payload))
+                    self._version = version
+                    self._snapshots.remember(self._state, version, payload)
+            except (sqlite3.Error, ValueError, KeyError) as e:
+                print(f"Failed to read shared state, using the local copy: {e}", file=sys.stderr)
+            return self._state
+
+    def update_state(self, state: AppState) -> None:
+        """Store the state, merged with what other workers wrote since it was loaded."""
+        payload = json.dumps(state.to_dict(), ensure_ascii=False)
+        with self._lock:
+            if not self._conn:
+                self._state = state
+                return
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute("SELECT version, payload FROM app_state WHERE id = 1").fetchone()
+                    document = self._merge(state, payload, row)
+                    self._conn.execute(
+                        "INSERT INTO app_state (id, version, payload) VALUES (1, 1, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET version = version + 1, payload = excluded.payload",
+                        (document,)
+                    )
+                    version = self._conn.execute("SELECT version FROM app_state WHERE id = 1").fetchone()[0]
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except (sqlite3.Error, ValueError, KeyError) as e:
+                print(f"Failed to write shared state: {e}", file=sys.stderr)
+                self._state = state
+                return
+
+            self._version = version
+            if document == payload:
+                self._state = state
+                self._snapshots.remember(state, version, payload)
+            else:
+                # Later requests get the merged state; the caller's object merges again on its next write
+                self._state = AppState.from_dict(json.loads(document))
+                self._snapshots.remember(self._state, version, document)
+                self._snapshots.remember(state, None, payload)
+
+    def _merge(self, state: AppState, payload: str, row) -> str:
+        """The document to store: `payload`, or it merged with a newer stored version."""
+        snapshot = self._snapshots.get(state)
+        if row is None or snapshot is None or snapshot[0] == row[0]:
+            return payload
+        ours = json.loads(payload)
+        merged = merge_states(json.loads(snapshot[1]), ours, json.loads(row[1]))
+        return payload if merged == ours else json.dumps(merged, ensure_ascii=False)
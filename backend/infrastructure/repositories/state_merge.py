@@ -0,0 +1,62 @@
+"""Merge of AppState documents written concurrently by several workers."""
+import weakref
+from typing import Any, Dict, Optional, Tuple
+from backend.domain.entities import AppState
+
+
+def merge_states(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Three-way merge of a worker's changes (`base` -> `ours`) into the stored `theirs`.
+
+    A top-level field, or one conversation, takes the worker's value only if
+    the worker changed it since `base`. Everything else comes from `theirs`,
+    so changes that another worker made in the meantime are kept. If `theirs`
+    moved to a different day that the worker did not install, the worker's
+    changes belong to the old day and `theirs` is kept unchanged.
+    """
+    if _date(theirs) != _date(base) and _date(ours) == _date(base):
+        return theirs
+    merged = {}
+    for key in set(ours) | set(theirs):
+        if key == "conversations":
+            merged[key] = _merge_keys(base.get(key) or {}, ours.get(key) or {}, theirs.get(key) or {})
+        else:
+            merged[key] = ours.get(key) if ours.get(key) != base.get(key) else theirs.get(key)
+    return merged
+
+
+def _merge_keys(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    merged = {}
+    for key in set(base) | set(ours) | set(theirs):
+        source = ours if ours.get(key) != base.get(key) else theirs
+        if key in source:
+            merged[key] = source[key]
+    return merged
+
+
+def _date(document: Dict[str, Any]) -> Optional[str]:
+    challenge = document.get("daily_challenge")
+    return challenge.get("date") if challenge else None
+
+
+class StateSnapshots:
+    """
+    The stored document each AppState object was loaded from or last written
+    as (the base of its next merge), with the version it had.
+
+    Objects are tracked weakly. An object without a snapshot, e.g. a fresh
+    AppState installed by the day rollover, replaces the stored state.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[weakref.ref, Any, Dict[str, Any]]] = {}
+
+    def remember(self, state: AppState, version: Any, document: Dict[str, Any]) -> None:
+        self._entries = {key: entry for key, entry in self._entries.items() if entry[0]() is not None}
+        self._entries[id(state)] = (weakref.ref(state), version, document)
+
+    def get(self, state: AppState) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        entry = self._entries.get(id(state))
+        if entry is None or entry[0]() is not state:
+            return None
+        return entry[1], entry[2]
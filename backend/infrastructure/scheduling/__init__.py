@@ -0,0 +1 @@
+# Timers and background schedulers
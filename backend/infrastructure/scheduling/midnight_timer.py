@@ -0,0 +1,69 @@
+"""Midnight Timer - Fires a callback when the local date changes."""
+import sys
+import threading
+from datetime import datetime, timedelta, date
+from typing import Callable, Optional
+
+
+class MidnightTimer:
+    """
+    Calls `callback(new_date)` right after each local midnight.
+    
+    The thread sleeps until the next midnight instead of polling. Sleeps are
+    capped at `max_sleep_seconds` so a machine resumed from suspend (when the
+    monotonic clock stood still) notices the new day shortly after waking.
+    A callback returning False is retried every `retry_seconds`.
+    """
+    
+    def __init__(
+        self,
+        callback: Callable[[str], bool],
+        retry_seconds: float = 60,
+        max_sleep_seconds: float = 900,
+        now: Callable[[], datetime] = datetime.now
+    ):
+        self.callback = callback
+        self.retry_seconds = retry_seconds
+        self.max_sleep_seconds = max_sleep_seconds
+        self._now = now
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.current_date: date = now().date()
+    
+    def start(self) -> None:
+        """Start the timer thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.current_date = self._now().date()
+        self._thread = threading.Thread(target=self._run, name="midnight-timer", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def seconds_until_midnight(self) -> float:
+        now = self._now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return (midnight - now).total_seconds()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            today = self._now().date()
+            if today != self.current_date:
+                if self._fire(today):
+                    self.current_date = today
+                elif self._stop.wait(self.retry_seconds):
+                    return
+                continue
+            
+            # Small margin so we never wake a few milliseconds before midnight
+            if self._stop.wait(min(self.seconds_until_midnight() + 0.5, self.max_sleep_seconds)):
+                return
+    
+    def _fire(self, today: date) -> bool:
+        try:
+            return bool(self.callback(str(today)))
+        except Exception as e:
+            print(f"Date rollover to {today} failed: {e}", file=sys.stderr)
+            return False
@@ -0,0 +1 @@
+# Stores and locks shared by every backend node
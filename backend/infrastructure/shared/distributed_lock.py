@@ -0,0 +1,109 @@
+"""Distributed lock with a renewed lease, on top of a KeyValueStore."""
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from backend.domain.repositories import KeyValueStore
+
+
+class LockTimeout(Exception):
+    """Raised when a lock could not be acquired in time."""
+
+
+class DistributedLock:
+    """
+    One named lock held by at most one node at a time.
+
+    The holder writes a random token under the key with a lease (TTL) and
+    a background thread extends the lease while the lock is held, so a
+    node that dies frees the lock after at most one lease. Release and
+    renewal only touch the key if it still holds the node's own token. If a
+    renewal finds the lock taken over (the lease expired, e.g. after a long
+    pause), `lost` is set and the work should not be published.
+    """
+
+    def __init__(self, store: KeyValueStore, name: str, lease_seconds: float = 30,
+                 renew_interval: Optional[float] = None):
+        self.store = store
+        self.key = f"lock:{name}"
+        self.lease_seconds = lease_seconds
+        self.renew_interval = renew_interval if renew_interval is not None else lease_seconds / 3
+        self.lost = threading.Event()
+        self._token: Optional[str] = None
+        self._stop = threading.Event()
+        self._renewer: Optional[threading.Thread] = None
+
+    def acquire(self, timeout: float = 0, poll_interval: float = 0.5) -> bool:
+        """Try to take the lock, waiting up to `timeout` seconds. True if now held."""
+        token = os.urandom(16).hex()
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.store.set_if_absent(self.key, token, self.lease_seconds):
+                self._token = token
+                self.lost.clear()
+                self._stop.clear()
+                self._renewer = threading.Thread(target=self._renew, name=f"{self.key}-lease", daemon=True)
+                self._renewer.start()
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+
+    def release(self) -> None:
+        if self._token is None:
+            return
+        self._stop.set()
+        if self._renewer:
+            self._renewer.join(timeout=self.renew_interval + 1)
+        try:
+            self.store.compare_and_delete(self.key, self._token)
+        except Exception as e:
+            # The lease runs out on its own
+            print(f"Failed to release {self.key}: {e}", file=sys.stderr)
+        self._token = None
+
+    @property
+    def held(self) -> bool:
+        return self._token is not None and not self.lost.is_set()
+
+    def _renew(self) -> None:
+        token = self._token
+        while not self._stop.wait(self.renew_interval):
+            try:
+                if not self.store.compare_and_expire(self.key, token, self.lease_seconds):
+                    print(f"Lost {self.key}: lease expired before renewal", file=sys.stderr)
+                    self.lost.set()
+                    return
+            except Exception as e:
+                # Transient store error: try again, the lease still has time left
+                print(f"Failed to renew {self.key}: {e}", file=sys.stderr)
+
+
+class DistributedLocks:
+    """Creates the named locks of one shared store."""
+
+    def __init__(self, store: KeyValueStore, lease_seconds: float = 30):
+        self.store = store
+        self.lease_seconds = lease_seconds
+
+    def lock(self, name: str) -> DistributedLock:
+        return DistributedLock(self.store, name, self.lease_seconds)
+
+    @contextmanager
+    def hold(self, name: str, timeout: float = 0) -> Iterator[DistributedLock]:
+        """
+        Hold the lock `name` for a block.
+
+        Raises:
+            LockTimeout: If another node keeps it for longer than `timeout`
+        """
+        lock = self.lock(name)
+        if not lock.acquire(timeout):
+            raise LockTimeout(f"Lock {name!r} is held by another node")
+        try:
+            yield lock
+        finally:
+            lock.release()
@@ -0,0 +1,277 @@
+"""Key-value stores shared by backend nodes: Redis, or local stand-ins."""
+import os
+import sys
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for redis:// URLs
+    redis = None
+
+
+class InMemoryKeyValueStore:
+    """KeyValueStore for a single process (tests, single-node runs)."""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, self._expiry(ttl_seconds))
+
+    def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (value, self._expiry(ttl_seconds))
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def compare_and_set(self, key: str, expected: Optional[str], value: str) -> bool:
+        with self._lock:
+            if self._live(key) != expected:
+                return False
+            self._data[key] = (value, None)
+            return True
+
+    def compare_and_delete(self, key: str, expected: str) -> bool:
+        with self._lock:
+            if self._live(key) != expected:
+                return False
+            del self._data[key]
+            return True
+
+    def compare_and_expire(self, key: str, expected: str, ttl_seconds: float) -> bool:
+        with self._lock:
+            if self._live(key) != expected:
+                return False
+            self._data[key] = (expected, self._expiry(ttl_seconds))
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            current = self._data.get(key, ("0", None))
+            value = int(self._live(key) or 0) + 1
+            self._data[key] = (str(value), current[1])
+            return value
+
+    def keys(self, prefix: str) -> List[str]:
+        with self._lock:
+            return sorted(key for key in list(self._data) if key.startswith(prefix) and self._live(key) is not None)
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._data[key]
+            return None
+        return value
+
+    def _expiry(self, ttl_seconds: Optional[float]) -> Optional[float]:
+        return self._clock() + ttl_seconds if ttl_seconds is not None else None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+) WITHOUT ROWID;
+"""
+
+
+class SqliteKeyValueStore:
+    """
+    KeyValueStore in a SQLite file, for several processes on one machine.
+
+    Every operation runs in its own IMMEDIATE transaction, so the
+    compare-and-set operations are atomic across processes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._query("SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                          (key, time.time()))
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        self._execute("INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                      (key, value, self._expiry(ttl_seconds)))
+
+    def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        def transaction(conn):
+            conn.execute("DELETE FROM kv WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                         (key, time.time()))
+            cursor = conn.execute("INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                                  (key, value, self._expiry(ttl_seconds)))
+            return cursor.rowcount == 1
+        return self._transaction(transaction)
+
+    def delete(self, key: str) -> None:
+        self._execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def compare_and_set(self, key: str, expected: Optional[str], value: str) -> bool:
+        def transaction(conn):
+            row = conn.execute("SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                               (key, time.time())).fetchone()
+            if (row[0] if row else None) != expected:
+                return False
+            conn.execute("INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, NULL)", (key, value))
+            return True
+        return self._transaction(transaction)
+
+    def compare_and_delete(self, key: str, expected: str) -> bool:
+        return self._transaction(lambda conn: conn.execute(
+            "DELETE FROM kv WHERE key = ? AND value = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, expected, time.time())
+        ).rowcount == 1)
+
+    def compare_and_expire(self, key: str, expected: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE kv SET expires_at = ? WHERE key = ? AND value = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (now + ttl_seconds, key, expected, now)
+        ).rowcount == 1)
+
+    def incr(self, key: str) -> int:
+        def transaction(conn):
+            conn.execute(
+                "INSERT INTO kv (key, value, expires_at) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT)",
+                (key,)
+            )
+            return int(conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()[0])
+        return self._transaction(transaction)
+
+    def keys(self, prefix: str) -> List[str]:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM kv WHERE key LIKE ? ESCAPE '\\' AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY key",
+                (escaped + "%", time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _query(self, sql: str, params: tuple):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        self._transaction(lambda conn: conn.execute(sql, params))
+
+    def _transaction(self, work):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _expiry(ttl_seconds: Optional[float]) -> Optional[float]:
+        return time.time() + ttl_seconds if ttl_seconds is not None else None
+
+
+# KEYS[1] = key, ARGV[1] = expected value (, ARGV[2] = TTL in ms)
+_COMPARE_AND_DELETE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+_COMPARE_AND_EXPIRE = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+)
+
+# KEYS[1] = key, ARGV[1] = expected value, ARGV[2] = new value, ARGV[3] = "1" if the key must be missing
+_COMPARE_AND_SET = (
+    "local current = redis.call('get', KEYS[1]) "
+    "if ARGV[3] == '1' then if current then return 0 end elseif current ~= ARGV[1] then return 0 end "
+    "redis.call('set', KEYS[1], ARGV[2]) return 1"
+)
+
+
+class RedisKeyValueStore:
+    """KeyValueStore on a Redis-compatible server (Redis, Valkey, KeyDB...)."""
+
+    def __init__(self, url: str, namespace: str = "dailystack:"):
+        if redis is None:
+            raise RuntimeError("The redis package is required for a redis:// shared store (pip install redis)")
+        self.namespace = namespace
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._compare_and_set = self._client.register_script(_COMPARE_AND_SET)
+        self._compare_and_delete = self._client.register_script(_COMPARE_AND_DELETE)
+        self._compare_and_expire = self._client.register_script(_COMPARE_AND_EXPIRE)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(self.namespace + key)
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        self._client.set(self.namespace + key, value, px=self._ms(ttl_seconds))
+
+    def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        return bool(self._client.set(self.namespace + key, value, nx=True, px=self._ms(ttl_seconds)))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.namespace + key)
+
+    def compare_and_set(self, key: str, expected: Optional[str], value: str) -> bool:
+        missing = "1" if expected is None else "0"
+        return bool(self._compare_and_set(keys=[self.namespace + key], args=[expected or "", value, missing]))
+
+    def compare_and_delete(self, key: str, expected: str) -> bool:
+        return bool(self._compare_and_delete(keys=[self.namespace + key], args=[expected]))
+
+    def compare_and_expire(self, key: str, expected: str, ttl_seconds: float) -> bool:
+        return bool(self._compare_and_expire(keys=[self.namespace + key], args=[expected, self._ms(ttl_seconds)]))
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(self.namespace + key))
+
+    def keys(self, prefix: str) -> List[str]:
+        start = len(self.namespace)
+        return sorted(key[start:] for key in self._client.scan_iter(match=f"{self.namespace}{prefix}*"))
+
+    @staticmethod
+    def _ms(ttl_seconds: Optional[float]) -> Optional[int]:
+        return max(1, int(ttl_seconds * 1000)) if ttl_seconds is not None else None
+
+
+def create_key_value_store(url: str):
+    """
+    Build a store from a URL: `redis://host:6379/0`, `sqlite:///relative/shared.db`
+    (`sqlite:////absolute/shared.db`) or `memory://`.
+    """
+    scheme = urlparse(url).scheme
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisKeyValueStore(url)
+    if scheme == "sqlite":
+        return SqliteKeyValueStore(url[len("sqlite:///"):])
+    if scheme == "memory":
+        return InMemoryKeyValueStore()
+    print(f"Unknown shared store URL {url!r}, using an in-process store", file=sys.stderr)
+    return InMemoryKeyValueStore()
@@ -0,0 +1 @@
+# Span tracing
@@ -0,0 +1,104 @@
+"""Span exporters: in-memory ring buffer and JSON-lines file."""
+import os
+import sys
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+from .tracer import Span
+
+
+class RingBufferExporter:
+    """Keeps the spans of the most recent `max_traces` traces in memory."""
+
+    def __init__(self, max_traces: int = 200):
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            spans.append(span)
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recent traces ordered by the duration of their root span, slowest first."""
+        with self._lock:
+            traces = [list(spans) for spans in self._traces.values()]
+
+        summaries = [self._summarize(spans) for spans in traces]
+        summaries.sort(key=lambda trace: trace["duration_ms"], reverse=True)
+        return summaries[:limit]
+
+    @staticmethod
+    def _summarize(spans: List[Span]) -> Dict[str, Any]:
+        """Root span plus the span tree flattened in start order, with depth and offsets."""
+        ids = {span.span_id for span in spans}
+        children: Dict[Any, List[Span]] = {}
+        for span in spans:
+            parent = span.parent_id if span.parent_id in ids else None
+            children.setdefault(parent, []).append(span)
+
+        roots = sorted(children.get(None, []), key=lambda span: span.start_time)
+        origin = min(span.start_time for span in spans)
+        flat: List[Dict[str, Any]] = []
+
+        def walk(span: Span, depth: int) -> None:
+            flat.append(dict(
+                span.to_dict(),
+                depth=depth,
+                offset_ms=round((span.start_time - origin) * 1000, 2)
+            ))
+            for child in sorted(children.get(span.span_id, []), key=lambda s: s.start_time):
+                walk(child, depth + 1)
+
+        for root in roots:
+            walk(root, 0)
+
+        root = max(roots, key=lambda span: span.duration_ms or 0)
+        return {
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "start_time": root.start_time,
+            "duration_ms": root.duration_ms,
+            "status": "error" if any(span.status == "error" for span in spans) else "ok",
+            "spans": flat
+        }
+
+
+class FileExporter:
+    """Appends every finished span as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        try:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"Failed to write trace file {self.path}: {e}", file=sys.stderr)
+
+
+def render_waterfall(trace: Dict[str, Any], width: int = 40) -> str:
+    """Plain-text waterfall of one trace summary (as returned by `slowest`)."""
+    total = max(trace["duration_ms"] or 0, 0.001)
+    lines = [f"{trace['name']}  {trace['duration_ms']} ms  trace={trace['trace_id']}"]
+    for span in trace["spans"]:
+        start = int(span["offset_ms"] / total * width)
+        length = max(1, int((span["duration_ms"] or 0) / total * width))
+        bar = " " * min(start, width) + "█" * min(length, max(1, width - start))
+        label = "  " * span["depth"] + span["name"]
+        events = ", ".join(f"{e['name']}@{e['offset_ms']}ms" for e in span["events"])
+        lines.append(f"{bar:<{width}} {span['duration_ms']:>9} ms  {label}" + (f"  [{events}]" if events else ""))
+    return "\n".join(lines)
@@ -0,0 +1,225 @@
+"""Lightweight span tracing with W3C trace context."""
+import os
+import re
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Return (trace_id, parent_span_id) from a W3C `traceparent` header, or None."""
+    match = TRACEPARENT_PATTERN.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+class Span:
+    """One timed operation; field names follow the OpenTelemetry span model."""
+
+    is_recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]] = None):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+    @property
+    def traceparent(self) -> str:
+        """W3C header value for propagating this span to downstream calls."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes) -> None:
+        """Record a point in time inside the span (e.g. first byte received)."""
+        self.events.append({
+            "name": name,
+            "offset_ms": round((time.perf_counter() - self._start) * 1000, 2),
+            "attributes": attributes
+        })
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error"] = str(error)
+
+    def end(self) -> None:
+        """End the span and hand it to the exporters; later calls are ignored."""
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        self._tracer._export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events
+        }
+
+
+class _NoopSpan(Span):
+    """Span handed out while tracing is disabled."""
+
+    is_recording = False
+
+    def __init__(self):
+        self.name = ""
+        self.trace_id = "0" * 32
+        self.span_id = "0" * 16
+        self.parent_id = None
+        self.attributes = {}
+        self.events = []
+        self.status = "ok"
+        self.duration_ms = 0.0
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, **attributes):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self):
+        pass
+
+
+class Tracer:
+    """
+    Creates spans and tracks the active one per thread / request.
+
+    `span()` activates a span for a block of code. Streams are consumed
+    lazily, after the route has returned, so `iterate()` re-activates their
+    span around each step instead; spans opened by inner generators then
+    still find their parent.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._exporters: List[Any] = []
+        self._lock = threading.Lock()
+
+    def configure(self, exporters: List[Any], enabled: bool = True) -> None:
+        with self._lock:
+            self._exporters = list(exporters)
+            self.enabled = enabled
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, traceparent: Optional[str] = None,
+                   **attributes) -> Span:
+        """
+        Start a span without activating it; call `end()` when done.
+
+        The parent is, in order: `parent`, the remote `traceparent` header,
+        the active span. Without any of them a new trace starts.
+        """
+        if not self.enabled:
+            return _NoopSpan()
+
+        parent = parent or self.current_span()
+        remote = parse_traceparent(traceparent) if traceparent else None
+        if parent is not None and parent.is_recording:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif remote:
+            trace_id, parent_id = remote
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+        return Span(self, name, trace_id, parent_id, attributes)
+
+    @contextmanager
+    def activate(self, span: Span) -> Iterator[Span]:
+        """Make `span` the active one for the block, without ending it."""
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Start, activate and end a child span of the active one."""
+        span = self.start_span(name, **attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                span.record_error(e)
+            raise
+        finally:
+            span.end()
+
+    def iterate(self, span: Span, iterable: Iterable) -> Iterator:
+        """Yield from `iterable` with `span` active during each step; ends the span at the end."""
+        iterator = iter(iterable)
+        count = 0
+        try:
+            while True:
+                with self.activate(span):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                count += 1
+                if count == 1:
+                    span.add_event("first_item")
+                yield item
+        except GeneratorExit:
+            span.set_attribute("cancelled", True)
+            raise
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.set_attribute("items", count)
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+            span.end()
+
+    def inject(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Add the `traceparent` of the active span to outgoing request headers."""
+        span = self.current_span()
+        if span is not None and span.is_recording:
+            headers["traceparent"] = span.traceparent
+        return headers
+
+    def _export(self, span: Span) -> None:
+        with self._lock:
+            exporters = list(self._exporters)
+        for exporter in exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                # Tracing must never break the request being traced
+                pass
+
+
+# Process-wide tracer, configured by the dependency container
+tracer = Tracer()
@@ -0,0 +1,28 @@
+"""Flask application factory."""
+from flask import Flask
+from backend.presentation.dependencies import container
+from backend.presentation.routes.status_routes import status_bp
+from backend.presentation.routes.flashcard_routes import flashcard_bp
+from backend.presentation.routes.chat_routes import chat_bp
+from backend.presentation.routes.debug_routes import debug_bp
+from backend.presentation.routes.credentials_routes import credentials_bp
+from backend.presentation.routes.search_routes import search_bp
+from backend.presentation.routes.study_routes import study_bp
+from backend.presentation.tracing_middleware import init_tracing
+from backend.presentation.static_assets import init_static_assets
+from backend.presentation.compression_middleware import init_compression
+
+
+def create_app(serve_frontend: bool = True) -> Flask:
+    """
+    Build the Flask app: API blueprints under /api, tracing, response
+    compression and, unless disabled, the frontend build at the root.
+    """
+    app = Flask(__name__, static_folder=None)
+    for blueprint in (status_bp, flashcard_bp, chat_bp, debug_bp, credentials_bp, search_bp, study_bp):
+        app.register_blueprint(blueprint, url_prefix='/api')
+    init_tracing(app)
+    init_compression(app, container.response_compression, container.compression_metrics)
+    if serve_frontend:
+        init_static_assets(app, container.static_assets)
+    return app
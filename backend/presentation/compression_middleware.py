@@ -0,0 +1,51 @@
+"""Flask hook that compresses the responses of selected routes."""
+from flask import Flask, request
+from backend.infrastructure.compression.response_compressor import (
+    COMPRESSIBLE_TYPES, CompressionConfig, CompressionMetrics, StreamCompressor, compress_body, compress_stream
+)
+
+
+def init_compression(app: Flask, config: CompressionConfig, metrics: CompressionMetrics) -> None:
+    """
+    Compress the responses of `config.routes` when the client accepts it.
+
+    Buffered bodies (JSON) are compressed whole when they reach
+    `config.min_bytes`. Streamed bodies (SSE) are compressed chunk by chunk
+    with a sync flush after each one, so every frame reaches the client
+    as soon as it is produced. Ratio and CPU time go to `metrics` per route.
+    """
+
+    @app.after_request
+    def _compress_response(response):
+        rule = request.url_rule.rule if request.url_rule else None
+        if rule not in config.routes:
+            return response
+        if (response.status_code != 200 or response.direct_passthrough
+                or "Content-Encoding" in response.headers
+                or not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = config.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            metrics.record_skipped(rule, "identity")
+            return response
+
+        if response.is_streamed:
+            compressor = StreamCompressor(encoding, config.level)
+            response.response = compress_stream(
+                response.response, compressor, on_done=lambda done: metrics.record(rule, done)
+            )
+            # Proxies such as nginx must not buffer the stream either
+            response.headers["X-Accel-Buffering"] = "no"
+        else:
+            data = response.get_data()
+            if len(data) < config.min_bytes:
+                metrics.record_skipped(rule, "small")
+                return response
+            body, compressor = compress_body(data, encoding, config.level)
+            response.set_data(body)
+            metrics.record(rule, compressor)
+
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -7,30 +7,116 @@ from backend.infrastructure.http.stackspot_auth_client import StackSpotAuthClien
 from backend.infrastructure.http.stackspot_agent_client import StackSpotAgentClient
 from backend.infrastructure.http.stackspot_challenge_client import StackSpotChallengeClient
 from backend.infrastructure.http.stackspot_chat_client import StackSpotChatClient
+from backend.infrastructure.http.local_llm_client import (
+    LocalAgentClient, LocalChallengeClient, LocalChatClient, DEFAULT_BASE_URL as LOCAL_LLM_URL
+)
+from backend.infrastructure.http.rate_limiter import RateLimiter, parse_limits, parse_rate
+from backend.infrastructure.http.circuit_breaker import CircuitBreaker
 from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+from backend.infrastructure.repositories.sqlite_state_repository import SqliteStateRepository
+from backend.infrastructure.repositories.shared_state_repository import SharedStateRepository
+from backend.infrastructure.repositories.shared_challenge_store import SharedChallengeStore
+from backend.infrastructure.shared.key_value_store import create_key_value_store
+from backend.infrastructure.shared.distributed_lock import DistributedLocks
+from backend.infrastructure.repositories.sqlite_search_index import SqliteSearchIndex
+from backend.infrastructure.repositories.sqlite_message_archive import SqliteMessageArchive
+from backend.infrastructure.repositories.file_challenge_store import FileChallengeStore
+from backend.infrastructure.repositories.offline_challenge_repository import OfflineChallengeRepository
+from backend.infrastructure.scheduling.midnight_timer import MidnightTimer
+from backend.infrastructure.tracing.tracer import tracer
+from backend.infrastructure.tracing.exporters import RingBufferExporter, FileExporter
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache
+from backend.infrastructure.cache.http_response_cache import HttpResponseCache, CachePolicy
+from backend.infrastructure.rendering.markdown_renderer import MarkdownRenderer
+from backend.infrastructure.assets.static_asset_store import StaticAssetStore
+from backend.infrastructure.compression.response_compressor import CompressionConfig, CompressionMetrics
+from backend.infrastructure.events.segmented_event_log import SegmentedEventLog
+from backend.presentation.lifecycle import ServerLifecycle
+from backend.presentation.js_bridge import JsBridge
 
 # Use Cases
+from backend.use_cases.admission.admission_controller import AdmissionController
 from backend.use_cases.auth.authenticate_user import AuthenticateUser
+from backend.use_cases.auth.update_credentials import UpdateCredentials
 from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
 from backend.use_cases.challenges.get_daily_challenge import GetDailyChallenge
+from backend.use_cases.challenges.load_daily_challenge import LoadDailyChallenge
+from backend.use_cases.challenges.stream_daily_challenge import StreamDailyChallenge
+from backend.use_cases.challenges.prefetch_challenges import PrefetchChallenges
+from backend.use_cases.challenges.rollover_day import RolloverDay
 from backend.use_cases.chat.chat_with_agent import ChatWithAgent
+from backend.use_cases.chat.coalesce_stream import CoalescingConfig, CoalescingMetrics
+from backend.use_cases.chat.pregenerate_explanations import PregenerateExplanations
+from backend.use_cases.chat.resumable_streams import ResumableStreams
+from backend.use_cases.chat.ask_about_flashcard import AskAboutFlashcard
+from backend.use_cases.chat.conversation_history import ConversationHistory
+from backend.use_cases.chat.conversation_turns import ConversationTurns
+from backend.use_cases.search.index_history import IndexDailyChallenge, IndexChatMessage
+from backend.use_cases.search.search_history import SearchHistory
+from backend.use_cases.study.study_events import RecordStudyEvent, ReplayStudyEvents
+
+# Repository root (or the PyInstaller bundle), where frontend/build lives
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 class Container:
     """Dependency Injection Container."""
     
     def __init__(self):
-        # Repositories
-        self.state_repository = InMemoryStateRepository()
+        # Local data directory (search index, caches, ...)
+        self.data_dir = os.environ.get("DAILYSTACK_DATA_DIR", os.path.join(os.getcwd(), "data"))
         
-        # HTTP Clients
-        self.auth_client = StackSpotAuthClient()
-        self.agent_client = StackSpotAgentClient(self.auth_client)
-        self.challenge_client = StackSpotChallengeClient(self.auth_client)
-        self.chat_client = StackSpotChatClient(self.auth_client)
+        # Tracing: recent traces in memory, optionally every span to a JSON-lines file
+        self.trace_buffer = RingBufferExporter(int(os.environ.get("DAILYSTACK_TRACE_BUFFER", 200)))
+        trace_exporters = [self.trace_buffer]
+        if os.environ.get("DAILYSTACK_TRACE_FILE"):
+            trace_exporters.append(FileExporter(os.environ["DAILYSTACK_TRACE_FILE"]))
+        tracer.configure(trace_exporters, enabled=os.environ.get("DAILYSTACK_TRACING", "1") != "0")
         
-        # Use Cases
-        self.authenticate_user = AuthenticateUser(self.auth_client)
+        # Store shared by every node (redis://, sqlite:///path or memory://): token,
+        # agent ID, challenges, app state and the lock that serializes generation
+        self.shared_store = None
+        self.locks = None
+        if os.environ.get("DAILYSTACK_SHARED_STORE"):
+            self.shared_store = create_key_value_store(os.environ["DAILYSTACK_SHARED_STORE"])
+            self.locks = DistributedLocks(
+                self.shared_store,
+                lease_seconds=float(os.environ.get("DAILYSTACK_LOCK_LEASE", 30))
+            )
+        lock_timeout = float(os.environ.get("DAILYSTACK_GENERATION_LOCK_TIMEOUT", 300))
+        
+        # Repositories
+        if self.shared_store:
+            self.state_repository = SharedStateRepository(self.shared_store)
+        elif os.environ.get("DAILYSTACK_STATE_DB"):
+            # Worker processes of a headless server share the state through SQLite
+            self.state_repository = SqliteStateRepository(os.environ["DAILYSTACK_STATE_DB"])
+        else:
+            self.state_repository = InMemoryStateRepository()
+        self.search_index = SqliteSearchIndex(os.path.join(self.data_dir, "search.db"))
+        self.message_archive = SqliteMessageArchive(os.path.join(self.data_dir, "conversations.db"))
+        if self.shared_store:
+            self.challenge_store = SharedChallengeStore(self.shared_store)
+        else:
+            self.challenge_store = FileChallengeStore(os.path.join(self.data_dir, "challenges"))
+        # Local content pack served when StackSpot is unreachable or not configured
+        self.offline_challenge_repository = OfflineChallengeRepository(
+            os.environ.get("DAILYSTACK_CONTENT_PACK", os.path.join(self.data_dir, "content.pack"))
+        )
+        
+        # Client-side throttling per upstream host ("rate:burst") and per session
+        host_limits = {
+            "idm.stackspot.com": (1.0, 5.0),
+            "genai-agent-tools-api.stackspot.com": (2.0, 5.0),
+            "genai-inference-app.stackspot.com": (0.5, 2.0),
+            "genai-code-buddy-api.stackspot.com": (2.0, 5.0)
+        }
+        host_limits.update(parse_limits(os.environ.get("DAILYSTACK_HOST_RATE_LIMITS", "")))
+        self.rate_limiter = RateLimiter(
+            host_limits=host_limits,
+            session_limit=parse_rate(os.environ.get("DAILYSTACK_SESSION_RATE_LIMIT", "1:5")),
+            max_wait_seconds=float(os.environ.get("DAILYSTACK_RATE_LIMIT_MAX_WAIT", 5))
+        )
         
         # Agent Configuration
         self.agent_name = "Flashcards - Java/Python/AWS"
@@ -68,20 +154,231 @@ class Container:
             "required": ["date", "scenario", "flashcards"]
         }
         
+        # Cached GET responses of StackSpot APIs, per endpoint prefix
+        self.http_cache = HttpResponseCache(
+            os.path.join(self.data_dir, "http_cache"),
+            policies={
+                "https://genai-agent-tools-api.stackspot.com/v1/agents": CachePolicy(
+                    ttl_seconds=float(os.environ.get("DAILYSTACK_AGENT_CACHE_TTL", 3600))
+                )
+            },
+            memory_entries=int(os.environ.get("DAILYSTACK_HTTP_CACHE_MEMORY_ENTRIES", 128))
+        )
+        
+        # HTTP Clients
+        self.auth_client = StackSpotAuthClient(self.rate_limiter, self.shared_store)
+        
+        # LLM provider: StackSpot agents or a local OpenAI-compatible server
+        self.llm_provider = os.environ.get("DAILYSTACK_LLM_PROVIDER", "stackspot").lower()
+        if self.llm_provider == "local":
+            local_url = os.environ.get("DAILYSTACK_LOCAL_LLM_URL", LOCAL_LLM_URL)
+            local_model = os.environ.get("DAILYSTACK_LOCAL_LLM_MODEL", "local-model")
+            self.agent_client = LocalAgentClient(local_model)
+            self.challenge_client = LocalChallengeClient(local_url, self.flashcard_schema)
+            self.chat_client = LocalChatClient(
+                local_url, local_model, history=ConversationTurns(self.state_repository).execute
+            )
+        else:
+            self.agent_client = StackSpotAgentClient(self.auth_client, self.rate_limiter, self.http_cache)
+            self.challenge_client = StackSpotChallengeClient(self.auth_client, self.rate_limiter, self.flashcard_schema)
+            self.chat_client = StackSpotChatClient(self.auth_client, self.rate_limiter)
+        
+        # Use Cases
+        self.authenticate_user = AuthenticateUser(self.auth_client)
+        
         self.ensure_agent_exists = EnsureAgentExists(
             agent_client=self.agent_client,
             agent_name=self.agent_name,
             agent_description=self.agent_description,
             agent_prompt=self.agent_prompt,
-            output_schema=self.flashcard_schema
+            output_schema=self.flashcard_schema,
+            shared_store=self.shared_store,
+            auth_client=self.auth_client
+        )
+        
+        # Shared limit on concurrent upstream LLM calls (chat streams + generations)
+        self.llm_admission = AdmissionController(
+            max_concurrent=int(os.environ.get("DAILYSTACK_LLM_MAX_CONCURRENCY", 4)),
+            max_queue=int(os.environ.get("DAILYSTACK_LLM_MAX_QUEUE", 16)),
+            max_wait_seconds=float(os.environ.get("DAILYSTACK_LLM_MAX_WAIT", 10))
+        )
+        
+        background_max_wait = float(os.environ.get("DAILYSTACK_LLM_BACKGROUND_MAX_WAIT", 300))
+        
+        # Opens after repeated challenge generation failures; offline content is used meanwhile
+        self.upstream_circuit = CircuitBreaker(
+            failure_threshold=int(os.environ.get("DAILYSTACK_CIRCUIT_FAILURES", 3)),
+            reset_timeout=float(os.environ.get("DAILYSTACK_CIRCUIT_RESET", 60))
         )
         
         self.get_daily_challenge = GetDailyChallenge(
             challenge_client=self.challenge_client,
-            ensure_agent_use_case=self.ensure_agent_exists
+            ensure_agent_use_case=self.ensure_agent_exists,
+            admission=self.llm_admission,
+            background_max_wait=background_max_wait,
+            challenge_store=self.challenge_store,
+            offline_repository=self.offline_challenge_repository,
+            circuit_breaker=self.upstream_circuit,
+            locks=self.locks,
+            lock_timeout=lock_timeout
+        )
+        
+        # Publishes the scenario and each flashcard while the agent is still writing
+        self.stream_daily_challenge = None
+        if os.environ.get("DAILYSTACK_CHALLENGE_STREAMING", "1") != "0":
+            self.stream_daily_challenge = StreamDailyChallenge(
+                challenge_client=self.challenge_client,
+                ensure_agent_use_case=self.ensure_agent_exists,
+                admission=self.llm_admission,
+                background_max_wait=background_max_wait,
+                challenge_store=self.challenge_store,
+                circuit_breaker=self.upstream_circuit,
+                locks=self.locks,
+                lock_timeout=lock_timeout
+            )
+        
+        # Generation of the coming days' challenges, filled ahead of time
+        self.prefetch_challenges = PrefetchChallenges(
+            challenge_client=self.challenge_client,
+            ensure_agent_use_case=self.ensure_agent_exists,
+            challenge_store=self.challenge_store,
+            admission=self.llm_admission,
+            days=int(os.environ.get("DAILYSTACK_PREFETCH_DAYS", 7)),
+            parallelism=int(os.environ.get("DAILYSTACK_PREFETCH_PARALLELISM", 3)),
+            background_max_wait=background_max_wait,
+            locks=self.locks
+        )
+        
+        # Cache for repeated chat prompts (e.g. the hidden "explain" message of each card)
+        self.chat_response_cache = ChatResponseCache(
+            ttl_seconds=float(os.environ.get("DAILYSTACK_CHAT_CACHE_TTL", 86400)),
+            max_entries=int(os.environ.get("DAILYSTACK_CHAT_CACHE_MAX_ENTRIES", 256)),
+            max_bytes=int(os.environ.get("DAILYSTACK_CHAT_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+        )
+        
+        self.chat_with_agent = ChatWithAgent(self.chat_client, self.chat_response_cache, self.llm_admission)
+        
+        # Each card's initial explanation, generated in the background once a challenge is installed
+        self.pregenerate_explanations = PregenerateExplanations(
+            self.chat_with_agent,
+            self.state_repository,
+            parallelism=int(os.environ.get("DAILYSTACK_EXPLANATION_PARALLELISM", 2)),
+            max_wait=background_max_wait
+        )
+        
+        # Merge token-sized chunks of /ask-llm into fewer SSE frames (overridable per request)
+        self.sse_coalescing = CoalescingConfig(
+            window_ms=float(os.environ.get("DAILYSTACK_SSE_COALESCE_MS", 40)),
+            max_bytes=int(os.environ.get("DAILYSTACK_SSE_COALESCE_BYTES", 1024))
+        )
+        self.sse_coalescing_metrics = CoalescingMetrics()
+        
+        # /ask-llm answers run detached from the connection: reconnects resume, extra windows fan out
+        self.resumable_streams = ResumableStreams(
+            orphan_grace_seconds=float(os.environ.get("DAILYSTACK_STREAM_ORPHAN_GRACE", 30)),
+            retain_seconds=float(os.environ.get("DAILYSTACK_STREAM_RETAIN", 120)),
+            # Reconnects that land on another worker follow the answer through the shared store
+            store=self.shared_store
+        )
+        
+        # gzip/deflate for chat answers and history, flushed per SSE frame
+        compression_routes = os.environ.get("DAILYSTACK_COMPRESS_ROUTES")
+        self.response_compression = CompressionConfig(
+            level=int(os.environ.get("DAILYSTACK_COMPRESS_LEVEL", 6)),
+            min_bytes=int(os.environ.get("DAILYSTACK_COMPRESS_MIN_BYTES", 1024))
+        )
+        if compression_routes is not None:
+            self.response_compression.routes = tuple(
+                route.strip() for route in compression_routes.split(",") if route.strip()
+            )
+        self.compression_metrics = CompressionMetrics()
+        
+        # Frontend build, precompressed and partly held in memory
+        self.static_assets = StaticAssetStore(
+            os.environ.get("DAILYSTACK_STATIC_DIR", os.path.join(PROJECT_ROOT, "frontend", "build")),
+            memory_budget_bytes=int(os.environ.get("DAILYSTACK_STATIC_MEMORY_BYTES", 16 * 1024 * 1024))
+        )
+        
+        # HTML of finished bot messages and flashcard explanations, rendered once
+        self.markdown_renderer = MarkdownRenderer(
+            max_entries=int(os.environ.get("DAILYSTACK_RENDER_CACHE_ENTRIES", 512))
+        )
+        
+        # Bounded in-memory chat window, older turns spilled to the archive
+        self.conversation_history = ConversationHistory(
+            archive=self.message_archive,
+            window_size=int(os.environ.get("DAILYSTACK_HISTORY_WINDOW", 50))
+        )
+        
+        # Append-only log of what the learner did, written in batches by a background thread
+        self.study_event_log = SegmentedEventLog(
+            os.environ.get("DAILYSTACK_EVENT_LOG_DIR", os.path.join(self.data_dir, "events")),
+            segment_bytes=int(os.environ.get("DAILYSTACK_EVENT_SEGMENT_BYTES", 4 * 1024 * 1024)),
+            fsync=os.environ.get("DAILYSTACK_EVENT_FSYNC", "interval"),
+            fsync_interval=float(os.environ.get("DAILYSTACK_EVENT_FSYNC_INTERVAL", 1.0)),
+            batch_delay_ms=float(os.environ.get("DAILYSTACK_EVENT_BATCH_MS", 50)),
+            max_queue=int(os.environ.get("DAILYSTACK_EVENT_QUEUE", 10000))
+        )
+        self.record_study_event = RecordStudyEvent(self.study_event_log)
+        self.replay_study_events = ReplayStudyEvents(self.study_event_log)
+        
+        # Search
+        self.index_daily_challenge = IndexDailyChallenge(self.search_index)
+        self.index_chat_message = IndexChatMessage(self.search_index)
+        self.search_history = SearchHistory(self.search_index)
+        
+        self.load_daily_challenge = LoadDailyChallenge(
+            get_daily_challenge=self.get_daily_challenge,
+            state_repository=self.state_repository,
+            index_daily_challenge=self.index_daily_challenge,
+            stream_daily_challenge=self.stream_daily_challenge,
+            pregenerate_explanations=self.pregenerate_explanations
+        )
+        
+        # Switches to the next day's challenge right after local midnight
+        self.rollover_day = RolloverDay(
+            get_daily_challenge=self.get_daily_challenge,
+            state_repository=self.state_repository,
+            conversation_history=self.conversation_history,
+            index_daily_challenge=self.index_daily_challenge,
+            prefetch_challenges=self.prefetch_challenges,
+            pregenerate_explanations=self.pregenerate_explanations
+        )
+        self.midnight_timer = MidnightTimer(self.rollover_day.execute)
+        
+        # Credential changes: drop the old account's caches, reload in the background
+        self.update_credentials = UpdateCredentials(
+            auth_client=self.auth_client,
+            ensure_agent_use_case=self.ensure_agent_exists,
+            load_daily_challenge=self.load_daily_challenge,
+            http_cache=self.http_cache,
+            chat_response_cache=self.chat_response_cache,
+            challenge_store=self.challenge_store,
+            circuit_breaker=self.upstream_circuit
+        )
+        
+        # Open streams, ended or awaited on shutdown
+        self.lifecycle = ServerLifecycle()
+        self.lifecycle.on_drain(self.conversation_history.wake_all)
+        self.lifecycle.on_drain(self.update_credentials.progress.wake_all)
+        
+        # A chat message on the current card (HTTP route and desktop JS bridge)
+        self.ask_about_flashcard = AskAboutFlashcard(
+            state_repository=self.state_repository,
+            chat_with_agent=self.chat_with_agent,
+            conversation_history=self.conversation_history,
+            index_chat_message=self.index_chat_message,
+            resumable_streams=self.resumable_streams,
+            pregenerate_explanations=self.pregenerate_explanations,
+            markdown_renderer=self.markdown_renderer,
+            coalescing=self.sse_coalescing,
+            coalescing_metrics=self.sse_coalescing_metrics,
+            track=self.lifecycle.track,
+            record_study_event=self.record_study_event
         )
         
-        self.chat_with_agent = ChatWithAgent(self.chat_client)
+        # In-process API for the desktop window (DAILYSTACK_DESKTOP_TRANSPORT=bridge in app.py)
+        self.js_bridge = JsBridge(self)
 
 # Global Container Instance
 container = Container()
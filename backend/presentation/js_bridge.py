@@ -0,0 +1,210 @@
+"""pywebview JS bridge - the app's API as in-process calls instead of loopback HTTP."""
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from backend.infrastructure.http.rate_limiter import RateLimitExceeded
+from backend.use_cases.admission.admission_controller import AdmissionRejected
+from backend.use_cases.study.study_events import CLIENT_EVENT_TYPES, FLASHCARD_VIEWED
+
+# Session of the desktop window for the per-session rate limit
+BRIDGE_SESSION = "desktop-bridge"
+
+
+class JsBridge:
+    """
+    Object handed to pywebview as `js_api`.
+
+    Its public methods are callable from the page as
+    `window.pywebview.api.<name>(...)` and return the same JSON as the
+    matching /api routes, without a socket or the HTTP stack in between.
+    Chat answers are pushed to the page with `evaluate_js`, as SSE text the
+    frontend turns back into a streamed Response, so the same reader
+    handles both transports. Static assets are still served over HTTP.
+    """
+
+    def __init__(self, container):
+        self._container = container
+        self._window = None
+        self._lock = threading.Lock()
+        self._cancelled = set()
+        self._calls: Dict[str, Dict[str, float]] = {}
+        self._pushes = {"count": 0, "seconds": 0.0, "failed": 0}
+        self._transport_latency: Optional[Dict[str, Any]] = None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._timed("get_status"):
+            state = self._container.state_repository.get_state()
+            return {
+                "loading": state.is_loading,
+                "has_data": state.daily_challenge is not None,
+                "generating": state.is_generating,
+                "flashcards_ready": len(state.daily_challenge.flashcards) if state.daily_challenge else 0,
+                "error": state.error
+            }
+
+    def get_scenario(self) -> Dict[str, Any]:
+        with self._timed("get_scenario"):
+            scenario = self._container.state_repository.get_state().get_scenario()
+            return scenario.to_dict() if scenario else {}
+
+    def get_current_flashcard(self) -> Dict[str, Any]:
+        with self._timed("get_current_flashcard"):
+            state = self._container.state_repository.get_state()
+            flashcard = state.get_current_flashcard()
+            return self._flashcard_payload(state, flashcard) if flashcard else {}
+
+    def next_flashcard(self) -> Dict[str, Any]:
+        with self._timed("next_flashcard"):
+            state = self._container.state_repository.get_state()
+            flashcard = state.next_flashcard()
+            self._container.state_repository.update_state(state)
+            self._container.pregenerate_explanations.focus(state.current_flashcard_index)
+            if not flashcard:
+                return {"status": "no flashcards"}
+            self._container.record_study_event.execute(
+                FLASHCARD_VIEWED, state, conversation_id=state.current_conversation_id
+            )
+            return self._flashcard_payload(state, flashcard)
+
+    def get_chat_history(self, since: int = 0, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Same as `GET /api/chat/history?since=<seq>&render=html`."""
+        with self._timed("get_chat_history"):
+            state = self._container.state_repository.get_state()
+            conversation = state.get_conversation(state.current_flashcard_index)
+            if not conversation:
+                return {"conversation_id": None, "messages": [], "latest_seq": 0, "has_more": False}
+            since = max(0, int(since or 0))
+            if conversation_id not in (None, conversation.id):
+                since = 0
+            messages, has_more = self._container.conversation_history.since(conversation, since)
+            renderer = self._container.markdown_renderer
+            return {
+                "conversation_id": conversation.id,
+                "messages": [
+                    dict(message, html=renderer.render(message.get("content")))
+                    if message.get("role") == "bot" else message
+                    for message in messages
+                ],
+                "latest_seq": conversation.total_messages(),
+                "has_more": has_more
+            }
+
+    def ask_llm(self, request_id: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Start an answer (options as the body of `POST /api/ask-llm`).
+
+        Events are pushed to `window.__dailystackBridge.push(request_id, text)`
+        and the end to `window.__dailystackBridge.close(request_id)`.
+        Errors that the route answers with 429 come back as
+        {"error": ..., "status": 429}.
+        """
+        with self._timed("ask_llm"):
+            options = options or {}
+            try:
+                self._container.rate_limiter.acquire_session(BRIDGE_SESSION)
+                chat_stream = self._container.ask_about_flashcard.execute(
+                    options.get("question"),
+                    hidden=bool(options.get("hidden", False)),
+                    explain=bool(options.get("explain")),
+                    use_cache=options.get("cache", True)
+                )
+            except RateLimitExceeded as e:
+                return {"error": str(e), "retry_after": round(e.retry_after, 1), "status": 429}
+            except AdmissionRejected as e:
+                return {"error": str(e), "queue_position": e.queue_position, "retry_after": e.retry_after, "status": 429}
+
+            threading.Thread(
+                target=self._push_stream, args=(request_id, chat_stream), name=f"bridge-{request_id}", daemon=True
+            ).start()
+            return {"stream_id": chat_stream.id}
+
+    def record_study_event(self, event_type: str) -> Dict[str, Any]:
+        """Same as `POST /api/study/events` (e.g. "answer_revealed")."""
+        with self._timed("record_study_event"):
+            if event_type not in CLIENT_EVENT_TYPES:
+                return {"error": f"Unknown event type: {event_type}", "status": 400}
+            state = self._container.state_repository.get_state()
+            return {"accepted": self._container.record_study_event.execute(event_type, state)}
+
+    def cancel_stream(self, request_id: str) -> None:
+        """The page stopped reading (card changed): stop pushing; the answer itself may be resumed."""
+        with self._lock:
+            self._cancelled.add(request_id)
+
+    def ping(self) -> float:
+        """Round trip probe for the transport latency comparison."""
+        return time.time()
+
+    def record_transport_latency(self, results: Dict[str, Any]) -> None:
+        """Keep the page's HTTP vs bridge measurements (shown in /api/debug/metrics)."""
+        with self._lock:
+            self._transport_latency = results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "attached": self._window is not None,
+                "calls": {
+                    name: {"count": entry["count"], "avg_ms": round(entry["seconds"] * 1000 / entry["count"], 3)}
+                    for name, entry in sorted(self._calls.items())
+                },
+                "pushes": self._pushes["count"],
+                "push_failures": self._pushes["failed"],
+                "avg_push_ms": round(self._pushes["seconds"] * 1000 / self._pushes["count"], 3)
+                if self._pushes["count"] else 0.0,
+                "transport_latency": self._transport_latency
+            }
+
+    def _push_stream(self, request_id: str, chat_stream) -> None:
+        events = chat_stream.follow()
+        try:
+            for seq, event_data in events:
+                with self._lock:
+                    if request_id in self._cancelled:
+                        break
+                frame = f"id: {chat_stream.id}:{seq}\ndata: {json.dumps(event_data)}\n\n"
+                self._eval(f"window.__dailystackBridge.push({json.dumps(request_id)}, {json.dumps(frame)})")
+        finally:
+            events.close()
+            with self._lock:
+                self._cancelled.discard(request_id)
+            self._eval(f"window.__dailystackBridge.close({json.dumps(request_id)})")
+
+    def _eval(self, script: str) -> None:
+        if self._window is None:
+            return
+        start = time.perf_counter()
+        try:
+            self._window.evaluate_js(script)
+        except Exception as e:
+            with self._lock:
+                self._pushes["failed"] += 1
+            print(f"JS bridge push failed: {e}", file=sys.stderr)
+            return
+        with self._lock:
+            self._pushes["count"] += 1
+            self._pushes["seconds"] += time.perf_counter() - start
+
+    def _flashcard_payload(self, state, flashcard) -> Dict[str, Any]:
+        payload = flashcard.to_dict()
+        payload["conversation_id"] = state.current_conversation_id
+        return payload
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry = self._calls.setdefault(name, {"count": 0, "seconds": 0.0})
+                entry["count"] += 1
+                entry["seconds"] += time.perf_counter() - start
+
+
+def attach_window(bridge: JsBridge, window) -> None:
+    """Give the bridge the pywebview window it pushes answers to (kept off the JS-visible API)."""
+    bridge._window = window
@@ -0,0 +1,50 @@
+"""Server lifecycle: open streaming responses and graceful shutdown."""
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List
+
+
+class ServerLifecycle:
+    """
+    Counts the streaming responses in progress so shutdown can wait for them.
+
+    Once `begin_drain` is called, open-ended streams (history and progress
+    subscriptions) end at their next wake-up, while chat answers are left
+    to finish; `wait_idle` returns when every tracked stream is closed.
+    """
+
+    def __init__(self):
+        self.draining = threading.Event()
+        self._idle = threading.Condition()
+        self._active = 0
+        self._drain_callbacks: List[Callable[[], None]] = []
+
+    def on_drain(self, callback: Callable[[], None]) -> None:
+        """Register a callback that wakes blocked streams when draining starts."""
+        self._drain_callbacks.append(callback)
+
+    def begin_drain(self) -> None:
+        if self.draining.is_set():
+            return
+        self.draining.set()
+        for callback in self._drain_callbacks:
+            callback()
+
+    def track(self, stream: Iterable) -> Iterator:
+        """Yield from `stream`, counting it as active until it is exhausted or closed."""
+        with self._idle:
+            self._active += 1
+        try:
+            yield from stream
+        finally:
+            with self._idle:
+                self._active -= 1
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Block until no tracked stream is open or the timeout elapses."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout)
+
+    def stats(self) -> Dict[str, object]:
+        with self._idle:
+            return {"active_streams": self._active, "draining": self.draining.is_set()}
@@ -2,69 +2,198 @@
 import json
 from flask import Blueprint, jsonify, request, Response, stream_with_context
 from backend.presentation.dependencies import container
+from backend.use_cases.admission.admission_controller import AdmissionRejected
+from backend.infrastructure.http.rate_limiter import RateLimitExceeded
+from backend.use_cases.chat.coalesce_stream import CoalescingConfig
+from backend.use_cases.chat.resumable_streams import parse_event_id
 
 chat_bp = Blueprint('chat', __name__)
 
 @chat_bp.route('/chat/history', methods=['GET'])
 def get_chat_history():
+    """
+    Chat history of the current card.
+    
+    Without parameters returns the recent in-memory window (oldest first).
+    With `limit` and/or `cursor` returns a page, newest first, plus the
+    cursor of the next (older) page. With `since=<seq>` returns only the
+    messages after that sequence number (delta sync).
+    """
     state = container.state_repository.get_state()
     idx = state.current_flashcard_index
     conversation = state.get_conversation(idx)
-    if conversation:
-        return jsonify(conversation.messages)
-    return jsonify([])
+    
+    if 'since' in request.args:
+        if not conversation:
+            return jsonify({"conversation_id": None, "messages": [], "latest_seq": 0, "has_more": False})
+        since = max(0, request.args.get('since', 0, type=int))
+        # A client that tracked another conversation (card changed) starts over
+        if request.args.get('conversation_id') not in (None, conversation.id):
+            since = 0
+        messages, has_more = container.conversation_history.since(conversation, since)
+        return jsonify({
+            "conversation_id": conversation.id,
+            "messages": _rendered(messages),
+            "latest_seq": conversation.total_messages(),
+            "has_more": has_more
+        })
+    
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        return jsonify(_rendered(conversation.messages) if conversation else [])
+    
+    if not conversation:
+        return jsonify({"messages": [], "next_cursor": None, "total": 0})
+    
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    cursor = request.args.get('cursor', type=int)
+    messages, next_cursor = container.conversation_history.page(conversation, cursor, limit)
+    return jsonify({
+        "messages": _rendered(messages),
+        "next_cursor": next_cursor,
+        "total": conversation.total_messages()
+    })
+
+def _rendered(messages):
+    """Copies of `messages` with the HTML of bot messages, when `render=html` was requested."""
+    if request.args.get('render') != 'html':
+        return messages
+    return [
+        dict(message, html=container.markdown_renderer.render(message.get("content")))
+        if message.get("role") == "bot" else message
+        for message in messages
+    ]
+
+@chat_bp.route('/chat/history/stream', methods=['GET'])
+def stream_chat_history():
+    """
+    Change stream of one conversation (SSE).
+    
+    Sends every message after `since` (or the `Last-Event-ID` header) as it is
+    stored, with its seq as the event id. Defaults to the current card.
+    """
+    state = container.state_repository.get_state()
+    conversation_id = request.args.get('conversation_id')
+    if conversation_id:
+        conversation = state.find_conversation(conversation_id)
+    else:
+        conversation = state.get_conversation(state.current_flashcard_index)
+    
+    if not conversation:
+        return jsonify({"error": "Conversation not found"}), 404
+    
+    since = request.args.get('since', type=int)
+    if since is None:
+        since = request.headers.get('Last-Event-ID', 0, type=int)
+    
+    draining = container.lifecycle.draining
+    # Other workers' messages only show up in the shared state: poll it instead of waiting for local changes
+    poll_seconds = 1 if container.shared_store else 15
+    
+    def generate():
+        current = conversation
+        seen = max(0, since)
+        idle = 0.0
+        # Ends on shutdown; the client reconnects to another worker with Last-Event-ID
+        while not draining.is_set():
+            # Reloaded when another worker wrote; an archived conversation keeps the object it had
+            current = container.state_repository.get_state().find_conversation(conversation.id) or current
+            messages, has_more = container.conversation_history.since(current, seen)
+            for message in messages:
+                seen = message["seq"]
+                idle = 0.0
+                yield f"id: {seen}\ndata: {json.dumps(message)}\n\n"
+            if has_more:
+                continue
+            if not container.conversation_history.wait_for_change(current, seen, timeout=poll_seconds, stop=draining):
+                idle += poll_seconds
+                if idle >= 15:
+                    # Keeps idle connections alive and lets the server notice disconnects
+                    idle = 0.0
+                    yield ": keepalive\n\n"
+    
+    return Response(stream_with_context(container.lifecycle.track(generate())), content_type='text/event-stream')
+
+@chat_bp.route('/chat/summary', methods=['GET'])
+def get_chat_summary():
+    """Compact summary of the current card's conversation."""
+    state = container.state_repository.get_state()
+    conversation = state.get_conversation(state.current_flashcard_index)
+    if not conversation:
+        return jsonify({"summary": "", "total": 0})
+    return jsonify({
+        "summary": container.conversation_history.summarize(conversation),
+        "total": conversation.total_messages()
+    })
 
 @chat_bp.route('/ask-llm', methods=['POST'])
 def ask_llm():
     data = request.json
     question = data.get("question")
     is_hidden = data.get("hidden", False)
+    # {"explain": true} asks for the card's initial explanation (hidden, prompt built by the backend)
+    is_explanation = bool(data.get("explain"))
+    use_cache = data.get("cache", True) and request.headers.get("Cache-Control") != "no-cache"
+    # {"coalesce": {"window_ms": 0}} streams every upstream chunk as its own frame
+    coalescing = CoalescingConfig.from_request(container.sse_coalescing, data.get("coalesce"))
     
-    state = container.state_repository.get_state()
-    idx = state.current_flashcard_index
+    # Smooth bursts from a single client; only fail if the wait would be too long
+    session_id = request.headers.get("X-Session-Id") or request.remote_addr or "local"
+    try:
+        container.rate_limiter.acquire_session(session_id)
+    except RateLimitExceeded as e:
+        response = jsonify({"error": str(e), "retry_after": round(e.retry_after, 1)})
+        response.headers["Retry-After"] = str(max(1, int(e.retry_after + 0.999)))
+        return response, 429
     
-    # Ensure conversation exists
-    if idx not in state.conversations:
-         state.initialize_conversation(idx)
-    
-    # Save user message ONLY if not hidden
-    if not is_hidden:
-        state.conversations[idx].messages.append({"role": "user", "content": question})
-    
-    if not state.current_conversation_id:
-        state.current_conversation_id = state.conversations[idx].id
-    
-    # Build user prompt
-    if state.is_first_message_for_card:
-        flashcard = state.get_current_flashcard()
-        if flashcard:
-            flashcard_question = flashcard.question
-            flashcard_answer = flashcard.detailed_explanation or flashcard.answer
-            
-            user_prompt = f"dada a questão: {flashcard_question} e dada a resposta {flashcard_answer} Responda a mensagem do usuário: {question}"
-            state.is_first_message_for_card = False
-            state.conversations[idx].is_first = False
-        else:
-            user_prompt = question
-    else:
-        user_prompt = question
+    try:
+        chat_stream = container.ask_about_flashcard.execute(
+            question, hidden=is_hidden, explain=is_explanation, use_cache=use_cache, coalescing=coalescing
+        )
+    except AdmissionRejected as e:
+        response = jsonify({
+            "error": str(e),
+            "queue_position": e.queue_position,
+            "retry_after": e.retry_after
+        })
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
     
+    return _sse_response(chat_stream, 0)
+
+@chat_bp.route('/ask-llm/streams', methods=['GET'])
+def list_answer_streams():
+    """Answers still being written for the current card (to resume after a reload)."""
+    state = container.state_repository.get_state()
+    conversation = state.get_conversation(state.current_flashcard_index)
+    streams = container.resumable_streams.active(conversation.id) if conversation else []
+    return jsonify({"streams": [
+        {"id": stream.id, "conversation_id": stream.conversation_id, "last_event_id": f"{stream.id}:{stream.last_seq}"}
+        for stream in streams
+    ]})
+
+@chat_bp.route('/ask-llm/streams/<stream_id>', methods=['GET'])
+def resume_answer_stream(stream_id):
+    """
+    Follow an answer from where the client left off.
+    
+    The last event seen comes in the `Last-Event-ID` header (sent by
+    EventSource on reconnect) or the `last_event_id` parameter; without
+    either the answer is replayed from the start.
+    """
+    chat_stream = container.resumable_streams.get(stream_id)
+    if chat_stream is None:
+        return jsonify({"error": "Stream not found or expired"}), 404
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    event_stream_id, after = parse_event_id(last_event_id)
+    if event_stream_id not in (None, stream_id):
+        after = 0
+    return _sse_response(chat_stream, after)
+
+def _sse_response(chat_stream, after: int) -> Response:
     def generate():
-        full_answer = ""
-        # Use the chat use case from container
-        for event_data in container.chat_with_agent.execute(state.current_conversation_id, user_prompt):
-            if "answer" in event_data:
-                answer_chunk = event_data["answer"]
-                full_answer += answer_chunk
-                chunk = f"data: {json.dumps(event_data)}\n\n"
-                yield chunk
-            elif "error" in event_data:
-                chunk = f"data: {json.dumps(event_data)}\n\n"
-                yield chunk
-                break
-        
-        # Save bot message after streaming is complete
-        if full_answer:
-            state.conversations[idx].messages.append({"role": "bot", "content": full_answer})
-    
-    return Response(stream_with_context(generate()), content_type='text/event-stream')
+        for seq, event_data in chat_stream.follow(after):
+            yield f"id: {chat_stream.id}:{seq}\ndata: {json.dumps(event_data)}\n\n"
+    
+    response = Response(stream_with_context(container.lifecycle.track(generate())), content_type='text/event-stream')
+    response.headers["X-Stream-Id"] = chat_stream.id
+    return response
@@ -1,12 +1,17 @@
 """Credentials validation endpoint."""
 import os
 from flask import Blueprint, jsonify
+from backend.presentation.dependencies import container
 
 credentials_bp = Blueprint('credentials', __name__)
 
 @credentials_bp.route('/check-credentials', methods=['GET'])
 def check_credentials():
     """Check if required environment variables are set."""
+    if container.llm_provider == "local":
+        # The local model needs no StackSpot credentials
+        return jsonify({"configured": True, "missing": []})
+    
     client_id = os.environ.get("STK_CLIENT_ID")
     client_key = os.environ.get("STK_CLIENT_KEY")
     realm = os.environ.get("STK_REALM")
@@ -1,7 +1,10 @@
 """Debug Routes."""
 import os
-from flask import Blueprint, jsonify, request
+import sys
+import json
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from backend.presentation.dependencies import container
+from backend.infrastructure.tracing.exporters import render_waterfall
 
 debug_bp = Blueprint('debug', __name__)
 
@@ -41,35 +44,40 @@ def save_credentials():
         f.write(f"STK_CLIENT_KEY={client_key}\n")
         f.write(f"STK_REALM={realm}\n")
         
-    # Reload credentials in auth client
-    container.authenticate_user.reload_credentials()
+    # Drops the old account's token and caches; the challenge reloads in the background
+    reload_id = container.update_credentials.execute()
     
-    # Trigger load of daily challenge
-    # We need to call the load logic. Ideally this should be a use case or function we can call.
-    # For now, we can trigger it via a helper or directly if we expose it.
-    # Let's import the load function from api.py (circular import risk) or move it to a use case.
-    # To avoid circular import, we'll rely on the client reloading on next request or 
-    # we can re-instantiate the container components if needed.
-    # Better approach: The state loading logic should be in a use case.
-    
-    # Re-executing the daily challenge fetch
-    try:
-        challenge = container.get_daily_challenge.execute()
-        if challenge:
-             state = container.state_repository.get_state()
-             state.daily_challenge = challenge
-             state.current_flashcard_index = 0
-             state.conversations = {}
-             state.initialize_conversation(0)
-             state.is_loading = False
-             state.error = None
-        else:
-             state = container.state_repository.get_state()
-             state.error = "Failed to load daily challenge after saving credentials"
-    except Exception as e:
-        pass
+    return jsonify({
+        "status": "success",
+        "reload_id": reload_id,
+        "progress_url": "/api/credentials/reload/stream"
+    }), 202
 
-    return jsonify({"status": "success"})
+@debug_bp.route('/credentials/reload', methods=['GET'])
+def credentials_reload_status():
+    """Progress of the reload triggered by the last credentials change."""
+    _, progress = container.update_credentials.progress.snapshot()
+    return jsonify(progress)
+
+@debug_bp.route('/credentials/reload/stream', methods=['GET'])
+def credentials_reload_stream():
+    """Progress of the credentials reload as Server-Sent Events, until it finishes."""
+    progress = container.update_credentials.progress
+    draining = container.lifecycle.draining
+    
+    def generate():
+        version = -1
+        while not draining.is_set():
+            current, snapshot = progress.snapshot()
+            if current != version:
+                version = current
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+                if snapshot["done"]:
+                    return
+            if not progress.wait_for_change(version, timeout=15, stop=draining):
+                yield ": keepalive\n\n"
+    
+    return Response(stream_with_context(container.lifecycle.track(generate())), content_type='text/event-stream')
 
 @debug_bp.route('/debug/state', methods=['GET'])
 def debug_state():
@@ -88,30 +96,78 @@ def debug_state():
         ])
     })
 
+@debug_bp.route('/debug/metrics', methods=['GET'])
+def debug_metrics():
+    """Returns runtime metrics of caches and streams."""
+    return jsonify({
+        "chat_cache": container.chat_response_cache.stats(),
+        "http_cache": container.http_cache.stats(),
+        "chat_streams": container.chat_client.get_stats(),
+        "sse_coalescing": container.sse_coalescing_metrics.stats(),
+        "resumable_streams": container.resumable_streams.stats(),
+        "response_compression": container.compression_metrics.stats(),
+        "markdown_render": container.markdown_renderer.stats(),
+        "static_assets": container.static_assets.stats(),
+        "window_load": container.static_assets.load_timings.stats(),
+        "llm_admission": container.llm_admission.stats(),
+        "explanations": container.pregenerate_explanations.stats(),
+        "study_event_log": container.study_event_log.stats(),
+        "upstream_circuit": container.upstream_circuit.snapshot(),
+        "offline_pack": container.offline_challenge_repository.available,
+        "server": container.lifecycle.stats(),
+        "js_bridge": container.js_bridge.stats()
+    })
+
+@debug_bp.route('/debug/load-timing', methods=['POST'])
+def debug_load_timing():
+    """Window time-to-interactive reported by the frontend once it has mounted."""
+    data = request.get_json(silent=True, force=True) or {}
+    try:
+        tti_ms = float(data["tti_ms"])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "tti_ms is required"}), 400
+    container.static_assets.load_timings.record(tti_ms, float(data.get("transfer_bytes") or 0))
+    return "", 204
+
+@debug_bp.route('/debug/traces', methods=['GET'])
+def debug_traces():
+    """
+    Slowest recent traces with their span tree.
+    
+    `?format=text` renders each one as a plain-text waterfall.
+    """
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    traces = container.trace_buffer.slowest(limit)
+    if request.args.get('format') == 'text':
+        body = "\n\n".join(render_waterfall(trace) for trace in traces) or "No traces recorded yet."
+        return Response(body + "\n", content_type='text/plain; charset=utf-8')
+    return jsonify({"traces": traces})
+
+@debug_bp.route('/debug/rate-limits', methods=['GET'])
+def debug_rate_limits():
+    """Returns the token buckets of upstream hosts and client sessions."""
+    return jsonify(container.rate_limiter.snapshot())
+
 @debug_bp.route('/debug/reload', methods=['POST'])
 def debug_reload():
     """Manually triggers a reload of the daily challenge."""
-    state = container.state_repository.get_state()
-    state.is_loading = True
-    
     try:
-        challenge = container.get_daily_challenge.execute()
-        if challenge:
-             state.daily_challenge = challenge
-             state.current_flashcard_index = 0
-             state.conversations = {}
-             state.initialize_conversation(0)
-             state.is_loading = False
-             state.error = None
-        else:
-             state.error = "Failed to reload daily challenge"
-             state.is_loading = False
+        container.load_daily_challenge.execute(error_message="Failed to reload daily challenge")
     except Exception as e:
-        state.error = str(e)
-        state.is_loading = False
+        print(f"Failed to reload daily challenge: {e}", file=sys.stderr)
+        return jsonify({"status": "error", "message": str(e)})
         
     return jsonify({"status": "reload triggered"})
 
+@debug_bp.route('/debug/prefetch', methods=['POST'])
+def debug_prefetch():
+    """Generates the missing challenges of the coming days."""
+    generated = container.prefetch_challenges.execute()
+    return jsonify({
+        "generated": generated,
+        "stored": container.challenge_store.dates()
+    })
+
 @debug_bp.route('/debug/fetch', methods=['GET'])
 def debug_fetch():
     """Debug endpoint to try fetching data and return result/error."""
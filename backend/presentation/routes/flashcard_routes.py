@@ -1,6 +1,7 @@
 """Flashcard Routes."""
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from backend.presentation.dependencies import container
+from backend.use_cases.study.study_events import FLASHCARD_VIEWED
 
 flashcard_bp = Blueprint('flashcard', __name__)
 
@@ -17,13 +18,32 @@ def get_current_flashcard():
     state = container.state_repository.get_state()
     flashcard = state.get_current_flashcard()
     if flashcard:
-        return jsonify(flashcard.to_dict())
+        return jsonify(_flashcard_payload(state, flashcard))
     return jsonify({})
 
 @flashcard_bp.route('/flashcard/next', methods=['POST'])
 def next_flashcard():
     state = container.state_repository.get_state()
     flashcard = state.next_flashcard()
+    container.state_repository.update_state(state)
+    # Explanations of the cards right after this one are generated first
+    container.pregenerate_explanations.focus(state.current_flashcard_index)
     if flashcard:
-        return jsonify(flashcard.to_dict())
+        container.record_study_event.execute(FLASHCARD_VIEWED, state, conversation_id=state.current_conversation_id)
+        return jsonify(_flashcard_payload(state, flashcard))
     return jsonify({"status": "no flashcards"})
+
+def _flashcard_payload(state, flashcard) -> dict:
+    """
+    Flashcard JSON plus the ID of its conversation (used for chat delta sync).
+    
+    With `render=html` the explanation and code example are also returned as
+    sanitized HTML (`detailed_explanation_html`, `code_example_html`).
+    """
+    payload = flashcard.to_dict()
+    payload["conversation_id"] = state.current_conversation_id
+    if request.args.get('render') == 'html':
+        renderer = container.markdown_renderer
+        payload["detailed_explanation_html"] = renderer.render(flashcard.detailed_explanation)
+        payload["code_example_html"] = renderer.render_code(flashcard.code_example)
+    return payload
@@ -0,0 +1,22 @@
+"""Search Routes."""
+import time
+from flask import Blueprint, jsonify, request
+from backend.presentation.dependencies import container
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+def search():
+    """Full-text search over past scenarios, flashcards and chat explanations."""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 20, type=int)
+    
+    started = time.perf_counter()
+    hits = container.search_history.execute(query, limit)
+    took_ms = (time.perf_counter() - started) * 1000
+    
+    return jsonify({
+        "query": query,
+        "results": [hit.to_dict() for hit in hits],
+        "took_ms": round(took_ms, 2)
+    })
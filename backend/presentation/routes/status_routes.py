@@ -11,5 +11,7 @@ def get_status():
     return jsonify({
         "loading": state.is_loading,
         "has_data": state.daily_challenge is not None,
+        "generating": state.is_generating,
+        "flashcards_ready": len(state.daily_challenge.flashcards) if state.daily_challenge else 0,
         "error": state.error
     })
@@ -0,0 +1,52 @@
+"""Study Event Routes."""
+from datetime import datetime
+from typing import Optional
+from flask import Blueprint, jsonify, request
+from backend.presentation.dependencies import container
+from backend.use_cases.study.study_events import CLIENT_EVENT_TYPES
+
+study_bp = Blueprint('study', __name__)
+
+@study_bp.route('/study/events', methods=['POST'])
+def record_study_event():
+    """Events only the frontend sees, e.g. {"type": "answer_revealed"}; tied to the current card."""
+    data = request.get_json(silent=True, force=True) or {}
+    event_type = data.get("type")
+    if event_type not in CLIENT_EVENT_TYPES:
+        return jsonify({"error": f"type must be one of {', '.join(CLIENT_EVENT_TYPES)}"}), 400
+    state = container.state_repository.get_state()
+    accepted = container.record_study_event.execute(event_type, state)
+    return jsonify({"accepted": accepted}), 202
+
+@study_bp.route('/study/events', methods=['GET'])
+def replay_study_events():
+    """
+    Recorded study events, oldest first.
+
+    `start` (included) and `end` (excluded) are Unix seconds or ISO 8601
+    dates/times (local time unless an offset is given); `type` takes a
+    comma-separated list. When `has_more` is true, ask again with
+    `start` set to the last event's timestamp (events at exactly that
+    time come again).
+    """
+    try:
+        start = _parse_time(request.args.get('start'))
+        end = _parse_time(request.args.get('end'))
+    except ValueError:
+        return jsonify({"error": "start and end must be Unix seconds or ISO 8601"}), 400
+    types = [t.strip() for t in request.args.get('type', '').split(',') if t.strip()] or None
+    limit = request.args.get('limit', 500, type=int)
+
+    events, has_more = container.replay_study_events.execute(start, end, types, limit)
+    return jsonify({
+        "events": [event.to_dict() for event in events],
+        "has_more": has_more
+    })
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
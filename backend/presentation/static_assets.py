@@ -0,0 +1,63 @@
+"""Flask routes that serve the frontend build."""
+import os
+from flask import Flask, Response, abort, request
+from werkzeug.wsgi import wrap_file
+from backend.infrastructure.assets.static_asset_store import StaticAssetStore
+
+# Hashed bundles never change under the same name; everything else is revalidated
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def init_static_assets(app: Flask, store: StaticAssetStore) -> None:
+    """
+    Serve `store` at the root of `app` (the app must be created with `static_folder=None`).
+
+    Responses carry a strong ETag per content-coding and answer
+    `If-None-Match` with 304.
+    Hashed bundles are cacheable forever; `index.html` and other unhashed
+    files are revalidated on every load, which costs one 304 each.
+    """
+
+    @app.route('/', endpoint='index')
+    def _index():
+        return _serve(store, 'index.html')
+
+    @app.route('/<path:path>', endpoint='static_asset')
+    def _static_asset(path):
+        return _serve(store, path)
+
+
+def _serve(store: StaticAssetStore, path: str) -> Response:
+    asset = store.get(path)
+    if asset is None:
+        abort(404)
+
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    # The ETag of the representation this request gets: a gzip body never validates an identity one
+    etag = asset.etag_for(store.choose_encoding(asset, accept_encoding))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        store.count_not_modified()
+        return Response(status=304, headers=headers)
+
+    encoding, body, filename = store.select(asset, accept_encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    if body is not None:
+        response = Response(body, content_type=asset.content_type, headers=headers)
+    else:
+        f = open(filename, "rb")
+        response = Response(
+            wrap_file(request.environ, f),
+            content_type=asset.content_type,
+            headers=headers,
+            direct_passthrough=True
+        )
+        response.content_length = os.fstat(f.fileno()).st_size
+    return response
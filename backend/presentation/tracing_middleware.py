@@ -0,0 +1,50 @@
+"""Flask hooks that open a span per request."""
+from flask import Flask, g, request
+from backend.infrastructure.tracing.tracer import tracer, _current_span
+
+
+def init_tracing(app: Flask) -> None:
+    """
+    Trace every request of `app`.
+    
+    The request span continues an incoming W3C `traceparent` and is echoed
+    back in the response. It ends when the response is closed, so streamed
+    answers are timed until their last byte.
+    """
+    
+    @app.before_request
+    def _start_request_span():
+        span = tracer.start_span(
+            f"{request.method} {request.path}",
+            traceparent=request.headers.get("traceparent"),
+            **{"http.method": request.method, "http.target": request.full_path.rstrip("?")}
+        )
+        g.trace_span = span
+        g.trace_token = _current_span.set(span)
+    
+    @app.after_request
+    def _finish_request_span(response):
+        span = g.get("trace_span")
+        if span is None:
+            return response
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.status = "error"
+        if span.is_recording:
+            response.headers["traceparent"] = span.traceparent
+        response.call_on_close(span.end)
+        return response
+    
+    @app.teardown_request
+    def _reset_request_span(error=None):
+        span = g.get("trace_span")
+        if span is not None and error is not None:
+            span.record_error(error)
+            span.end()
+        token = g.pop("trace_token", None)
+        if token is not None:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Teardown of a streamed response runs in another context
+                _current_span.set(None)
@@ -0,0 +1,154 @@
+"""
+Headless production server: the API (and the frontend build) without the desktop window.
+
+    python -m backend.serve --host 0.0.0.0 --port 5000 --workers 2 --threads 16
+
+Runs under gunicorn (threaded workers) when installed, otherwise under
+waitress (a single process). With more than one worker the app state, token
+and challenges are kept in a shared SQLite store (DAILYSTACK_SHARED_STORE)
+so every worker sees the same challenge, card and conversations, and only
+one of them generates each day's challenge. Chat answers are copied to the
+shared store as they are written, so a reconnect to /ask-llm/streams/<id>
+and /chat/history/stream work whichever worker they land on (no sticky
+routing needed). On SIGTERM/SIGINT, open-ended
+streams are ended and chat answers in progress get up to --graceful-timeout
+seconds to finish.
+"""
+import os
+import sys
+import signal
+import argparse
+import threading
+import _thread
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the DailyStack backend as a headless service.")
+    parser.add_argument("--host", default=os.environ.get("DAILYSTACK_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("DAILYSTACK_PORT", 5000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("DAILYSTACK_WORKERS", 1)),
+                        help="Worker processes (gunicorn only)")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("DAILYSTACK_THREADS", 16)),
+                        help="Threads per worker; every open stream holds one")
+    parser.add_argument("--graceful-timeout", type=float,
+                        default=float(os.environ.get("DAILYSTACK_GRACEFUL_TIMEOUT", 30)),
+                        help="Seconds streams in progress get to finish on shutdown")
+    parser.add_argument("--no-frontend", action="store_true", help="Serve only /api")
+    parser.add_argument("--server", choices=("auto", "gunicorn", "waitress"), default="auto")
+    return parser.parse_args(argv)
+
+
+def _worker_started() -> None:
+    """Per worker process: load the challenge and start the midnight rollover."""
+    from backend.bootstrap import init_app_state, start_date_rollover
+    threading.Thread(target=init_app_state, name="init-app-state", daemon=True).start()
+    start_date_rollover()
+
+
+def run_gunicorn(args: argparse.Namespace) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    def post_worker_init(worker):
+        from backend.presentation.dependencies import container
+        _worker_started()
+        handle_exit = worker.handle_exit
+
+        def drain_and_exit(sig, frame):
+            # Wake idle streams so the worker's graceful wait only covers real work
+            container.lifecycle.begin_drain()
+            handle_exit(sig, frame)
+
+        signal.signal(signal.SIGTERM, drain_and_exit)
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("threads", args.threads)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("graceful_timeout", int(args.graceful_timeout))
+            # Streams can stay open for minutes; gthread workers heartbeat independently
+            self.cfg.set("keepalive", 5)
+            self.cfg.set("post_worker_init", post_worker_init)
+
+        def load(self):
+            # Imported in each worker (no preload) so every process builds its own Container
+            from backend.presentation.app_factory import create_app
+            return create_app(serve_frontend=not args.no_frontend)
+
+    Application().run()
+
+
+def run_waitress(args: argparse.Namespace) -> None:
+    from waitress import create_server
+    from backend.presentation.app_factory import create_app
+    from backend.presentation.dependencies import container
+
+    if args.workers > 1:
+        print("waitress runs a single process; ignoring --workers", file=sys.stderr)
+
+    server = create_server(
+        create_app(serve_frontend=not args.no_frontend),
+        host=args.host,
+        port=args.port,
+        threads=args.threads,
+        channel_timeout=3600
+    )
+
+    def drain(sig, frame):
+        if container.lifecycle.draining.is_set():
+            # Streams are done (or a second signal arrived): leave server.run()
+            raise KeyboardInterrupt
+        print("Draining open streams...", file=sys.stderr)
+        container.lifecycle.begin_drain()
+
+        def stop_when_idle():
+            container.lifecycle.wait_idle(args.graceful_timeout)
+            # Delivered to the main thread as SIGINT, i.e. to `drain` again
+            _thread.interrupt_main()
+
+        threading.Thread(target=stop_when_idle, name="drain", daemon=True).start()
+
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, drain)
+
+    _worker_started()
+    print(f"Serving on http://{args.host}:{args.port} (waitress, {args.threads} threads)", flush=True)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.workers > 1 and not (os.environ.get("DAILYSTACK_SHARED_STORE") or os.environ.get("DAILYSTACK_STATE_DB")):
+        data_dir = os.environ.get("DAILYSTACK_DATA_DIR", os.path.join(os.getcwd(), "data"))
+        # Set before the Container is built (in each worker): shared state, token and generation lock
+        os.environ["DAILYSTACK_SHARED_STORE"] = "sqlite:///" + os.path.abspath(os.path.join(data_dir, "shared.db"))
+    elif args.workers > 1 and not os.environ.get("DAILYSTACK_SHARED_STORE"):
+        print("DAILYSTACK_STATE_DB shares only the app state: answer stream reconnects need sticky routing "
+              "unless DAILYSTACK_SHARED_STORE is set", file=sys.stderr)
+
+    servers = ["gunicorn", "waitress"] if args.server == "auto" else [args.server]
+    for name in servers:
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        if name == "gunicorn":
+            run_gunicorn(args)
+        else:
+            run_waitress(args)
+        return 0
+
+    print("No production server installed: pip install gunicorn (Linux/macOS) or waitress (Windows)",
+          file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
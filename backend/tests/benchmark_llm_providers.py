@@ -0,0 +1,97 @@
+"""
+Compares LLM providers: time to first token and streaming throughput.
+
+Usage:
+    python backend/tests/benchmark_llm_providers.py --providers stackspot,local --runs 3
+
+The local provider reads DAILYSTACK_LOCAL_LLM_URL / DAILYSTACK_LOCAL_LLM_MODEL,
+StackSpot needs STK_CLIENT_ID, STK_CLIENT_KEY and STK_REALM.
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import generate_ulid
+from backend.infrastructure.http.local_llm_client import LocalChatClient, DEFAULT_BASE_URL
+from backend.infrastructure.http.stackspot_auth_client import StackSpotAuthClient
+from backend.infrastructure.http.stackspot_chat_client import StackSpotChatClient
+
+PROMPT = "Explique em um parágrafo a diferença entre um HashMap e um TreeMap em Java."
+
+
+def make_provider(name: str):
+    if name == "local":
+        return LocalChatClient(
+            os.environ.get("DAILYSTACK_LOCAL_LLM_URL", DEFAULT_BASE_URL),
+            os.environ.get("DAILYSTACK_LOCAL_LLM_MODEL", "local-model")
+        )
+    if name == "stackspot":
+        return StackSpotChatClient(StackSpotAuthClient())
+    raise ValueError(f"Unknown provider: {name}")
+
+
+def run_once(provider, prompt: str) -> dict:
+    """Stream one answer on a fresh conversation and time it."""
+    start = time.perf_counter()
+    first_token = None
+    chunks = 0
+    chars = 0
+
+    for event in provider.chat_with_agent(generate_ulid(), prompt):
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        chunks += 1
+        chars += len(event.get("answer", ""))
+
+    total = time.perf_counter() - start
+    streaming = max(total - (first_token or 0), 1e-9)
+    return {
+        "ttft": first_token or total,
+        "total": total,
+        "chunks": chunks,
+        "chars_per_s": chars / streaming,
+        # Rough token estimate (~4 characters per token)
+        "tokens_per_s": chars / 4 / streaming
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--providers", default="stackspot,local")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--prompt", default=PROMPT)
+    args = parser.parse_args()
+
+    print(f"{'provider':<10} {'ttft p50':>9} {'ttft max':>9} {'total p50':>10} {'tok/s p50':>10} {'chunks':>7}")
+    for name in args.providers.split(","):
+        provider = make_provider(name.strip())
+        results = []
+        for _ in range(args.runs):
+            try:
+                results.append(run_once(provider, args.prompt))
+            except Exception as e:
+                print(f"{name:<10} failed: {e}")
+                break
+        if not results:
+            continue
+
+        print(
+            f"{name:<10} "
+            f"{statistics.median(r['ttft'] for r in results):>8.2f}s "
+            f"{max(r['ttft'] for r in results):>8.2f}s "
+            f"{statistics.median(r['total'] for r in results):>9.2f}s "
+            f"{statistics.median(r['tokens_per_s'] for r in results):>10.1f} "
+            f"{statistics.median(r['chunks'] for r in results):>7.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Compares the loopback HTTP API with the in-process JS bridge: round trip of
+the calls the desktop UI makes, and time to the first pushed chunk of an answer.
+
+Usage:
+    python backend/tests/benchmark_transports.py --runs 200
+
+Both transports call the same backend; chat answers are a canned two-chunk
+stream so only the transport is timed. This measures the Python side (HTTP
+stack + socket vs. a method call + evaluate_js); the webview's own IPC hop
+is measured in the page with `dailystackCompareTransports()` (devtools
+console, DAILYSTACK_DESKTOP_TRANSPORT=bridge), whose results show up in
+/api/debug/metrics under `js_bridge.transport_latency`.
+"""
+import sys
+import os
+import json
+import time
+import logging
+import argparse
+import statistics
+import threading
+import urllib.request
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from werkzeug.serving import make_server
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+from backend.presentation.app_factory import create_app
+from backend.presentation.dependencies import container
+from backend.presentation.js_bridge import JsBridge, attach_window
+
+CALLS = {
+    "status": ("/api/status", lambda bridge: bridge.get_status()),
+    "flashcard": ("/api/flashcard/current", lambda bridge: bridge.get_current_flashcard()),
+    "history": ("/api/chat/history?since=0&render=html", lambda bridge: bridge.get_chat_history(0)),
+}
+
+
+class PushTimer:
+    """Stands in for the pywebview window: notes when the first chunk is pushed."""
+
+    def __init__(self):
+        self.first_push = threading.Event()
+        self.closed = threading.Event()
+
+    def evaluate_js(self, script):
+        if script.startswith("window.__dailystackBridge.push"):
+            self.first_push.set()
+        else:
+            self.closed.set()
+
+
+def install_fixture() -> None:
+    state = AppState(
+        daily_challenge=DailyChallenge(
+            "2026-10-19", Scenario("Cache", "LRU"), [Flashcard(f"Q{i}", f"A{i}") for i in range(5)]
+        ),
+        is_loading=False
+    )
+    state.initialize_conversation(0)
+    container.state_repository.update_state(state)
+    container.chat_with_agent.execute = lambda *args, **kwargs: iter([{"answer": "Olá"}, {"answer": ", mundo"}])
+    container.rate_limiter.session_limit = None
+
+
+def summarize(times) -> str:
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered) * 1000:7.3f} ms   p95 {p95 * 1000:7.3f} ms"
+
+
+def time_calls(runs: int, base_url: str, bridge: JsBridge) -> None:
+    for name, (path, call) in CALLS.items():
+        http, direct = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            with urllib.request.urlopen(base_url + path) as response:
+                json.loads(response.read())
+            http.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            call(bridge)
+            direct.append(time.perf_counter() - start)
+        print(f"{name:<10} http   {summarize(http)}")
+        print(f"{'':<10} bridge {summarize(direct)}")
+
+
+def time_first_chunk(runs: int, base_url: str, bridge: JsBridge) -> None:
+    http, direct = [], []
+    body = json.dumps({"question": "oi"}).encode()
+    for _ in range(runs):
+        request = urllib.request.Request(
+            base_url + "/api/ask-llm", data=body, headers={"Content-Type": "application/json"}
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.readline()
+            http.append(time.perf_counter() - start)
+            response.read()
+
+        window = PushTimer()
+        attach_window(bridge, window)
+        start = time.perf_counter()
+        bridge.ask_llm("benchmark", {"question": "oi"})
+        window.first_push.wait(5)
+        direct.append(time.perf_counter() - start)
+        window.closed.wait(5)
+    print(f"{'answer':<10} http   {summarize(http)}  (first chunk)")
+    print(f"{'':<10} bridge {summarize(direct)}  (first chunk)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    install_fixture()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, create_app(serve_frontend=False), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    bridge = JsBridge(container)
+
+    try:
+        time_calls(args.runs, base_url, bridge)
+        time_first_chunk(max(1, args.runs // 10), base_url, bridge)
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import sys
+import os
+import threading
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+import pytest
+from backend.use_cases.admission.admission_controller import (
+    AdmissionController, AdmissionRejected, Priority
+)
+
+
+def test_limits_concurrency_and_rejects_when_queue_full():
+    controller = AdmissionController(max_concurrent=1, max_queue=0, max_wait_seconds=0.05)
+    ticket = controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.queue_position == 1
+    assert excinfo.value.retry_after >= 1
+
+    ticket.release()
+    ticket.release()  # idempotent
+    controller.acquire().release()
+    assert controller.stats()["active"] == 0
+
+
+def test_times_out_with_queue_position():
+    controller = AdmissionController(max_concurrent=1, max_queue=5, max_wait_seconds=0.05)
+    ticket = controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.queue_position == 1
+    assert controller.stats()["rejected_timeout"] == 1
+
+    ticket.release()
+    assert controller.stats()["active"] == 0
+
+
+def test_interactive_is_served_before_background_fifo_within_class():
+    controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait_seconds=5)
+    ticket = controller.acquire()
+    order = []
+
+    def worker(name, priority):
+        with controller.acquire(priority):
+            order.append(name)
+
+    threads = []
+    for name, priority in [("bg1", Priority.BACKGROUND), ("chat1", Priority.INTERACTIVE),
+                           ("bg2", Priority.BACKGROUND), ("chat2", Priority.INTERACTIVE)]:
+        t = threading.Thread(target=worker, args=(name, priority))
+        t.start()
+        threads.append(t)
+        time.sleep(0.02)
+
+    ticket.release()
+    for t in threads:
+        t.join()
+
+    assert order == ["chat1", "chat2", "bg1", "bg2"]
+
+
+def test_guarded_stream_releases_slot_when_closed_unstarted():
+    controller = AdmissionController(max_concurrent=1)
+    stream = controller.acquire().guard(iter([1, 2, 3]))
+    assert controller.stats()["active"] == 1
+    stream.close()
+    assert controller.stats()["active"] == 0
+
+    stream = controller.acquire().guard(iter([1, 2]))
+    assert list(stream) == [1, 2]
+    assert controller.stats()["active"] == 0
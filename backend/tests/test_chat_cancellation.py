@@ -0,0 +1,75 @@
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.http.stackspot_chat_client import StackSpotChatClient
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache
+from backend.use_cases.chat.chat_with_agent import ChatWithAgent
+
+
+class FakeAuth:
+    def get_token(self):
+        return "token"
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+        self.lines_read = 0
+
+    def iter_lines(self):
+        for line in self.lines:
+            self.lines_read += 1
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, *args, **kwargs):
+        return self.response
+
+
+def make_client(lines):
+    client = StackSpotChatClient(FakeAuth())
+    response = FakeResponse(lines)
+    client.session = FakeSession(response)
+    return client, response
+
+
+LINES = [b'data: {"answer": "a"}', b'data: {"answer": "b"}', b'data: {"answer": "c"}', b'event: end_event']
+
+
+def test_completed_stream_is_counted():
+    client, response = make_client(LINES)
+    assert [c["answer"] for c in client.chat_with_agent("C1", "oi")] == ["a", "b", "c"]
+    assert response.closed
+    stats = client.get_stats()
+    assert stats["streams_completed"] == 1
+    assert stats["streams_cancelled"] == 0
+
+
+def test_closing_consumer_closes_upstream():
+    client, response = make_client(LINES)
+    use_case = ChatWithAgent(client, ChatResponseCache())
+
+    stream = use_case.execute("C1", "oi", "key")
+    assert next(stream) == {"answer": "a"}
+    stream.close()
+
+    assert response.closed
+    assert response.lines_read == 1
+    stats = client.get_stats()
+    assert stats["streams_cancelled"] == 1
+    assert stats["wasted_bytes"] == len(LINES[0]) + 1
+    # Partial answers are never cached
+    assert use_case.response_cache.stats()["entries"] == 0
@@ -0,0 +1,139 @@
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache, make_cache_key
+from backend.use_cases.chat.chat_with_agent import ChatWithAgent
+
+
+class FakeChatClient:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+
+    def chat_with_agent(self, conversation_id, user_prompt):
+        self.calls += 1
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_cache_key_is_normalized():
+    a = make_cache_key("O que é TTL?", "Tempo de vida", "Explique  isso\n")
+    b = make_cache_key("o que é ttl?", "tempo de vida", "explique isso")
+    c = make_cache_key("O que é TTL?", "Tempo de vida", "Outra pergunta")
+    assert a == b
+    assert a != c
+
+
+def test_replay_keeps_chunk_granularity():
+    chunks = [{"answer": "Olá"}, {"answer": ", "}, {"answer": "mundo"}]
+    client = FakeChatClient(chunks)
+    use_case = ChatWithAgent(client, ChatResponseCache())
+
+    first = list(use_case.execute("C1", "prompt", "key"))
+    second = list(use_case.execute("C2", "prompt", "key"))
+
+    assert first == chunks
+    assert second == chunks
+    assert client.calls == 1
+    stats = use_case.response_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_errors_are_not_cached_and_bypass_skips_cache():
+    client = FakeChatClient([{"answer": "par"}, {"error": "boom"}])
+    use_case = ChatWithAgent(client, ChatResponseCache())
+
+    list(use_case.execute("C1", "prompt", "key"))
+    list(use_case.execute("C1", "prompt", "key"))
+    list(use_case.execute("C1", "prompt", None))
+
+    assert client.calls == 3
+    assert use_case.response_cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_and_ttl():
+    cache = ChatResponseCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", [{"answer": "a"}])
+    cache.put("b", [{"answer": "b"}])
+    cache.get("a")
+    cache.put("c", [{"answer": "c"}])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+    expiring = ChatResponseCache(ttl_seconds=0.01)
+    expiring.put("a", [{"answer": "a"}])
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_size_bound():
+    cache = ChatResponseCache(max_bytes=40)
+    cache.put("a", [{"answer": "x" * 10}])
+    cache.put("b", [{"answer": "y" * 10}])
+    assert cache.stats()["bytes"] <= 40
+    assert cache.get("a") is None
+
+
+class RecordingChatClient(FakeChatClient):
+    def __init__(self, chunks):
+        super().__init__(chunks)
+        self.prompts = []
+
+    def chat_with_agent(self, conversation_id, user_prompt):
+        self.prompts.append((conversation_id, user_prompt))
+        return super().chat_with_agent(conversation_id, user_prompt)
+
+
+class NoArchive:
+    def archive(self, *args):
+        pass
+
+    def load(self, *args):
+        return []
+
+
+class NoIndex:
+    def execute(self, **kwargs):
+        pass
+
+
+def test_cached_explanation_does_not_count_as_the_cards_first_turn():
+    from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+    from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+    from backend.use_cases.chat.ask_about_flashcard import AskAboutFlashcard
+    from backend.use_cases.chat.conversation_history import ConversationHistory
+    from backend.use_cases.chat.resumable_streams import ResumableStreams
+
+    client = RecordingChatClient([{"answer": "explicação"}])
+    chat = ChatWithAgent(client, ChatResponseCache())
+    repository = InMemoryStateRepository()
+    ask = AskAboutFlashcard(repository, chat, ConversationHistory(NoArchive()), NoIndex(), ResumableStreams())
+
+    def visit_card():
+        state = AppState(
+            daily_challenge=DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q1", "A1")]),
+            is_loading=False
+        )
+        state.initialize_conversation(0)
+        repository.update_state(state)
+        list(ask.execute(None, explain=True).follow())
+        return state
+
+    visit_card()
+    state = visit_card()
+    assert len(client.prompts) == 1
+    # Served from the cache: the agent's conversation has not seen the card yet
+    assert state.is_first_message_for_card
+    assert state.conversations[0].is_first
+
+    list(ask.execute("e o TTL?").follow())
+    conversation_id, prompt = client.prompts[-1]
+    assert conversation_id == state.conversations[0].id
+    assert prompt.startswith("dada a questão: Q1")
@@ -0,0 +1,126 @@
+import sys
+import os
+import time
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.http.cancellation import on_cancel
+from backend.use_cases.chat.chat_with_agent import CachedReplay
+from backend.use_cases.chat.coalesce_stream import CoalescingConfig, CoalescingMetrics, coalesce
+
+
+def timed_chunks(schedule, closed=None):
+    """Yields {"answer": text} after each (delay_seconds, text) pair."""
+    try:
+        for delay, text in schedule:
+            time.sleep(delay)
+            yield {"answer": text}
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+def test_fast_tokens_are_merged_and_first_is_flushed_alone():
+    metrics = CoalescingMetrics()
+    schedule = [(0, "a")] + [(0.001, "b")] * 20
+    frames = list(coalesce(timed_chunks(schedule), CoalescingConfig(window_ms=200, max_bytes=10), metrics))
+
+    assert frames[0] == {"answer": "a"}
+    assert "".join(f["answer"] for f in frames) == "a" + "b" * 20
+    # Byte threshold splits the rest into frames of 10
+    assert [len(f["answer"]) for f in frames[1:]] == [10, 10]
+
+    stats = metrics.stats()
+    assert stats["answers"] == 1
+    assert stats["chunks_in"] == 21
+    assert stats["frames_out"] == 3
+
+
+def test_buffered_chunk_is_flushed_when_window_expires():
+    # The upstream stalls after two quick tokens; the second must not wait for the third
+    schedule = [(0, "a"), (0.001, "b"), (0.5, "c")]
+    config = CoalescingConfig(window_ms=30, max_bytes=1024, passthrough_gap_ms=1000)
+    started = time.perf_counter()
+    arrivals = []
+    for frame in coalesce(timed_chunks(schedule), config):
+        arrivals.append((frame["answer"], time.perf_counter() - started))
+
+    assert [text for text, _ in arrivals] == ["a", "b", "c"]
+    assert arrivals[1][1] < 0.3
+
+
+def test_slow_upstream_is_passed_through():
+    metrics = CoalescingMetrics()
+    schedule = [(0, "a"), (0.06, "b"), (0.06, "c"), (0.06, "d")]
+    frames = list(coalesce(timed_chunks(schedule), CoalescingConfig(window_ms=20), metrics))
+
+    assert [f["answer"] for f in frames] == ["a", "b", "c", "d"]
+    assert metrics.stats()["max_added_latency_ms"] < 50
+
+
+def test_other_events_flush_the_buffer_and_pass_unchanged():
+    def upstream():
+        yield {"answer": "a"}
+        yield {"answer": "b"}
+        yield {"error": "boom"}
+
+    frames = list(coalesce(upstream(), CoalescingConfig(window_ms=500)))
+    assert frames == [{"answer": "a"}, {"answer": "b"}, {"error": "boom"}]
+
+
+def test_closing_the_frames_closes_the_upstream():
+    closed = []
+    frames = coalesce(timed_chunks([(0, "a")] + [(0.01, "b")] * 50, closed), CoalescingConfig(window_ms=20))
+    next(frames)
+    frames.close()
+
+    deadline = time.time() + 2
+    while not closed and time.time() < deadline:
+        time.sleep(0.01)
+    assert closed
+
+
+def test_closing_the_frames_interrupts_a_stalled_upstream():
+    closed = threading.Event()
+
+    def stalled():
+        woken = threading.Event()
+        on_cancel(woken.set)
+        try:
+            yield {"answer": "a"}
+            # The upstream stops sending: only a cancel ends the wait early
+            woken.wait(10)
+        finally:
+            closed.set()
+
+    frames = coalesce(stalled(), CoalescingConfig(window_ms=20))
+    assert next(frames) == {"answer": "a"}
+    started = time.time()
+    frames.close()
+    assert closed.wait(2)
+    assert time.time() - started < 2
+
+
+def test_cached_replays_keep_their_chunks():
+    chunks = [{"answer": "a"}, {"answer": "b"}, {"answer": "c"}]
+    frames = list(coalesce(CachedReplay(chunk for chunk in chunks), CoalescingConfig(window_ms=500, flush_first=False)))
+    assert frames == chunks
+
+
+def test_zero_window_disables_coalescing():
+    metrics = CoalescingMetrics()
+    frames = list(coalesce(timed_chunks([(0, "a"), (0, "b")]), CoalescingConfig(window_ms=0), metrics))
+    assert frames == [{"answer": "a"}, {"answer": "b"}]
+    assert metrics.stats()["frames_per_answer"] == 2.0
+
+
+def test_request_options_are_clamped():
+    default = CoalescingConfig(window_ms=40, max_bytes=1024)
+    assert CoalescingConfig.from_request(default, None) is default
+    assert CoalescingConfig.from_request(default, {"window_ms": "x"}) is default
+
+    config = CoalescingConfig.from_request(default, {"window_ms": 99999, "max_bytes": 0})
+    assert config.window_ms == 1000
+    assert config.max_bytes == 1
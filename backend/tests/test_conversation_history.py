@@ -0,0 +1,89 @@
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import ConversationState
+from backend.infrastructure.repositories.sqlite_message_archive import SqliteMessageArchive
+from backend.use_cases.chat.conversation_history import ConversationHistory
+
+
+def make_history(tmp_path, window_size=3):
+    archive = SqliteMessageArchive(str(tmp_path / "conversations.db"))
+    return ConversationHistory(archive, window_size=window_size, summary_max_chars=200)
+
+
+def fill(history, conversation, count):
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "bot"
+        history.append(conversation, {"role": role, "content": f"mensagem {i}. detalhe"})
+
+
+def test_window_is_bounded_and_spills(tmp_path):
+    history = make_history(tmp_path)
+    conversation = ConversationState(id="C1")
+    fill(history, conversation, 10)
+
+    assert len(conversation.messages) == 3
+    assert conversation.spilled_count == 7
+    assert conversation.total_messages() == 10
+    assert conversation.messages[0]["content"].startswith("mensagem 7")
+
+
+def test_cursor_pages_newest_first_across_archive(tmp_path):
+    history = make_history(tmp_path)
+    conversation = ConversationState(id="C1")
+    fill(history, conversation, 10)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = history.page(conversation, cursor, limit=4)
+        seen.extend(message["content"].split(".")[0] for message in page)
+        if cursor is None:
+            break
+
+    assert seen == [f"mensagem {i}" for i in range(9, -1, -1)]
+
+
+def test_summary_is_compact(tmp_path):
+    history = make_history(tmp_path)
+    conversation = ConversationState(id="C1")
+    fill(history, conversation, 40)
+
+    summary = history.summarize(conversation)
+    assert len(summary) <= 200
+    assert summary.splitlines()[-1] == "- Resposta: mensagem 39."
+    assert "detalhe" not in summary
+
+
+def test_since_returns_only_unseen_messages(tmp_path):
+    history = make_history(tmp_path)
+    conversation = ConversationState(id="C1")
+    fill(history, conversation, 10)
+
+    assert [m["seq"] for m in conversation.messages] == [8, 9, 10]
+
+    messages, has_more = history.since(conversation, 5)
+    assert [m["seq"] for m in messages] == [6, 7, 8, 9, 10]
+    assert not has_more
+
+    messages, has_more = history.since(conversation, 0, limit=4)
+    assert [m["seq"] for m in messages] == [1, 2, 3, 4]
+    assert has_more
+
+    assert history.since(conversation, 10) == ([], False)
+
+
+def test_wait_for_change(tmp_path):
+    import threading
+
+    history = make_history(tmp_path)
+    conversation = ConversationState(id="C1")
+    assert not history.wait_for_change(conversation, 0, timeout=0.01)
+
+    timer = threading.Timer(0.05, lambda: fill(history, conversation, 1))
+    timer.start()
+    assert history.wait_for_change(conversation, 0, timeout=2)
+    timer.join()
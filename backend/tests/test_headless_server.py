@@ -0,0 +1,118 @@
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.repositories.sqlite_state_repository import SqliteStateRepository
+from backend.presentation.lifecycle import ServerLifecycle
+
+
+def make_state() -> AppState:
+    state = AppState(
+        daily_challenge=DailyChallenge(
+            date="2026-10-19",
+            scenario=Scenario(title="Cache", description="LRU"),
+            flashcards=[Flashcard(question="Q1", answer="A1"), Flashcard(question="Q2", answer="A2")]
+        ),
+        is_loading=False
+    )
+    state.initialize_conversation(0)
+    state.conversations[0].messages.append({"role": "bot", "content": "oi"})
+    return state
+
+
+def test_app_state_round_trip():
+    state = make_state()
+    copy = AppState.from_dict(state.to_dict())
+    assert copy == state
+    assert list(copy.conversations) == [0]
+
+
+def test_workers_share_state_through_sqlite(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteStateRepository(path)
+    worker_b = SqliteStateRepository(path)
+
+    state = make_state()
+    worker_a.update_state(state)
+    seen_by_b = worker_b.get_state()
+    assert seen_by_b.get_current_date() == "2026-10-19"
+    # Unchanged state: the same object is handed out again
+    assert worker_b.get_state() is seen_by_b
+
+    seen_by_b.next_flashcard()
+    worker_b.update_state(seen_by_b)
+    assert worker_a.get_state().current_flashcard_index == 1
+    assert worker_a.get_state() is not state
+
+
+def test_concurrent_writes_are_merged_not_reverted(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteStateRepository(path)
+    worker_b = SqliteStateRepository(path)
+    worker_a.update_state(make_state())
+
+    # A holds the state while an answer streams; meanwhile B moves to the next card
+    held_by_a = worker_a.get_state()
+    seen_by_b = worker_b.get_state()
+    seen_by_b.next_flashcard()
+    worker_b.update_state(seen_by_b)
+
+    held_by_a.conversations[0].messages.append({"role": "bot", "content": "answer"})
+    worker_a.update_state(held_by_a)
+
+    for worker in (worker_a, worker_b):
+        state = worker.get_state()
+        assert state.current_flashcard_index == 1
+        assert [m["content"] for m in state.conversations[0].messages] == ["oi", "answer"]
+        assert 1 in state.conversations
+
+    # A's object merges again on its next write instead of publishing its stale index
+    held_by_a.conversations[0].summary = "short"
+    worker_a.update_state(held_by_a)
+    assert worker_b.get_state().current_flashcard_index == 1
+    assert worker_b.get_state().conversations[0].summary == "short"
+
+
+def test_a_new_day_is_not_mixed_with_the_old_one(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = SqliteStateRepository(path)
+    worker_b = SqliteStateRepository(path)
+    worker_a.update_state(make_state())
+    held_by_a = worker_a.get_state()
+
+    next_day = AppState(
+        daily_challenge=DailyChallenge("2026-10-20", Scenario("Queue", "FIFO"), [Flashcard("Q", "A")]),
+        is_loading=False
+    )
+    worker_b.update_state(next_day)
+
+    held_by_a.conversations[0].messages.append({"role": "bot", "content": "late answer"})
+    worker_a.update_state(held_by_a)
+    state = worker_b.get_state()
+    assert state.get_current_date() == "2026-10-20"
+    assert state.conversations == {}
+
+
+def test_drain_wakes_idle_streams_and_waits_for_active_ones():
+    lifecycle = ServerLifecycle()
+    woken = threading.Event()
+    lifecycle.on_drain(woken.set)
+
+    def answer():
+        yield "a"
+        yield "b"
+
+    stream = lifecycle.track(answer())
+    assert next(stream) == "a"
+    assert lifecycle.stats() == {"active_streams": 1, "draining": False}
+
+    lifecycle.begin_drain()
+    assert woken.is_set()
+    assert not lifecycle.wait_idle(timeout=0.05)
+
+    assert list(stream) == ["b"]
+    assert lifecycle.wait_idle(timeout=0.05)
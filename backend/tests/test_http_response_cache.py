@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.cache.http_response_cache import HttpResponseCache, CachePolicy
+
+URL = "https://api.example.com/v1/agents?visibility=personal"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+
+class FakeServer:
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, url, headers):
+        self.requests.append(dict(headers))
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304, headers={"ETag": self.etag})
+        return FakeResponse(200, json.dumps(self.body).encode(), {"ETag": self.etag, "Content-Type": "application/json"})
+
+
+def make_cache(tmp_path, ttl=60):
+    return HttpResponseCache(str(tmp_path), {"https://api.example.com/v1/agents": CachePolicy(ttl_seconds=ttl)})
+
+
+def test_fresh_entries_are_served_from_memory_then_disk(tmp_path):
+    server = FakeServer([{"id": "A", "name": "Agent"}])
+
+    cache = make_cache(tmp_path)
+    assert cache.get(URL, {}, "realm:client", server).source == "network"
+    assert cache.get(URL, {}, "realm:client", server).json() == [{"id": "A", "name": "Agent"}]
+    assert len(server.requests) == 1
+
+    # A new process starts with an empty memory tier but finds the file
+    restarted = make_cache(tmp_path)
+    response = restarted.get(URL, {}, "realm:client", server)
+    assert response.source == "disk"
+    assert len(server.requests) == 1
+
+
+def test_stale_entries_are_revalidated_with_etag(tmp_path):
+    server = FakeServer(["agents"])
+    cache = make_cache(tmp_path, ttl=0)
+
+    cache.get(URL, {"Authorization": "Bearer t"}, "realm:client", server)
+    response = cache.get(URL, {"Authorization": "Bearer t"}, "realm:client", server)
+
+    assert response.source == "revalidated"
+    assert response.json() == ["agents"]
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_scopes_are_isolated_and_invalidated_separately(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.get(URL, {}, "realm-a:client", FakeServer(["a"]))
+    other = FakeServer(["b"])
+
+    assert cache.get(URL, {}, "realm-b:client", other).json() == ["b"]
+    assert len(other.requests) == 1
+
+    cache.invalidate("realm-a:client")
+    refetch = FakeServer(["a2"])
+    assert cache.get(URL, {}, "realm-a:client", refetch).json() == ["a2"]
+    assert cache.get(URL, {}, "realm-b:client", refetch).json() == ["b"]
+
+
+def test_uncached_endpoints_and_errors_pass_through(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+
+    def failing(url, headers):
+        calls.append(url)
+        return FakeResponse(500, b"boom")
+
+    assert cache.get("https://api.example.com/v1/other", {}, "s", failing).status_code == 500
+    assert cache.get(URL, {}, "s", failing).status_code == 500
+    assert cache.get(URL, {}, "s", failing).status_code == 500
+    assert len(calls) == 3
@@ -0,0 +1,98 @@
+import sys
+import os
+import json
+import threading
+from types import SimpleNamespace
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.http.rate_limiter import RateLimiter
+from backend.infrastructure.rendering.markdown_renderer import MarkdownRenderer
+from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+from backend.presentation.js_bridge import JsBridge, attach_window
+from backend.use_cases.chat.ask_about_flashcard import AskAboutFlashcard
+from backend.use_cases.chat.conversation_history import ConversationHistory
+from backend.use_cases.chat.resumable_streams import ResumableStreams
+
+
+class FakeChat:
+    def execute(self, conversation_id, user_prompt, cache_key=None):
+        return iter([{"answer": "Olá"}, {"answer": ", mundo"}])
+
+
+class FakeArchive:
+    def append(self, *args, **kwargs):
+        pass
+
+
+class FakeIndex:
+    def execute(self, **kwargs):
+        pass
+
+
+class FakeWindow:
+    """Records the scripts the bridge evaluates in the page."""
+
+    def __init__(self):
+        self.scripts = []
+        self.closed = threading.Event()
+
+    def evaluate_js(self, script):
+        self.scripts.append(script)
+        if script.startswith("window.__dailystackBridge.close"):
+            self.closed.set()
+
+
+def make_bridge():
+    repository = InMemoryStateRepository()
+    state = AppState(
+        daily_challenge=DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q1", "A1"), Flashcard("Q2", "A2")]),
+        is_loading=False
+    )
+    state.initialize_conversation(0)
+    repository.update_state(state)
+
+    history = ConversationHistory(FakeArchive())
+    renderer = MarkdownRenderer()
+    container = SimpleNamespace(
+        state_repository=repository,
+        conversation_history=history,
+        markdown_renderer=renderer,
+        rate_limiter=RateLimiter(),
+        pregenerate_explanations=SimpleNamespace(focus=lambda index: None),
+        record_study_event=SimpleNamespace(execute=lambda *args, **kwargs: True),
+        ask_about_flashcard=AskAboutFlashcard(
+            repository, FakeChat(), history, FakeIndex(), ResumableStreams(), markdown_renderer=renderer
+        )
+    )
+    return JsBridge(container), state
+
+
+def test_bridge_returns_the_route_payloads():
+    bridge, state = make_bridge()
+    assert bridge.get_status()["flashcards_ready"] == 2
+    assert bridge.get_scenario() == {"title": "Cache", "description": "LRU"}
+    assert bridge.get_current_flashcard()["question"] == "Q1"
+    assert bridge.next_flashcard()["conversation_id"] == state.conversations[1].id
+    assert bridge.stats()["calls"]["get_status"]["count"] == 1
+
+
+def test_answer_is_pushed_to_the_page_as_sse_frames():
+    bridge, state = make_bridge()
+    window = FakeWindow()
+    attach_window(bridge, window)
+
+    result = bridge.ask_llm("req-1", {"question": "oi"})
+    assert window.closed.wait(5)
+
+    pushes = [script for script in window.scripts if script.startswith("window.__dailystackBridge.push")]
+    frames = [json.loads(script[script.index(", ") + 2:-1]) for script in pushes]
+    assert frames[0].startswith(f"id: {result['stream_id']}:1\n")
+    answer = "".join(json.loads(frame.split("data: ")[1])["answer"] for frame in frames)
+    assert answer == "Olá, mundo"
+
+    history = bridge.get_chat_history(0)
+    assert [message["role"] for message in history["messages"]] == ["user", "bot"]
+    assert "html" in history["messages"][1]
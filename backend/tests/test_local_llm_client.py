@@ -0,0 +1,168 @@
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.http.local_llm_client import LocalChallengeClient, LocalChatClient, LocalAgentClient
+from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.chat.coalesce_stream import CoalescingConfig, coalesce
+
+
+CHALLENGE = {
+    "date": "2026-01-01",
+    "scenario": {"title": "Fila", "problem_description": "Mensagens duplicadas", "solution_description": "Idempotência"},
+    "flashcards": [{"id": 1, "question": "Q1", "answer": "A1"}, {"id": 2, "question": "Q2", "answer": "A2"}]
+}
+
+
+def sse(deltas):
+    lines = [f"data: {json.dumps({'choices': [{'delta': {'content': d}}]})}".encode("utf-8") for d in deltas]
+    return lines + [b"data: [DONE]"]
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, lines=None, body=None):
+        self.lines = lines or []
+        self.body = body
+        self.closed = False
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def json(self):
+        return self.body
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.payloads = []
+        self.options = []
+
+    def post(self, url, json=None, **kwargs):
+        self.payloads.append(json)
+        self.options.append(kwargs)
+        return self.responses.pop(0)
+
+
+def test_stream_challenge_from_completion_deltas():
+    text = json.dumps(CHALLENGE)
+    client = LocalChallengeClient("http://localhost:8080/v1/")
+    client.session = FakeSession([FakeResponse(sse([text[i:i + 9] for i in range(0, len(text), 9)]))])
+
+    events = list(client.stream_daily_challenge("qwen2.5"))
+
+    assert [kind for kind, _ in events] == ["scenario", "flashcard", "flashcard", "challenge"]
+    assert client.session.payloads[0]["model"] == "qwen2.5"
+
+
+def test_get_challenge_validates_schema():
+    schema = {"type": "object", "required": ["date", "scenario", "flashcards"]}
+    body = {"choices": [{"message": {"content": json.dumps({"scenario": {}})}}]}
+    client = LocalChallengeClient(output_schema=schema)
+    client.session = FakeSession([FakeResponse(body=body)])
+
+    try:
+        client.get_daily_challenge("model", validate_schema=True)
+        assert False, "expected a schema error"
+    except Exception as e:
+        assert "does not match output schema" in str(e)
+
+
+def test_chat_sends_the_stored_turns_with_a_timeout():
+    from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+    from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+    from backend.use_cases.chat.conversation_turns import ConversationTurns
+
+    state = AppState(
+        daily_challenge=DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q1", "A1")]),
+        is_loading=False
+    )
+    conversation_id = state.initialize_conversation(0)
+    state.conversations[0].messages = [
+        {"role": "user", "content": "oi"},
+        {"role": "bot", "content": "Olá!"},
+        {"role": "user", "content": "como vai?"},
+        {"role": "bot", "content": "Tudo bem"},
+        {"role": "user", "content": "e agora?"}
+    ]
+    repository = InMemoryStateRepository()
+    repository.update_state(state)
+
+    # A fresh client (another worker, or after a restart) still has the card and the recent turns
+    client = LocalChatClient(model="m", history=ConversationTurns(repository, max_turns=1).execute, timeout=30)
+    client.session = FakeSession([FakeResponse(sse(["Sim"]))])
+
+    assert [e["answer"] for e in client.chat_with_agent(conversation_id, "e agora?")] == ["Sim"]
+
+    messages = client.session.payloads[0]["messages"]
+    assert messages[1] == {"role": "system", "content": "O usuário está estudando o flashcard: Q1 Resposta: A1"}
+    assert [(m["role"], m["content"]) for m in messages[2:]] == [
+        ("user", "como vai?"), ("assistant", "Tudo bem"), ("user", "e agora?")
+    ]
+    assert client.session.options[0]["timeout"] == 30
+    assert client.get_stats()["streams_completed"] == 1
+
+
+def test_chat_without_history_sends_only_the_prompt():
+    client = LocalChatClient(model="m")
+    client.session = FakeSession([FakeResponse(sse(["Olá"]))])
+
+    list(client.chat_with_agent("C1", "oi"))
+
+    assert [m["role"] for m in client.session.payloads[0]["messages"]] == ["system", "user"]
+    assert client.session.options[0]["timeout"] == 300
+
+
+def test_local_agent_uses_model_as_id():
+    ensure = EnsureAgentExists(LocalAgentClient("llama3"), "Flashcards", "desc", "prompt")
+    assert ensure.execute() == "llama3"
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    """Sends one delta, then stops sending without closing the response."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        event = sse(["Olá"])[0] + b"\n\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+        self.wfile.flush()
+        time.sleep(5)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_closing_a_coalesced_answer_interrupts_a_stalled_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = LocalChatClient(f"http://127.0.0.1:{server.server_port}/v1", model="m")
+        frames = coalesce(client.chat_with_agent("C1", "oi"), CoalescingConfig(window_ms=20))
+        assert next(frames) == {"answer": "Olá"}
+        frames.close()
+
+        deadline = time.time() + 2
+        while not client.get_stats()["streams_cancelled"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert client.get_stats()["streams_cancelled"] == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,82 @@
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.rendering.markdown_renderer import MarkdownRenderer
+
+
+def test_block_and_inline_markup():
+    html = MarkdownRenderer().render(
+        "## Cache\n\nUse **LRU** with *TTL* and `get()`.\n\n- um\n- dois\n\n1. a\n2. b\n\n> nota"
+    )
+    assert "<h2>Cache</h2>" in html
+    assert "<p>Use <strong>LRU</strong> with <em>TTL</em> and <code>get()</code>.</p>" in html
+    assert "<ul><li>um</li><li>dois</li></ul>" in html
+    assert "<ol><li>a</li><li>b</li></ol>" in html
+    assert "<blockquote><p>nota</p></blockquote>" in html
+
+
+def test_raw_html_and_unsafe_links_are_neutralized():
+    html = MarkdownRenderer().render(
+        '<script>alert(1)</script> [x](javascript:alert(1)) [ok](https://example.com/?a=1&b="2")'
+    )
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+    assert 'href="javascript' not in html
+    assert 'href="https://example.com/?a=1&amp;b=&quot;2&quot;"' in html
+
+
+def test_code_is_escaped_and_never_interpreted():
+    html = MarkdownRenderer().render("```python\nx = '<b>**not bold**</b>'\n```\n\nfim `**a**`")
+    assert "<pre" in html and "<strong>" not in html
+    assert "&lt;b&gt;" in html
+    assert "<code>**a**</code>" in html
+
+
+def test_snake_case_is_not_emphasized():
+    assert "<em>" not in MarkdownRenderer().render("use max_entries and ttl_seconds")
+
+
+def test_link_urls_are_not_emphasized():
+    html = MarkdownRenderer().render(
+        "[docs](https://example.com/_private_/x) [a](https://x.com/**b**) [**bold** label](https://x.com)"
+    )
+    assert 'href="https://example.com/_private_/x"' in html
+    assert 'href="https://x.com/**b**"' in html
+    assert '<a href="https://x.com" target="_blank" rel="noopener noreferrer"><strong>bold</strong> label</a>' in html
+    assert "<em>private</em>" not in html
+
+
+def test_dunder_names_are_not_bold():
+    html = MarkdownRenderer().render("edit __init__.py and a**b**c, but __this__ is bold")
+    assert "__init__.py" in html
+    assert "a**b**c" in html
+    assert "<strong>this</strong>" in html
+
+
+def test_nul_characters_cannot_forge_placeholders():
+    html = MarkdownRenderer().render("`a` \x005\x00 b \x000\x00")
+    assert html == "<p><code>a</code> \ufffd5\ufffd b \ufffd0\ufffd</p>"
+
+
+def test_rendered_html_is_cached_by_content():
+    renderer = MarkdownRenderer(max_entries=2)
+    first = renderer.render("**a**")
+    assert renderer.render("**a**") == first
+    renderer.render("b")
+    renderer.render("c")
+    renderer.render("**a**")
+
+    stats = renderer.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["entries"] == 2
+
+
+def test_bare_code_example_becomes_a_code_block():
+    renderer = MarkdownRenderer()
+    assert renderer.render_code("a < b") == '<pre class="highlight"><code>a &lt; b</code></pre>'
+    assert "<pre" in renderer.render_code("```js\nlet a = 1\n```")
+    assert renderer.render_code(None) == ""
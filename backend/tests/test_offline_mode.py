@@ -0,0 +1,186 @@
+import sys
+import os
+from datetime import date, timedelta
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+import pytest
+
+from backend.domain.entities import DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.http.circuit_breaker import CircuitBreaker
+from backend.infrastructure.repositories.content_pack import ContentPack, write_content_pack, main
+from backend.infrastructure.repositories.file_challenge_store import FileChallengeStore
+from backend.infrastructure.repositories.offline_challenge_repository import OfflineChallengeRepository
+from backend.use_cases.admission.admission_controller import AdmissionRejected
+from backend.use_cases.challenges.get_daily_challenge import GetDailyChallenge
+from backend.use_cases.challenges.stream_daily_challenge import StreamDailyChallenge
+
+
+def make_challenges(start, days):
+    return [
+        DailyChallenge(
+            date=str(start + timedelta(days=i)),
+            scenario=Scenario(f"Cenário {i}", "Descrição"),
+            flashcards=[Flashcard(f"Q{i}", f"A{i}")]
+        )
+        for i in range(days)
+    ]
+
+
+def test_pack_maps_dates_to_slots_and_wraps(tmp_path):
+    path = str(tmp_path / "content.pack")
+    assert write_content_pack(make_challenges(date(2026, 1, 1), 3), path) == 3
+    pack = ContentPack(path)
+
+    assert pack.get("2026-01-02").scenario.title == "Cenário 1"
+    # Past the end the pack starts over, dated as requested
+    wrapped = pack.get("2026-01-05")
+    assert wrapped.scenario.title == "Cenário 1"
+    assert wrapped.date == "2026-01-05"
+    assert pack.get("2025-12-31").scenario.title == "Cenário 2"
+    assert pack.get("not a date") is None
+    pack.close()
+
+
+def test_pack_with_gaps_finds_each_stored_date(tmp_path):
+    path = str(tmp_path / "content.pack")
+    challenges = [
+        DailyChallenge(day, Scenario(f"Cenário {day}", "Descrição"), [Flashcard("Q", "A")])
+        for day in ("2026-01-10", "2026-01-01", "2026-01-03")
+    ]
+    assert write_content_pack(challenges, path) == 3
+    pack = ContentPack(path)
+
+    for day in ("2026-01-01", "2026-01-03", "2026-01-10"):
+        assert pack.get(day).scenario.title == f"Cenário {day}"
+    # A gap has no challenge rather than another day's
+    assert pack.get("2026-01-02") is None
+    assert pack.get("2026-01-09") is None
+    # Outside the stored range the pack still repeats
+    assert pack.get("2026-01-11").scenario.title == "Cenário 2026-01-03"
+    pack.close()
+
+
+def test_pack_rejects_duplicate_dates(tmp_path):
+    challenges = make_challenges(date(2026, 1, 1), 2) * 2
+    with pytest.raises(ValueError):
+        write_content_pack(challenges, str(tmp_path / "content.pack"))
+
+
+def test_pack_builder_reads_challenge_store(tmp_path):
+    store = FileChallengeStore(str(tmp_path / "challenges"))
+    for challenge in make_challenges(date(2026, 2, 1), 2):
+        store.save(challenge)
+
+    output = str(tmp_path / "content.pack")
+    assert main([store.directory, output]) == 0
+    assert ContentPack(output).count == 2
+
+
+def test_invalid_or_missing_pack_disables_offline_mode(tmp_path):
+    assert not OfflineChallengeRepository(str(tmp_path / "missing.pack")).available
+
+    bogus = tmp_path / "bogus.pack"
+    bogus.write_bytes(b"not a pack at all, definitely not")
+    assert not OfflineChallengeRepository(str(bogus)).available
+
+
+def test_circuit_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    now[0] = 10
+    assert breaker.allow_request()
+    # Only one trial call while half open
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+class FakeEnsureAgent:
+    def __init__(self, agent_id="AGENT"):
+        self.agent_id = agent_id
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        return self.agent_id
+
+
+class FailingClient:
+    def get_daily_challenge(self, agent_id):
+        raise Exception("Connection refused")
+
+
+class FakeOffline:
+    def get_daily_challenge(self):
+        return DailyChallenge(date=str(date.today()), scenario=Scenario("Offline", "D"), flashcards=[Flashcard("Q", "A")])
+
+
+def test_falls_back_to_offline_and_stops_calling_upstream():
+    ensure = FakeEnsureAgent()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    get = GetDailyChallenge(FailingClient(), ensure, offline_repository=FakeOffline(), circuit_breaker=breaker)
+
+    assert get.execute().scenario.title == "Offline"
+    assert get.execute().scenario.title == "Offline"
+    assert breaker.state == "open"
+
+    # Circuit open: the offline pack answers without touching upstream
+    assert get.execute().scenario.title == "Offline"
+    assert ensure.calls == 2
+
+
+def test_missing_credentials_use_offline_pack():
+    get = GetDailyChallenge(FailingClient(), FakeEnsureAgent(agent_id=None), offline_repository=FakeOffline())
+
+    assert get.execute().scenario.title == "Offline"
+
+
+class RejectingAdmission:
+    def acquire(self, priority, max_wait=None):
+        raise AdmissionRejected("busy", queue_position=1, retry_after=1)
+
+
+class EndlessStreamClient:
+    def stream_daily_challenge(self, agent_id):
+        yield "scenario", Scenario("Cache", "LRU")
+        yield "flashcard", Flashcard("Q", "A")
+
+
+def half_open_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 10
+    return breaker
+
+
+def test_trial_without_verdict_is_released():
+    breaker = half_open_breaker()
+    get = GetDailyChallenge(FailingClient(), FakeEnsureAgent(), admission=RejectingAdmission(), circuit_breaker=breaker)
+    with pytest.raises(AdmissionRejected):
+        get.execute()
+    # The rejected trial does not keep the circuit closed to every later call
+    assert breaker.allow_request()
+
+    breaker = half_open_breaker()
+    stream = StreamDailyChallenge(EndlessStreamClient(), FakeEnsureAgent(), circuit_breaker=breaker).execute()
+    assert next(stream)[0] == "scenario"
+    stream.close()
+    assert breaker.allow_request()
+
+    breaker = half_open_breaker()
+    stream = StreamDailyChallenge(
+        EndlessStreamClient(), FakeEnsureAgent(), admission=RejectingAdmission(), circuit_breaker=breaker
+    ).execute()
+    with pytest.raises(AdmissionRejected):
+        next(stream)
+    assert breaker.allow_request()
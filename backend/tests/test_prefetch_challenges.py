@@ -0,0 +1,102 @@
+import sys
+import os
+import threading
+from datetime import date
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.http.json_schema import validate
+from backend.infrastructure.repositories.file_challenge_store import FileChallengeStore
+from backend.use_cases.challenges.prefetch_challenges import PrefetchChallenges
+
+
+class FakeEnsureAgent:
+    def execute(self):
+        return "AGENT"
+
+
+class FakeChallengeClient:
+    def __init__(self, fail_every=None):
+        self.conversations = []
+        self.prompts = []
+        self.fail_every = fail_every
+        self._lock = threading.Lock()
+
+    def get_daily_challenge(self, agent_id, conversation_id=None, validate_schema=False, user_prompt=None):
+        with self._lock:
+            self.conversations.append(conversation_id)
+            self.prompts.append(user_prompt)
+            count = len(self.conversations)
+        if self.fail_every and count % self.fail_every == 0:
+            raise Exception("Agent response does not match output schema")
+        return DailyChallenge(date="1999-01-01", scenario=Scenario(f"T{count}", "D"), flashcards=[Flashcard("Q", "A")])
+
+
+def test_fills_missing_days_on_separate_conversations(tmp_path):
+    store = FileChallengeStore(str(tmp_path))
+    store.save(DailyChallenge(date="2026-03-02", scenario=Scenario("Existing", "D")))
+    client = FakeChallengeClient()
+    prefetch = PrefetchChallenges(client, FakeEnsureAgent(), store, days=4, parallelism=2)
+
+    generated = prefetch.execute(start=date(2026, 3, 1))
+
+    assert sorted(generated) == ["2026-03-01", "2026-03-03", "2026-03-04"]
+    assert store.dates() == ["2026-03-01", "2026-03-02", "2026-03-03", "2026-03-04"]
+    assert len(set(client.conversations)) == 3
+    assert store.get("2026-03-02").scenario.title == "Existing"
+    assert store.get("2026-03-03").date == "2026-03-03"
+
+    # Nothing left to do on the next run
+    assert prefetch.execute(start=date(2026, 3, 1)) == []
+
+
+def test_prompts_name_the_date_and_the_titles_already_taken(tmp_path):
+    store = FileChallengeStore(str(tmp_path))
+    store.save(DailyChallenge(date="2026-02-28", scenario=Scenario("Ontem", "D")))
+    client = FakeChallengeClient()
+    prefetch = PrefetchChallenges(client, FakeEnsureAgent(), store, days=3, parallelism=1)
+
+    prefetch.execute(start=date(2026, 3, 1))
+
+    assert client.prompts == [
+        "proximo cenário, para o dia 2026-03-01, com um tema diferente destes cenários já usados: Ontem",
+        "proximo cenário, para o dia 2026-03-02, com um tema diferente destes cenários já usados: Ontem; T1",
+        "proximo cenário, para o dia 2026-03-03, com um tema diferente destes cenários já usados: Ontem; T1; T2"
+    ]
+
+
+def test_failed_days_are_retried_next_run(tmp_path):
+    store = FileChallengeStore(str(tmp_path))
+    prefetch = PrefetchChallenges(FakeChallengeClient(fail_every=2), FakeEnsureAgent(), store, days=4, parallelism=1)
+
+    assert len(prefetch.execute(start=date(2026, 3, 1))) == 2
+    assert len(prefetch.execute(start=date(2026, 3, 1))) == 1
+    assert len(store.dates()) == 3
+
+
+def test_store_round_trip(tmp_path):
+    store = FileChallengeStore(str(tmp_path))
+    challenge = DailyChallenge(date="2026-03-01", scenario=Scenario("T", "Desc"),
+                               flashcards=[Flashcard("Q", "A", detailed_explanation="E")])
+    store.save(challenge)
+    assert store.get("2026-03-01") == challenge
+    assert store.get("../etc") is None
+
+
+def test_schema_validation():
+    schema = {
+        "type": "object",
+        "properties": {"flashcards": {"type": "array", "items": {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}},
+            "required": ["id", "question"]
+        }}},
+        "required": ["flashcards"]
+    }
+    assert validate({"flashcards": [{"id": 1, "question": "q"}]}, schema) == []
+    errors = validate({"flashcards": [{"id": True}]}, schema)
+    assert "$.flashcards[0]: missing required property 'question'" in errors
+    assert "$.flashcards[0].id: expected integer, got bool" in errors
+    assert validate({}, schema) == ["$: missing required property 'flashcards'"]
@@ -0,0 +1,132 @@
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+from backend.use_cases.admission.admission_controller import Priority
+from backend.use_cases.chat.chat_with_agent import CachedReplay
+from backend.use_cases.chat.pregenerate_explanations import PregenerateExplanations
+
+
+class FakeChat:
+    """Answers "explanation of <question>" in two chunks, optionally held between them."""
+
+    def __init__(self, hold: threading.Event = None):
+        self.hold = hold
+        self.calls = []
+        self.started = threading.Event()
+
+    def execute(self, conversation_id, user_prompt, cache_key=None, priority=None, max_wait=None):
+        self.calls.append((conversation_id, priority))
+        question = user_prompt.split("dada a questão: ")[1].split(" e dada")[0]
+
+        def stream():
+            yield {"answer": "explanation of "}
+            self.started.set()
+            if self.hold:
+                self.hold.wait(5)
+            yield {"answer": question}
+        return stream()
+
+
+def install(cards: int) -> InMemoryStateRepository:
+    repository = InMemoryStateRepository()
+    state = AppState(
+        daily_challenge=DailyChallenge(
+            date="2026-10-19",
+            scenario=Scenario("Cache", "LRU"),
+            flashcards=[Flashcard(f"Q{i}", f"A{i}") for i in range(cards)]
+        ),
+        is_loading=False
+    )
+    state.initialize_conversation(0)
+    repository.update_state(state)
+    return repository
+
+
+def wait_idle(pipeline: PregenerateExplanations):
+    for _ in range(200):
+        stats = pipeline.stats()
+        if stats["queued"] == 0 and stats["running"] == 0:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("explanations still running")
+
+
+def test_cards_are_explained_in_background_next_card_first():
+    repository = install(3)
+    chat = FakeChat()
+    pipeline = PregenerateExplanations(chat, repository, parallelism=1)
+    state = repository.get_state()
+
+    assert pipeline.execute(state.daily_challenge) == 3
+    # Already known cards are not queued twice
+    assert pipeline.execute(state.daily_challenge) == 0
+    wait_idle(pipeline)
+
+    order = [next(i for i, c in state.conversations.items() if c.id == call[0]) for call in chat.calls]
+    assert order == [1, 2, 0]
+    assert all(priority == Priority.BACKGROUND for _, priority in chat.calls)
+    assert state.conversations[2].explanation == "explanation of Q2"
+    assert not state.conversations[2].is_first
+    # Card 0 is on screen: its first message is now plain
+    assert not state.is_first_message_for_card
+    assert state.current_flashcard_index == 0
+    assert pipeline.stats()["generated"] == 3
+
+
+def test_opening_a_card_joins_the_running_explanation():
+    repository = install(2)
+    hold = threading.Event()
+    chat = FakeChat(hold)
+    pipeline = PregenerateExplanations(chat, repository, parallelism=1)
+    pipeline.execute(repository.get_state().daily_challenge)
+
+    assert chat.started.wait(5)
+    job = pipeline.claim("2026-10-19", 1)
+    assert job is not None
+    follower = job.events()
+    assert next(follower) == {"answer": "explanation of "}
+    hold.set()
+    assert list(follower) == [{"answer": "Q1"}]
+    assert pipeline.stats()["served_joined"] == 1
+
+
+def test_queued_card_is_dropped_when_opened():
+    repository = install(2)
+    hold = threading.Event()
+    chat = FakeChat(hold)
+    pipeline = PregenerateExplanations(chat, repository, parallelism=1)
+    pipeline.execute(repository.get_state().daily_challenge)
+    assert chat.started.wait(5)
+
+    # Card 0 waits behind card 1: the request asks the agent itself
+    assert pipeline.claim("2026-10-19", 0) is None
+    hold.set()
+    wait_idle(pipeline)
+    assert len(chat.calls) == 1
+    assert pipeline.stats()["dropped"] == 1
+
+
+class CachedFakeChat(FakeChat):
+    """Serves every explanation from the response cache."""
+
+    def execute(self, *args, **kwargs):
+        return CachedReplay(super().execute(*args, **kwargs))
+
+
+def test_cached_explanation_leaves_the_card_context_pending():
+    repository = install(2)
+    pipeline = PregenerateExplanations(CachedFakeChat(), repository, parallelism=1)
+    state = repository.get_state()
+    pipeline.execute(state.daily_challenge)
+    wait_idle(pipeline)
+
+    assert state.conversations[1].explanation == "explanation of Q1"
+    # The agent never received the card: the first real question must still carry it
+    assert state.conversations[1].is_first
+    assert state.is_first_message_for_card
@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+import pytest
+from backend.infrastructure.http.rate_limiter import (
+    RateLimiter, RateLimitExceeded, TokenBucket, parse_limits
+)
+
+HOST = "genai-code-buddy-api.stackspot.com"
+URL = f"https://{HOST}/v3/chat"
+
+
+def test_parse_limits():
+    assert parse_limits("a.com=1:5; b.com=0.5") == {"a.com": (1.0, 5.0), "b.com": (0.5, 0.5)}
+
+
+def test_burst_then_smoothing():
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 0
+    wait = bucket.reserve(1)
+    assert 0 < wait <= 0.011
+    assert bucket.throttled == 1
+
+
+def test_rejects_when_wait_too_long():
+    limiter = RateLimiter(host_limits={HOST: (0.1, 1)}, max_wait_seconds=0.5)
+    limiter.acquire_host(URL)
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.acquire_host(URL)
+    assert excinfo.value.retry_after > 0.5
+
+
+def test_unconfigured_host_and_session_are_not_limited():
+    limiter = RateLimiter()
+    for _ in range(100):
+        assert limiter.acquire_host("https://example.com/x") == 0
+        assert limiter.acquire_session("s1") == 0
+
+
+def test_retry_after_header_blocks_host():
+    limiter = RateLimiter(host_limits={HOST: (100, 10)}, max_wait_seconds=0.1)
+    limiter.observe(URL, 429, {"Retry-After": "30"})
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire_host(URL)
+    assert limiter.snapshot()["hosts"][HOST]["blocked_for_seconds"] > 29
+
+
+def test_remaining_header_caps_tokens():
+    limiter = RateLimiter(host_limits={HOST: (1, 10)})
+    limiter.observe(URL, 200, {"X-RateLimit-Remaining": "1"})
+    assert limiter.snapshot()["hosts"][HOST]["tokens"] <= 1.01
+
+
+def test_sessions_have_separate_buckets():
+    limiter = RateLimiter(session_limit=(0.1, 1), max_wait_seconds=0)
+    limiter.acquire_session("a")
+    limiter.acquire_session("b")
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire_session("a")
+    assert set(limiter.snapshot()["sessions"]) == {"a", "b"}
@@ -0,0 +1,76 @@
+import sys
+import os
+import zlib
+import json
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+from backend.infrastructure.compression.response_compressor import CompressionConfig, CompressionMetrics
+from backend.presentation.compression_middleware import init_compression
+
+
+def make_app(metrics: CompressionMetrics) -> Flask:
+    app = Flask(__name__)
+    frames = [f"data: {json.dumps({'answer': f'token {i} ' * 20})}\n\n" for i in range(5)]
+
+    @app.route('/api/ask-llm')
+    def ask():
+        return Response(stream_with_context(iter(frames)), content_type='text/event-stream')
+
+    @app.route('/api/chat/history')
+    def history():
+        size = int(request.args.get("size", 200))
+        return jsonify({"messages": [{"role": "bot", "content": "Resposta longa"} for _ in range(size)]})
+
+    @app.route('/api/other')
+    def other():
+        return jsonify({"messages": ["x"] * 500})
+
+    init_compression(app, CompressionConfig(routes=("/api/ask-llm", "/api/chat/history")), metrics)
+    app.frames = frames
+    return app
+
+
+def test_sse_frames_decode_as_they_arrive():
+    metrics = CompressionMetrics()
+    app = make_app(metrics)
+    response = app.test_client().get('/api/ask-llm', headers={"Accept-Encoding": "gzip, deflate"}, buffered=False)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    decoder = zlib.decompressobj(31)
+    received = []
+    for chunk in response.response:
+        received.append(decoder.decompress(chunk).decode())
+    response.close()
+
+    # Each compressed chunk carries exactly one whole frame
+    assert received[:len(app.frames)] == app.frames
+    stats = metrics.stats()["/api/ask-llm"]
+    assert stats["responses"] == 1
+    assert stats["flushes"] == len(app.frames)
+    assert stats["ratio"] > 1
+
+
+def test_json_is_compressed_above_threshold_only():
+    metrics = CompressionMetrics()
+    client = make_app(metrics).test_client()
+
+    response = client.get('/api/chat/history', headers={"Accept-Encoding": "deflate"})
+    assert response.headers["Content-Encoding"] == "deflate"
+    assert len(json.loads(zlib.decompress(response.data))["messages"]) == 200
+
+    small = client.get('/api/chat/history?size=1', headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+    plain = client.get('/api/chat/history', headers={"Accept-Encoding": "br;q=1, gzip;q=0"})
+    assert "Content-Encoding" not in plain.headers
+    assert "Content-Encoding" not in client.get('/api/other', headers={"Accept-Encoding": "gzip"}).headers
+
+    stats = metrics.stats()["/api/chat/history"]
+    assert stats["responses"] == 1
+    assert stats["skipped_small"] == 1
+    assert stats["skipped_identity"] == 1
+    assert stats["saved_bytes"] > 0
@@ -0,0 +1,137 @@
+import sys
+import os
+import time
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.infrastructure.shared.key_value_store import InMemoryKeyValueStore
+from backend.use_cases.chat.resumable_streams import ResumableStreams, parse_event_id
+
+
+class Upstream:
+    """Yields the given chunks, each one only after `step` is released."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.step = threading.Semaphore(0)
+        self.closed = threading.Event()
+        self.reads = 0
+
+    def __iter__(self):
+        try:
+            for chunk in self.chunks:
+                self.step.acquire(timeout=5)
+                self.reads += 1
+                yield {"answer": chunk}
+        finally:
+            self.closed.set()
+
+
+def test_reconnect_resumes_after_last_event_without_a_second_call():
+    streams = ResumableStreams()
+    upstream = Upstream(["a", "b", "c"])
+    saved = []
+    stream = streams.start("conv-1", iter(upstream), saved.append)
+
+    first = stream.follow()
+    upstream.step.release()
+    assert next(first) == (1, {"answer": "a"})
+    # The connection drops
+    first.close()
+
+    upstream.step.release(2)
+    resumed = streams.get(stream.id).follow(after=1)
+    assert list(resumed) == [(2, {"answer": "b"}), (3, {"answer": "c"})]
+    assert saved == ["abc"]
+    assert upstream.reads == 3
+    assert streams.stats()["completed"] == 1
+
+
+def test_subscribers_share_one_upstream():
+    streams = ResumableStreams()
+    upstream = Upstream(["x", "y"])
+    stream = streams.start("conv-1", iter(upstream))
+    assert [s.id for s in streams.active("conv-1")] == [stream.id]
+    assert streams.active("conv-2") == []
+
+    results = {}
+    readers = [
+        threading.Thread(target=lambda name=name: results.__setitem__(name, list(stream.events())))
+        for name in ("window-1", "window-2")
+    ]
+    for reader in readers:
+        reader.start()
+    upstream.step.release(2)
+    for reader in readers:
+        reader.join(5)
+
+    assert results["window-1"] == results["window-2"] == [{"answer": "x"}, {"answer": "y"}]
+    assert upstream.reads == 2
+
+
+def test_answer_nobody_reads_is_cancelled():
+    streams = ResumableStreams(orphan_grace_seconds=0)
+    upstream = Upstream(["a", "b", "c"])
+    saved = []
+    stream = streams.start("conv-1", iter(upstream), saved.append)
+
+    upstream.step.release()
+    assert upstream.closed.wait(5)
+    assert stream.cancelled
+    # Partial answers are kept, as when the browser aborted the request
+    assert saved == ["a"]
+
+
+def test_reconnect_to_another_worker_follows_through_the_shared_store():
+    store = InMemoryKeyValueStore()
+    worker_a = ResumableStreams(store=store, poll_seconds=0.01)
+    worker_b = ResumableStreams(store=store, poll_seconds=0.01)
+    upstream = Upstream(["a", "b", "c"])
+    stream = worker_a.start("conv-1", iter(upstream))
+
+    upstream.step.release()
+    assert next(stream.follow()) == (1, {"answer": "a"})
+    assert [s.id for s in worker_b.active("conv-1")] == [stream.id]
+    assert worker_b.get("missing") is None
+
+    resumed = worker_b.get(stream.id).follow(after=1)
+    upstream.step.release(2)
+    assert list(resumed) == [(2, {"answer": "b"}), (3, {"answer": "c"})]
+    assert worker_b.get(stream.id).done
+    assert worker_b.active("conv-1") == []
+
+
+def test_reader_on_another_worker_keeps_the_answer_alive():
+    store = InMemoryKeyValueStore()
+    worker_a = ResumableStreams(orphan_grace_seconds=0, store=store, poll_seconds=0.01)
+    worker_b = ResumableStreams(orphan_grace_seconds=0, store=store, poll_seconds=0.01)
+    upstream = Upstream(["a", "b"])
+    stream = worker_a.start("conv-1", iter(upstream))
+
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(worker_b.get(stream.id).events()))
+    reader.start()
+    # Only a reader on worker B is following
+    assert wait_until(lambda: store.get("stream:watched:" + stream.id))
+    upstream.step.release(2)
+    reader.join(5)
+    assert received == [{"answer": "a"}, {"answer": "b"}]
+    assert not stream.cancelled
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_parse_event_id():
+    assert parse_event_id("abc:7") == ("abc", 7)
+    assert parse_event_id("7") == (None, 7)
+    assert parse_event_id("abc:x") == (None, 0)
+    assert parse_event_id(None) == (None, 0)
@@ -0,0 +1,139 @@
+import sys
+import os
+import threading
+from datetime import datetime
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+from backend.infrastructure.repositories.sqlite_message_archive import SqliteMessageArchive
+from backend.infrastructure.scheduling.midnight_timer import MidnightTimer
+from backend.use_cases.challenges.rollover_day import RolloverDay
+from backend.use_cases.chat.conversation_history import ConversationHistory
+
+
+class FakeGet:
+    def __init__(self, title="Novo dia"):
+        self.title = title
+
+    def execute(self):
+        if not self.title:
+            return None
+        return DailyChallenge(date="", scenario=Scenario(self.title, "D"), flashcards=[Flashcard("Q", "A")])
+
+
+class FakeIndex:
+    def execute(self, challenge):
+        pass
+
+
+def make_old_state(history):
+    state = AppState(daily_challenge=DailyChallenge(date="2026-05-01", scenario=Scenario("Ontem", "D")), is_loading=False)
+    state.initialize_conversation(0)
+    history.append(state.conversations[0], {"role": "user", "content": "pergunta"})
+    return state
+
+
+def test_swaps_state_and_archives_old_conversations(tmp_path):
+    archive = SqliteMessageArchive(str(tmp_path / "conversations.db"))
+    history = ConversationHistory(archive)
+    repository = InMemoryStateRepository()
+    old_state = make_old_state(history)
+    repository.update_state(old_state)
+
+    rollover = RolloverDay(FakeGet(), repository, history, FakeIndex())
+    assert rollover.execute("2026-05-02")
+
+    new_state = repository.get_state()
+    assert new_state is not old_state
+    assert new_state.get_current_date() == "2026-05-02"
+    assert new_state.get_scenario().title == "Novo dia"
+    assert new_state.current_conversation_id == new_state.conversations[0].id
+
+    # A stream that started yesterday still saves its answer, straight to the archive
+    old_conversation = old_state.conversations[0]
+    history.append(old_conversation, {"role": "bot", "content": "resposta"})
+    assert old_conversation.messages == []
+    assert [m["content"] for m in archive.load(old_conversation.id, 0, 10)] == ["pergunta", "resposta"]
+
+    # Already on that day: nothing to do
+    assert rollover.execute("2026-05-02")
+    assert repository.get_state() is new_state
+
+
+def test_keeps_old_state_when_no_challenge_is_available(tmp_path):
+    history = ConversationHistory(SqliteMessageArchive(str(tmp_path / "conversations.db")))
+    repository = InMemoryStateRepository()
+    old_state = make_old_state(history)
+    repository.update_state(old_state)
+
+    assert not RolloverDay(FakeGet(title=None), repository, history, FakeIndex()).execute("2026-05-02")
+    assert repository.get_state() is old_state
+    assert old_state.conversations[0].messages
+
+
+def test_timer_sleeps_until_midnight_and_fires_once():
+    readings = []
+    fired = []
+    done = threading.Event()
+
+    def callback(new_date):
+        fired.append(new_date)
+        done.set()
+        return True
+
+    def now():
+        # Construction, start and the first sleep computation happen just before midnight
+        readings.append(None)
+        if len(readings) <= 4:
+            return datetime(2026, 5, 1, 23, 59, 59, 800000)
+        return datetime(2026, 5, 2, 0, 0, 1)
+
+    timer = MidnightTimer(callback, now=now)
+    assert 0 < MidnightTimer(callback, now=lambda: datetime(2026, 5, 1, 23, 0)).seconds_until_midnight() == 3600
+
+    timer.start()
+    assert done.wait(5)
+    timer.stop()
+    assert fired == ["2026-05-02"]
+
+
+class BlockingChatClient:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def chat_with_agent(self, conversation_id, user_prompt):
+        self.release.wait(5)
+        yield {"answer": "resposta de ontem"}
+
+
+class NoChatIndex:
+    def execute(self, **kwargs):
+        pass
+
+
+def test_a_stream_that_spans_the_rollover_does_not_restore_yesterday(tmp_path):
+    from backend.use_cases.chat.ask_about_flashcard import AskAboutFlashcard
+    from backend.use_cases.chat.chat_with_agent import ChatWithAgent
+    from backend.use_cases.chat.resumable_streams import ResumableStreams
+
+    archive = SqliteMessageArchive(str(tmp_path / "conversations.db"))
+    history = ConversationHistory(archive)
+    repository = InMemoryStateRepository()
+    old_state = make_old_state(history)
+    old_state.daily_challenge.flashcards = [Flashcard("Q", "A")]
+    repository.update_state(old_state)
+
+    client = BlockingChatClient()
+    ask = AskAboutFlashcard(repository, ChatWithAgent(client), history, NoChatIndex(), ResumableStreams())
+    stream = ask.execute("e o TTL?")
+
+    assert RolloverDay(FakeGet(), repository, history, FakeIndex()).execute("2026-05-02")
+    client.release.set()
+    list(stream.follow())
+
+    assert repository.get_state().get_current_date() == "2026-05-02"
+    old_conversation = old_state.conversations[0]
+    assert [m["content"] for m in archive.load(old_conversation.id, 0, 10)][-1] == "resposta de ontem"
@@ -0,0 +1,57 @@
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.repositories.sqlite_search_index import SqliteSearchIndex
+
+
+def make_challenge(day):
+    return DailyChallenge(
+        date=day,
+        scenario=Scenario(title="Cache de sessão", description="Latência alta no Redis durante picos"),
+        flashcards=[
+            Flashcard(question="O que é TTL?", answer="Tempo de vida de uma chave"),
+            Flashcard(question="Quando usar SQS?", answer="Para desacoplar produtores e consumidores")
+        ]
+    )
+
+
+def test_search_challenge_and_messages(tmp_path):
+    index = SqliteSearchIndex(str(tmp_path / "search.db"))
+    index.index_challenge(make_challenge("2026-01-01"))
+    index.index_message("2026-01-01", 1, "CONV1", 1, "Filas SQS aceitam mensagens com atraso")
+
+    hits = index.search("sqs")
+    kinds = {hit.kind for hit in hits}
+    assert kinds == {"flashcard", "message"}
+    message = next(hit for hit in hits if hit.kind == "message")
+    assert "<mark>SQS</mark>" in message.snippet
+    assert message.flashcard_index == 1
+
+    # Accents are folded, prefixes match
+    hits = index.search("latencia")
+    assert [hit.kind for hit in hits] == ["scenario"]
+    assert "<mark>Latência</mark>" in hits[0].snippet
+
+
+def test_reindexing_is_idempotent_and_persistent(tmp_path):
+    path = str(tmp_path / "search.db")
+    index = SqliteSearchIndex(path)
+    index.index_challenge(make_challenge("2026-01-01"))
+    index.index_challenge(make_challenge("2026-01-01"))
+    index.index_challenge(make_challenge("2026-01-02"))
+
+    reopened = SqliteSearchIndex(path)
+    dates = sorted(hit.date for hit in reopened.search("redis"))
+    assert dates == ["2026-01-01", "2026-01-02"]
+
+
+def test_query_syntax_is_escaped(tmp_path):
+    index = SqliteSearchIndex(str(tmp_path / "search.db"))
+    index.index_challenge(make_challenge("2026-01-01"))
+
+    assert index.search('" OR (') == []
+    assert index.search("") == []
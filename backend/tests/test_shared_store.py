@@ -0,0 +1,256 @@
+import sys
+import os
+import time
+import threading
+from datetime import date
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import Agent, AppState, DailyChallenge, Scenario, Flashcard
+from backend.infrastructure.repositories.shared_challenge_store import SharedChallengeStore
+from backend.infrastructure.repositories.shared_state_repository import SharedStateRepository
+from backend.infrastructure.shared.key_value_store import (
+    InMemoryKeyValueStore, SqliteKeyValueStore, create_key_value_store
+)
+from backend.infrastructure.shared.distributed_lock import DistributedLock, DistributedLocks, LockTimeout
+from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.challenges.get_daily_challenge import GetDailyChallenge
+from backend.use_cases.challenges.stream_daily_challenge import StreamDailyChallenge
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryKeyValueStore()
+    return SqliteKeyValueStore(str(tmp_path / "shared.db"))
+
+
+def test_compare_and_set_operations(store):
+    assert store.set_if_absent("k", "a")
+    assert not store.set_if_absent("k", "b")
+    assert store.get("k") == "a"
+
+    assert not store.compare_and_delete("k", "b")
+    assert store.compare_and_expire("k", "a", 60)
+    assert store.compare_and_delete("k", "a")
+    assert store.get("k") is None
+
+    assert store.compare_and_set("c", None, "1")
+    assert not store.compare_and_set("c", None, "2")
+    assert not store.compare_and_set("c", "0", "2")
+    assert store.compare_and_set("c", "1", "2")
+    assert store.get("c") == "2"
+
+    assert store.incr("n") == 1
+    assert store.incr("n") == 2
+    store.set("p:1", "x")
+    store.set("p_2", "y")
+    assert store.keys("p:") == ["p:1"]
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    store = InMemoryKeyValueStore(clock)
+    store.set("k", "a", ttl_seconds=5)
+    clock.now += 6
+    assert store.get("k") is None
+    assert store.set_if_absent("k", "b")
+
+
+def test_store_url():
+    assert isinstance(create_key_value_store("memory://"), InMemoryKeyValueStore)
+
+
+def test_lock_is_exclusive_across_processes(tmp_path):
+    path = str(tmp_path / "shared.db")
+    node_a = DistributedLock(SqliteKeyValueStore(path), "challenge:2026-10-19", lease_seconds=5)
+    node_b = DistributedLock(SqliteKeyValueStore(path), "challenge:2026-10-19", lease_seconds=5)
+
+    assert node_a.acquire()
+    assert not node_b.acquire(timeout=0.1, poll_interval=0.02)
+    node_a.release()
+    assert node_b.acquire()
+    node_b.release()
+
+
+def test_lease_is_renewed_and_loss_detected():
+    store = InMemoryKeyValueStore()
+    lock = DistributedLock(store, "job", lease_seconds=0.2, renew_interval=0.05)
+    assert lock.acquire()
+    time.sleep(0.4)
+    # Renewed past the original lease
+    assert lock.held
+    assert not store.set_if_absent(lock.key, "other")
+
+    # Taken over behind its back: the next renewal notices
+    store.set(lock.key, "other")
+    assert lock.lost.wait(1)
+    assert not lock.held
+    lock.release()
+    assert store.get(lock.key) == "other"
+
+
+def test_hold_times_out():
+    locks = DistributedLocks(InMemoryKeyValueStore(), lease_seconds=5)
+    with locks.hold("job"):
+        with pytest.raises(LockTimeout):
+            with locks.hold("job", timeout=0.05):
+                pass
+
+
+def test_challenges_and_state_are_shared(store):
+    challenges = SharedChallengeStore(store)
+    challenge = DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q", "A")])
+    challenges.save(challenge)
+    assert challenges.get("2026-10-19") == challenge
+    assert challenges.dates() == ["2026-10-19"]
+    challenges.clear("2026-10-19")
+    assert challenges.get("2026-10-19") is None
+
+    node_a = SharedStateRepository(store)
+    node_b = SharedStateRepository(store)
+    state = AppState(daily_challenge=challenge, is_loading=False)
+    node_a.update_state(state)
+    seen = node_b.get_state()
+    assert seen.get_current_date() == "2026-10-19"
+    assert node_b.get_state() is seen
+
+    # Concurrent changes of two nodes are merged, not overwritten by the last writer
+    state.initialize_conversation(0)
+    node_a.update_state(state)
+    held_by_a = node_a.get_state()
+    seen = node_b.get_state()
+    seen.current_flashcard_index = 1
+    node_b.update_state(seen)
+    held_by_a.conversations[0].messages.append({"role": "bot", "content": "answer"})
+    node_a.update_state(held_by_a)
+    for node in (node_a, node_b):
+        assert node.get_state().current_flashcard_index == 1
+        assert node.get_state().conversations[0].messages == [{"role": "bot", "content": "answer"}]
+
+
+class Account:
+    def __init__(self, client_id):
+        self.client_id = client_id
+
+    def cache_scope(self):
+        return f"realm:{self.client_id}"
+
+
+class AccountAgents:
+    def __init__(self, account):
+        self.account = account
+
+    def get_by_name(self, name):
+        return Agent(id=f"{self.account.client_id}-agent", name=name)
+
+
+def test_agent_id_is_shared_per_account():
+    store = InMemoryKeyValueStore()
+
+    def node(client_id):
+        account = Account(client_id)
+        return EnsureAgentExists(AccountAgents(account), "Flashcards", "d", "p", shared_store=store, auth_client=account)
+
+    assert node("a").execute() == "a-agent"
+    assert node("b").execute() == "b-agent"
+    # A second node of account "a" reuses the published ID
+    second = node("a")
+    second.agent_client = None
+    assert second.execute() == "a-agent"
+    assert not any("realm" in key or key.endswith(":a") for key in store.keys("agent:id:"))
+
+
+class SlowGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    def get_daily_challenge(self, agent_id):
+        self.calls += 1
+        time.sleep(0.2)
+        return DailyChallenge("", Scenario("Cache", "LRU"), [Flashcard("Q", "A")])
+
+
+class FixedAgent:
+    def execute(self):
+        return "agent-1"
+
+
+def test_only_one_node_generates_the_challenge():
+    store = InMemoryKeyValueStore()
+    generator = SlowGenerator()
+    nodes = [
+        GetDailyChallenge(
+            generator, FixedAgent(),
+            challenge_store=SharedChallengeStore(store),
+            locks=DistributedLocks(store, lease_seconds=5),
+            lock_timeout=5
+        )
+        for _ in range(3)
+    ]
+    results = []
+    threads = [threading.Thread(target=lambda node=node: results.append(node.execute())) for node in nodes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert generator.calls == 1
+    assert [result.scenario.title for result in results] == ["Cache"] * 3
+
+
+class TakenOverGenerator:
+    """Stalls past its lease while another node takes the day over and publishes."""
+
+    def __init__(self, store):
+        self.store = store
+        self.challenges = SharedChallengeStore(store)
+
+    def _take_over(self):
+        today = str(date.today())
+        self.store.set(f"lock:challenge:{today}", "other-node")
+        self.challenges.save(DailyChallenge(today, Scenario("Other", "node"), [Flashcard("Q2", "A2")]))
+        time.sleep(0.3)
+        return DailyChallenge("", Scenario("Stale", "LRU"), [Flashcard("Q", "A")])
+
+    def get_daily_challenge(self, agent_id):
+        return self._take_over()
+
+    def stream_daily_challenge(self, agent_id):
+        challenge = self._take_over()
+        yield "scenario", challenge.scenario
+        yield "challenge", challenge
+
+
+def test_a_node_that_lost_its_lock_does_not_publish():
+    store = InMemoryKeyValueStore()
+    challenges = SharedChallengeStore(store)
+    node = GetDailyChallenge(
+        TakenOverGenerator(store), FixedAgent(),
+        challenge_store=challenges,
+        locks=DistributedLocks(store, lease_seconds=0.15)
+    )
+    assert node.execute().scenario.title == "Other"
+    assert challenges.get(str(date.today())).scenario.title == "Other"
+
+    store = InMemoryKeyValueStore()
+    challenges = SharedChallengeStore(store)
+    node = StreamDailyChallenge(
+        TakenOverGenerator(store), FixedAgent(),
+        challenge_store=challenges,
+        locks=DistributedLocks(store, lease_seconds=0.15)
+    )
+    events = list(node.execute())
+    assert events[-1][1].scenario.title == "Other"
+    assert challenges.get(str(date.today())).scenario.title == "Other"
@@ -0,0 +1,121 @@
+import sys
+import os
+import gzip
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from flask import Flask
+from backend.infrastructure.assets.static_asset_store import (
+    StaticAssetStore, parse_accept_encoding, precompress_directory
+)
+from backend.presentation.static_assets import init_static_assets
+
+BUNDLE = b"export const answer = 42;\n" * 200
+
+
+def make_build(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html><script src='/assets/index-BXk3_9aF.js'></script></html>")
+    (tmp_path / "assets" / "index-BXk3_9aF.js").write_bytes(BUNDLE)
+    return tmp_path
+
+
+def make_client(store):
+    app = Flask(__name__, static_folder=None)
+    init_static_assets(app, store)
+    return app.test_client()
+
+
+def test_hashed_assets_are_immutable_and_compressed(tmp_path):
+    store = StaticAssetStore(str(make_build(tmp_path)))
+    client = make_client(store)
+
+    response = client.get("/assets/index-BXk3_9aF.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.data) == BUNDLE
+    # Compressed on first access and stored next to the original
+    assert (tmp_path / "assets" / "index-BXk3_9aF.js.gz").exists()
+
+    plain = client.get("/assets/index-BXk3_9aF.js", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data == BUNDLE
+
+
+def test_index_is_revalidated_with_strong_etag(tmp_path):
+    store = StaticAssetStore(str(make_build(tmp_path)))
+    client = make_client(store)
+
+    first = client.get("/")
+    assert first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    second = client.get("/", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert store.stats()["not_modified"] == 1
+
+    (tmp_path / "index.html").write_text("<html>new build</html>")
+    os.utime(tmp_path / "index.html", (1, 1))
+    third = client.get("/", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["ETag"] != etag
+
+
+def test_each_content_coding_has_its_own_etag(tmp_path):
+    store = StaticAssetStore(str(make_build(tmp_path)))
+    client = make_client(store)
+
+    compressed = client.get("/assets/index-BXk3_9aF.js", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/assets/index-BXk3_9aF.js", headers={"Accept-Encoding": "identity"})
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gz"'
+
+    # The gzip validator does not revalidate the identity body, and the other way round
+    assert client.get(
+        "/assets/index-BXk3_9aF.js",
+        headers={"Accept-Encoding": "identity", "If-None-Match": compressed.headers["ETag"]}
+    ).status_code == 200
+    assert client.get(
+        "/assets/index-BXk3_9aF.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    ).status_code == 304
+    assert client.get(
+        "/assets/index-BXk3_9aF.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]}
+    ).status_code == 200
+
+
+def test_large_files_are_streamed_from_disk(tmp_path):
+    store = StaticAssetStore(str(make_build(tmp_path)), memory_file_bytes=10)
+    client = make_client(store)
+
+    response = client.get("/assets/index-BXk3_9aF.js", headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(response.data) == BUNDLE
+    assert store.stats()["disk"] == 1
+    assert store.stats()["memory_bytes"] == 0
+
+
+def test_paths_outside_the_build_are_not_served(tmp_path):
+    (tmp_path / "build").mkdir()
+    build = make_build(tmp_path / "build")
+    (tmp_path / "secret.txt").write_text("no")
+    client = make_client(StaticAssetStore(str(build)))
+
+    assert client.get("/../secret.txt").status_code == 404
+    assert client.get("/missing.js").status_code == 404
+
+
+def test_precompress_directory_writes_gzip_copies(tmp_path):
+    make_build(tmp_path)
+    written = precompress_directory(str(tmp_path))
+
+    assert [path for path, _, _ in written] == [os.path.join("assets", "index-BXk3_9aF.js")]
+    assert gzip.decompress((tmp_path / "assets" / "index-BXk3_9aF.js.gz").read_bytes()) == BUNDLE
+
+
+def test_accept_encoding_q_values():
+    assert parse_accept_encoding("gzip, br;q=0.5, deflate;q=0") == ["gzip", "br"]
+    assert parse_accept_encoding(None) == []
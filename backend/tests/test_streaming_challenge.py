@@ -0,0 +1,170 @@
+import sys
+import os
+import json
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import AppState, DailyChallenge
+from backend.infrastructure.http.incremental_json import IncrementalJsonParser
+from backend.infrastructure.http.stackspot_challenge_client import StackSpotChallengeClient
+from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+from backend.use_cases.challenges.load_daily_challenge import LoadDailyChallenge
+
+
+DOCUMENT = {
+    "scenario": {"title": "Cache \"quente\" {", "problem_description": "Latência ] alta"},
+    "flashcards": [
+        {"question": "Q1", "short_answer": "A1", "category": "Cache"},
+        {"question": "Q2", "short_answer": "A2", "tags": [1, 2.5, True, None]},
+        {"question": "Q3", "short_answer": "A3"}
+    ]
+}
+TEXT = "```json\n" + json.dumps(DOCUMENT, indent=2, ensure_ascii=False) + "\n```"
+
+
+def is_card(path):
+    return path == ("scenario",) or (len(path) == 2 and path[0] == "flashcards")
+
+
+def test_parser_reports_values_as_they_close():
+    parser = IncrementalJsonParser(is_card)
+    seen = []
+    for i in range(0, len(TEXT), 7):
+        for path, value in parser.feed(TEXT[i:i + 7]):
+            seen.append((path, value, i))
+
+    assert [path for path, _, _ in seen] == [("scenario",), ("flashcards", 0), ("flashcards", 1), ("flashcards", 2)]
+    assert seen[0][1] == DOCUMENT["scenario"]
+    assert seen[2][1] == DOCUMENT["flashcards"][1]
+    # The scenario is published long before the document ends
+    assert seen[0][2] < len(TEXT) // 3
+    assert parser.done and parser.root == DOCUMENT
+
+
+def test_parser_indexes_bare_scalars_in_arrays():
+    parser = IncrementalJsonParser(lambda path: len(path) == 2)
+    events = parser.feed('{"a": [1, "x", {"b": 2}, [3], null, "y"]}')
+
+    assert events == [(("a", 1), "x"), (("a", 2), {"b": 2}), (("a", 3), [3]), (("a", 5), "y")]
+
+
+class FakeAuth:
+    def get_token(self):
+        return "token"
+
+
+class FakeStreamResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/event-stream"}
+
+    def __init__(self, text, step=5):
+        self.lines = [
+            f"data: {json.dumps({'message': text[i:i + step]})}".encode("utf-8")
+            for i in range(0, len(text), step)
+        ]
+        self.closed = False
+
+    def iter_lines(self):
+        for line in self.lines:
+            yield line
+            yield b""
+
+    def close(self):
+        self.closed = True
+
+
+def test_client_streams_scenario_and_flashcards(monkeypatch):
+    response = FakeStreamResponse(TEXT)
+    monkeypatch.setattr("requests.post", lambda *args, **kwargs: response)
+    client = StackSpotChallengeClient(FakeAuth())
+
+    events = list(client.stream_daily_challenge("AGENT"))
+
+    assert [kind for kind, _ in events] == ["scenario", "flashcard", "flashcard", "flashcard", "challenge"]
+    assert events[0][1].description == "Latência ] alta"
+    assert events[1][1].answer == "A1"
+    assert len(events[-1][1].flashcards) == 3
+    assert response.closed
+
+
+class FakeStream:
+    """Yields the client's events and records what the state looked like at each step."""
+
+    def __init__(self, events, state_repository):
+        self.events = events
+        self.state_repository = state_repository
+        self.snapshots = []
+
+    def execute(self):
+        for event in self.events:
+            yield event
+            state = self.state_repository.get_state()
+            self.snapshots.append((state.is_loading, state.is_generating,
+                                   len(state.daily_challenge.flashcards) if state.daily_challenge else 0))
+
+
+class FakeGet:
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        return None
+
+
+class FakeIndex:
+    def __init__(self):
+        self.indexed = []
+
+    def execute(self, challenge):
+        self.indexed.append(challenge)
+
+
+def client_events(monkeypatch):
+    monkeypatch.setattr("requests.post", lambda *args, **kwargs: FakeStreamResponse(TEXT))
+    return list(StackSpotChallengeClient(FakeAuth()).stream_daily_challenge("AGENT"))
+
+
+def test_load_installs_first_card_before_generation_ends(monkeypatch):
+    repository = InMemoryStateRepository()
+    stream = FakeStream(client_events(monkeypatch), repository)
+    index = FakeIndex()
+    load = LoadDailyChallenge(FakeGet(), repository, index, stream_daily_challenge=stream)
+
+    challenge = load.execute()
+
+    assert stream.snapshots == [
+        (True, False, 0),   # scenario only
+        (False, True, 1),   # first card on screen
+        (False, True, 2),
+        (False, True, 3)
+    ]
+    assert not repository.get_state().is_generating
+    assert repository.get_state().daily_challenge is challenge
+    assert index.indexed == [challenge]
+
+
+def test_next_flashcard_waits_for_generation():
+    state = AppState()
+    state.daily_challenge = DailyChallenge.from_dict({"scenario": {}, "flashcards": DOCUMENT["flashcards"][:1]})
+    state.initialize_conversation(0)
+    state.is_generating = True
+
+    assert state.next_flashcard().question == "Q1"
+    assert state.current_flashcard_index == 0
+
+
+def test_load_falls_back_when_stream_fails_early():
+    class BrokenStream:
+        def execute(self):
+            raise Exception("stream not supported")
+            yield
+
+    repository = InMemoryStateRepository()
+    get = FakeGet()
+    load = LoadDailyChallenge(get, repository, FakeIndex(), stream_daily_challenge=BrokenStream())
+
+    assert load.execute(error_message="nothing") is None
+    assert get.calls == 1
+    assert repository.get_state().error == "nothing"
@@ -0,0 +1,158 @@
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+import pytest
+from backend.domain.entities import AppState, DailyChallenge, Scenario, Flashcard, StudyEvent
+from backend.infrastructure.events.segmented_event_log import SegmentedEventLog
+from backend.use_cases.study.study_events import (
+    ANSWER_REVEALED, FLASHCARD_VIEWED, QUESTION_ASKED, RecordStudyEvent, ReplayStudyEvents
+)
+
+
+def event(event_type: str, timestamp: float, **data) -> StudyEvent:
+    return StudyEvent(type=event_type, timestamp=timestamp, challenge_date="2026-10-19", flashcard_index=0, data=data)
+
+
+def test_concurrent_appends_are_written_in_few_batches(tmp_path):
+    log = SegmentedEventLog(str(tmp_path), batch_delay_ms=50)
+    start = threading.Barrier(8)
+
+    def record(worker):
+        start.wait()
+        for n in range(25):
+            log.append(StudyEvent(type=QUESTION_ASKED, data={"worker": worker, "n": n}))
+
+    threads = [threading.Thread(target=record, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert log.flush(5)
+
+    events = list(log.read())
+    assert len(events) == 200
+    timestamps = [e.timestamp for e in events]
+    assert timestamps == sorted(timestamps)
+    for worker in range(8):
+        assert [e.data["n"] for e in events if e.data["worker"] == worker] == list(range(25))
+    stats = log.stats()
+    assert stats["written"] == 200
+    assert stats["batches"] < 20
+    log.close()
+
+
+def test_segments_rotate_and_reads_skip_to_the_time_range(tmp_path):
+    log = SegmentedEventLog(str(tmp_path), segment_bytes=300, batch_delay_ms=0)
+    for second in range(20):
+        log.append(event(ANSWER_REVEALED if second % 2 else FLASHCARD_VIEWED, 1000.0 + second))
+        log.flush(5)
+    log.close()
+
+    assert len(os.listdir(tmp_path)) > 3
+    assert [e.timestamp for e in log.read(1005, 1010)] == [1005.0, 1006.0, 1007.0, 1008.0, 1009.0]
+    revealed = list(log.read(start=1010, types=[ANSWER_REVEALED]))
+    assert [e.timestamp for e in revealed] == [1011.0, 1013.0, 1015.0, 1017.0, 1019.0]
+    assert list(log.read(end=1000)) == []
+
+
+def test_torn_last_line_is_skipped_and_writers_are_merged(tmp_path):
+    first = SegmentedEventLog(str(tmp_path), batch_delay_ms=0)
+    second = SegmentedEventLog(str(tmp_path), batch_delay_ms=0)
+    for timestamp in (1.0, 3.0, 5.0):
+        first.append(event(QUESTION_ASKED, timestamp))
+    for timestamp in (2.0, 4.0):
+        second.append(event(QUESTION_ASKED, timestamp))
+    first.close()
+    second.close()
+
+    # A crash in the middle of a write leaves a line without its newline
+    segment = next(name for name in os.listdir(tmp_path) if first.writer_id in name)
+    with open(tmp_path / segment, "ab") as f:
+        f.write(b'{"type": "question_asked", "timest')
+
+    assert [e.timestamp for e in first.read()] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_fsync_policies(tmp_path):
+    with pytest.raises(ValueError):
+        SegmentedEventLog(str(tmp_path), fsync="sometimes")
+
+    per_batch = SegmentedEventLog(str(tmp_path / "batch"), fsync="batch", batch_delay_ms=0)
+    never = SegmentedEventLog(str(tmp_path / "never"), fsync="never", batch_delay_ms=0)
+    for log in (per_batch, never):
+        for n in range(3):
+            log.append(event(QUESTION_ASKED, 1.0 + n))
+            log.flush(5)
+        log.close()
+    assert per_batch.stats()["fsyncs"] == per_batch.stats()["batches"] == 3
+    assert never.stats()["fsyncs"] == 0
+
+
+def test_full_queue_drops_instead_of_blocking_and_close_writes_the_rest(tmp_path):
+    log = SegmentedEventLog(str(tmp_path), batch_delay_ms=10000, max_batch=10, max_queue=2)
+    assert log.append(event(QUESTION_ASKED, 1.0))
+    assert log.append(event(QUESTION_ASKED, 2.0))
+    assert not log.append(event(QUESTION_ASKED, 3.0))
+    log.close()
+
+    assert [e.timestamp for e in log.read()] == [1.0, 2.0]
+    assert log.stats()["dropped"] == 1
+    assert not log.append(event(QUESTION_ASKED, 4.0))
+
+
+def test_record_and_replay_use_cases(tmp_path):
+    log = SegmentedEventLog(str(tmp_path), batch_delay_ms=10000)
+    state = AppState(
+        daily_challenge=DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q1", "A1"), Flashcard("Q2", "A2")]),
+        current_flashcard_index=1
+    )
+    record = RecordStudyEvent(log)
+    assert record.execute(FLASHCARD_VIEWED, state, conversation_id="c1")
+    assert record.execute(ANSWER_REVEALED, state)
+    assert record.execute(ANSWER_REVEALED, AppState())
+
+    # Replay flushes first: no need to wait for the batch delay
+    events, has_more = ReplayStudyEvents(log).execute(limit=2)
+    assert has_more
+    assert [(e.type, e.challenge_date, e.flashcard_index, e.data) for e in events] == [
+        (FLASHCARD_VIEWED, "2026-10-19", 1, {"conversation_id": "c1"}),
+        (ANSWER_REVEALED, "2026-10-19", 1, {})
+    ]
+    events, has_more = ReplayStudyEvents(log).execute(start=events[-1].timestamp, types=[ANSWER_REVEALED])
+    assert not has_more
+    assert events[-1].challenge_date is None
+    log.close()
+
+
+def test_routes_record_views_and_reveals(tmp_path, monkeypatch):
+    from backend.infrastructure.repositories.in_memory_state_repository import InMemoryStateRepository
+    from backend.presentation.app_factory import create_app
+    from backend.presentation.dependencies import container
+
+    repository = InMemoryStateRepository()
+    repository.update_state(AppState(
+        daily_challenge=DailyChallenge("2026-10-19", Scenario("Cache", "LRU"), [Flashcard("Q1", "A1"), Flashcard("Q2", "A2")]),
+        is_loading=False
+    ))
+    log = SegmentedEventLog(str(tmp_path))
+    monkeypatch.setattr(container, "state_repository", repository)
+    monkeypatch.setattr(container, "record_study_event", RecordStudyEvent(log))
+    monkeypatch.setattr(container, "replay_study_events", ReplayStudyEvents(log))
+    client = create_app(serve_frontend=False).test_client()
+
+    assert client.post('/api/flashcard/next').status_code == 200
+    assert client.post('/api/study/events', json={"type": ANSWER_REVEALED}).status_code == 202
+    assert client.post('/api/study/events', json={"type": FLASHCARD_VIEWED}).status_code == 400
+
+    body = client.get('/api/study/events?start=2000-01-01T00:00:00').get_json()
+    assert [(e["type"], e["flashcard_index"]) for e in body["events"]] == [
+        (FLASHCARD_VIEWED, 1), (ANSWER_REVEALED, 1)
+    ]
+    assert client.get(f'/api/study/events?type={ANSWER_REVEALED}&limit=1').get_json()["has_more"] is False
+    assert client.get('/api/study/events?end=2000-01-01').get_json()["events"] == []
+    assert client.get('/api/study/events?start=yesterday').status_code == 400
+    log.close()
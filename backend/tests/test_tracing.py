@@ -0,0 +1,76 @@
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from flask import Flask, Response, stream_with_context
+from backend.infrastructure.tracing.tracer import tracer, parse_traceparent
+from backend.infrastructure.tracing.exporters import RingBufferExporter, render_waterfall
+from backend.presentation.tracing_middleware import init_tracing
+from backend.use_cases.admission.admission_controller import AdmissionController
+from backend.use_cases.chat.chat_with_agent import ChatWithAgent
+
+
+class FakeChatClient:
+    def chat_with_agent(self, conversation_id, user_prompt):
+        # Client spans are opened lazily, while the route is already streaming
+        span = tracer.start_span("fake.upstream")
+        try:
+            for word in ["um", "dois"]:
+                yield {"answer": word}
+        finally:
+            span.end()
+
+
+def make_app():
+    app = Flask(__name__)
+    init_tracing(app)
+    chat = ChatWithAgent(FakeChatClient(), admission=AdmissionController(max_concurrent=1))
+
+    @app.route('/ask')
+    def ask():
+        stream = chat.execute("CONV", "oi")
+        return Response(stream_with_context(e["answer"] for e in stream), content_type='text/plain')
+
+    return app
+
+
+def test_request_span_parents_use_case_and_client_spans():
+    buffer = RingBufferExporter()
+    tracer.configure([buffer])
+    try:
+        incoming = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        response = make_app().test_client().get('/ask', headers={"traceparent": incoming})
+        assert response.get_data(as_text=True) == "umdois"
+        response.close()
+    finally:
+        tracer.configure([])
+
+    assert parse_traceparent(response.headers["traceparent"])[0] == "a" * 32
+
+    trace = buffer.slowest(1)[0]
+    assert trace["trace_id"] == "a" * 32
+    names = [(span["depth"], span["name"]) for span in trace["spans"]]
+    assert names == [(0, "GET /ask"), (1, "chat.stream"), (2, "admission.acquire"), (2, "fake.upstream")]
+    assert trace["spans"][1]["attributes"]["items"] == 2
+    assert "GET /ask" in render_waterfall(trace)
+
+
+def test_traceparent_parsing_rejects_invalid_values():
+    assert parse_traceparent("00-" + "0" * 32 + "-" + "b" * 16 + "-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_ring_buffer_keeps_most_recent_traces():
+    buffer = RingBufferExporter(max_traces=2)
+    tracer.configure([buffer])
+    try:
+        for name in ["a", "b", "c"]:
+            with tracer.span(name):
+                pass
+    finally:
+        tracer.configure([])
+
+    assert sorted(trace["name"] for trace in buffer.slowest()) == ["b", "c"]
@@ -0,0 +1,84 @@
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from backend.domain.entities import DailyChallenge, Scenario
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache
+from backend.infrastructure.repositories.file_challenge_store import FileChallengeStore
+from backend.use_cases.auth.update_credentials import UpdateCredentials
+
+
+class FakeAuth:
+    def __init__(self):
+        self.realm = "old"
+        self.token = "old-token"
+
+    def cache_scope(self):
+        return f"{self.realm}:client"
+
+    def reload_credentials(self):
+        self.realm = "new"
+
+    def invalidate_token(self):
+        self.token = None
+
+    def get_token(self):
+        return "new-token"
+
+
+class FakeEnsureAgent:
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+
+class FakeHttpCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, scope=None, url=None):
+        self.invalidated.append(scope)
+
+
+class BlockingLoad:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def execute(self, error_message=""):
+        self.release.wait(5)
+        return DailyChallenge(date="2026-01-01", scenario=Scenario("Novo", "D"))
+
+
+def test_invalidates_old_account_and_reloads_in_background(tmp_path):
+    auth, ensure, http_cache, load = FakeAuth(), FakeEnsureAgent(), FakeHttpCache(), BlockingLoad()
+    chat_cache = ChatResponseCache()
+    chat_cache.put("key", [{"answer": "old"}])
+    store = FileChallengeStore(str(tmp_path))
+    store.save(DailyChallenge(date="2000-01-01", scenario=Scenario("Passado", "D")))
+    store.save(DailyChallenge(date="2999-01-01", scenario=Scenario("Futuro", "D")))
+
+    update = UpdateCredentials(auth, ensure, load, http_cache, chat_cache, store)
+    reload_id = update.execute()
+
+    # Returns before the reload finishes, with the old account already forgotten
+    assert auth.token is None
+    assert ensure.resets == 1
+    assert http_cache.invalidated == ["old:client"]
+    assert chat_cache.get("key") is None
+    assert store.dates() == ["2000-01-01"]
+
+    version, progress = update.progress.snapshot()
+    assert progress["reload_id"] == reload_id and not progress["done"]
+
+    load.release.set()
+    while not progress["done"]:
+        update.progress.wait_for_change(version, timeout=5)
+        version, progress = update.progress.snapshot()
+
+    assert progress["stage"] == "ready"
+    assert progress["title"] == "Novo"
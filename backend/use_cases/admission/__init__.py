@@ -0,0 +1 @@
+# Admission control for upstream LLM calls
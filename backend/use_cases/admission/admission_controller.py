@@ -0,0 +1,213 @@
+"""Admission Controller - Bounds concurrent LLM calls."""
+import heapq
+import itertools
+import math
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted (queue full or max wait exceeded)."""
+    
+    def __init__(self, message: str, queue_position: int, retry_after: int):
+        super().__init__(message)
+        self.queue_position = queue_position
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "event", "granted", "abandoned")
+    
+    def __init__(self, priority: Priority, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.event = threading.Event()
+        self.granted = False
+        self.abandoned = False
+    
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionTicket:
+    """A granted slot. Release it exactly once (extra calls are ignored)."""
+    
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._started_at = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+    
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._controller._release(time.monotonic() - self._started_at)
+    
+    def guard(self, stream: Iterator) -> "AdmittedStream":
+        """Tie this ticket to a stream: the slot is freed when the stream ends or is closed."""
+        return AdmittedStream(stream, self)
+    
+    def __enter__(self) -> "AdmissionTicket":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AdmittedStream:
+    """
+    Iterator wrapper that holds an admission slot for the lifetime of a stream.
+    
+    Unlike a generator, the slot is also released if the stream is closed or
+    garbage-collected before the first item is requested.
+    """
+    
+    def __init__(self, stream: Iterator, ticket: AdmissionTicket):
+        self._stream = stream
+        self._ticket = ticket
+    
+    def __iter__(self) -> "AdmittedStream":
+        return self
+    
+    def __next__(self) -> Any:
+        try:
+            return next(self._stream)
+        except BaseException:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        try:
+            close = getattr(self._stream, "close", None)
+            if close:
+                close()
+        finally:
+            self._ticket.release()
+    
+    def __del__(self) -> None:
+        self._ticket.release()
+
+
+class AdmissionController:
+    """
+    Limits how many upstream LLM calls run at once.
+    
+    Calls beyond the limit wait in a FIFO queue ordered by priority, so
+    interactive chat is always served before background generation. Calls
+    are rejected with their queue position when the queue is full or when
+    they wait longer than their max wait.
+    """
+    
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, max_wait_seconds: float = 10.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._queued = 0
+        self._active = 0
+        self._seq = itertools.count()
+        # Moving average of slot hold time, used for Retry-After hints
+        self._avg_hold_seconds = 5.0
+        self._stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "max_wait_seconds_observed": 0.0
+        }
+    
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, max_wait: Optional[float] = None) -> AdmissionTicket:
+        """
+        Wait for a slot.
+        
+        Args:
+            priority: Scheduling class of the call
+            max_wait: Seconds to wait before giving up (defaults to the controller setting)
+            
+        Returns:
+            AdmissionTicket to release when the call finishes
+            
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out
+        """
+        max_wait = self.max_wait_seconds if max_wait is None else max_wait
+        started = time.monotonic()
+        
+        with self._lock:
+            if self._active < self.max_concurrent and self._queued == 0:
+                self._active += 1
+                self._stats["admitted"] += 1
+                return AdmissionTicket(self)
+            
+            if self._queued >= self.max_queue:
+                position = self._queued + 1
+                self._stats["rejected_queue_full"] += 1
+                raise AdmissionRejected("LLM capacity exhausted, queue is full", position, self._retry_after(position))
+            
+            waiter = _Waiter(priority, next(self._seq))
+            heapq.heappush(self._queue, waiter)
+            self._queued += 1
+            self._stats["queued"] += 1
+        
+        waiter.event.wait(max_wait)
+        
+        with self._lock:
+            waited = time.monotonic() - started
+            self._stats["max_wait_seconds_observed"] = max(self._stats["max_wait_seconds_observed"], round(waited, 3))
+            
+            if waiter.granted:
+                return AdmissionTicket(self)
+            
+            position = self._position(waiter)
+            waiter.abandoned = True
+            self._queued -= 1
+            self._stats["rejected_timeout"] += 1
+            raise AdmissionRejected(
+                f"Timed out after {waited:.1f}s waiting for LLM capacity", position, self._retry_after(position)
+            )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return current occupancy and counters."""
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": self._queued,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "max_wait_seconds": self.max_wait_seconds,
+                "avg_hold_seconds": round(self._avg_hold_seconds, 3),
+                **self._stats
+            }
+    
+    def _release(self, held_seconds: float) -> None:
+        with self._lock:
+            self._avg_hold_seconds = 0.8 * self._avg_hold_seconds + 0.2 * held_seconds
+            self._active -= 1
+            
+            while self._queue and self._active < self.max_concurrent:
+                waiter = heapq.heappop(self._queue)
+                if waiter.abandoned:
+                    continue
+                waiter.granted = True
+                self._queued -= 1
+                self._active += 1
+                self._stats["admitted"] += 1
+                waiter.event.set()
+    
+    def _position(self, waiter: _Waiter) -> int:
+        """1-based position of a waiter among the live waiters."""
+        return 1 + sum(1 for other in self._queue if not other.abandoned and other < waiter)
+    
+    def _retry_after(self, position: int) -> int:
+        return max(1, math.ceil(position * self._avg_hold_seconds / max(1, self.max_concurrent)))
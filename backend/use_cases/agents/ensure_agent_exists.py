@@ -1,7 +1,9 @@
 """Use case: Ensure Agent Exists."""
+import hashlib
 from typing import Optional
 from backend.domain.entities import Agent, AgentCreationRequest
-from backend.infrastructure.http.stackspot_agent_client import StackSpotAgentClient
+from backend.domain.repositories import AgentRepository, KeyValueStore
+from backend.infrastructure.http.stackspot_auth_client import StackSpotAuthClient
 
 
 class EnsureAgentExists:
@@ -10,21 +12,27 @@ class EnsureAgentExists:
     
     This encapsulates the business logic of checking for an agent
     and creating it with the proper configuration if not found.
+    With a shared store the ID is shared by every backend node that uses
+    the same credentials (the key includes the auth client's cache scope).
     """
     
     def __init__(
         self,
-        agent_client: StackSpotAgentClient,
+        agent_client: AgentRepository,
         agent_name: str,
         agent_description: str,
         agent_prompt: str,
-        output_schema: Optional[dict] = None
+        output_schema: Optional[dict] = None,
+        shared_store: Optional[KeyValueStore] = None,
+        auth_client: Optional[StackSpotAuthClient] = None
     ):
         self.agent_client = agent_client
         self.agent_name = agent_name
         self.agent_description = agent_description
         self.agent_prompt = agent_prompt
         self.output_schema = output_schema
+        self.shared_store = shared_store
+        self.auth_client = auth_client
         self._cached_agent_id: Optional[str] = None
     
     def execute(self) -> Optional[str]:
@@ -38,12 +46,16 @@ class EnsureAgentExists:
         if self._cached_agent_id:
             return self._cached_agent_id
         
+        if self.shared_store:
+            self._cached_agent_id = self.shared_store.get(self._shared_key())
+            if self._cached_agent_id:
+                return self._cached_agent_id
+        
         # Try to get existing agent
         agent = self.agent_client.get_by_name(self.agent_name)
         
         if agent:
-            self._cached_agent_id = agent.id
-            return self._cached_agent_id
+            return self._remember(agent.id)
         
         # Agent doesn't exist, create it
         print(f"Agent '{self.agent_name}' not found. Creating...")
@@ -58,7 +70,24 @@ class EnsureAgentExists:
         agent = self.agent_client.create(request)
         
         if agent:
-            self._cached_agent_id = agent.id
-            return self._cached_agent_id
+            return self._remember(agent.id)
         
         return None
+    
+    def reset(self) -> None:
+        """Forget the cached agent ID (e.g. after switching accounts)."""
+        self._cached_agent_id = None
+        if self.shared_store:
+            self.shared_store.delete(self._shared_key())
+    
+    def _remember(self, agent_id: str) -> str:
+        self._cached_agent_id = agent_id
+        if self.shared_store:
+            self.shared_store.set(self._shared_key(), agent_id)
+        return agent_id
+    
+    def _shared_key(self) -> str:
+        # Agent IDs belong to an account; hashed like the token key so credentials never appear
+        scope = self.auth_client.cache_scope() if self.auth_client else ""
+        account = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:32]
+        return f"agent:id:{account}:{self.agent_name}"
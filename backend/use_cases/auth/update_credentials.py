@@ -0,0 +1,136 @@
+"""Use case: Update Credentials."""
+import sys
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from backend.domain.repositories import ChallengeStore
+from backend.infrastructure.http.stackspot_auth_client import StackSpotAuthClient
+from backend.infrastructure.http.circuit_breaker import CircuitBreaker
+from backend.infrastructure.cache.http_response_cache import HttpResponseCache
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache
+from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.challenges.load_daily_challenge import LoadDailyChallenge
+
+
+class ReloadProgress:
+    """
+    Latest state of the background reload, with a version clients can wait on.
+
+    Stages: idle, queued, authenticating, loading_challenge, ready, failed.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._version = 0
+        self._snapshot: Dict[str, Any] = {"reload_id": 0, "stage": "idle", "error": None, "done": True}
+
+    def update(self, **fields) -> None:
+        with self._changed:
+            self._snapshot = dict(self._snapshot, **fields)
+            self._version += 1
+            self._changed.notify_all()
+
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """Return (version, state)."""
+        with self._changed:
+            return self._version, dict(self._snapshot)
+
+    def wait_for_change(self, version: int, timeout: float, stop: Optional[threading.Event] = None) -> bool:
+        """Block until the progress moves past `version`, `stop` is set or the timeout elapses."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._version > version or (stop is not None and stop.is_set()),
+                timeout
+            )
+
+    def wake_all(self) -> None:
+        """Wake every waiter so it re-checks its `stop` event."""
+        with self._changed:
+            self._changed.notify_all()
+
+
+class UpdateCredentials:
+    """
+    Use case for switching to new StackSpot credentials.
+
+    Everything tied to the old account is dropped right away: the access
+    token, the agent ID, cached HTTP responses of the old realm, cached chat
+    answers and the challenges generated ahead of time (today's included).
+    The challenge is then reloaded on a background worker and its progress
+    published through `progress`, so the caller returns immediately.
+    Reloads run one at a time, in the order credentials were saved.
+    """
+
+    def __init__(
+        self,
+        auth_client: StackSpotAuthClient,
+        ensure_agent_use_case: EnsureAgentExists,
+        load_daily_challenge: LoadDailyChallenge,
+        http_cache: Optional[HttpResponseCache] = None,
+        chat_response_cache: Optional[ChatResponseCache] = None,
+        challenge_store: Optional[ChallengeStore] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        self.auth_client = auth_client
+        self.ensure_agent = ensure_agent_use_case
+        self.load_daily_challenge = load_daily_challenge
+        self.http_cache = http_cache
+        self.chat_response_cache = chat_response_cache
+        self.challenge_store = challenge_store
+        self.circuit_breaker = circuit_breaker
+        self.progress = ReloadProgress()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="credentials-reload")
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def execute(self) -> int:
+        """
+        Apply credentials already set in the environment and schedule the reload.
+
+        Returns:
+            ID of the scheduled reload (see `progress`)
+        """
+        with self._lock:
+            self._last_id += 1
+            reload_id = self._last_id
+
+            old_scope = self.auth_client.cache_scope()
+            self.auth_client.reload_credentials()
+            self.auth_client.invalidate_token()
+            self.ensure_agent.reset()
+
+            if self.http_cache:
+                self.http_cache.invalidate(old_scope)
+            if self.chat_response_cache:
+                self.chat_response_cache.clear()
+            if self.challenge_store:
+                self.challenge_store.clear(since=str(date.today()))
+            if self.circuit_breaker:
+                self.circuit_breaker.reset()
+
+        self.progress.update(reload_id=reload_id, stage="queued", error=None, done=False)
+        self._executor.submit(self._reload, reload_id)
+        return reload_id
+
+    def _reload(self, reload_id: int) -> None:
+        if reload_id != self._last_id:
+            # Newer credentials were saved meanwhile; their reload will run next
+            return
+
+        try:
+            self.progress.update(reload_id=reload_id, stage="authenticating")
+            if not self.auth_client.get_token():
+                raise Exception("Authentication failed with the new credentials")
+
+            self.progress.update(reload_id=reload_id, stage="loading_challenge")
+            challenge = self.load_daily_challenge.execute(
+                error_message="Failed to load daily challenge after saving credentials"
+            )
+            if not challenge:
+                raise Exception("Failed to load daily challenge after saving credentials")
+
+            self.progress.update(reload_id=reload_id, stage="ready", title=challenge.scenario.title, done=True)
+        except Exception as e:
+            print(f"Credentials reload failed: {e}", file=sys.stderr)
+            self.progress.update(reload_id=reload_id, stage="failed", error=str(e), done=True)
@@ -1,8 +1,13 @@
 """Use case: Get Daily Challenge."""
+from datetime import date
 from typing import Optional
 from backend.domain.entities import DailyChallenge
-from backend.infrastructure.http.stackspot_challenge_client import StackSpotChallengeClient
+from backend.domain.repositories import ChallengeStore, ChallengeRepository, ChallengeGenerator
+from backend.infrastructure.http.circuit_breaker import CircuitBreaker
+from backend.infrastructure.shared.distributed_lock import DistributedLock, DistributedLocks, LockTimeout
+from backend.infrastructure.tracing.tracer import tracer
 from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.admission.admission_controller import AdmissionController, AdmissionRejected, Priority
 
 
 class GetDailyChallenge:
@@ -10,24 +15,141 @@ class GetDailyChallenge:
     Use case for retrieving the daily challenge.
     
     Orchestrates the flow of ensuring the agent exists and then
-    fetching the challenge from it.
+    fetching the challenge from it. Generation shares the admission
+    controller with chat, at background priority by default. Challenges
+    generated ahead of time are served from the local store, and fresh
+    ones are saved there.
+    
+    When the upstream circuit is open, credentials are missing or the
+    generation fails, the offline repository (a local content pack) is
+    used instead.
+    
+    With distributed locks, only the node holding the day's lock generates;
+    the others wait for it and then read the result from the shared store.
+    A node whose lease ran out while generating does not publish its result.
     """
     
     def __init__(
         self,
-        challenge_client: StackSpotChallengeClient,
-        ensure_agent_use_case: EnsureAgentExists
+        challenge_client: ChallengeGenerator,
+        ensure_agent_use_case: EnsureAgentExists,
+        admission: Optional[AdmissionController] = None,
+        background_max_wait: Optional[float] = None,
+        challenge_store: Optional[ChallengeStore] = None,
+        offline_repository: Optional[ChallengeRepository] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        locks: Optional[DistributedLocks] = None,
+        lock_timeout: float = 300
     ):
         self.challenge_client = challenge_client
         self.ensure_agent = ensure_agent_use_case
+        self.admission = admission
+        self.background_max_wait = background_max_wait
+        self.challenge_store = challenge_store
+        self.offline_repository = offline_repository
+        self.circuit_breaker = circuit_breaker
+        self.locks = locks
+        self.lock_timeout = lock_timeout
     
-    def execute(self) -> Optional[DailyChallenge]:
+    def execute(self, priority: Priority = Priority.BACKGROUND) -> Optional[DailyChallenge]:
         """
         Execute the use case.
         
+        Args:
+            priority: Scheduling class of the generation call
+        
         Returns:
             DailyChallenge object if successful, None otherwise
+            
+        Raises:
+            AdmissionRejected: If no upstream slot is available in time
         """
+        with tracer.span("challenge.get", priority=priority.name) as span:
+            return self._execute(priority, span)
+    
+    def _execute(self, priority: Priority, span) -> Optional[DailyChallenge]:
+        today = str(date.today())
+        if self.challenge_store:
+            stored = self.challenge_store.get(today)
+            if stored:
+                span.set_attribute("source", "store")
+                return stored
+        
+        if self.circuit_breaker and not self.circuit_breaker.allow_request():
+            print("Upstream circuit open, serving the offline challenge.")
+            span.set_attribute("source", "offline")
+            return self._offline()
+        
+        try:
+            if not self.locks:
+                return self._generate_and_store(priority, today, span)
+            
+            try:
+                with self.locks.hold(f"challenge:{today}", self.lock_timeout) as lock:
+                    # Another node may have generated it while this one waited
+                    stored = self.challenge_store.get(today) if self.challenge_store else None
+                    if stored:
+                        span.set_attribute("source", "store")
+                        return stored
+                    return self._generate_and_store(priority, today, span, lock)
+            except LockTimeout as e:
+                print(f"{e}; serving the offline challenge.")
+                span.set_attribute("source", "offline")
+                return self._offline()
+        finally:
+            # Paths without a verdict (admission rejected, lock timeout, stored by another
+            # node) must not leave a half-open trial in flight forever
+            if self.circuit_breaker:
+                self.circuit_breaker.release_trial()
+    
+    def _generate_and_store(
+        self,
+        priority: Priority,
+        today: str,
+        span,
+        lock: Optional[DistributedLock] = None
+    ) -> Optional[DailyChallenge]:
+        try:
+            challenge = self._generate(priority)
+        except AdmissionRejected:
+            raise
+        except Exception:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure()
+            offline = self._offline()
+            if offline:
+                span.set_attribute("source", "offline")
+                return offline
+            raise
+        
+        if not challenge:
+            # No credentials or no agent: upstream is unusable as well
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure()
+            span.set_attribute("source", "offline")
+            return self._offline()
+        
+        span.set_attribute("source", "agent")
+        
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success()
+        
+        challenge.date = today
+        if lock and lock.lost.is_set():
+            # The lease ran out and another node took over the day: its challenge is the one kept
+            print(f"Lost the lock for {today}, not publishing this challenge.")
+            stored = self.challenge_store.get(today) if self.challenge_store else None
+            if stored:
+                span.set_attribute("source", "store")
+                return stored
+            return challenge
+        
+        if self.challenge_store:
+            self.challenge_store.save(challenge)
+        
+        return challenge
+    
+    def _generate(self, priority: Priority) -> Optional[DailyChallenge]:
         # Step 1: Ensure agent exists and get its ID
         agent_id = self.ensure_agent.execute()
         
@@ -36,4 +158,14 @@ class GetDailyChallenge:
             return None
             
         # Step 2: Fetch challenge using the agent ID
-        return self.challenge_client.get_daily_challenge(agent_id)
+        if not self.admission:
+            return self.challenge_client.get_daily_challenge(agent_id)
+        
+        max_wait = self.background_max_wait if priority == Priority.BACKGROUND else None
+        with self.admission.acquire(priority, max_wait):
+            return self.challenge_client.get_daily_challenge(agent_id)
+    
+    def _offline(self) -> Optional[DailyChallenge]:
+        if not self.offline_repository:
+            return None
+        return self.offline_repository.get_daily_challenge()
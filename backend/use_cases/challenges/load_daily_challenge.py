@@ -0,0 +1,150 @@
+"""Use case: Load Daily Challenge."""
+import sys
+from datetime import date
+from typing import Optional
+from backend.domain.entities import DailyChallenge
+from backend.domain.repositories import StateRepository
+from backend.use_cases.challenges.get_daily_challenge import GetDailyChallenge
+from backend.use_cases.challenges.stream_daily_challenge import StreamDailyChallenge
+from backend.use_cases.chat.pregenerate_explanations import PregenerateExplanations
+from backend.use_cases.search.index_history import IndexDailyChallenge
+
+
+class LoadDailyChallenge:
+    """
+    Use case for fetching the daily challenge and installing it in the app state.
+    
+    Single place where a new challenge replaces the current one, so everything
+    that must follow an install (resetting conversations, indexing) happens
+    for startup, manual reloads and credential changes alike.
+    
+    With a streaming use case, the challenge is installed as soon as the
+    scenario and the first flashcard arrive; the remaining cards are appended
+    while `state.is_generating` is set. If the stream fails before anything
+    was installed, the non-streaming request is used instead.
+    
+    Installed cards are handed to the explanation pre-generation as they arrive.
+    """
+    
+    def __init__(
+        self,
+        get_daily_challenge: GetDailyChallenge,
+        state_repository: StateRepository,
+        index_daily_challenge: IndexDailyChallenge,
+        stream_daily_challenge: Optional[StreamDailyChallenge] = None,
+        pregenerate_explanations: Optional[PregenerateExplanations] = None
+    ):
+        self.get_daily_challenge = get_daily_challenge
+        self.state_repository = state_repository
+        self.index_daily_challenge = index_daily_challenge
+        self.stream_daily_challenge = stream_daily_challenge
+        self.pregenerate_explanations = pregenerate_explanations
+    
+    def execute(self, error_message: str = "Failed to load daily challenge") -> Optional[DailyChallenge]:
+        """
+        Execute the use case.
+        
+        Args:
+            error_message: Error stored in the state if no challenge is returned
+            
+        Returns:
+            The installed DailyChallenge, or None on failure (see state.error)
+        """
+        state = self.state_repository.get_state()
+        try:
+            return self._load(state, error_message)
+        finally:
+            # Shared state repositories only see the result once it is stored
+            self.state_repository.update_state(state)
+    
+    def _load(self, state, error_message: str) -> Optional[DailyChallenge]:
+        state.is_loading = True
+        state.error = None
+        
+        if self.stream_daily_challenge:
+            try:
+                challenge = self._load_streaming()
+                if challenge:
+                    return challenge
+            except Exception as e:
+                if state.is_generating:
+                    # Part of the challenge is already on screen; keep it
+                    print(f"Challenge stream interrupted: {e}", file=sys.stderr)
+                    state.is_generating = False
+                    return state.daily_challenge
+                print(f"Challenge stream failed, retrying without streaming: {e}", file=sys.stderr)
+        
+        try:
+            challenge = self.get_daily_challenge.execute()
+        except Exception as e:
+            state.error = str(e)
+            state.is_loading = False
+            raise
+        
+        if not challenge:
+            state.error = error_message
+            state.is_loading = False
+            return None
+        
+        self._install(state, challenge)
+        state.is_loading = False
+        self.state_repository.update_state(state)
+        
+        self.index_daily_challenge.execute(challenge)
+        self._pregenerate(challenge)
+        return challenge
+    
+    def _load_streaming(self) -> Optional[DailyChallenge]:
+        """Install the challenge incrementally. Returns None if nothing usable arrived."""
+        state = self.state_repository.get_state()
+        scenario = None
+        installed: Optional[DailyChallenge] = None
+        
+        for kind, value in self.stream_daily_challenge.execute():
+            if kind == "scenario":
+                scenario = value
+            elif kind == "flashcard" and scenario is not None:
+                if installed is None:
+                    installed = DailyChallenge(date=str(date.today()), scenario=scenario, flashcards=[value])
+                    self._install(state, installed)
+                    state.is_generating = True
+                    state.is_loading = False
+                else:
+                    installed.flashcards.append(value)
+                self.state_repository.update_state(state)
+                self._pregenerate(installed)
+            elif kind == "challenge":
+                if installed is None:
+                    self._install(state, value)
+                    installed = value
+                else:
+                    installed.date = value.date
+                    # Replace in place so readers holding the list see the final cards
+                    installed.flashcards[:] = value.flashcards
+                state.is_generating = False
+                state.is_loading = False
+                self.state_repository.update_state(state)
+                self.index_daily_challenge.execute(installed)
+                self._pregenerate(installed)
+                return installed
+        
+        if installed is not None:
+            raise Exception("Challenge stream ended without the full document")
+        return None
+    
+    def _pregenerate(self, challenge: DailyChallenge) -> None:
+        if not self.pregenerate_explanations:
+            return
+        try:
+            self.pregenerate_explanations.execute(challenge)
+        except Exception as e:
+            # Cards are then explained when opened, as before
+            print(f"Error scheduling explanations: {e}", file=sys.stderr)
+    
+    @staticmethod
+    def _install(state, challenge: DailyChallenge) -> None:
+        state.daily_challenge = challenge
+        state.current_flashcard_index = 0
+        state.conversations = {}
+        state.initialize_conversation(0)
+
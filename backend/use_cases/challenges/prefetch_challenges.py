@@ -0,0 +1,169 @@
+"""Use case: Prefetch Challenges."""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import List, Optional
+from backend.domain.entities import generate_ulid
+from backend.domain.repositories import ChallengeStore, ChallengeGenerator
+from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.admission.admission_controller import AdmissionController, Priority
+from backend.infrastructure.shared.distributed_lock import DistributedLock, DistributedLocks
+
+PREFETCH_PROMPT = "proximo cenário, para o dia {date}"
+AVOID_TITLES = ", com um tema diferente destes cenários já usados: {titles}"
+
+
+def prefetch_prompt(challenge_date: str, taken_titles: List[str]) -> str:
+    """Request for one day's challenge that names its date and the scenarios it must not repeat."""
+    prompt = PREFETCH_PROMPT.format(date=challenge_date)
+    if taken_titles:
+        prompt += AVOID_TITLES.format(titles="; ".join(taken_titles))
+    return prompt
+
+
+class PrefetchChallenges:
+    """
+    Use case for generating the challenges of the coming days ahead of time.
+    
+    Each missing day is generated on its own agent conversation, several in
+    parallel, validated against the agent output schema and saved to the
+    local challenge store. Since the conversations share no context, each
+    prompt names its date and the scenario titles already taken: those
+    stored around the range and those generated earlier in the run (days
+    running at the same time cannot see each other's). Days that fail are
+    simply retried on the next run. With distributed locks, days another
+    node is generating are skipped.
+    """
+    
+    def __init__(
+        self,
+        challenge_client: ChallengeGenerator,
+        ensure_agent_use_case: EnsureAgentExists,
+        challenge_store: ChallengeStore,
+        admission: Optional[AdmissionController] = None,
+        days: int = 7,
+        parallelism: int = 3,
+        background_max_wait: Optional[float] = None,
+        locks: Optional[DistributedLocks] = None
+    ):
+        self.challenge_client = challenge_client
+        self.ensure_agent = ensure_agent_use_case
+        self.challenge_store = challenge_store
+        self.admission = admission
+        self.days = days
+        self.parallelism = max(1, parallelism)
+        self.background_max_wait = background_max_wait
+        self.locks = locks
+        self._running = threading.Lock()
+        self._titles_lock = threading.Lock()
+        self._taken_titles: List[str] = []
+    
+    def execute(self, start: Optional[date] = None) -> List[str]:
+        """
+        Execute the use case.
+        
+        Args:
+            start: First day to cover (defaults to today)
+            
+        Returns:
+            Dates (YYYY-MM-DD) that were generated in this run
+        """
+        if self.days <= 0:
+            return []
+        
+        # A prefetch already in progress covers the same days
+        if not self._running.acquire(blocking=False):
+            return []
+        
+        try:
+            start = start or date.today()
+            stored = set(self.challenge_store.dates())
+            missing = [
+                str(start + timedelta(days=offset))
+                for offset in range(self.days)
+                if str(start + timedelta(days=offset)) not in stored
+            ]
+            if not missing:
+                return []
+            
+            agent_id = self.ensure_agent.execute()
+            if not agent_id:
+                print("Could not get agent ID for challenge prefetch.", file=sys.stderr)
+                return []
+            
+            self._taken_titles = self._recent_titles(start, stored)
+            with ThreadPoolExecutor(max_workers=min(self.parallelism, len(missing))) as pool:
+                results = list(pool.map(lambda day: self._generate(agent_id, day), missing))
+            
+            generated = [day for day in results if day]
+            print(f"Prefetched {len(generated)}/{len(missing)} challenges.", file=sys.stderr)
+            return generated
+        finally:
+            self._running.release()
+    
+    def _generate(self, agent_id: str, challenge_date: str) -> Optional[str]:
+        if not self.locks:
+            return self._generate_unlocked(agent_id, challenge_date)
+        
+        lock = self.locks.lock(f"challenge:{challenge_date}")
+        if not lock.acquire():
+            # Another node is generating this day
+            return None
+        try:
+            if self.challenge_store.get(challenge_date):
+                return None
+            return self._generate_unlocked(agent_id, challenge_date, lock)
+        finally:
+            lock.release()
+    
+    def _generate_unlocked(
+        self,
+        agent_id: str,
+        challenge_date: str,
+        lock: Optional[DistributedLock] = None
+    ) -> Optional[str]:
+        try:
+            with self._titles_lock:
+                prompt = prefetch_prompt(challenge_date, list(self._taken_titles))
+            if self.admission:
+                with self.admission.acquire(Priority.BACKGROUND, self.background_max_wait):
+                    challenge = self._fetch(agent_id, prompt)
+            else:
+                challenge = self._fetch(agent_id, prompt)
+            
+            if not challenge:
+                return None
+            
+            if lock and lock.lost.is_set():
+                # Another node took over this day and publishes its own challenge
+                print(f"Lost the lock for {challenge_date}, not saving the prefetched challenge.", file=sys.stderr)
+                return None
+            
+            challenge.date = challenge_date
+            self.challenge_store.save(challenge)
+            with self._titles_lock:
+                self._taken_titles.append(challenge.scenario.title)
+            return challenge_date
+        except Exception as e:
+            print(f"Failed to prefetch challenge for {challenge_date}: {e}", file=sys.stderr)
+            return None
+    
+    def _recent_titles(self, start: date, stored: set) -> List[str]:
+        """Titles of the stored challenges from `days` days before `start` to the end of the range."""
+        first = str(start - timedelta(days=self.days))
+        last = str(start + timedelta(days=self.days - 1))
+        titles = []
+        for challenge_date in sorted(d for d in stored if first <= d <= last):
+            challenge = self.challenge_store.get(challenge_date)
+            if challenge and challenge.scenario and challenge.scenario.title:
+                titles.append(challenge.scenario.title)
+        return titles
+    
+    def _fetch(self, agent_id: str, prompt: str):
+        return self.challenge_client.get_daily_challenge(
+            agent_id,
+            conversation_id=generate_ulid(),
+            validate_schema=True,
+            user_prompt=prompt
+        )
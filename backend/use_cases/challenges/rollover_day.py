@@ -0,0 +1,85 @@
+"""Use case: Rollover Day."""
+import sys
+import threading
+from typing import Optional
+from backend.domain.entities import AppState
+from backend.domain.repositories import StateRepository
+from backend.use_cases.challenges.get_daily_challenge import GetDailyChallenge
+from backend.use_cases.challenges.prefetch_challenges import PrefetchChallenges
+from backend.use_cases.chat.conversation_history import ConversationHistory
+from backend.use_cases.chat.pregenerate_explanations import PregenerateExplanations
+from backend.use_cases.search.index_history import IndexDailyChallenge
+
+
+class RolloverDay:
+    """
+    Use case for switching the app to a new day.
+    
+    The new state is built off to the side while the old one keeps serving
+    requests, then swapped in with a single `update_state`. Chat streams
+    that started before the swap keep their reference to the old state and
+    finish normally; the old day's conversations are archived after the
+    swap, and anything those streams still append goes to the archive too.
+    """
+    
+    def __init__(
+        self,
+        get_daily_challenge: GetDailyChallenge,
+        state_repository: StateRepository,
+        conversation_history: ConversationHistory,
+        index_daily_challenge: IndexDailyChallenge,
+        prefetch_challenges: Optional[PrefetchChallenges] = None,
+        pregenerate_explanations: Optional[PregenerateExplanations] = None
+    ):
+        self.get_daily_challenge = get_daily_challenge
+        self.state_repository = state_repository
+        self.conversation_history = conversation_history
+        self.index_daily_challenge = index_daily_challenge
+        self.prefetch_challenges = prefetch_challenges
+        self.pregenerate_explanations = pregenerate_explanations
+        self._lock = threading.Lock()
+    
+    def execute(self, new_date: str) -> bool:
+        """
+        Execute the use case.
+        
+        Args:
+            new_date: The day being switched to (YYYY-MM-DD)
+            
+        Returns:
+            True if the app now shows `new_date`, False to retry later
+        """
+        with self._lock:
+            old_state = self.state_repository.get_state()
+            if old_state.get_current_date() == new_date:
+                return True
+            
+            challenge = self.get_daily_challenge.execute()
+            if not challenge:
+                print(f"No challenge available for {new_date} yet.", file=sys.stderr)
+                return False
+            challenge.date = new_date
+            
+            new_state = AppState(daily_challenge=challenge, is_loading=False)
+            new_state.initialize_conversation(0)
+            
+            self.state_repository.update_state(new_state)
+            
+            for conversation in list(old_state.conversations.values()):
+                self.conversation_history.archive_all(conversation)
+        
+        self.index_daily_challenge.execute(challenge)
+        print(f"Switched to the challenge of {new_date}.", flush=True)
+        
+        if self.pregenerate_explanations:
+            try:
+                self.pregenerate_explanations.execute(challenge)
+            except Exception as e:
+                print(f"Error scheduling explanations: {e}", file=sys.stderr)
+        
+        if self.prefetch_challenges:
+            try:
+                self.prefetch_challenges.execute()
+            except Exception as e:
+                print(f"Error prefetching challenges: {e}", file=sys.stderr)
+        return True
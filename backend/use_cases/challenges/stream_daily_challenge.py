@@ -0,0 +1,138 @@
+"""Use case: Stream Daily Challenge."""
+from datetime import date
+from typing import Any, Iterator, Optional, Tuple
+from backend.domain.repositories import ChallengeStore, ChallengeGenerator
+from backend.infrastructure.http.circuit_breaker import CircuitBreaker
+from backend.infrastructure.shared.distributed_lock import DistributedLock, DistributedLocks
+from backend.use_cases.agents.ensure_agent_exists import EnsureAgentExists
+from backend.use_cases.admission.admission_controller import AdmissionController, Priority
+
+
+class StreamDailyChallenge:
+    """
+    Use case for retrieving the daily challenge piece by piece.
+    
+    Same flow as GetDailyChallenge, but yields the scenario and each
+    flashcard as soon as the agent finishes writing them. A challenge
+    already in the local store is replayed through the same events.
+    Nothing is streamed while the upstream circuit is open. With
+    distributed locks, a node waits for the one already generating the day
+    and replays its result.
+    """
+    
+    def __init__(
+        self,
+        challenge_client: ChallengeGenerator,
+        ensure_agent_use_case: EnsureAgentExists,
+        admission: Optional[AdmissionController] = None,
+        background_max_wait: Optional[float] = None,
+        challenge_store: Optional[ChallengeStore] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        locks: Optional[DistributedLocks] = None,
+        lock_timeout: float = 300
+    ):
+        self.challenge_client = challenge_client
+        self.ensure_agent = ensure_agent_use_case
+        self.admission = admission
+        self.background_max_wait = background_max_wait
+        self.challenge_store = challenge_store
+        self.circuit_breaker = circuit_breaker
+        self.locks = locks
+        self.lock_timeout = lock_timeout
+    
+    def execute(self, priority: Priority = Priority.BACKGROUND) -> Iterator[Tuple[str, Any]]:
+        """
+        Execute the use case.
+        
+        Args:
+            priority: Scheduling class of the generation call
+        
+        Yields:
+            ("scenario", Scenario), ("flashcard", Flashcard)... and finally
+            ("challenge", DailyChallenge). Nothing is yielded if no agent is available.
+            
+        Raises:
+            AdmissionRejected: If no upstream slot is available in time
+            LockTimeout: If another node keeps generating for too long
+        """
+        today = str(date.today())
+        stored = self.challenge_store.get(today) if self.challenge_store else None
+        if stored:
+            yield from self._replay(stored)
+            return
+        
+        if self.circuit_breaker and not self.circuit_breaker.allow_request():
+            return
+        
+        try:
+            if not self.locks:
+                yield from self._generate(priority, today)
+                return
+            
+            with self.locks.hold(f"challenge:{today}", self.lock_timeout) as lock:
+                # Another node may have generated it while this one waited
+                stored = self.challenge_store.get(today) if self.challenge_store else None
+                if stored:
+                    yield from self._replay(stored)
+                else:
+                    yield from self._generate(priority, today, lock)
+        finally:
+            # Paths without a verdict (admission rejected, consumer gone, lock timeout,
+            # stored by another node) must not leave a half-open trial in flight forever
+            if self.circuit_breaker:
+                self.circuit_breaker.release_trial()
+    
+    @staticmethod
+    def _replay(stored) -> Iterator[Tuple[str, Any]]:
+        yield "scenario", stored.scenario
+        for flashcard in stored.flashcards:
+            yield "flashcard", flashcard
+        yield "challenge", stored
+    
+    def _generate(
+        self,
+        priority: Priority,
+        today: str,
+        lock: Optional[DistributedLock] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        agent_id = self.ensure_agent.execute()
+        
+        if not agent_id:
+            print("Could not get agent ID for daily challenge.")
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure()
+            return
+        
+        if not self.admission:
+            yield from self._stream(agent_id, today, lock)
+        else:
+            max_wait = self.background_max_wait if priority == Priority.BACKGROUND else None
+            with self.admission.acquire(priority, max_wait):
+                yield from self._stream(agent_id, today, lock)
+    
+    def _stream(
+        self,
+        agent_id: str,
+        today: str,
+        lock: Optional[DistributedLock] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        try:
+            for kind, value in self.challenge_client.stream_daily_challenge(agent_id):
+                if kind == "challenge":
+                    value.date = today
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_success()
+                    if lock and lock.lost.is_set():
+                        # Another node took over the day: finish with its challenge, if stored yet
+                        print(f"Lost the lock for {today}, not publishing this challenge.")
+                        stored = self.challenge_store.get(today) if self.challenge_store else None
+                        value = stored or value
+                    elif self.challenge_store:
+                        self.challenge_store.save(value)
+                yield kind, value
+        except GeneratorExit:
+            raise
+        except Exception:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure()
+            raise
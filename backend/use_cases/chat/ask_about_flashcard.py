@@ -0,0 +1,162 @@
+"""Use case: Ask About Flashcard - one chat message on the current card."""
+from typing import Callable, Iterator, Optional
+from backend.domain.repositories import StateRepository
+from backend.infrastructure.cache.chat_response_cache import make_cache_key
+from backend.infrastructure.rendering.markdown_renderer import MarkdownRenderer
+from backend.use_cases.chat.chat_with_agent import ChatWithAgent, is_cached_replay
+from backend.use_cases.chat.coalesce_stream import CoalescingConfig, CoalescingMetrics, coalesce
+from backend.use_cases.chat.conversation_history import ConversationHistory
+from backend.use_cases.chat.pregenerate_explanations import (
+    PregenerateExplanations, explanation_question, first_message_prompt
+)
+from backend.use_cases.chat.resumable_streams import ChatStream, ResumableStreams
+from backend.use_cases.search.index_history import IndexChatMessage
+from backend.use_cases.study.study_events import QUESTION_ASKED, RecordStudyEvent
+
+
+class AskAboutFlashcard:
+    """
+    Use case for sending a message about the current flashcard.
+
+    The first message of a card carries the card itself. With `explain`,
+    the card's initial explanation is asked for (hidden); one generated in
+    the background is served or followed instead of a new upstream call.
+    The answer runs as a resumable stream and is saved to the conversation
+    once complete. Shared by the HTTP route and the desktop JS bridge.
+    """
+
+    def __init__(
+        self,
+        state_repository: StateRepository,
+        chat_with_agent: ChatWithAgent,
+        conversation_history: ConversationHistory,
+        index_chat_message: IndexChatMessage,
+        resumable_streams: ResumableStreams,
+        pregenerate_explanations: Optional[PregenerateExplanations] = None,
+        markdown_renderer: Optional[MarkdownRenderer] = None,
+        coalescing: Optional[CoalescingConfig] = None,
+        coalescing_metrics: Optional[CoalescingMetrics] = None,
+        track: Optional[Callable[[Iterator], Iterator]] = None,
+        record_study_event: Optional[RecordStudyEvent] = None
+    ):
+        self.state_repository = state_repository
+        self.chat_with_agent = chat_with_agent
+        self.conversation_history = conversation_history
+        self.index_chat_message = index_chat_message
+        self.resumable_streams = resumable_streams
+        self.pregenerate_explanations = pregenerate_explanations
+        self.markdown_renderer = markdown_renderer
+        self.coalescing = coalescing or CoalescingConfig()
+        self.coalescing_metrics = coalescing_metrics
+        # Wraps the upstream so a graceful shutdown waits for it (ServerLifecycle.track)
+        self.track = track
+        self.record_study_event = record_study_event
+
+    def execute(
+        self,
+        question: Optional[str],
+        hidden: bool = False,
+        explain: bool = False,
+        use_cache: bool = True,
+        coalescing: Optional[CoalescingConfig] = None
+    ) -> ChatStream:
+        """
+        Execute the use case.
+
+        Args:
+            question: The learner's message (ignored with `explain`)
+            hidden: Keep the message itself out of the history
+            explain: Ask for the card's initial explanation
+            use_cache: Allow the hidden explanation to come from the response cache
+            coalescing: How answer chunks are merged into frames (defaults to the configured one)
+
+        Returns:
+            The answer stream, to follow from event 0
+
+        Raises:
+            AdmissionRejected: If no upstream slot is available in time
+        """
+        state = self.state_repository.get_state()
+        idx = state.current_flashcard_index
+
+        # Ensure conversation exists
+        if idx not in state.conversations:
+            state.initialize_conversation(idx)
+
+        if not state.current_conversation_id:
+            state.current_conversation_id = state.conversations[idx].id
+
+        conversation = state.conversations[idx]
+        flashcard = state.get_current_flashcard()
+        stream = None
+        if explain and flashcard:
+            question = explanation_question(state.daily_challenge.scenario, flashcard)
+            hidden = True
+            # Generated in the background: served right away, or followed while it is written
+            if conversation.explanation:
+                stream = iter([{"answer": conversation.explanation}])
+            elif self.pregenerate_explanations:
+                job = self.pregenerate_explanations.claim(state.get_current_date(), idx)
+                if job:
+                    stream = job.events()
+
+        # Build user prompt (a background explanation needs none: its job marks the
+        # conversation as having seen the card once its upstream call ran)
+        cache_key = None
+        is_first_message = False
+        user_prompt = question
+        if stream is None and state.is_first_message_for_card and flashcard:
+            user_prompt = first_message_prompt(flashcard, question)
+            # The hidden "explain" message is the same for every visit of a card
+            if hidden and use_cache:
+                cache_key = make_cache_key(
+                    flashcard.question, flashcard.detailed_explanation or flashcard.answer, question
+                )
+            is_first_message = True
+
+        # Admission happens before any state change, so a rejected request can simply be retried
+        if stream is None:
+            stream = self.chat_with_agent.execute(state.current_conversation_id, user_prompt, cache_key)
+            # A cached answer never reached the agent: the next real turn still carries the card
+            if is_cached_replay(stream):
+                is_first_message = False
+
+        if is_first_message:
+            state.is_first_message_for_card = False
+            conversation.is_first = False
+
+        # Save user message ONLY if not hidden
+        if not hidden:
+            self.conversation_history.append(conversation, {"role": "user", "content": question})
+        self.state_repository.update_state(state)
+
+        frames = coalesce(stream, coalescing or self.coalescing, self.coalescing_metrics)
+
+        def save_answer(full_answer: str) -> None:
+            # Runs when the upstream ends, whether or not anyone is still reading
+            position = self.conversation_history.append(conversation, {"role": "bot", "content": full_answer})
+            self.index_chat_message.execute(
+                challenge_date=state.get_current_date() or "",
+                flashcard_index=idx,
+                conversation_id=conversation.id,
+                message_index=position,
+                content=full_answer
+            )
+            self.state_repository.update_state(state)
+            if self.markdown_renderer:
+                # Rendered now, while nobody waits, so history loads hit the cache
+                self.markdown_renderer.render(full_answer)
+
+        # Read on its own thread, so a dropped connection can resume with Last-Event-ID
+        upstream = self.track(frames) if self.track else frames
+        chat_stream = self.resumable_streams.start(conversation.id, upstream, save_answer)
+        if self.record_study_event:
+            self.record_study_event.execute(
+                QUESTION_ASKED, state,
+                conversation_id=conversation.id,
+                stream_id=chat_stream.id,
+                explain=explain,
+                hidden=hidden,
+                chars=0 if explain else len(question or "")
+            )
+        return chat_stream
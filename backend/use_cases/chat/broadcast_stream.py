@@ -0,0 +1,92 @@
+"""Broadcast Stream - one stream of chat events read by any number of subscribers."""
+import os
+import time
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class BroadcastStream:
+    """
+    Events of one upstream stream, kept in order so readers can join late.
+
+    Each published event gets a sequence number (1, 2, ...). `follow(after)`
+    replays the events after `after` and then waits for the others until
+    the stream ends, so a reader that lost its connection resumes from the
+    last event it saw. An error ends the stream as a final {"error": ...} event.
+    """
+
+    def __init__(self, stream_id: Optional[str] = None):
+        self.id = stream_id or os.urandom(8).hex()
+        self.done = False
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self._events: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._subscribers = 0
+        self._last_seen = time.monotonic()
+
+    @property
+    def text(self) -> str:
+        """The answer so far (all "answer" chunks joined)."""
+        with self._cond:
+            return "".join(event["answer"] for event in self._events if "answer" in event)
+
+    @property
+    def last_seq(self) -> int:
+        with self._cond:
+            return len(self._events)
+
+    @property
+    def subscribers(self) -> int:
+        with self._cond:
+            return self._subscribers
+
+    def unwatched_seconds(self) -> float:
+        """How long nobody has been reading (0 while someone is)."""
+        with self._cond:
+            return 0.0 if self._subscribers else time.monotonic() - self._last_seen
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """Append an event; returns its sequence number."""
+        with self._cond:
+            self._events.append(event)
+            self._cond.notify_all()
+            return len(self._events)
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self._cond:
+            if self.done:
+                return
+            if error:
+                self._events.append({"error": error})
+            self.error = error
+            self.done = True
+            self.finished_at = time.monotonic()
+            self._cond.notify_all()
+
+    def follow(self, after: int = 0, poll_seconds: float = 1.0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(seq, event) for every event after `after`, live until the stream ends."""
+        with self._cond:
+            self._subscribers += 1
+        position = max(0, after)
+        try:
+            while True:
+                with self._cond:
+                    while position >= len(self._events) and not self.done:
+                        self._cond.wait(poll_seconds)
+                    events = self._events[position:]
+                    first = position + 1
+                    position += len(events)
+                    finished = self.done and position >= len(self._events)
+                for offset, event in enumerate(events):
+                    yield first + offset, event
+                if finished:
+                    return
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+                self._last_seen = time.monotonic()
+
+    def events(self) -> Iterator[Dict[str, Any]]:
+        """The events only, from the start."""
+        return (event for _, event in self.follow())
@@ -1,6 +1,37 @@
 """Use case: Chat With Agent."""
-from typing import Generator, Dict, Any
-from backend.infrastructure.http.stackspot_chat_client import StackSpotChatClient
+from typing import Generator, Iterator, Dict, Any, List, Optional
+from backend.domain.repositories import ChatProvider
+from backend.infrastructure.cache.chat_response_cache import ChatResponseCache
+from backend.infrastructure.tracing.tracer import tracer
+from backend.use_cases.admission.admission_controller import AdmissionController, Priority
+
+
+class CachedReplay:
+    """
+    Answer chunks replayed from the response cache.
+    
+    The upstream conversation never received the prompt, so callers must
+    not treat it as having seen it (e.g. the card context of a first message).
+    """
+    
+    from_cache = True
+    
+    def __init__(self, stream: Iterator[Dict[str, Any]]):
+        self._stream = stream
+    
+    def __iter__(self) -> 'CachedReplay':
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        return next(self._stream)
+    
+    def close(self) -> None:
+        self._stream.close()
+
+
+def is_cached_replay(stream: Iterator[Dict[str, Any]]) -> bool:
+    """True if `stream` was served by the response cache instead of the agent."""
+    return getattr(stream, "from_cache", False)
 
 
 class ChatWithAgent:
@@ -8,20 +39,86 @@ class ChatWithAgent:
     Use case for chatting with the agent.
     
     Encapsulates the logic of sending messages and streaming responses.
+    Streams for cacheable prompts are recorded and replayed from the
+    response cache on later requests. Upstream calls need a slot from the
+    admission controller, held until the stream ends or is closed.
     """
     
-    def __init__(self, chat_client: StackSpotChatClient):
+    def __init__(
+        self,
+        chat_client: ChatProvider,
+        response_cache: Optional[ChatResponseCache] = None,
+        admission: Optional[AdmissionController] = None
+    ):
         self.chat_client = chat_client
+        self.response_cache = response_cache
+        self.admission = admission
     
-    def execute(self, conversation_id: str, user_prompt: str) -> Generator[Dict[str, Any], None, None]:
+    def execute(
+        self,
+        conversation_id: str,
+        user_prompt: str,
+        cache_key: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        max_wait: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
         Execute the use case.
         
+        Admission happens eagerly, before the first chunk is requested, so
+        callers can turn a rejection into an error response.
+        
         Args:
             conversation_id: ID of the conversation
             user_prompt: User's message
+            cache_key: Fingerprint of a cacheable prompt, None to bypass the cache
+            priority: Scheduling class of the upstream call
+            max_wait: Seconds to wait for a slot (defaults to the controller setting)
+            
+        Returns:
+            Iterator of response chunks (a CachedReplay on a cache hit)
             
-        Yields:
-            dict: Response chunks
+        Raises:
+            AdmissionRejected: If no upstream slot is available in time
         """
-        return self.chat_client.chat_with_agent(conversation_id, user_prompt)
+        span = tracer.start_span("chat.stream", conversation_id=conversation_id)
+        
+        use_cache = bool(cache_key and self.response_cache)
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            span.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return CachedReplay(tracer.iterate(span, cached))
+        
+        try:
+            with tracer.activate(span), tracer.span("admission.acquire", priority=priority.name):
+                ticket = self.admission.acquire(priority, max_wait) if self.admission else None
+        except Exception as e:
+            span.record_error(e)
+            span.end()
+            raise
+        
+        stream = self.chat_client.chat_with_agent(conversation_id, user_prompt)
+        if use_cache:
+            stream = self._record(cache_key, stream)
+        stream = tracer.iterate(span, stream)
+        
+        return ticket.guard(stream) if ticket else stream
+    
+    def _record(self, cache_key: str, stream) -> Generator[Dict[str, Any], None, None]:
+        """Pass chunks through and cache them once the stream completes without errors."""
+        chunks: List[Dict[str, Any]] = []
+        
+        try:
+            for event_data in stream:
+                if "error" in event_data:
+                    yield event_data
+                    return
+                chunks.append(event_data)
+                yield event_data
+        finally:
+            # Propagate cancellation to the upstream stream right away
+            stream.close()
+        
+        if chunks:
+            self.response_cache.put(cache_key, chunks)
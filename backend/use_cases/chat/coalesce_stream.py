@@ -0,0 +1,210 @@
+"""Use case: Coalesce Stream - merges small answer chunks into fewer SSE frames."""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional
+from backend.infrastructure.http.cancellation import CancelScope
+from backend.use_cases.chat.chat_with_agent import is_cached_replay
+
+_END = object()
+
+
+@dataclass
+class CoalescingConfig:
+    """How answer chunks are merged into frames."""
+    # Longest time a chunk may wait for others (0 disables coalescing)
+    window_ms: float = 40
+    # Flush as soon as this many bytes are buffered
+    max_bytes: int = 1024
+    # Send the first chunk right away so time-to-first-token is unchanged
+    flush_first: bool = True
+    # Upstream slower than this (EWMA of inter-chunk gaps) is passed through unmerged
+    passthrough_gap_ms: Optional[float] = None
+
+    @classmethod
+    def from_request(cls, default: "CoalescingConfig", options: Optional[Dict[str, Any]]) -> "CoalescingConfig":
+        """Per-request overrides, clamped to sane bounds."""
+        if not isinstance(options, dict):
+            return default
+        window_ms = options.get("window_ms", default.window_ms)
+        max_bytes = options.get("max_bytes", default.max_bytes)
+        try:
+            return cls(
+                window_ms=min(max(float(window_ms), 0.0), 1000.0),
+                max_bytes=min(max(int(max_bytes), 1), 65536),
+                flush_first=bool(options.get("flush_first", default.flush_first)),
+                passthrough_gap_ms=default.passthrough_gap_ms
+            )
+        except (TypeError, ValueError):
+            return default
+
+
+class CoalescingMetrics:
+    """Frames per answer and latency added by buffering."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._answers = 0
+        self._chunks = 0
+        self._frames = 0
+        self._added_latency_ms = 0.0
+        self._max_added_latency_ms = 0.0
+
+    def record(self, chunks: int, frames: int, added_latency_ms: float, max_added_latency_ms: float) -> None:
+        with self._lock:
+            self._answers += 1
+            self._chunks += chunks
+            self._frames += frames
+            self._added_latency_ms += added_latency_ms
+            self._max_added_latency_ms = max(self._max_added_latency_ms, max_added_latency_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "answers": self._answers,
+                "chunks_in": self._chunks,
+                "frames_out": self._frames,
+                "frames_per_answer": round(self._frames / self._answers, 1) if self._answers else 0.0,
+                "chunks_per_frame": round(self._chunks / self._frames, 2) if self._frames else 0.0,
+                "avg_added_latency_ms": round(self._added_latency_ms / self._chunks, 2) if self._chunks else 0.0,
+                "max_added_latency_ms": round(self._max_added_latency_ms, 2)
+            }
+
+
+def coalesce(
+    stream: Iterable[Dict[str, Any]],
+    config: CoalescingConfig,
+    metrics: Optional[CoalescingMetrics] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Merge consecutive {"answer": ...} chunks of `stream` into larger ones.
+
+    A frame is flushed when its oldest chunk has waited `window_ms`, when
+    it reaches `max_bytes`, or when any other event (e.g. an error) comes
+    through. The upstream is read on a helper thread so a buffered chunk
+    never waits for the next one beyond the window. When the upstream is
+    slow anyway, chunks pass through one by one. Answers replayed from the
+    response cache keep their original chunks.
+
+    Closing the returned generator cancels the helper thread's read (see
+    CancelScope), so `stream` is closed right away even while it stalls.
+    """
+    if config.window_ms <= 0 or is_cached_replay(stream):
+        yield from _passthrough(stream, metrics)
+        return
+
+    window = config.window_ms / 1000.0
+    passthrough_gap = (config.passthrough_gap_ms if config.passthrough_gap_ms is not None else config.window_ms) / 1000.0
+    chunks: "queue.Queue" = queue.Queue()
+    scope = CancelScope()
+    pump = threading.Thread(target=_pump, args=(stream, chunks, scope), name="sse-coalesce", daemon=True)
+    pump.start()
+
+    buffer = []
+    buffer_arrivals = []
+    buffered_bytes = 0
+    first_arrival = 0.0
+    frames = 0
+    chunk_count = 0
+    added_latency = 0.0
+    max_added_latency = 0.0
+    last_arrival = None
+    gap_ewma = None
+
+    def flush():
+        nonlocal buffer, buffered_bytes, frames, added_latency, max_added_latency
+        now = time.perf_counter()
+        for arrival in buffer_arrivals:
+            waited = (now - arrival) * 1000
+            added_latency += waited
+            max_added_latency = max(max_added_latency, waited)
+        buffer_arrivals.clear()
+        frame = {"answer": "".join(buffer)}
+        buffer = []
+        buffered_bytes = 0
+        frames += 1
+        return frame
+
+    try:
+        while True:
+            timeout = None
+            if buffer:
+                timeout = max(0.0, first_arrival + window - time.perf_counter())
+            try:
+                item = chunks.get(timeout=timeout)
+            except queue.Empty:
+                yield flush()
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                if buffer:
+                    yield flush()
+                raise item
+
+            now = time.perf_counter()
+            if last_arrival is not None:
+                gap = now - last_arrival
+                gap_ewma = gap if gap_ewma is None else 0.8 * gap_ewma + 0.2 * gap
+            last_arrival = now
+
+            if "answer" not in item or not isinstance(item.get("answer"), str) or len(item) != 1:
+                if buffer:
+                    yield flush()
+                frames += 1
+                yield item
+                continue
+
+            chunk_count += 1
+            if not buffer:
+                first_arrival = now
+            buffer.append(item["answer"])
+            buffer_arrivals.append(now)
+            buffered_bytes += len(item["answer"].encode("utf-8"))
+
+            slow_upstream = gap_ewma is not None and gap_ewma >= passthrough_gap
+            if (config.flush_first and chunk_count == 1) or slow_upstream or buffered_bytes >= config.max_bytes:
+                yield flush()
+
+        if buffer:
+            yield flush()
+    finally:
+        # Wakes a read the helper thread is blocked in, which then closes the upstream
+        scope.cancel()
+        if metrics:
+            metrics.record(chunk_count, frames, added_latency, max_added_latency)
+
+
+def _pump(stream: Iterable[Dict[str, Any]], chunks: "queue.Queue", scope: CancelScope) -> None:
+    """Read the upstream on a helper thread; stops (and closes it) once the consumer is gone."""
+    iterator = iter(stream)
+    try:
+        with scope.active():
+            for item in iterator:
+                if scope.cancelled:
+                    break
+                chunks.put(item)
+    except Exception as e:
+        chunks.put(e)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+        chunks.put(_END)
+
+
+def _passthrough(stream: Iterable[Dict[str, Any]], metrics: Optional[CoalescingMetrics]) -> Iterator[Dict[str, Any]]:
+    iterator = iter(stream)
+    count = 0
+    try:
+        for item in iterator:
+            count += 1
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+        if metrics:
+            metrics.record(count, count, 0.0, 0.0)
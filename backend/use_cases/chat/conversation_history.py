@@ -0,0 +1,168 @@
+"""Use case: Conversation History."""
+import re
+import threading
+from typing import List, Optional, Tuple
+from backend.domain.entities import ConversationState
+from backend.domain.repositories import MessageArchive
+
+
+class ConversationHistory:
+    """
+    Manages chat history of a conversation with bounded memory.
+
+    Only the most recent `window_size` messages stay in
+    `ConversationState.messages`; older ones are spilled to the message
+    archive and folded into a compact running summary. Positions are
+    absolute (0 = first message ever), which makes them stable cursors.
+    Every message also carries `seq` (position + 1), a monotonically
+    increasing sequence number clients use to ask only for what is new.
+    """
+
+    def __init__(self, archive: MessageArchive, window_size: int = 50, summary_max_chars: int = 2000):
+        self.archive = archive
+        self.window_size = max(1, window_size)
+        self.summary_max_chars = summary_max_chars
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def append(self, conversation: ConversationState, message: dict) -> int:
+        """
+        Append a message, spilling the oldest ones if the window is full.
+
+        Returns:
+            Absolute position of the new message
+        """
+        with self._lock:
+            position = conversation.total_messages()
+            message["seq"] = position + 1
+            conversation.messages.append(message)
+
+            window_size = 0 if conversation.archived else self.window_size
+            self._spill(conversation, len(conversation.messages) - window_size)
+
+            self._changed.notify_all()
+            return position
+
+    def archive_all(self, conversation: ConversationState) -> None:
+        """
+        Move the whole window to the archive and mark the conversation archived.
+
+        Messages appended later (e.g. by a stream that was still running)
+        are archived right away as well.
+        """
+        with self._lock:
+            conversation.archived = True
+            self._spill(conversation, len(conversation.messages))
+            self._changed.notify_all()
+
+    def _spill(self, conversation: ConversationState, overflow: int) -> None:
+        """Archive the `overflow` oldest messages of the window. Caller holds the lock."""
+        if overflow <= 0:
+            return
+        spilled = conversation.messages[:overflow]
+        self.archive.archive(conversation.id, conversation.spilled_count, spilled)
+        del conversation.messages[:overflow]
+        conversation.spilled_count += overflow
+        conversation.summary = self._fold_summary(conversation.summary, spilled)
+
+    def since(self, conversation: ConversationState, since_seq: int, limit: int = 200) -> Tuple[List[dict], bool]:
+        """
+        Return messages the client has not seen yet, oldest first.
+
+        Args:
+            conversation: Conversation to read
+            since_seq: Highest seq the client already has (0 = nothing)
+            limit: Maximum number of messages to return
+
+        Returns:
+            (messages with seq > since_seq, True if more remain after this batch)
+        """
+        with self._lock:
+            total = conversation.total_messages()
+            start = max(0, min(since_seq, total))
+            end = min(total, start + max(1, limit))
+            spilled_count = conversation.spilled_count
+            window_start = max(start, spilled_count)
+            window = conversation.messages[window_start - spilled_count:end - spilled_count] if end > spilled_count else []
+
+        archived = self.archive.load(conversation.id, start, min(end, spilled_count)) if start < spilled_count else []
+        return archived + list(window), end < total
+
+    def wait_for_change(self, conversation: ConversationState, since_seq: int, timeout: float,
+                        stop: Optional[threading.Event] = None) -> bool:
+        """Block until the conversation has messages after `since_seq`, `stop` is set or the timeout elapses."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: conversation.total_messages() > since_seq or (stop is not None and stop.is_set()),
+                timeout
+            )
+
+    def wake_all(self) -> None:
+        """Wake every waiter so it re-checks its `stop` event."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def page(
+        self,
+        conversation: ConversationState,
+        cursor: Optional[int] = None,
+        limit: int = 20
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Return one page of history, newest first.
+
+        Args:
+            conversation: Conversation to read
+            cursor: Exclusive upper position bound from a previous page (None = newest)
+            limit: Page size
+
+        Returns:
+            (messages newest first, cursor of the next page or None when exhausted)
+        """
+        with self._lock:
+            total = conversation.total_messages()
+            end = total if cursor is None else max(0, min(cursor, total))
+            start = max(0, end - max(1, limit))
+            spilled_count = conversation.spilled_count
+
+            window_start = max(start, spilled_count)
+            window = conversation.messages[window_start - spilled_count:end - spilled_count] if end > spilled_count else []
+
+        archived = self.archive.load(conversation.id, start, min(end, spilled_count)) if start < spilled_count else []
+        messages = archived + list(window)
+        messages.reverse()
+
+        return messages, (start if start > 0 else None)
+
+    def summarize(self, conversation: ConversationState) -> str:
+        """
+        Compact summary of the whole conversation.
+
+        Combines the running summary of archived turns with the turns still
+        in the window, capped at `summary_max_chars`.
+        """
+        with self._lock:
+            return self._fold_summary(conversation.summary, list(conversation.messages))
+
+    def _fold_summary(self, summary: Optional[str], messages: List[dict]) -> str:
+        """Append one line per message to the summary, keeping only the most recent lines that fit."""
+        lines = summary.splitlines() if summary else []
+        lines.extend(self._summary_line(message) for message in messages)
+
+        while lines and sum(len(line) + 1 for line in lines) > self.summary_max_chars:
+            lines.pop(0)
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _summary_line(message: dict) -> str:
+        content = " ".join(str(message.get("content", "")).split())
+        # Drop code and markdown noise, keep the first sentence
+        content = re.sub(r"`{1,3}[^`]*`{1,3}", "", content)
+        content = re.sub(r"[*_#>]+", "", content).strip()
+        first_sentence = re.split(r"(?<=[.!?])\s", content, maxsplit=1)[0]
+        if len(first_sentence) > 160:
+            first_sentence = first_sentence[:157].rstrip() + "..."
+
+        label = "Pergunta" if message.get("role") == "user" else "Resposta"
+        return f"- {label}: {first_sentence}"
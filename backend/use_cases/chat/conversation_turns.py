@@ -0,0 +1,55 @@
+"""Use case: Conversation Turns - the stored context of a conversation, for stateless chat providers."""
+from typing import Dict, List
+from backend.domain.repositories import StateRepository
+
+CARD_CONTEXT = "O usuário está estudando o flashcard: {question} Resposta: {answer}"
+SUMMARY_CONTEXT = "Resumo das mensagens anteriores: {summary}"
+
+
+class ConversationTurns:
+    """
+    Use case for rebuilding what a conversation has said so far.
+
+    Chat completion servers keep nothing between requests, so the turns
+    are read from the stored conversation (the app state every worker
+    shares and that survives restarts): the card being discussed, the
+    running summary of archived messages and the most recent messages.
+    """
+
+    def __init__(self, state_repository: StateRepository, max_turns: int = 10):
+        self.state_repository = state_repository
+        self.max_turns = max_turns
+
+    def execute(self, conversation_id: str) -> List[Dict[str, str]]:
+        """
+        Chat messages ({"role", "content"}) that precede a new prompt.
+
+        Returns:
+            Context and recent turns, oldest first; empty for an unknown conversation
+        """
+        state = self.state_repository.get_state()
+        for index, conversation in state.conversations.items():
+            if conversation.id == conversation_id:
+                break
+        else:
+            return []
+
+        turns = []
+        flashcards = state.daily_challenge.flashcards if state.daily_challenge else []
+        if 0 <= index < len(flashcards):
+            flashcard = flashcards[index]
+            turns.append({"role": "system", "content": CARD_CONTEXT.format(
+                question=flashcard.question,
+                answer=flashcard.detailed_explanation or flashcard.answer
+            )})
+        if conversation.summary:
+            turns.append({"role": "system", "content": SUMMARY_CONTEXT.format(summary=conversation.summary)})
+
+        messages = list(conversation.messages)
+        if messages and messages[-1].get("role") == "user":
+            # The question being asked right now: the client sends it as the prompt
+            messages.pop()
+        for message in messages[-2 * self.max_turns:]:
+            role = "user" if message.get("role") == "user" else "assistant"
+            turns.append({"role": role, "content": message.get("content", "")})
+        return turns
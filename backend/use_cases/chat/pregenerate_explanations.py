@@ -0,0 +1,262 @@
+"""Use case: Pregenerate Explanations - explains every card before it is opened."""
+import sys
+import heapq
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from backend.domain.entities import DailyChallenge, Flashcard, Scenario
+from backend.domain.repositories import StateRepository
+from backend.infrastructure.cache.chat_response_cache import make_cache_key
+from backend.use_cases.admission.admission_controller import Priority
+from backend.use_cases.chat.broadcast_stream import BroadcastStream
+from backend.use_cases.chat.chat_with_agent import ChatWithAgent, is_cached_replay
+
+# Hidden message that asks for the explanation of a card (it used to be built by the frontend)
+EXPLANATION_QUESTION = """Dada a pergunta e a resposta fornecida com o cenario correspondente na qual a pergunta faz parte, gere uma explicação o mais didática possível com exemplos de código.
+Construa os exemplos em java e considere que a stack é Java com AWS além de docker e terraform.
+
+Titulo: {title}
+Contexto: {description}
+Pergunta: {question}
+Resposta: {answer}"""
+
+
+def explanation_question(scenario: Scenario, flashcard: Flashcard) -> str:
+    """The hidden "explain" message of a card."""
+    return EXPLANATION_QUESTION.format(
+        title=scenario.title,
+        description=scenario.description,
+        question=flashcard.question,
+        answer=flashcard.answer
+    )
+
+
+def first_message_prompt(flashcard: Flashcard, question: str) -> str:
+    """Prompt of the first message of a card's conversation, which carries the card itself."""
+    flashcard_answer = flashcard.detailed_explanation or flashcard.answer
+    return f"dada a questão: {flashcard.question} e dada a resposta {flashcard_answer} Responda a mensagem do usuário: {question}"
+
+
+def explanation_cache_key(scenario: Scenario, flashcard: Flashcard) -> str:
+    return make_cache_key(
+        flashcard.question,
+        flashcard.detailed_explanation or flashcard.answer,
+        explanation_question(scenario, flashcard)
+    )
+
+
+class ExplanationJob(BroadcastStream):
+    """The explanation of one card, followed by any number of readers while it is generated."""
+
+    def __init__(self, challenge_date: str, index: int, conversation_id: str):
+        super().__init__()
+        self.challenge_date = challenge_date
+        self.index = index
+        self.conversation_id = conversation_id
+        self.started = False
+
+
+class PregenerateExplanations:
+    """
+    Use case for generating each card's initial explanation in the background.
+
+    Once a challenge is installed, every card that was not opened yet gets a
+    job. At most `parallelism` jobs run at once, at background priority, the
+    card after the one on screen first (`focus` reorders the queue when the
+    learner moves on). Each explanation is sent on the card's own
+    conversation, exactly as the hidden "explain" message would be, and
+    stored in its ConversationState once complete.
+
+    When the card is opened, `claim` hands over the running or finished job
+    so the request can follow it; a job still waiting in the queue is
+    dropped instead and the request asks the agent itself.
+    """
+
+    def __init__(
+        self,
+        chat_with_agent: ChatWithAgent,
+        state_repository: StateRepository,
+        parallelism: int = 2,
+        max_wait: Optional[float] = None
+    ):
+        self.chat_with_agent = chat_with_agent
+        self.state_repository = state_repository
+        self.parallelism = max(0, parallelism)
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._jobs: Dict[Tuple[str, int], ExplanationJob] = {}
+        # (rank, seq, job) of the jobs waiting for a worker
+        self._queue: List[Tuple[int, int, ExplanationJob]] = []
+        self._seq = itertools.count()
+        self._date: Optional[str] = None
+        self._focus = 0
+        self._cards = 0
+        self._workers: List[threading.Thread] = []
+        self._stats = {"generated": 0, "failed": 0, "served_ready": 0, "served_joined": 0, "dropped": 0}
+
+    def execute(self, challenge: DailyChallenge) -> int:
+        """
+        Queue the cards of `challenge` that have no explanation yet.
+
+        Safe to call again as cards are appended: known cards are skipped.
+
+        Returns:
+            Number of cards queued by this call
+        """
+        if self.parallelism == 0 or not challenge.flashcards:
+            return 0
+
+        state = self.state_repository.get_state()
+        if state.get_current_date() != challenge.date:
+            return 0
+
+        queued = 0
+        with self._lock:
+            if self._date != challenge.date:
+                # New day: jobs of the previous one are of no use anymore
+                self._jobs.clear()
+                self._queue.clear()
+                self._date = challenge.date
+            self._focus = state.current_flashcard_index
+            self._cards = len(challenge.flashcards)
+
+            for index in range(len(challenge.flashcards)):
+                if (challenge.date, index) in self._jobs:
+                    continue
+                conversation = state.ensure_conversation(index)
+                if conversation.explanation or not conversation.is_first:
+                    continue
+                job = ExplanationJob(challenge.date, index, conversation.id)
+                self._jobs[(challenge.date, index)] = job
+                heapq.heappush(self._queue, (self._rank(index), next(self._seq), job))
+                queued += 1
+
+            if queued:
+                self._start_workers()
+                self._wakeup.notify_all()
+
+        if queued:
+            # The new conversation IDs must be the ones other requests see
+            self.state_repository.update_state(state)
+        return queued
+
+    def focus(self, index: int) -> None:
+        """The learner is now on card `index`: the cards right after it go first."""
+        with self._lock:
+            self._focus = index
+            self._queue = [(self._rank(job.index), seq, job) for _, seq, job in self._queue]
+            heapq.heapify(self._queue)
+
+    def claim(self, challenge_date: str, index: int) -> Optional[ExplanationJob]:
+        """
+        Take the job of a card that is being opened.
+
+        Returns:
+            The running or finished job to follow, or None if the caller
+            should ask the agent itself (no job, still queued, or failed)
+        """
+        with self._lock:
+            job = self._jobs.get((challenge_date, index))
+            if job is None:
+                return None
+            if not job.started or (job.done and job.error):
+                # Not worth waiting for a worker: the request goes upstream right away
+                del self._jobs[(challenge_date, index)]
+                self._queue = [entry for entry in self._queue if entry[2] is not job]
+                heapq.heapify(self._queue)
+                self._stats["dropped"] += 1
+                return None
+            self._stats["served_ready" if job.done else "served_joined"] += 1
+            return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "running": sum(1 for job in self._jobs.values() if job.started and not job.done),
+                "parallelism": self.parallelism,
+                **self._stats
+            }
+
+    def _rank(self, index: int) -> int:
+        # 0 for the next card, ... the card on screen last (opening it asks the agent directly)
+        cards = max(self._cards, index + 1)
+        return (index - self._focus - 1) % cards
+
+    def _start_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.parallelism:
+            worker = threading.Thread(target=self._work, name=f"explanations-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue:
+                    # Idle workers leave; the next `execute` starts new ones
+                    if not self._wakeup.wait(timeout=60) and not self._queue:
+                        self._workers.remove(threading.current_thread())
+                        return
+                _, _, job = heapq.heappop(self._queue)
+                job.started = True
+            self._run(job)
+
+    def _run(self, job: ExplanationJob) -> None:
+        state = self.state_repository.get_state()
+        challenge = state.daily_challenge
+        if not challenge or challenge.date != job.challenge_date or job.index >= len(challenge.flashcards):
+            job.finish("The challenge changed")
+            return
+        flashcard = challenge.flashcards[job.index]
+        prompt = first_message_prompt(flashcard, explanation_question(challenge.scenario, flashcard))
+
+        error = None
+        primed = False
+        try:
+            stream = self.chat_with_agent.execute(
+                job.conversation_id,
+                prompt,
+                explanation_cache_key(challenge.scenario, flashcard),
+                priority=Priority.BACKGROUND,
+                max_wait=self.max_wait
+            )
+            # A cached explanation never reached the agent's conversation
+            primed = not is_cached_replay(stream)
+            try:
+                for event_data in stream:
+                    if "answer" in event_data:
+                        job.publish(event_data)
+                    elif "error" in event_data:
+                        error = str(event_data["error"])
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+        except Exception as e:
+            error = str(e)
+
+        if error is None and job.text:
+            self._store(job, primed)
+        with self._lock:
+            self._stats["generated" if error is None else "failed"] += 1
+        if error:
+            print(f"Explanation of card {job.index} failed: {error}", file=sys.stderr)
+        job.finish(error)
+
+    def _store(self, job: ExplanationJob, primed: bool) -> None:
+        state = self.state_repository.get_state()
+        if state.get_current_date() != job.challenge_date:
+            return
+        conversation = state.get_conversation(job.index)
+        if conversation is None or conversation.id != job.conversation_id:
+            return
+        conversation.explanation = job.text
+        if primed:
+            # The agent has seen the card on this conversation already
+            conversation.is_first = False
+            if state.current_flashcard_index == job.index:
+                state.is_first_message_for_card = False
+        self.state_repository.update_state(state)
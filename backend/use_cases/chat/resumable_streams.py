@@ -0,0 +1,271 @@
+"""Use case: Resumable Streams - chat answers that outlive the connection reading them."""
+import sys
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from backend.domain.repositories import KeyValueStore
+from backend.use_cases.chat.broadcast_stream import BroadcastStream
+
+
+def parse_event_id(event_id: Optional[str]) -> Tuple[Optional[str], int]:
+    """Split an SSE event ID "<stream_id>:<seq>" (a bare "<seq>" is accepted too)."""
+    if not event_id:
+        return None, 0
+    stream_id, _, seq = event_id.strip().rpartition(":")
+    try:
+        return stream_id or None, max(0, int(seq))
+    except ValueError:
+        return None, 0
+
+
+class ChatStream(BroadcastStream):
+    """An answer being written on one conversation."""
+
+    def __init__(self, conversation_id: str):
+        super().__init__()
+        self.conversation_id = conversation_id
+        self.cancelled = False
+
+
+class SharedChatStream:
+    """
+    An answer being written by another worker, followed through the shared store.
+
+    Same reading interface as ChatStream. The owning worker copies each
+    event to the store; this reader polls for new ones and, while it
+    follows, tells the owner that somebody is still reading.
+    """
+
+    def __init__(self, streams: "ResumableStreams", stream_id: str, meta: Dict[str, Any]):
+        self.id = stream_id
+        self.conversation_id = meta.get("conversation_id")
+        self._streams = streams
+        self._meta = meta
+
+    @property
+    def done(self) -> bool:
+        return bool(self._meta.get("done"))
+
+    @property
+    def last_seq(self) -> int:
+        return int(self._meta.get("last_seq", 0))
+
+    def follow(self, after: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(seq, event) for every event after `after`, live until the stream ends."""
+        streams = self._streams
+        position = max(0, after)
+        last_beat = None
+        while True:
+            if last_beat is None or time.monotonic() - last_beat >= streams.heartbeat_seconds:
+                streams.store.set(streams._key("watched", self.id), "1", max(1.0, streams.orphan_grace_seconds))
+                last_beat = time.monotonic()
+            meta = streams._read_meta(self.id)
+            if meta is None:
+                # Expired, or the owner's store writes failed
+                return
+            self._meta = meta
+            while position < self.last_seq:
+                raw = streams.store.get(streams._key("event", self.id, position + 1))
+                if raw is None:
+                    return
+                position += 1
+                yield position, json.loads(raw)
+            if self.done:
+                return
+            time.sleep(streams.poll_seconds)
+
+    def events(self) -> Iterator[Dict[str, Any]]:
+        """The events only, from the start."""
+        return (event for _, event in self.follow())
+
+
+class ResumableStreams:
+    """
+    Use case for running chat answers independently of the HTTP connections.
+
+    `start` reads the upstream stream on its own thread into a ChatStream,
+    and every connection (the one that asked, a reconnect after a dropped
+    connection or a reload, a second window) follows that buffer. So the
+    answer is paid for once, whoever reads it. An answer nobody has read
+    for `orphan_grace_seconds` is cancelled like before, when the browser
+    aborted the request. Finished answers stay replayable for
+    `retain_seconds`.
+
+    With a shared `store` (several worker processes), every event is also
+    copied to the store, so a reconnect that lands on another worker
+    follows the answer from there (see SharedChatStream).
+    """
+
+    # How long a copied event may stay in the store while its answer is still written
+    SHARED_TTL_SECONDS = 3600
+
+    def __init__(
+        self,
+        orphan_grace_seconds: float = 30,
+        retain_seconds: float = 120,
+        store: Optional[KeyValueStore] = None,
+        prefix: str = "stream:",
+        poll_seconds: float = 0.2
+    ):
+        self.orphan_grace_seconds = orphan_grace_seconds
+        self.retain_seconds = retain_seconds
+        self.store = store
+        self.prefix = prefix
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = max(0.5, min(5.0, orphan_grace_seconds / 3))
+        self._lock = threading.Lock()
+        self._streams: Dict[str, ChatStream] = {}
+        self._stats = {"started": 0, "completed": 0, "cancelled": 0, "resumed": 0}
+
+    def start(
+        self,
+        conversation_id: str,
+        upstream: Iterator[Dict[str, Any]],
+        on_complete: Optional[Callable[[str], None]] = None
+    ) -> ChatStream:
+        """
+        Start reading `upstream` in the background.
+
+        Args:
+            conversation_id: Conversation the answer belongs to
+            upstream: Events ({"answer": ...} / {"error": ...}) of the answer
+            on_complete: Called with the answer text (possibly partial) once
+                the upstream ended or was cancelled
+        """
+        stream = ChatStream(conversation_id)
+        with self._lock:
+            self._prune()
+            self._streams[stream.id] = stream
+            self._stats["started"] += 1
+        self._share_meta(stream, 0, done=False)
+        thread = threading.Thread(
+            target=self._pump, args=(stream, upstream, on_complete), name=f"chat-stream-{stream.id}", daemon=True
+        )
+        thread.start()
+        return stream
+
+    def get(self, stream_id: str) -> Optional[Union[ChatStream, SharedChatStream]]:
+        """The stream `stream_id`, if it is running or finished recently (on any worker)."""
+        with self._lock:
+            self._prune()
+            stream = self._streams.get(stream_id)
+        if stream is None and self.store:
+            meta = self._read_meta(stream_id)
+            if meta is not None:
+                stream = SharedChatStream(self, stream_id, meta)
+        if stream is not None:
+            with self._lock:
+                self._stats["resumed"] += 1
+        return stream
+
+    def active(self, conversation_id: Optional[str] = None) -> List[Union[ChatStream, SharedChatStream]]:
+        """Streams still being written (on any worker), optionally only those of one conversation."""
+        with self._lock:
+            streams = [
+                stream for stream in self._streams.values()
+                if not stream.done and conversation_id in (None, stream.conversation_id)
+            ]
+        if self.store:
+            local = {stream.id for stream in streams}
+            meta_prefix = self._key("meta", "")
+            for key in self.store.keys(meta_prefix):
+                stream_id = key[len(meta_prefix):]
+                meta = None if stream_id in local else self._read_meta(stream_id)
+                if meta and not meta.get("done") and conversation_id in (None, meta.get("conversation_id")):
+                    streams.append(SharedChatStream(self, stream_id, meta))
+        return streams
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": sum(1 for stream in self._streams.values() if not stream.done),
+                "retained": len(self._streams),
+                "subscribers": sum(stream.subscribers for stream in self._streams.values()),
+                **self._stats
+            }
+
+    def _pump(self, stream: ChatStream, upstream, on_complete) -> None:
+        error = None
+        try:
+            for event in upstream:
+                if "error" in event:
+                    error = str(event["error"])
+                    break
+                seq = stream.publish(event)
+                self._share_event(stream, seq, event)
+                if stream.unwatched_seconds() > self.orphan_grace_seconds and not self._watched_elsewhere(stream):
+                    # Nobody came back for it: stop paying for the rest
+                    stream.cancelled = True
+                    break
+        except Exception as e:
+            error = str(e)
+        finally:
+            close = getattr(upstream, "close", None)
+            if close:
+                close()
+
+        if on_complete:
+            text = stream.text
+            if text:
+                try:
+                    on_complete(text)
+                except Exception as e:
+                    print(f"Error saving the answer of stream {stream.id}: {e}", file=sys.stderr)
+        with self._lock:
+            self._stats["cancelled" if stream.cancelled else "completed"] += 1
+        stream.finish(error)
+        if error:
+            self._share_event(stream, stream.last_seq, {"error": error})
+        self._share_meta(stream, stream.last_seq, done=True)
+
+    def _key(self, kind: str, stream_id: str, seq: Optional[int] = None) -> str:
+        key = f"{self.prefix}{kind}:{stream_id}"
+        return key if seq is None else f"{key}:{seq}"
+
+    def _read_meta(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.store.get(self._key("meta", stream_id))
+        except Exception as e:
+            print(f"Failed to read stream {stream_id} from the shared store: {e}", file=sys.stderr)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _share_meta(self, stream: ChatStream, last_seq: int, done: bool) -> None:
+        if not self.store:
+            return
+        meta = {"conversation_id": stream.conversation_id, "last_seq": last_seq, "done": done}
+        try:
+            self.store.set(
+                self._key("meta", stream.id), json.dumps(meta),
+                self.retain_seconds if done else self.SHARED_TTL_SECONDS
+            )
+        except Exception as e:
+            # Only reconnects to other workers are affected
+            print(f"Failed to share stream {stream.id}: {e}", file=sys.stderr)
+
+    def _share_event(self, stream: ChatStream, seq: int, event: Dict[str, Any]) -> None:
+        if not self.store:
+            return
+        try:
+            # The event first: a reader never sees a last_seq whose event is missing
+            self.store.set(self._key("event", stream.id, seq), json.dumps(event), self.SHARED_TTL_SECONDS)
+        except Exception as e:
+            print(f"Failed to share stream {stream.id}: {e}", file=sys.stderr)
+            return
+        self._share_meta(stream, seq, done=False)
+
+    def _watched_elsewhere(self, stream: ChatStream) -> bool:
+        """True if a reader on another worker followed the stream within the grace period."""
+        if not self.store:
+            return False
+        try:
+            return self.store.get(self._key("watched", stream.id)) is not None
+        except Exception:
+            return False
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for stream_id, stream in list(self._streams.items()):
+            if stream.done and now - stream.finished_at > self.retain_seconds:
+                del self._streams[stream_id]
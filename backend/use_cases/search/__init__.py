@@ -0,0 +1 @@
+# Search use cases
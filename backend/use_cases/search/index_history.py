@@ -0,0 +1,55 @@
+"""Use cases: Index Daily Challenge and Index Chat Message."""
+import sys
+from backend.domain.entities import DailyChallenge
+from backend.domain.repositories import SearchIndex
+
+
+class IndexDailyChallenge:
+    """
+    Use case for adding an installed daily challenge to the search index.
+    
+    Indexing is best effort: a failure here must never prevent the
+    challenge from being shown.
+    """
+    
+    def __init__(self, search_index: SearchIndex):
+        self.search_index = search_index
+    
+    def execute(self, challenge: DailyChallenge) -> None:
+        """
+        Execute the use case.
+        
+        Args:
+            challenge: The challenge that was just installed
+        """
+        try:
+            self.search_index.index_challenge(challenge)
+        except Exception as e:
+            print(f"Failed to index daily challenge {challenge.date}: {e}", file=sys.stderr)
+
+
+class IndexChatMessage:
+    """
+    Use case for adding a completed chat message to the search index.
+    """
+    
+    def __init__(self, search_index: SearchIndex):
+        self.search_index = search_index
+    
+    def execute(self, challenge_date: str, flashcard_index: int, conversation_id: str,
+                message_index: int, content: str) -> None:
+        """
+        Execute the use case.
+        
+        Args:
+            challenge_date: Date of the challenge the conversation belongs to
+            flashcard_index: Index of the flashcard being discussed
+            conversation_id: ID of the conversation
+            message_index: Position of the message in the conversation
+            content: Message text
+        """
+        try:
+            self.search_index.index_message(challenge_date, flashcard_index, conversation_id,
+                                            message_index, content)
+        except Exception as e:
+            print(f"Failed to index chat message: {e}", file=sys.stderr)
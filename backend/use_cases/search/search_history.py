@@ -0,0 +1,32 @@
+"""Use case: Search History."""
+from typing import List
+from backend.domain.entities import SearchHit
+from backend.domain.repositories import SearchIndex
+
+
+class SearchHistory:
+    """
+    Use case for searching past scenarios, flashcards and chat explanations.
+    """
+    
+    MAX_LIMIT = 100
+    
+    def __init__(self, search_index: SearchIndex):
+        self.search_index = search_index
+    
+    def execute(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Execute the use case.
+        
+        Args:
+            query: Free text to search for
+            limit: Maximum number of results
+            
+        Returns:
+            List of hits ordered by relevance
+        """
+        if not query or not query.strip():
+            return []
+        
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        return self.search_index.search(query, limit)
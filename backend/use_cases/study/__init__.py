@@ -0,0 +1 @@
+# Study event use cases
@@ -0,0 +1,83 @@
+"""Use cases: Record Study Event and Replay Study Events."""
+from itertools import islice
+from typing import List, Optional, Tuple
+from backend.domain.entities import AppState, StudyEvent
+from backend.domain.repositories import StudyEventLog
+
+# Event types
+FLASHCARD_VIEWED = "flashcard_viewed"
+QUESTION_ASKED = "question_asked"
+ANSWER_REVEALED = "answer_revealed"
+
+# Types the frontend may report itself (the others are recorded by the backend)
+CLIENT_EVENT_TYPES = (ANSWER_REVEALED,)
+
+
+class RecordStudyEvent:
+    """
+    Use case for noting something the learner did, for scheduling and analytics.
+    
+    The event is tied to the challenge date and card of the given state and
+    only queued: the log's writer thread stores it, so the calling route
+    does not wait for the disk.
+    """
+    
+    def __init__(self, event_log: StudyEventLog):
+        self.event_log = event_log
+    
+    def execute(self, event_type: str, state: AppState, **data) -> bool:
+        """
+        Execute the use case.
+        
+        Args:
+            event_type: What happened (FLASHCARD_VIEWED, QUESTION_ASKED, ANSWER_REVEALED, ...)
+            state: App state at the time, already loaded by the caller
+            **data: Details of the event (JSON-serializable)
+            
+        Returns:
+            False if the event was dropped because the log is falling behind
+        """
+        has_challenge = state.daily_challenge is not None
+        return self.event_log.append(StudyEvent(
+            type=event_type,
+            challenge_date=state.get_current_date() if has_challenge else None,
+            flashcard_index=state.current_flashcard_index if has_challenge else None,
+            data=data
+        ))
+
+
+class ReplayStudyEvents:
+    """
+    Use case for reading back recorded study events over a time range.
+    """
+    
+    MAX_LIMIT = 5000
+    
+    def __init__(self, event_log: StudyEventLog, flush_timeout: float = 1.0):
+        self.event_log = event_log
+        self.flush_timeout = flush_timeout
+    
+    def execute(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        types: Optional[List[str]] = None,
+        limit: int = 500
+    ) -> Tuple[List[StudyEvent], bool]:
+        """
+        Execute the use case.
+        
+        Args:
+            start: Oldest timestamp included (Unix seconds), or None
+            end: First timestamp excluded (Unix seconds), or None
+            types: Only events of these types, or None for all
+            limit: Maximum number of events
+            
+        Returns:
+            (events oldest first, whether more events follow in the range)
+        """
+        # Events still queued are written first, so the replay includes everything recorded so far
+        self.event_log.flush(self.flush_timeout)
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        events = list(islice(self.event_log.read(start, end, types), limit + 1))
+        return events[:limit], len(events) > limit
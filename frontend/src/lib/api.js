@@ -6,11 +6,89 @@ import { Scenario, Flashcard } from './models';
 
 const API_BASE = '/api';
 
+/**
+ * In-process API of the desktop app (pywebview js_api), when the window was
+ * started with DAILYSTACK_DESKTOP_TRANSPORT=bridge. Calls made before
+ * pywebview injects it simply go over HTTP.
+ * @returns {Object|null} window.pywebview.api, or null in a browser
+ */
+function bridge() {
+    const api = typeof window !== 'undefined' && window.pywebview && window.pywebview.api;
+    return api && api.ask_llm ? api : null;
+}
+
+// Answers pushed by the bridge, per request: ReadableStream controllers
+const bridgeStreams = new Map();
+const encoder = new TextEncoder();
+
+if (typeof window !== 'undefined') {
+    // Called by the backend through evaluate_js
+    window.__dailystackBridge = {
+        push(requestId, text) {
+            const controller = bridgeStreams.get(requestId);
+            if (controller) controller.enqueue(encoder.encode(text));
+        },
+        close(requestId) {
+            const controller = bridgeStreams.get(requestId);
+            bridgeStreams.delete(requestId);
+            if (controller) controller.close();
+        }
+    };
+}
+
+/**
+ * Start an answer through the bridge. The pushed SSE text is wrapped in a
+ * Response, so callers read it exactly like the /ask-llm HTTP response.
+ */
+async function bridgeAskLlm(options, signal = null) {
+    const requestId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    const body = new ReadableStream({
+        start(controller) {
+            bridgeStreams.set(requestId, controller);
+        },
+        cancel() {
+            bridgeStreams.delete(requestId);
+            bridge().cancel_stream(requestId);
+        }
+    });
+
+    if (signal) {
+        signal.addEventListener('abort', () => {
+            const controller = bridgeStreams.get(requestId);
+            bridgeStreams.delete(requestId);
+            if (controller) controller.error(new DOMException('Aborted', 'AbortError'));
+            bridge().cancel_stream(requestId);
+        });
+    }
+
+    const result = await bridge().ask_llm(requestId, options);
+    if (result.error) {
+        bridgeStreams.delete(requestId);
+        return new Response(JSON.stringify(result), {
+            status: result.status || 500,
+            headers: { 'Content-Type': 'application/json' }
+        });
+    }
+    return new Response(body, { headers: { 'Content-Type': 'text/event-stream', 'X-Stream-Id': result.stream_id } });
+}
+
+/**
+ * Fetch the loading status of the daily challenge
+ * @returns {Promise<Object>} { loading, has_data, generating, flashcards_ready, error }
+ */
+export async function fetchStatus() {
+    if (bridge()) return await bridge().get_status();
+    const res = await fetch(`${API_BASE}/status`);
+    if (!res.ok) throw new Error('Failed to check status');
+    return await res.json();
+}
+
 /**
  * Fetch the daily scenario
  * @returns {Promise<Scenario>} Scenario object
  */
 export async function fetchScenario() {
+    if (bridge()) return Scenario.fromDict(await bridge().get_scenario());
     const res = await fetch(`${API_BASE}/scenario`);
     if (!res.ok) throw new Error('Failed to fetch scenario');
     const data = await res.json();
@@ -22,6 +100,7 @@ export async function fetchScenario() {
  * @returns {Promise<Flashcard>} Flashcard object
  */
 export async function fetchCurrentFlashcard() {
+    if (bridge()) return Flashcard.fromDict(await bridge().get_current_flashcard());
     const res = await fetch(`${API_BASE}/flashcard/current`);
     if (!res.ok) throw new Error('Failed to fetch flashcard');
     const data = await res.json();
@@ -33,6 +112,7 @@ export async function fetchCurrentFlashcard() {
  * @returns {Promise<Flashcard>} Flashcard object
  */
 export async function fetchNextFlashcard() {
+    if (bridge()) return Flashcard.fromDict(await bridge().next_flashcard());
     const res = await fetch(`${API_BASE}/flashcard/next`, {
         method: 'POST'
     });
@@ -42,13 +122,70 @@ export async function fetchNextFlashcard() {
 }
 
 /**
- * Fetch chat history for the current flashcard
+ * Record a study event only the frontend sees (e.g. 'answer_revealed').
+ * Fire and forget: a failure never gets in the learner's way.
+ * @param {string} type - Event type
+ */
+export async function recordStudyEvent(type) {
+    try {
+        if (bridge()) {
+            await bridge().record_study_event(type);
+            return;
+        }
+        await fetch(`${API_BASE}/study/events`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ type }),
+            keepalive: true
+        });
+    } catch (e) {
+        console.warn('Failed to record study event', e);
+    }
+}
+
+// Messages already downloaded, per conversation: { messages, latestSeq }
+const historyCache = new Map();
+
+/**
+ * Fetch chat history for the current flashcard.
+ * Only messages newer than the ones already cached for the conversation are downloaded.
+ * @param {string|null} conversationId - Conversation of the current flashcard, if known
  * @returns {Promise<Array>} List of messages
  */
-export async function fetchChatHistory() {
-    const res = await fetch(`${API_BASE}/chat/history`);
-    if (!res.ok) throw new Error('Failed to fetch chat history');
-    return await res.json();
+export async function fetchChatHistory(conversationId = null) {
+    const cached = conversationId ? historyCache.get(conversationId) : null;
+    let since = cached ? cached.latestSeq : 0;
+    let messages = cached ? cached.messages : [];
+
+    while (true) {
+        // Bot messages come with server-rendered HTML, so they are not re-parsed here
+        const params = new URLSearchParams({ since: String(since), render: 'html' });
+        if (conversationId) params.set('conversation_id', conversationId);
+
+        let data;
+        if (bridge()) {
+            data = await bridge().get_chat_history(since, conversationId);
+        } else {
+            const res = await fetch(`${API_BASE}/chat/history?${params}`);
+            if (!res.ok) throw new Error('Failed to fetch chat history');
+            data = await res.json();
+        }
+
+        if (data.conversation_id !== conversationId) {
+            // Server answered for another conversation (card changed): start over
+            conversationId = data.conversation_id;
+            messages = [];
+        }
+        messages = messages.concat(data.messages);
+        since = data.messages.length ? data.messages[data.messages.length - 1].seq : data.latest_seq;
+
+        if (!data.has_more) break;
+    }
+
+    if (conversationId) {
+        historyCache.set(conversationId, { messages, latestSeq: since });
+    }
+    return messages;
 }
 
 /**
@@ -59,6 +196,8 @@ export async function fetchChatHistory() {
  * @returns {Promise<Response>} Fetch response object (for streaming)
  */
 export async function askLlm(question, hidden = false, signal = null) {
+    if (bridge()) return await bridgeAskLlm({ question, hidden }, signal);
+
     const options = {
         method: 'POST',
         headers: {
@@ -73,3 +212,165 @@ export async function askLlm(question, hidden = false, signal = null) {
 
     return await fetch(`${API_BASE}/ask-llm`, options);
 }
+
+/**
+ * Ask for the current flashcard's explanation (usually generated in advance by the backend)
+ * @param {AbortSignal} signal - Optional AbortSignal to cancel the request
+ * @returns {Promise<Response>} Fetch response object (for streaming)
+ */
+export async function explainFlashcard(signal = null) {
+    if (bridge()) return await bridgeAskLlm({ explain: true }, signal);
+
+    const options = {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ explain: true })
+    };
+
+    if (signal) {
+        options.signal = signal;
+    }
+
+    return await fetch(`${API_BASE}/ask-llm`, options);
+}
+
+/**
+ * Resume an answer stream after the last event seen
+ * @param {string} streamId - Stream to follow (the part of the event ID before ':')
+ * @param {string|null} lastEventId - ID of the last event received, null to replay from the start
+ * @param {AbortSignal} signal - Optional AbortSignal to cancel the request
+ * @returns {Promise<Response>} Fetch response object (for streaming)
+ */
+export async function resumeAnswer(streamId, lastEventId = null, signal = null) {
+    const options = { headers: {} };
+    if (lastEventId) {
+        options.headers['Last-Event-ID'] = lastEventId;
+    }
+    if (signal) {
+        options.signal = signal;
+    }
+    return await fetch(`${API_BASE}/ask-llm/streams/${encodeURIComponent(streamId)}`, options);
+}
+
+/**
+ * Answers still being written for the current flashcard (e.g. before a reload)
+ * @returns {Promise<Array>} List of { id, conversation_id, last_event_id }
+ */
+export async function fetchActiveAnswers() {
+    const res = await fetch(`${API_BASE}/ask-llm/streams`);
+    if (!res.ok) return [];
+    const data = await res.json();
+    return data.streams;
+}
+
+/**
+ * Read an answer stream, calling onEvent for each SSE event.
+ * If the connection drops, the answer is resumed from the last event ID seen.
+ * @param {Response} response - Response of /ask-llm (or of resumeAnswer)
+ * @param {function(Object): void} onEvent - Receives each parsed event ({ answer } or { error })
+ * @param {AbortSignal} signal - Optional AbortSignal, also used for the reconnections
+ * @param {number} retries - Reconnections allowed
+ */
+export async function followAnswer(response, onEvent, signal = null, retries = 3) {
+    let lastEventId = null;
+
+    while (true) {
+        try {
+            await readEventStream(response, (id, data) => {
+                if (id) lastEventId = id;
+                onEvent(data);
+            });
+            return;
+        } catch (e) {
+            if (e.name === 'AbortError' || !lastEventId || retries-- <= 0) throw e;
+            const streamId = lastEventId.slice(0, lastEventId.lastIndexOf(':'));
+            response = await resumeAnswer(streamId, lastEventId, signal);
+            if (!response.ok) throw e;
+        }
+    }
+}
+
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        // Events may be split across reads: only complete ones (ending in a blank line) are parsed
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const event of events) {
+            let id = null;
+            let data = '';
+            for (const line of event.split('\n')) {
+                if (line.startsWith('id: ')) id = line.slice(4);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (!data) continue;
+            try {
+                onEvent(id, JSON.parse(data));
+            } catch (e) {
+                console.error("Error parsing SSE data", e);
+            }
+        }
+    }
+}
+
+/**
+ * Compare the latency of the HTTP API and the desktop bridge (run from the devtools console
+ * as `dailystackCompareTransports()`). The results are also kept by the backend, under
+ * `js_bridge.transport_latency` in /api/debug/metrics.
+ * @param {number} iterations - Calls per transport and endpoint
+ * @returns {Promise<Object>} Median and p95 round trip (ms) per endpoint and transport
+ */
+export async function compareTransports(iterations = 50) {
+    if (!bridge()) throw new Error('The JS bridge is not available (DAILYSTACK_DESKTOP_TRANSPORT=bridge)');
+
+    const probes = {
+        status: [() => fetch(`${API_BASE}/status`).then(res => res.json()), () => bridge().get_status()],
+        flashcard: [() => fetch(`${API_BASE}/flashcard/current`).then(res => res.json()), () => bridge().get_current_flashcard()]
+    };
+    const summary = (times) => {
+        const sorted = [...times].sort((a, b) => a - b);
+        return {
+            median_ms: +sorted[Math.floor(sorted.length / 2)].toFixed(3),
+            p95_ms: +sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * 0.95))].toFixed(3)
+        };
+    };
+
+    const results = { iterations };
+    for (const [name, [viaHttp, viaBridge]] of Object.entries(probes)) {
+        const http = [];
+        const direct = [];
+        // Interleaved, so both transports see the same conditions
+        for (let i = 0; i < iterations; i++) {
+            let start = performance.now();
+            await viaHttp();
+            http.push(performance.now() - start);
+            start = performance.now();
+            await viaBridge();
+            direct.push(performance.now() - start);
+        }
+        results[name] = { http: summary(http), bridge: summary(direct) };
+    }
+
+    console.table(Object.fromEntries(
+        Object.keys(probes).map(name => [name, {
+            http_median_ms: results[name].http.median_ms,
+            bridge_median_ms: results[name].bridge.median_ms
+        }])
+    ));
+    await bridge().record_transport_latency(results);
+    return results;
+}
+
+if (typeof window !== 'undefined') {
+    window.dailystackCompareTransports = compareTransports;
+}
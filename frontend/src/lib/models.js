@@ -15,12 +15,13 @@ export class Scenario {
 }
 
 export class Flashcard {
-    constructor({ question, answer, category, detailed_explanation, code_example }) {
+    constructor({ question, answer, category, detailed_explanation, code_example, conversation_id }) {
         this.question = question || '';
         this.answer = answer || '';
         this.category = category || 'General';
         this.detailedExplanation = detailed_explanation || '';
         this.codeExample = code_example || '';
+        this.conversationId = conversation_id || null;
     }
 
     static fromDict(data) {
@@ -24,9 +24,7 @@ export async function loadDailyChallenge() {
 
     const checkStatus = async () => {
         try {
-            const res = await fetch('/api/status');
-            if (!res.ok) throw new Error('Failed to check status');
-            return await res.json();
+            return await api.fetchStatus();
         } catch (e) {
             console.error("Status check failed:", e);
             return { loading: true, has_data: false };
@@ -97,6 +95,9 @@ flashcard.subscribe(() => {
 export function toggleAnswer() {
     showAnswer.update(n => {
         const newValue = !n;
+        if (newValue) {
+            api.recordStudyEvent('answer_revealed');
+        }
         if (newValue && !explanationRequested) {
             triggerExplanation();
         }
@@ -128,51 +129,28 @@ async function triggerExplanation() {
         return;
     }
 
-    const prompt = `Dada a pergunta e a resposta fornecida com o cenario correspondente na qual a pergunta faz parte, gere uma explicação o mais didática possível com exemplos de código.
-Construa os exemplos em java e considere que a stack é Java com AWS além de docker e terraform.
-
-Titulo: ${currentScenario.title}
-Contexto: ${currentScenario.description}
-Pergunta: ${currentFlashcard.question}
-Resposta: ${currentFlashcard.answer}`;
-
     try {
-        const res = await api.askLlm(prompt, true, signal); // Pass signal
+        // The backend builds the prompt and usually has the explanation ready
+        const res = await api.explainFlashcard(signal);
         if (!res.ok) throw new Error("Failed to fetch explanation");
 
-        const reader = res.body.getReader();
-        const decoder = new TextDecoder();
         let botMessage = { role: 'bot', content: '' };
 
         // Add empty bot message to start
         messages.update(msgs => [...msgs, botMessage]);
 
-        while (true) {
-            const { done, value } = await reader.read();
-            if (done) break;
-
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
-
-            for (const line of lines) {
-                if (line.startsWith('data: ')) {
-                    try {
-                        const data = JSON.parse(line.slice(6));
-                        if (data.answer) {
-                            botMessage.content += data.answer;
-                            // Update the last message
-                            messages.update(msgs => {
-                                const newMsgs = [...msgs];
-                                newMsgs[newMsgs.length - 1] = { ...botMessage };
-                                return newMsgs;
-                            });
-                        }
-                    } catch (e) {
-                        console.error("Error parsing SSE data", e);
-                    }
-                }
+        // Resumes from the last event if the connection drops
+        await api.followAnswer(res, data => {
+            if (data.answer) {
+                botMessage.content += data.answer;
+                // Update the last message
+                messages.update(msgs => {
+                    const newMsgs = [...msgs];
+                    newMsgs[newMsgs.length - 1] = { ...botMessage };
+                    return newMsgs;
+                });
             }
-        }
+        }, signal);
     } catch (e) {
         // Don't show error if request was aborted (user changed cards)
         if (e.name === 'AbortError') {
@@ -6,4 +6,13 @@ const app = mount(App, {
   target: document.getElementById('app'),
 })
 
+// Report time-to-interactive (navigation start until the first frame after mount)
+requestAnimationFrame(() => {
+  const navigation = performance.getEntriesByType('navigation')[0]
+  const resources = performance.getEntriesByType('resource')
+  const transferBytes = [navigation, ...resources].reduce((sum, entry) => sum + ((entry && entry.transferSize) || 0), 0)
+  const payload = JSON.stringify({ tti_ms: performance.now(), transfer_bytes: transferBytes })
+  navigator.sendBeacon?.('/api/debug/load-timing', payload)
+})
+
 export default app